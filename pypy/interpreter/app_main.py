@@ -45,6 +45,8 @@ PYTHONIOENCODING: Encoding[:errors] used for stdin/stdout/stderr.
 PYPY_IRC_TOPIC: if set to a non-empty value, print a random #pypy IRC
                topic at startup of interactive mode.
 PYPYLOG: If set to a non-empty value, enable logging.
+PYPY_JIT_PROFILE: file in which the JIT remembers the hot loops across runs,
+               to compile them earlier after a restart.
 """
 
 try:
@@ -234,6 +236,17 @@ def set_jit_option(options, jitparam, *args):
         import pypyjit
         pypyjit.set_param(jitparam)
 
+def enable_jit_profile(filename):
+    if 'pypyjit' not in sys.builtin_module_names:
+        print >> sys.stderr, ("Warning: No jit support in %s" %
+                              (get_sys_executable(),))
+        return
+    import pypyjit
+    try:
+        pypyjit.enable_warmup_profile(filename)
+    except (IOError, ValueError) as e:
+        print >> sys.stderr, "Warning: PYPY_JIT_PROFILE: %s" % (e,)
+
 def run_faulthandler():
     if 'faulthandler' in sys.builtin_module_names:
         import faulthandler
@@ -545,6 +558,10 @@ def parse_command_line(argv):
     if os.getenv('PYTHONFAULTHANDLER'):
         run_faulthandler()
 
+    jit_profile = os.getenv('PYPY_JIT_PROFILE')
+    if jit_profile:
+        enable_jit_profile(jit_profile)
+
 ##    if not we_are_translated():
 ##        for key in sorted(options):
 ##            print '%40s: %s' % (key, options[key])
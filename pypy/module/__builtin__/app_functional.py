@@ -4,7 +4,7 @@ functional programming.
 """
 import operator
 from __pypy__ import resizelist_hint, newlist_hint
-from __pypy__ import specialized_zip_2_lists
+from __pypy__ import specialized_zip_2_lists, specialized_sum_list
 
 # ____________________________________________________________
 
@@ -46,6 +46,9 @@ of parameter 'start' (which defaults to 0).  When the sequence is
 empty, returns start."""
     if isinstance(start, basestring):
         raise TypeError("sum() can't sum strings")
+    res = specialized_sum_list(sequence, start)
+    if res is not None:
+        return res
     last = start
     for x in sequence:
         # Very intentionally *not* +=, that would have different semantics if
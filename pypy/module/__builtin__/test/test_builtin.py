@@ -226,6 +226,27 @@ class AppTestBuiltinApp:
                 return 42
         assert sum([Foo()], None) == 42
 
+    def test_sum_floats_complexes(self):
+        assert sum([1.5, 2.5]) == 4.0
+        assert type(sum([1.5, 2.5])) is float
+        assert sum([1.5, 2.5], 1j) == 4+1j
+        assert sum([1j, 2+3j]) == 2+4j
+        assert sum([1j, 2+3j], 0.5) == 2.5+4j
+        assert sum([1j, 2+3j], 1j) == 2+5j
+        assert sum([], 1j) == 1j
+        assert type(sum([], 5)) is int
+        raises(TypeError, sum, [1.5, 2.5], None)
+        c = complex(-0.0, -0.0)
+        assert repr(sum([c])) == "0j"
+        assert repr(sum([c], c)) == "(-0-0j)"
+        assert repr(sum([c], -0.0)) == "(-0+0j)"
+        assert repr(sum([-0.0], -0.0)) == "-0.0"
+        raises(TypeError, sum, [1j], "")
+        class C(complex):
+            def __radd__(self, other):
+                return 42
+        assert sum([1j, C(2)]) == 42
+
     def test_type_selftest(self):
         assert type(type) is type
 
@@ -19,6 +19,9 @@ def newdict(space, type):
                  in a function, optimized for passing around
 
     * "strdict" - string-key only dict. This one should be chosen automatically
+
+    * "sharedkeys" - a record-like dict: all the dicts built by inserting
+                     the same sequence of string keys share one table of keys
     """
     if type == 'module':
         return space.newdict(module=True)
@@ -28,6 +31,8 @@ def newdict(space, type):
         return space.newdict(kwargs=True)
     elif type == 'strdict':
         return space.newdict(strdict=True)
+    elif type == 'sharedkeys':
+        return space.newdict(sharedkeys=True)
     else:
         raise oefmt(space.w_TypeError, "unknown type of dict %s", type)
 
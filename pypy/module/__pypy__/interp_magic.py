@@ -161,6 +161,10 @@ def specialized_zip_2_lists(space, w_list1, w_list2):
     from pypy.objspace.std.specialisedtupleobject import specialized_zip_2_lists
     return specialized_zip_2_lists(space, w_list1, w_list2)
 
+def specialized_sum_list(space, w_list, w_start):
+    from pypy.objspace.std.listobject import specialized_sum_list
+    return specialized_sum_list(space, w_list, w_start)
+
 def set_code_callback(space, w_callable):
     cache = space.fromcache(CodeHookCache)
     if space.is_none(w_callable):
@@ -0,0 +1,115 @@
+"""Interp-level implementation of the bisect functions.
+
+Searching an exact list of ints (or floats) for an exact int (or float)
+runs on the unwrapped storage of the IntegerListStrategy (or the
+FloatListStrategy).  Everything else indexes the sequence and compares
+with '<', like the pure Python version in lib-python/2.7/bisect.py.
+"""
+
+from rpython.rlib.objectmodel import specialize
+
+from pypy.interpreter.error import oefmt
+from pypy.interpreter.gateway import unwrap_spec
+from pypy.objspace.std.floatobject import W_FloatObject
+from pypy.objspace.std.intobject import W_IntObject
+from pypy.objspace.std.listobject import (
+    W_ListObject, IntegerListStrategy, FloatListStrategy)
+
+
+@specialize.argtype(0)
+def _bisect_unboxed(items, x, lo, hi, right):
+    while lo < hi:
+        mid = lo + (hi - lo) // 2
+        if right:
+            lt = not (x < items[mid])
+        else:
+            lt = items[mid] < x
+        if lt:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+def _bisect(space, w_a, w_x, lo, w_hi, right):
+    if lo < 0:
+        raise oefmt(space.w_ValueError, "lo must be non-negative")
+    if space.is_none(w_hi):
+        hi = -1
+    else:
+        hi = space.int_w(w_hi)
+    if hi == -1:
+        hi = space.len_w(w_a)
+    if type(w_a) is W_ListObject and hi <= w_a.length():
+        strategy = w_a.strategy
+        if (type(w_x) is W_IntObject and
+                strategy is space.fromcache(IntegerListStrategy)):
+            return _bisect_unboxed(w_a.getitems_int(), space.int_w(w_x),
+                                   lo, hi, right)
+        if (type(w_x) is W_FloatObject and
+                strategy is space.fromcache(FloatListStrategy)):
+            return _bisect_unboxed(w_a.getitems_float(), space.float_w(w_x),
+                                   lo, hi, right)
+    while lo < hi:
+        mid = lo + (hi - lo) // 2
+        w_litem = space.getitem(w_a, space.newint(mid))
+        if right:
+            lt = not space.is_true(space.lt(w_x, w_litem))
+        else:
+            lt = space.is_true(space.lt(w_litem, w_x))
+        if lt:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+def _insort(space, w_a, w_x, lo, w_hi, right):
+    index = _bisect(space, w_a, w_x, lo, w_hi, right)
+    if type(w_a) is W_ListObject:
+        w_a.descr_insert(space, index, w_x)
+    else:
+        space.call_method(w_a, 'insert', space.newint(index), w_x)
+
+
+@unwrap_spec(lo=int)
+def bisect_left(space, w_a, w_x, lo=0, w_hi=None):
+    """Return the index where to insert item x in list a, assuming a is sorted.
+
+The return value i is such that all e in a[:i] have e < x, and all e in
+a[i:] have e >= x.  So if x already appears in the list, i points just
+before the leftmost x already there.
+
+Optional args lo (default 0) and hi (default len(a)) bound the
+slice of a to be searched."""
+    return space.newint(_bisect(space, w_a, w_x, lo, w_hi, False))
+
+@unwrap_spec(lo=int)
+def bisect_right(space, w_a, w_x, lo=0, w_hi=None):
+    """Return the index where to insert item x in list a, assuming a is sorted.
+
+The return value i is such that all e in a[:i] have e <= x, and all e in
+a[i:] have e > x.  So if x already appears in the list, i points just
+beyond the rightmost x already there
+
+Optional args lo (default 0) and hi (default len(a)) bound the
+slice of a to be searched."""
+    return space.newint(_bisect(space, w_a, w_x, lo, w_hi, True))
+
+@unwrap_spec(lo=int)
+def insort_left(space, w_a, w_x, lo=0, w_hi=None):
+    """Insert item x in list a, and keep it sorted assuming a is sorted.
+
+If x is already in a, insert it to the left of the leftmost x.
+
+Optional args lo (default 0) and hi (default len(a)) bound the
+slice of a to be searched."""
+    _insort(space, w_a, w_x, lo, w_hi, False)
+
+@unwrap_spec(lo=int)
+def insort_right(space, w_a, w_x, lo=0, w_hi=None):
+    """Insert item x in list a, and keep it sorted assuming a is sorted.
+
+If x is already in a, insert it to the right of the rightmost x.
+
+Optional args lo (default 0) and hi (default len(a)) bound the
+slice of a to be searched."""
+    _insort(space, w_a, w_x, lo, w_hi, True)
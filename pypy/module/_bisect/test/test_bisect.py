@@ -0,0 +1,58 @@
+class AppTestBisect:
+    spaceconfig = {
+        "usemodules": ['_bisect'],
+    }
+
+    def test_dict(self):
+        import _bisect
+        _bisect.__dict__  # crashes if entries in __init__.py can't be resolved
+
+    def test_bisect(self):
+        from _bisect import bisect_left, bisect_right, bisect
+        assert bisect is bisect_right
+        for a in [[1, 2, 2, 2, 3, 5], [1.0, 2.0, 2.0, 2.0, 3.0, 5.0],
+                  ['1', '2', '2', '2', '3', '5']]:
+            t = type(a[0])
+            assert bisect_left(a, t(2)) == 1
+            assert bisect_right(a, t(2)) == 4
+            assert bisect_left(a, t(0)) == 0
+            assert bisect_right(a, t(9)) == 6
+            assert bisect_left(a, t(2), 2) == 2
+            assert bisect_right(a, t(2), 0, 3) == 3
+            assert bisect_left(a, t(4), hi=None) == 5
+            assert bisect_right(a=a, x=t(3), lo=1, hi=6) == 5
+        assert bisect_left([1, 2, 3], 2.5) == 2
+        assert bisect_right([1.5, 2.5], 2) == 1
+        assert bisect_left((1, 3, 5), 4) == 2
+        raises(ValueError, bisect_left, [1, 2, 3], 5, -1, 3)
+        raises(IndexError, bisect_left, [1, 2, 3], 5, 0, 10)
+
+    def test_subclass_item(self):
+        from _bisect import bisect_left
+        class Int(int):
+            def __gt__(self, other):
+                return True
+        # Int(2).__gt__() is used for 'item < Int(2)'
+        assert bisect_left([1, 2, 3], Int(2)) == 3
+
+    def test_insort(self):
+        from _bisect import insort_left, insort_right, insort
+        assert insort is insort_right
+        a = []
+        for x in [5, 3, 8, 3, 1]:
+            insort_left(a, x)
+        assert a == [1, 3, 3, 5, 8]
+        insort_right(a, 3.0)
+        assert a == [1, 3, 3, 3, 5, 8]
+        assert type(a[3]) is float
+        insort_left(a, 0, 10)
+        assert a == [1, 3, 3, 3, 5, 8, 0]
+        class List(list):
+            data = []
+            def insert(self, index, item):
+                self.data.insert(index, item)
+        lst = List()
+        insort_left(lst, 10)
+        insort_right(lst, 5)
+        assert lst.data == [5, 10]
+        assert lst == []
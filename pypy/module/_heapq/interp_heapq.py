@@ -0,0 +1,251 @@
+"""Interp-level implementation of the heapq functions.
+
+Heaps whose list uses the IntegerListStrategy or the FloatListStrategy are
+sifted directly on the unwrapped storage.  All other heaps go through the
+generic W_ListObject interface and compare items with cmp_lt(), like the
+pure Python version in lib-python/2.7/heapq.py.
+"""
+
+from rpython.rlib.objectmodel import specialize
+
+from pypy.interpreter.error import OperationError, oefmt
+from pypy.interpreter.gateway import unwrap_spec
+from pypy.objspace.std.listobject import (
+    W_ListObject, IntegerListStrategy, FloatListStrategy)
+
+
+def cmp_lt(space, w_x, w_y):
+    # Use __lt__ if available; otherwise, try __le__.
+    if space.is_oldstyle_instance(w_x):
+        has_lt = space.findattr(w_x, space.newtext('__lt__')) is not None
+    else:
+        has_lt = space.lookup(w_x, '__lt__') is not None
+    if has_lt:
+        return space.is_true(space.lt(w_x, w_y))
+    return not space.is_true(space.le(w_y, w_x))
+
+def _heap_lt(space, w_x, w_y, maxheap):
+    if maxheap:
+        return cmp_lt(space, w_y, w_x)
+    return cmp_lt(space, w_x, w_y)
+
+def _check_size(space, w_heap, size):
+    # the comparison may have run arbitrary code
+    if w_heap.length() != size:
+        raise oefmt(space.w_RuntimeError,
+                    "list changed size during iteration")
+
+def _as_list(space, w_heap):
+    if not isinstance(w_heap, W_ListObject):
+        raise oefmt(space.w_TypeError, "heap argument must be a list")
+    return w_heap
+
+# ____________________________________________________________
+# sifting unwrapped ints or floats
+
+@specialize.argtype(0)
+def _siftdown_unboxed(heap, startpos, pos, maxheap):
+    newitem = heap[pos]
+    while pos > startpos:
+        parentpos = (pos - 1) >> 1
+        parent = heap[parentpos]
+        if maxheap:
+            lt = parent < newitem
+        else:
+            lt = newitem < parent
+        if not lt:
+            break
+        heap[pos] = parent
+        pos = parentpos
+    heap[pos] = newitem
+
+@specialize.argtype(0)
+def _siftup_unboxed(heap, pos, maxheap):
+    endpos = len(heap)
+    startpos = pos
+    newitem = heap[pos]
+    childpos = 2 * pos + 1
+    while childpos < endpos:
+        rightpos = childpos + 1
+        if rightpos < endpos:
+            if maxheap:
+                lt = heap[rightpos] < heap[childpos]
+            else:
+                lt = heap[childpos] < heap[rightpos]
+            if not lt:
+                childpos = rightpos
+        heap[pos] = heap[childpos]
+        pos = childpos
+        childpos = 2 * pos + 1
+    heap[pos] = newitem
+    _siftdown_unboxed(heap, startpos, pos, maxheap)
+
+# ____________________________________________________________
+# sifting any list
+
+def _siftdown_obj(space, w_heap, startpos, pos, maxheap):
+    size = w_heap.length()
+    if pos >= size:
+        raise oefmt(space.w_IndexError, "index out of range")
+    w_newitem = w_heap.getitem(pos)
+    while pos > startpos:
+        parentpos = (pos - 1) >> 1
+        w_parent = w_heap.getitem(parentpos)
+        lt = _heap_lt(space, w_newitem, w_parent, maxheap)
+        _check_size(space, w_heap, size)
+        if not lt:
+            break
+        w_heap.setitem(pos, w_parent)
+        pos = parentpos
+    w_heap.setitem(pos, w_newitem)
+
+def _siftup_obj(space, w_heap, pos, maxheap):
+    endpos = w_heap.length()
+    if pos >= endpos:
+        raise oefmt(space.w_IndexError, "index out of range")
+    startpos = pos
+    w_newitem = w_heap.getitem(pos)
+    childpos = 2 * pos + 1
+    while childpos < endpos:
+        rightpos = childpos + 1
+        if rightpos < endpos:
+            lt = _heap_lt(space, w_heap.getitem(childpos),
+                          w_heap.getitem(rightpos), maxheap)
+            _check_size(space, w_heap, endpos)
+            if not lt:
+                childpos = rightpos
+        w_heap.setitem(pos, w_heap.getitem(childpos))
+        pos = childpos
+        childpos = 2 * pos + 1
+    w_heap.setitem(pos, w_newitem)
+    _siftdown_obj(space, w_heap, startpos, pos, maxheap)
+
+# ____________________________________________________________
+
+def _siftdown(space, w_heap, startpos, pos, maxheap=False):
+    strategy = w_heap.strategy
+    if strategy is space.fromcache(IntegerListStrategy):
+        _siftdown_unboxed(w_heap.getitems_int(), startpos, pos, maxheap)
+    elif strategy is space.fromcache(FloatListStrategy):
+        _siftdown_unboxed(w_heap.getitems_float(), startpos, pos, maxheap)
+    else:
+        _siftdown_obj(space, w_heap, startpos, pos, maxheap)
+
+def _siftup(space, w_heap, pos, maxheap=False):
+    strategy = w_heap.strategy
+    if strategy is space.fromcache(IntegerListStrategy):
+        _siftup_unboxed(w_heap.getitems_int(), pos, maxheap)
+    elif strategy is space.fromcache(FloatListStrategy):
+        _siftup_unboxed(w_heap.getitems_float(), pos, maxheap)
+    else:
+        _siftup_obj(space, w_heap, pos, maxheap)
+
+def _heapify(space, w_heap, maxheap=False):
+    # Transform bottom-up.  The largest index there's any point to looking
+    # at is the largest with a child index in-range, so must have
+    # 2*i + 1 < n, or i < (n-1)/2.
+    for i in range(w_heap.length() // 2 - 1, -1, -1):
+        _siftup(space, w_heap, i, maxheap)
+
+
+def heappush(space, w_heap, w_item):
+    """Push item onto heap, maintaining the heap invariant."""
+    w_heap = _as_list(space, w_heap)
+    w_heap.append(w_item)
+    _siftdown(space, w_heap, 0, w_heap.length() - 1)
+
+def heappop(space, w_heap):
+    """Pop the smallest item off the heap, maintaining the heap invariant."""
+    w_heap = _as_list(space, w_heap)
+    if w_heap.length() == 0:
+        raise oefmt(space.w_IndexError, "index out of range")
+    w_lastelt = w_heap.pop_end()
+    if w_heap.length() == 0:
+        return w_lastelt
+    w_returnitem = w_heap.getitem(0)
+    w_heap.setitem(0, w_lastelt)
+    _siftup(space, w_heap, 0)
+    return w_returnitem
+
+def heapreplace(space, w_heap, w_item):
+    """Pop and return the current smallest value, and add the new item.
+
+This is more efficient than heappop() followed by heappush(), and can be
+more appropriate when using a fixed-size heap.  Note that the value
+returned may be larger than item!  That constrains reasonable uses of
+this routine unless written as part of a conditional replacement:
+
+    if item > heap[0]:
+        item = heapreplace(heap, item)
+"""
+    w_heap = _as_list(space, w_heap)
+    if w_heap.length() == 0:
+        raise oefmt(space.w_IndexError, "index out of range")
+    w_returnitem = w_heap.getitem(0)
+    w_heap.setitem(0, w_item)
+    _siftup(space, w_heap, 0)
+    return w_returnitem
+
+def heappushpop(space, w_heap, w_item):
+    """Push item on the heap, then pop and return the smallest item
+from the heap. The combined action runs more efficiently than
+heappush() followed by a separate call to heappop()."""
+    w_heap = _as_list(space, w_heap)
+    if w_heap.length() == 0:
+        return w_item
+    if not cmp_lt(space, w_heap.getitem(0), w_item):
+        return w_item
+    if w_heap.length() == 0:
+        raise oefmt(space.w_IndexError, "index out of range")
+    w_returnitem = w_heap.getitem(0)
+    w_heap.setitem(0, w_item)
+    _siftup(space, w_heap, 0)
+    return w_returnitem
+
+def heapify(space, w_heap):
+    """Transform list into a heap, in-place, in O(len(heap)) time."""
+    w_heap = _as_list(space, w_heap)
+    _heapify(space, w_heap)
+
+
+def _nbest(space, n, w_iterable, maxheap):
+    # keep the n best items seen so far in a heap whose root is the
+    # worst of them: a min-heap for nlargest(), a max-heap for nsmallest()
+    w_iter = space.iter(w_iterable)
+    w_heap = space.newlist([])
+    if n <= 0:
+        return w_heap
+    while True:
+        try:
+            w_item = space.next(w_iter)
+        except OperationError as e:
+            if not e.match(space, space.w_StopIteration):
+                raise
+            break
+        if w_heap.length() < n:
+            w_heap.append(w_item)
+            if w_heap.length() == n:
+                _heapify(space, w_heap, maxheap)
+        elif _heap_lt(space, w_heap.getitem(0), w_item, maxheap):
+            w_heap.setitem(0, w_item)
+            _siftup(space, w_heap, 0, maxheap)
+    w_heap.descr_sort(space)
+    if not maxheap:
+        w_heap.reverse()
+    return w_heap
+
+@unwrap_spec(n=int)
+def nlargest(space, n, w_iterable):
+    """Find the n largest elements in a dataset.
+
+Equivalent to:  sorted(iterable, reverse=True)[:n]
+"""
+    return _nbest(space, n, w_iterable, False)
+
+@unwrap_spec(n=int)
+def nsmallest(space, n, w_iterable):
+    """Find the n smallest elements in a dataset.
+
+Equivalent to:  sorted(iterable)[:n]
+"""
+    return _nbest(space, n, w_iterable, True)
@@ -0,0 +1,96 @@
+class AppTestHeapq:
+    spaceconfig = {
+        "usemodules": ['_heapq'],
+    }
+
+    def test_dict(self):
+        import _heapq
+        _heapq.__dict__  # crashes if entries in __init__.py can't be resolved
+
+    def test_push_pop(self):
+        import _heapq, __pypy__
+        for data in [[(i * 7919) % 1000 for i in range(1000)],
+                     [(i * 7919) % 1000 / 10.0 for i in range(1000)],
+                     [str((i * 7919) % 1000) for i in range(1000)]]:
+            heap = []
+            for item in data:
+                _heapq.heappush(heap, item)
+            strategy = __pypy__.strategy(heap)
+            assert strategy == __pypy__.strategy(data)
+            result = [_heapq.heappop(heap) for i in range(len(data))]
+            assert result == sorted(data)
+            assert heap == []
+        raises(IndexError, _heapq.heappop, [])
+
+    def test_heapify(self):
+        import _heapq
+        for data in [[(i * 7919) % 1000 for i in range(1000)],
+                     [(i * 7919) % 1000 / 10.0 for i in range(1000)],
+                     [(i * 7919) % 1000 for i in range(999)] + [None]]:
+            heap = data[:]
+            _heapq.heapify(heap)
+            for i in range(1, len(heap)):
+                assert not heap[i] < heap[(i - 1) // 2]
+            assert sorted(heap) == sorted(data)
+
+    def test_mixed_types(self):
+        import _heapq
+        heap = [1, 5, 3]
+        _heapq.heapify(heap)
+        _heapq.heappush(heap, 2.5)
+        _heapq.heappush(heap, 0L)
+        assert [_heapq.heappop(heap) for i in range(5)] == [0, 1, 2.5, 3, 5]
+
+    def test_replace_pushpop(self):
+        import _heapq
+        heap = [5, 1, 3]
+        _heapq.heapify(heap)
+        assert _heapq.heapreplace(heap, 4) == 1
+        assert heap[0] == 3
+        assert _heapq.heappushpop(heap, 2) == 2
+        assert _heapq.heappushpop(heap, 4.5) == 3
+        assert sorted(heap) == [4, 4.5, 5]
+        assert _heapq.heappushpop([], 7) == 7
+        raises(IndexError, _heapq.heapreplace, [], 1)
+
+    def test_nbest(self):
+        import _heapq
+        data = [(i * 7919) % 1000 for i in range(1000)]
+        for n in [-1, 0, 1, 5, 1000, 1200]:
+            assert _heapq.nsmallest(n, data) == sorted(data)[:max(n, 0)]
+            assert _heapq.nlargest(n, iter(data)) == (
+                sorted(data, reverse=True)[:max(n, 0)])
+        assert _heapq.nsmallest(2, "hello") == ['e', 'h']
+
+    def test_comparison_operator(self):
+        import _heapq
+        class LT:
+            def __init__(self, x):
+                self.x = x
+            def __lt__(self, other):
+                return self.x > other.x
+        class LE:
+            def __init__(self, x):
+                self.x = x
+            def __le__(self, other):
+                return self.x >= other.x
+        for cls in [LT, LE]:
+            heap = [cls(i) for i in range(50)]
+            _heapq.heapify(heap)
+            assert [_heapq.heappop(heap).x for i in range(50)] == (
+                range(49, -1, -1))
+
+    def test_errors(self):
+        import _heapq
+        raises(TypeError, _heapq.heapify, (1, 2))
+        raises(TypeError, _heapq.heappush, 10, 10)
+        class SideEffectLT(object):
+            def __init__(self, value, heap):
+                self.value = value
+                self.heap = heap
+            def __lt__(self, other):
+                self.heap[:] = []
+                return self.value < other.value
+        heap = []
+        heap.extend(SideEffectLT(i, heap) for i in range(200))
+        raises(RuntimeError, _heapq.heappush, heap, SideEffectLT(5, heap))
@@ -248,7 +248,8 @@ class JSONDecoder(object):
 
     def decode_object(self, i):
         start = i
-        w_dict = self.space.newdict()
+        # JSON objects are very often records built with the same keys
+        w_dict = self.space.newdict(sharedkeys=True)
         #
         i = self.skip_whitespace(i)
         if self.ll_chars[i] == '}':
@@ -56,7 +56,7 @@ class FakeSpace(object):
     def newtuple(self, items):
         return None
 
-    def newdict(self):
+    def newdict(self, sharedkeys=False):
         return W_Dict()
 
     def newlist(self, items):
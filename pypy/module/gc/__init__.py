@@ -4,9 +4,14 @@ from pypy.interpreter.mixedmodule import MixedModule
 class Module(MixedModule):
     interpleveldefs = {
         'collect': 'interp_gc.collect',
+        'collect_step': 'interp_gc.collect_step',
         'enable': 'interp_gc.enable',
         'disable': 'interp_gc.disable',
         'isenabled': 'interp_gc.isenabled',
+        'freeze': 'interp_gc.freeze',
+        'get_freeze_count': 'interp_gc.get_freeze_count',
+        'get_stats': 'interp_gc.get_stats',
+        'set_hooks': 'interp_gc.set_hooks',
         'enable_finalizers': 'interp_gc.enable_finalizers',
         'disable_finalizers': 'interp_gc.disable_finalizers',
         'garbage': 'space.newlist([])',
@@ -34,3 +39,6 @@ class Module(MixedModule):
                 'GcRef': 'referents.W_GcRef',
                 })
         MixedModule.__init__(self, space, w_name)
+        from pypy.module.gc.hook import GcHooksAction
+        space.actionflag.register_periodic_action(
+            space.fromcache(GcHooksAction), use_bytecode_counter=True)
@@ -0,0 +1,80 @@
+from rpython.rlib import rgc
+
+from pypy.interpreter.error import OperationError
+from pypy.interpreter.executioncontext import PeriodicAsyncAction
+
+
+class GcHooksAction(PeriodicAsyncAction):
+    """Calls the hooks installed with gc.set_hooks().  App-level code
+    cannot run in the middle of a collection, so instead we compare the
+    counters of the GC with the ones seen the last time, every check
+    interval, and call each hook once with the activity in between.
+    """
+
+    def __init__(self, space):
+        PeriodicAsyncAction.__init__(self, space)
+        self.w_on_gc_minor = space.w_None
+        self.w_on_gc_collect_step = space.w_None
+        self.in_hook = False
+        self.reset()
+
+    def reset(self):
+        self.minor_collections = rgc.get_stats(rgc.STAT_MINOR_COLLECTIONS)
+        self.minor_time = rgc.get_stats(rgc.STAT_MINOR_TIME)
+        self.major_steps = rgc.get_stats(rgc.STAT_MAJOR_STEPS)
+        self.major_step_time = rgc.get_stats(rgc.STAT_MAJOR_STEP_TIME)
+        self.major_collections = rgc.get_stats(rgc.STAT_MAJOR_COLLECTIONS)
+
+    def perform(self, executioncontext, frame):
+        if self.in_hook:
+            return
+        space = self.space
+        if not space.is_none(self.w_on_gc_minor):
+            count = rgc.get_stats(rgc.STAT_MINOR_COLLECTIONS)
+            if count != self.minor_collections:
+                time = rgc.get_stats(rgc.STAT_MINOR_TIME)
+                w_stats = space.newdict()
+                space.setitem_str(w_stats, 'count',
+                                  space.newint(count - self.minor_collections))
+                space.setitem_str(w_stats, 'duration',
+                                  newseconds(space, time - self.minor_time))
+                space.setitem_str(w_stats, 'total_memory_used', space.newint(
+                    rgc.get_stats(rgc.STAT_TOTAL_MEMORY)))
+                space.setitem_str(w_stats, 'pinned_objects', space.newint(
+                    rgc.get_stats(rgc.STAT_PINNED_OBJECTS)))
+                self.minor_collections = count
+                self.minor_time = time
+                self.call_hook(self.w_on_gc_minor, w_stats)
+        if not space.is_none(self.w_on_gc_collect_step):
+            count = rgc.get_stats(rgc.STAT_MAJOR_STEPS)
+            if count != self.major_steps:
+                time = rgc.get_stats(rgc.STAT_MAJOR_STEP_TIME)
+                major = rgc.get_stats(rgc.STAT_MAJOR_COLLECTIONS)
+                w_stats = space.newdict()
+                space.setitem_str(w_stats, 'count',
+                                  space.newint(count - self.major_steps))
+                space.setitem_str(w_stats, 'duration',
+                                  newseconds(space, time - self.major_step_time))
+                space.setitem_str(w_stats, 'major_collections',
+                                  space.newint(major - self.major_collections))
+                space.setitem_str(w_stats, 'total_memory_used', space.newint(
+                    rgc.get_stats(rgc.STAT_TOTAL_MEMORY)))
+                self.major_steps = count
+                self.major_step_time = time
+                self.major_collections = major
+                self.call_hook(self.w_on_gc_collect_step, w_stats)
+
+    def call_hook(self, w_hook, w_stats):
+        space = self.space
+        self.in_hook = True
+        try:
+            try:
+                space.call_function(w_hook, w_stats)
+            except OperationError as e:
+                e.write_unraisable(space, "gc hook ", w_hook)
+        finally:
+            self.in_hook = False
+
+
+def newseconds(space, microseconds):
+    return space.newfloat(microseconds / 1000000.0)
@@ -1,6 +1,7 @@
 from pypy.interpreter.gateway import unwrap_spec
 from pypy.interpreter.error import oefmt
-from rpython.rlib import rgc
+from rpython.rlib import rgc, jit_hooks
+from pypy.module.gc.hook import GcHooksAction
 
 
 @unwrap_spec(generation=int)
@@ -58,6 +59,75 @@ def disable(space):
 def isenabled(space):
     return space.newbool(space.user_del_action.enabled_at_app_level)
 
+@unwrap_spec(budget=int)
+def collect_step(space, budget=0):
+    """collect_step(budget=0) -> bool
+
+Do a small amount of garbage collection work: a minor collection and one
+step of the incremental major collection, starting a new one if none is
+in progress.  With a 'budget', the step marks or sweeps about 'budget'
+bytes of memory, instead of the amount chosen by the GC.  Returns True
+if this finished a major collection.  Meant to be called by programs
+that know when they are idle, like event loops.
+"""
+    return space.newbool(rgc.collect_step(budget))
+
+class FreezeState(object):
+    def __init__(self, space):
+        self.count = 0
+
+def freeze(space):
+    """Run a full collection, then freeze all the objects that survive
+it: they will never be freed, and the following collections don't write
+to the memory that holds them any more.  The machine code produced so far
+by the JIT is frozen too.  A pre-forking server should call this just
+before forking its workers, so that they keep sharing this memory.
+"""
+    space.fromcache(FreezeState).count = rgc.freeze()
+    if space.config.translation.jit:
+        jit_hooks.seal_machine_code(None)
+
+def get_freeze_count(space):
+    """Return the total number of objects frozen by all the calls to
+freeze() so far."""
+    return space.newint(space.fromcache(FreezeState).count)
+
+def get_stats(space):
+    """Return a dict with the statistics of the GC: the number and the
+total time (in microseconds) of the minor collections and of the major
+collection steps, the number of major collections completed, the number
+of bytes promoted out of the nursery, the memory currently used in the
+arenas and by raw-malloced objects, the number of pinned objects, and
+histograms of how long each minor collection ('minor_pauses_under_1ms'
+...) and each major collection step ('major_step_pauses_under_1ms' ...)
+paused the program.  The values are -1 if this GC doesn't provide them.
+"""
+    w_stats = space.newdict()
+    for i, stat_name in enumerate(rgc.stat_names):
+        space.setitem_str(w_stats, stat_name, space.newint(rgc.get_stats(i)))
+    return w_stats
+
+def set_hooks(space, w_on_gc_minor=None, w_on_gc_collect_step=None):
+    """set_hooks(on_gc_minor=None, on_gc_collect_step=None)
+
+Set the hooks called after some minor collections, respectively major
+collection steps, have run.  They are not called during the collections
+themselves, but soon after, and then only once for all the collections
+since the previous call.  They receive a dict with the number of
+collections or steps ('count'), the time they took in seconds
+('duration') and the 'total_memory_used' afterwards; 'on_gc_minor'
+also gets the number of 'pinned_objects', and 'on_gc_collect_step' the
+number of 'major_collections' completed.  Passing None removes a hook.
+"""
+    action = space.fromcache(GcHooksAction)
+    if w_on_gc_minor is None:
+        w_on_gc_minor = space.w_None
+    if w_on_gc_collect_step is None:
+        w_on_gc_collect_step = space.w_None
+    action.w_on_gc_minor = w_on_gc_minor
+    action.w_on_gc_collect_step = w_on_gc_collect_step
+    action.reset()
+
 def enable_finalizers(space):
     uda = space.user_del_action
     if uda.finalizers_lock_count == 0:
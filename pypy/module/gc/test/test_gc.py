@@ -70,6 +70,27 @@ class AppTestGC(object):
         gc.enable()
         assert gc.isenabled()
 
+    def test_freeze(self):
+        import gc
+        class X(object):
+            pass
+        x = X()
+        gc.freeze()
+        assert gc.get_freeze_count() >= 0
+        x.y = X()
+        gc.collect()
+        assert isinstance(x.y, X)
+
+    def test_collect_step(self):
+        import gc
+        class X(object):
+            pass
+        x = X()
+        while not gc.collect_step(1000):
+            pass
+        assert gc.collect_step() in (True, False)
+        assert isinstance(x, X)
+
     def test_gc_collect_overrides_gc_disable(self):
         import gc
         deleted = []
@@ -118,6 +139,79 @@ class AppTestGcDumpHeap(object):
         gc.dump_heap_stats(self.fname)
 
 
+class AppTestGcStats(object):
+
+    def setup_class(cls):
+        from rpython.rlib import rgc
+        from pypy.interpreter.gateway import interp2app
+        from pypy.module.gc.hook import GcHooksAction
+        stats = [0] * len(rgc.stat_names)
+
+        def fake_get_stats(stat_no):
+            return stats[stat_no]
+
+        def fake_collections(space):
+            stats[rgc.STAT_MINOR_COLLECTIONS] += 3
+            stats[rgc.STAT_MINOR_TIME] += 1500
+            stats[rgc.STAT_MAJOR_STEPS] += 2
+            stats[rgc.STAT_MAJOR_STEP_TIME] += 20000
+            stats[rgc.STAT_MAJOR_COLLECTIONS] += 1
+            stats[rgc.STAT_TOTAL_MEMORY] = 4096
+            space.fromcache(GcHooksAction).perform(None, None)
+
+        cls._get_stats = staticmethod(rgc.get_stats)
+        rgc.get_stats = fake_get_stats
+        cls.w_fake_collections = cls.space.wrap(interp2app(fake_collections))
+
+    def teardown_class(cls):
+        from rpython.rlib import rgc
+        rgc.get_stats = cls._get_stats
+
+    def test_get_stats(self):
+        import gc
+        stats = gc.get_stats()
+        assert stats['minor_collections'] == 0
+        self.fake_collections()
+        stats = gc.get_stats()
+        assert stats['minor_collections'] == 3
+        assert stats['minor_collection_time'] == 1500
+        assert stats['major_step_pauses_over_50ms'] == 0
+
+    def test_hooks(self):
+        import gc
+        minor = []
+        steps = []
+        gc.set_hooks(on_gc_minor=minor.append,
+                     on_gc_collect_step=steps.append)
+        try:
+            self.fake_collections()
+            self.fake_collections()
+        finally:
+            gc.set_hooks()
+        assert len(minor) == 2
+        assert minor[0] == {'count': 3, 'duration': 0.0015,
+                            'total_memory_used': 4096, 'pinned_objects': 0}
+        assert len(steps) == 2
+        assert steps[1] == {'count': 2, 'duration': 0.02,
+                            'major_collections': 1,
+                            'total_memory_used': 4096}
+        self.fake_collections()
+        assert len(minor) == 2
+
+    def test_hook_error(self):
+        import gc
+        seen = []
+        def hook(stats):
+            seen.append(stats['count'])
+            raise ValueError
+        gc.set_hooks(on_gc_minor=hook)
+        try:
+            self.fake_collections()    # the error is only printed
+        finally:
+            gc.set_hooks()
+        assert seen == [3]
+
+
 class AppTestGcMethodCache(object):
 
     def test_clear_method_cache(self):
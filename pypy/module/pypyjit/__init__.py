@@ -12,11 +12,17 @@ class Module(MixedModule):
         'dont_trace_here': 'interp_jit.dont_trace_here',
         'trace_next_iteration': 'interp_jit.trace_next_iteration',
         'trace_next_iteration_hash': 'interp_jit.trace_next_iteration_hash',
+        'enable_warmup_profile': 'interp_warmup.enable_warmup_profile',
+        'load_warmup_profile': 'interp_warmup.load_warmup_profile',
+        'dump_warmup_profile': 'interp_warmup.dump_warmup_profile',
         'set_compile_hook': 'interp_resop.set_compile_hook',
         'set_abort_hook': 'interp_resop.set_abort_hook',
         'set_trace_too_long_hook': 'interp_resop.set_trace_too_long_hook',
         'get_stats_snapshot': 'interp_resop.get_stats_snapshot',
         'get_stats_asmmemmgr': 'interp_resop.get_stats_asmmemmgr',
+        'get_stats_memmgr': 'interp_resop.get_stats_memmgr',
+        'get_stats_compile_budget': 'interp_resop.get_stats_compile_budget',
+        'get_loop_stats': 'interp_resop.get_loop_stats',
         # those things are disabled because they have bugs, but if
         # they're found to be useful, fix test_ztranslation_jit_stats
         # in the backend first. get_stats_snapshot still produces
@@ -41,3 +47,7 @@ class Module(MixedModule):
         w_obj = space.wrap(PARAMETERS)
         space.setattr(self, space.newtext('defaults'), w_obj)
         pypy_hooks.space = space
+
+    def shutdown(self, space):
+        from pypy.module.pypyjit.interp_warmup import WarmupProfile
+        space.fromcache(WarmupProfile).save_at_exit()
@@ -7,8 +7,7 @@ from rpython.rlib.rarithmetic import r_uint, intmask
 from rpython.rlib.jit import JitDriver, hint, we_are_jitted, dont_look_inside
 from rpython.rlib import jit, jit_hooks
 from rpython.rlib.rjitlog import rjitlog as jl
-from rpython.rlib.jit import current_trace_length, unroll_parameters,\
-     JitHookInterface
+from rpython.rlib.jit import current_trace_length, unroll_parameters
 from rpython.rtyper.annlowlevel import cast_instance_to_gcref
 import pypy.interpreter.pyopcode   # for side-effects
 from pypy.interpreter.error import OperationError, oefmt
@@ -19,6 +18,7 @@ from pypy.interpreter.pyopcode import ExitFrame, Yield
 from pypy.interpreter.baseobjspace import W_Root
 from pypy.interpreter.typedef import TypeDef
 from pypy.interpreter.gateway import interp2app
+from pypy.module.pypyjit.interp_warmup import WarmupProfile
 from opcode import opmap
 
 
@@ -78,6 +78,8 @@ class __extend__(PyFrame):
 
     def dispatch(self, pycode, next_instr, ec):
         self = hint(self, access_directly=True)
+        if not we_are_jitted():
+            self.space.fromcache(WarmupProfile).enter_code(pycode)
         next_instr = r_uint(next_instr)
         is_being_profiled = self.get_is_being_profiled()
         try:
@@ -238,70 +240,3 @@ def trace_next_iteration_hash(space, hash):
     jit_hooks.trace_next_iteration_hash('pypyjit', hash)
     return space.w_None
 
-# class Cache(object):
-#     in_recursion = False
-
-#     def __init__(self, space):
-#         self.w_compile_bridge = space.w_None
-#         self.w_compile_loop = space.w_None
-
-# def set_compile_bridge(space, w_hook):
-#     cache = space.fromcache(Cache)
-#     assert w_hook is not None
-#     cache.w_compile_bridge = w_hook
-
-# def set_compile_loop(space, w_hook):
-#     from rpython.rlib.nonconst import NonConstant
-    
-#     cache = space.fromcache(Cache)
-#     assert w_hook is not None
-#     cache.w_compile_loop = w_hook
-#     cache.in_recursion = NonConstant(False)
-
-# class PyPyJitHookInterface(JitHookInterface):
-#     def after_compile(self, debug_info):
-#         space = self.space
-#         cache = space.fromcache(Cache)
-#         if cache.in_recursion:
-#             return
-#         l_w = []
-#         if not space.is_true(cache.w_compile_loop):
-#             return
-#         for i, op in enumerate(debug_info.operations):
-#             if op.is_guard():
-#                 w_t = space.newtuple([space.newint(i), space.newint(op.getopnum()), space.newint(op.getdescr().get_jitcounter_hash())])
-#                 l_w.append(w_t)
-#         try:
-#             cache.in_recursion = True
-#             try:
-#                 space.call_function(cache.w_compile_loop, space.newlist(l_w))
-#             except OperationError, e:
-#                 e.write_unraisable(space, "jit hook ", cache.w_compile_bridge)
-#         finally:
-#             cache.in_recursion = False
-
-#     def after_compile_bridge(self, debug_info):
-#         space = self.space
-#         cache = space.fromcache(Cache)
-#         if cache.in_recursion:
-#             return
-#         if not space.is_true(cache.w_compile_bridge):
-#             return
-#         w_hash = space.newint(debug_info.fail_descr.get_jitcounter_hash())
-#         try:
-#             cache.in_recursion = True
-#             try:
-#                 space.call_function(cache.w_compile_bridge, w_hash)
-#             except OperationError, e:
-#                 e.write_unraisable(space, "jit hook ", cache.w_compile_bridge)
-#         finally:
-#             cache.in_recursion = False
-
-#     def before_compile(self, debug_info):
-#         pass
-
-#     def before_compile_bridge(self, debug_info):
-#         pass
-
-# pypy_hooks = PyPyJitHookInterface()
-
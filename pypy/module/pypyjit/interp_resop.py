@@ -13,6 +13,9 @@ from rpython.rlib.nonconst import NonConstant
 from rpython.rlib.rarithmetic import r_uint
 from rpython.rlib import jit_hooks
 from rpython.rlib.jit import Counters
+from rpython.jit.metainterp.memmgr import stat_names as memmgr_stat_names
+from rpython.jit.metainterp.compilebudget import (
+    stat_names as compile_budget_stat_names)
 from rpython.rlib.objectmodel import compute_unique_id
 from pypy.module.pypyjit.interp_jit import pypyjitdriver
 
@@ -388,6 +391,51 @@ def get_stats_asmmemmgr(space):
     m2 = jit_hooks.stats_asmmemmgr_used(None)
     return space.newtuple([space.newint(m1), space.newint(m2)])
 
+def get_stats_memmgr(space):
+    """Returns a dict describing the JIT code cache: the estimated size in
+    bytes of the loops that are kept alive ('total_size') and the limit set
+    with the 'memory_budget' parameter, the number of entries into compiled
+    loops ('hits') and of loops and bridges compiled ('misses'), and the
+    number and size of the loops freed to stay within the budget."""
+    w_stats = space.newdict()
+    for i, stat_name in enumerate(memmgr_stat_names):
+        v = jit_hooks.stats_memmgr_get_value(None, i)
+        space.setitem_str(w_stats, stat_name, space.newint(v))
+    return w_stats
+
+def get_stats_compile_budget(space):
+    """Returns a dict describing how much time is spent compiling bridges:
+    the 'compile_budget' and 'compile_budget_window' parameters and the
+    milliseconds 'spent' in the current window, the number of guards whose
+    bridge is 'pending' because the budget was exhausted, the total number
+    of bridges 'deferred' and 'compiled', and a histogram of how long each
+    compilation stalled the program ('stalls_under_1ms' ...)."""
+    w_stats = space.newdict()
+    for i, stat_name in enumerate(compile_budget_stat_names):
+        v = jit_hooks.stats_compile_budget_get_value(None, i)
+        space.setitem_str(w_stats, stat_name, space.newint(v))
+    return w_stats
+
+def get_loop_stats(space):
+    """Returns a dict mapping the number of every compiled loop that is
+    still alive (the 'loop_no' of JitLoopInfo) to a dict with how many
+    times a guard of the loop or of its bridges failed without a bridge to
+    jump to ('guard_failures'), the number of 'bridges' and the size in
+    bytes of the machine code of the loop and its bridges ('asm_size').
+    """
+    ll_stats = jit_hooks.stats_get_loop_stats(None)
+    w_result = space.newdict()
+    for i in range(len(ll_stats)):
+        w_stats = space.newdict()
+        space.setitem_str(w_stats, 'guard_failures',
+                          space.newint(ll_stats[i].guard_failures))
+        space.setitem_str(w_stats, 'bridges',
+                          space.newint(ll_stats[i].bridges))
+        space.setitem_str(w_stats, 'asm_size',
+                          space.newint(ll_stats[i].asm_size))
+        space.setitem(w_result, space.newint(ll_stats[i].number), w_stats)
+    return w_result
+
 def enable_debug(space):
     """ Set the jit debugging - completely necessary for some stats to work,
     most notably assembler counters.
@@ -0,0 +1,206 @@
+"""Warm-up profiles: remember which loops the JIT compiled in an earlier
+run of the program, and trace them as soon as possible in the next one.
+
+A profile is a text file with one line per loop.  The loop is identified
+by the bytecode position of its header and by the file name, first line
+number and name of its code object, which are stable across processes.
+When a profile is loaded, the first time a matching code object starts
+running in the interpreter, the JIT counters of its loops are set just
+below the threshold, so that they are traced on their next iteration
+instead of after 'threshold' iterations.
+"""
+
+import os
+
+from rpython.rlib import jit_hooks
+from rpython.rlib.rarithmetic import r_uint
+from rpython.rlib.streamio import StreamErrors, open_file_as_stream
+from rpython.rtyper.annlowlevel import (
+    cast_instance_to_gcref, cast_base_ptr_to_instance)
+from rpython.rtyper.lltypesystem import lltype
+from rpython.rtyper.rclass import OBJECT
+
+from pypy.interpreter.error import oefmt
+from pypy.interpreter.gateway import unwrap_spec
+from pypy.interpreter.miscutils import string_sort
+from pypy.interpreter.pycode import PyCode
+from pypy.interpreter.streamutil import wrap_streamerror
+
+PROFILE_HEADER = "# pypyjit warm-up profile 1"
+
+
+def _trace_next_iteration(next_instr, is_being_profiled, pycode):
+    ll_pycode = cast_instance_to_gcref(pycode)
+    jit_hooks.trace_next_iteration(
+        'pypyjit', r_uint(next_instr), int(is_being_profiled), ll_pycode)
+
+
+class ProfileEntry(object):
+    def __init__(self, filename, firstlineno, next_instr, is_being_profiled):
+        self.filename = filename
+        self.firstlineno = firstlineno
+        self.next_instr = next_instr
+        self.is_being_profiled = is_being_profiled
+
+
+class WarmupProfile(object):
+    recording = False
+    filename = None      # where to write the profile at shutdown
+
+    def __init__(self, space):
+        self.space = space
+        self.loops = {}      # profile line -> None
+        self.pending = {}    # co_name -> [ProfileEntry] not seeded yet
+
+    def add_loop(self, pycode, next_instr, is_being_profiled):
+        line = "%d %d %d %s %s" % (next_instr, int(is_being_profiled),
+                                   pycode.co_firstlineno, pycode.co_name,
+                                   pycode.co_filename)
+        self.loops[line] = None
+
+    def record_loop(self, debug_info):
+        # called by the JIT hooks for every loop or entry bridge
+        if not self.recording:
+            return
+        if debug_info.get_jitdriver().name != 'pypyjit':
+            return
+        greenkey = debug_info.greenkey
+        next_instr = greenkey[0].getint()
+        is_being_profiled = greenkey[1].getint()
+        ll_code = lltype.cast_opaque_ptr(lltype.Ptr(OBJECT),
+                                         greenkey[2].getref_base())
+        pycode = cast_base_ptr_to_instance(PyCode, ll_code)
+        self.add_loop(pycode, next_instr, is_being_profiled)
+
+    def add_line(self, line):
+        # lines that cannot be parsed are ignored: a stale or damaged
+        # profile must not prevent the program from starting
+        fields = line.split(' ', 4)
+        if len(fields) != 5:
+            return
+        try:
+            next_instr = int(fields[0])
+            is_being_profiled = int(fields[1])
+            firstlineno = int(fields[2])
+        except ValueError:
+            return
+        name = fields[3]
+        entry = ProfileEntry(fields[4], firstlineno, next_instr,
+                             is_being_profiled != 0)
+        self.loops[line] = None
+        self.pending.setdefault(name, []).append(entry)
+
+    def load(self, filename):
+        stream = open_file_as_stream(filename, 'r')
+        try:
+            data = stream.readall()
+        finally:
+            stream.close()
+        lines = data.split('\n')
+        if lines[0] != PROFILE_HEADER:
+            raise oefmt(self.space.w_ValueError,
+                        "%s is not a warm-up profile", filename)
+        for line in lines[1:]:
+            if line:
+                self.add_line(line)
+
+    def dump(self, filename):
+        lines = self.loops.keys()
+        string_sort(lines)
+        # write a new file and rename it, so that a process that dies while
+        # writing does not leave a truncated profile behind.  The name of
+        # the new file is per process, for processes saving the same profile
+        tmpname = '%s.%d.tmp' % (filename, os.getpid())
+        stream = open_file_as_stream(tmpname, 'w')
+        try:
+            stream.write(PROFILE_HEADER + '\n')
+            for line in lines:
+                stream.write(line + '\n')
+        finally:
+            stream.close()
+        os.rename(tmpname, filename)
+
+    def enter_code(self, pycode):
+        # called by the interpreter every time a frame starts running
+        if self.pending:
+            self.seed(pycode)
+
+    def seed(self, pycode):
+        name = pycode.co_name
+        entries = self.pending.get(name, None)
+        if entries is None:
+            return
+        remaining = []
+        for entry in entries:
+            if (entry.firstlineno == pycode.co_firstlineno and
+                    entry.filename == pycode.co_filename):
+                _trace_next_iteration(entry.next_instr,
+                                      entry.is_being_profiled, pycode)
+            else:
+                remaining.append(entry)
+        if remaining:
+            self.pending[name] = remaining
+        else:
+            del self.pending[name]
+
+    def save_at_exit(self):
+        filename = self.filename
+        if filename is None:
+            return
+        try:
+            self.dump(filename)
+        except StreamErrors:
+            pass
+
+
+@unwrap_spec(filename='fsencode')
+def enable_warmup_profile(space, filename):
+    """enable_warmup_profile(filename)
+
+Load the warm-up profile stored in 'filename' if the file exists, record
+the loops that the JIT compiles from now on, and write all of them back
+to 'filename' when the process exits.  This is what the PYPY_JIT_PROFILE
+environment variable does.
+"""
+    profile = space.fromcache(WarmupProfile)
+    try:
+        profile.load(filename)
+    except StreamErrors:
+        pass      # no profile yet
+    profile.recording = True
+    profile.filename = filename
+
+@unwrap_spec(filename='fsencode')
+def load_warmup_profile(space, filename):
+    """load_warmup_profile(filename)
+
+Make the JIT trace the loops listed in the warm-up profile stored in
+'filename' as soon as they run.
+"""
+    profile = space.fromcache(WarmupProfile)
+    try:
+        profile.load(filename)
+    except StreamErrors as e:
+        raise wrap_streamerror(space, e, space.newtext(filename))
+
+def dump_warmup_profile(space, w_filename=None):
+    """dump_warmup_profile([filename])
+
+Write the loops compiled so far, and those of the profile that was
+loaded, to 'filename'.  The default is the file given to
+enable_warmup_profile(); call this periodically in processes that are
+not expected to exit cleanly.
+"""
+    profile = space.fromcache(WarmupProfile)
+    if space.is_none(w_filename):
+        filename = profile.filename
+        if filename is None:
+            raise oefmt(space.w_ValueError,
+                        "no file name given and enable_warmup_profile() "
+                        "was not called")
+    else:
+        filename = space.fsencode_w(w_filename)
+    try:
+        profile.dump(filename)
+    except StreamErrors as e:
+        raise wrap_streamerror(space, e, space.newtext(filename))
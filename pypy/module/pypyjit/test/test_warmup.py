@@ -0,0 +1,93 @@
+from rpython.tool.udir import udir
+from pypy.module.pypyjit import interp_warmup
+from pypy.module.pypyjit.interp_warmup import WarmupProfile, PROFILE_HEADER
+
+
+class TestWarmupProfile(object):
+    spaceconfig = dict(usemodules=('pypyjit',))
+
+    def setup_method(self, meth):
+        self.w_f = self.space.appexec([], """():
+        def function(n):
+            total = 0
+            for i in range(n):
+                total += i
+            return total
+        return function
+        """)
+
+    def test_dump_and_load(self, tmpdir):
+        space = self.space
+        code = self.w_f.code
+        profile = WarmupProfile(space)
+        profile.add_loop(code, 17, False)
+        profile.add_loop(code, 17, False)
+        profile.add_loop(code, 23, True)
+        filename = str(tmpdir.join('profile'))
+        profile.dump(filename)
+        lines = open(filename).read().splitlines()
+        assert lines[0] == PROFILE_HEADER
+        assert lines[1:] == [
+            "17 0 %d function %s" % (code.co_firstlineno, code.co_filename),
+            "23 1 %d function %s" % (code.co_firstlineno, code.co_filename)]
+        #
+        profile = WarmupProfile(space)
+        profile.load(filename)
+        assert sorted(profile.loops) == sorted(lines[1:])
+        entries = profile.pending['function']
+        assert [(e.next_instr, e.is_being_profiled) for e in entries] == [
+            (17, False), (23, True)]
+        assert entries[0].filename == code.co_filename
+        assert entries[0].firstlineno == code.co_firstlineno
+
+    def test_load_garbage(self, tmpdir):
+        space = self.space
+        tmpdir.join('profile').write(PROFILE_HEADER + "\n"
+                                     "17 0 12\n"
+                                     "x 0 12 f /tmp/f.py\n"
+                                     "3 0 12 g /tmp/with space.py\n")
+        profile = WarmupProfile(space)
+        profile.load(str(tmpdir.join('profile')))
+        assert profile.pending.keys() == ['g']
+        assert profile.pending['g'][0].filename == '/tmp/with space.py'
+        tmpdir.join('other').write("hello\n")
+        exc = raises(Exception, profile.load, str(tmpdir.join('other')))
+        assert exc.value.match(space, space.w_ValueError)
+
+    def test_seed_on_first_call(self, monkeypatch):
+        space = self.space
+        code = self.w_f.code
+        seeded = []
+        monkeypatch.setattr(interp_warmup, '_trace_next_iteration',
+            lambda next_instr, is_being_profiled, pycode:
+                seeded.append((next_instr, is_being_profiled, pycode)))
+        profile = space.fromcache(WarmupProfile)
+        monkeypatch.setattr(profile, 'pending', {})
+        profile.add_line("17 0 %d function %s" % (code.co_firstlineno,
+                                                  code.co_filename))
+        profile.add_line("5 0 1 function /elsewhere.py")
+        space.call_function(self.w_f, space.newint(3))
+        assert seeded == [(17, False, code)]
+        assert len(profile.pending['function']) == 1
+        space.call_function(self.w_f, space.newint(3))
+        assert len(seeded) == 1
+
+
+class AppTestWarmupProfile(object):
+    spaceconfig = dict(usemodules=('pypyjit',))
+
+    def setup_class(cls):
+        cls.w_tmpdir = cls.space.wrap(str(udir.ensure('warmup', dir=1)))
+
+    def test_api(self):
+        import pypyjit, os
+        filename = os.path.join(self.tmpdir, 'profile')
+        raises(IOError, pypyjit.load_warmup_profile, filename)
+        pypyjit.dump_warmup_profile(filename)
+        with open(filename) as f:
+            assert f.read().startswith('# pypyjit warm-up profile')
+        pypyjit.load_warmup_profile(filename)
+        pypyjit.enable_warmup_profile(filename + '2')
+        pypyjit.dump_warmup_profile()
+        assert os.path.exists(filename + '2')
+        assert sorted(os.listdir(self.tmpdir)) == ['profile', 'profile2']
@@ -154,7 +154,7 @@ class FakeObjSpace(ObjSpace):
         raise NotImplementedError
 
     def newdict(self, module=False, instance=False, kwargs=False,
-                strdict=False):
+                strdict=False, sharedkeys=False):
         return w_some_obj()
 
     def newtuple(self, list_w):
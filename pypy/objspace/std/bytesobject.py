@@ -125,6 +125,23 @@ class W_AbstractBytesObject(W_Root):
     def descr_str(self, space):
         """x.__str__() <==> str(x)"""
 
+    def descr_getbuffer(self, space, w_flags):
+        """x.__buffer__(flags) -> read-only buffer over the bytes of x"""
+
+    def descr_formatter_parser(self, space):
+        """S._formatter_parser() -> iterator
+
+        Internal helper of format(): iterate over the literal text and the
+        replacement fields of S.
+        """
+
+    def descr_formatter_field_name_split(self, space):
+        """S._formatter_field_name_split() -> (first, rest)
+
+        Internal helper of format(): split the field name S into its first
+        part and an iterator over the attribute and item lookups after it.
+        """
+
     def descr_capitalize(self, space):
         """S.capitalize() -> string
 
@@ -612,31 +629,55 @@ class W_BytesObject(W_AbstractBytesObject):
         return mod_format(space, w_values, self, do_unicode=False)
 
     def descr_eq(self, space, w_other):
+        if space.config.objspace.std.withstrbuf:
+            from pypy.objspace.std.strbufobject import W_StringBufferObject
+            if isinstance(w_other, W_StringBufferObject):
+                return space.newbool(self._value == w_other.force())
         if not isinstance(w_other, W_BytesObject):
             return space.w_NotImplemented
         return space.newbool(self._value == w_other._value)
 
     def descr_ne(self, space, w_other):
+        if space.config.objspace.std.withstrbuf:
+            from pypy.objspace.std.strbufobject import W_StringBufferObject
+            if isinstance(w_other, W_StringBufferObject):
+                return space.newbool(self._value != w_other.force())
         if not isinstance(w_other, W_BytesObject):
             return space.w_NotImplemented
         return space.newbool(self._value != w_other._value)
 
     def descr_lt(self, space, w_other):
+        if space.config.objspace.std.withstrbuf:
+            from pypy.objspace.std.strbufobject import W_StringBufferObject
+            if isinstance(w_other, W_StringBufferObject):
+                return space.newbool(self._value < w_other.force())
         if not isinstance(w_other, W_BytesObject):
             return space.w_NotImplemented
         return space.newbool(self._value < w_other._value)
 
     def descr_le(self, space, w_other):
+        if space.config.objspace.std.withstrbuf:
+            from pypy.objspace.std.strbufobject import W_StringBufferObject
+            if isinstance(w_other, W_StringBufferObject):
+                return space.newbool(self._value <= w_other.force())
         if not isinstance(w_other, W_BytesObject):
             return space.w_NotImplemented
         return space.newbool(self._value <= w_other._value)
 
     def descr_gt(self, space, w_other):
+        if space.config.objspace.std.withstrbuf:
+            from pypy.objspace.std.strbufobject import W_StringBufferObject
+            if isinstance(w_other, W_StringBufferObject):
+                return space.newbool(self._value > w_other.force())
         if not isinstance(w_other, W_BytesObject):
             return space.w_NotImplemented
         return space.newbool(self._value > w_other._value)
 
     def descr_ge(self, space, w_other):
+        if space.config.objspace.std.withstrbuf:
+            from pypy.objspace.std.strbufobject import W_StringBufferObject
+            if isinstance(w_other, W_StringBufferObject):
+                return space.newbool(self._value >= w_other.force())
         if not isinstance(w_other, W_BytesObject):
             return space.w_NotImplemented
         return space.newbool(self._value >= w_other._value)
@@ -654,6 +695,22 @@ class W_BytesObject(W_AbstractBytesObject):
             from .bytearrayobject import W_BytearrayObject, _make_data
             self_as_bytearray = W_BytearrayObject(_make_data(self._value))
             return space.add(self_as_bytearray, w_other)
+        elif space.config.objspace.std.withstrbuf:
+            from pypy.objspace.std.strbufobject import W_StringBufferObject
+            if not (self._use_rstr_ops(space, w_other) or
+                    isinstance(w_other, W_StringBufferObject)):
+                # like the generic descr_add(): no str + buffer
+                return space.w_NotImplemented
+            try:
+                other = self._op_val(space, w_other)
+            except OperationError as e:
+                if e.match(space, space.w_TypeError):
+                    return space.w_NotImplemented
+                raise
+            builder = StringBuilder()
+            builder.append(self._value)
+            builder.append(other)
+            return W_StringBufferObject(builder)
         return self._StringMethods_descr_add(space, w_other)
 
     _StringMethods__startswith = _startswith
@@ -699,6 +756,12 @@ class W_BytesObject(W_AbstractBytesObject):
 
     _StringMethods_descr_join = descr_join
     def descr_join(self, space, w_list):
+        from pypy.objspace.std.listobject import (
+            W_ListObject, BytesSliceListStrategy)
+        if type(w_list) is W_ListObject:
+            strategy = w_list.strategy
+            if strategy is space.fromcache(BytesSliceListStrategy):
+                return space.newbytes(strategy.join(w_list, self._value))
         l = space.listview_bytes(w_list)
         if l is not None:
             if len(l) == 1:
@@ -712,7 +775,23 @@ class W_BytesObject(W_AbstractBytesObject):
         if w_sep is not None and space.isinstance_w(w_sep, space.w_unicode):
             self_as_uni = unicode_from_encoded_object(space, self, None, None)
             return self_as_uni.descr_split(space, w_sep, maxsplit)
-        return self._StringMethods_descr_split(space, w_sep, maxsplit)
+        from pypy.objspace.std.listobject import W_ListObject
+        value = self._value
+        if space.is_none(w_sep):
+            bounds = _split_whitespace_bounds(value, maxsplit)
+        else:
+            by = self._op_val(space, w_sep)
+            if len(by) == 0:
+                raise oefmt(space.w_ValueError, "empty separator")
+            bounds = _split_bounds(value, by, maxsplit)
+        return W_ListObject.newlist_bytes_slices(space, value, bounds)
+
+    @unwrap_spec(keepends=bool)
+    def descr_splitlines(self, space, keepends=False):
+        from pypy.objspace.std.listobject import W_ListObject
+        value = self._value
+        bounds = _splitlines_bounds(value, keepends)
+        return W_ListObject.newlist_bytes_slices(space, value, bounds)
 
     _StringMethods_descr_rsplit = descr_rsplit
     @unwrap_spec(maxsplit=int)
@@ -827,6 +906,75 @@ class W_BytesObject(W_AbstractBytesObject):
         return tformat.formatter_field_name_split()
 
 
+# The following helpers return the start and stop of every item of the
+# result of split() and splitlines(), next to each other in a flat list,
+# for W_ListObject.newlist_bytes_slices().  They follow rstring.split()
+# and StringMethods.descr_splitlines().
+
+def _split_whitespace_bounds(value, maxsplit):
+    length = len(value)
+    bounds = []
+    i = 0
+    while True:
+        # find the beginning of the next word
+        while i < length:
+            if not value[i].isspace():
+                break   # found
+            i += 1
+        else:
+            break  # end of string, finished
+
+        # find the end of the word
+        if maxsplit == 0:
+            j = length   # take all the rest of the string
+        else:
+            j = i + 1
+            while j < length and not value[j].isspace():
+                j += 1
+            maxsplit -= 1   # NB. if it's already < 0, it stays < 0
+
+        bounds.append(i)
+        bounds.append(j)
+        i = j + 1
+    return bounds
+
+def _split_bounds(value, by, maxsplit):
+    length = len(value)
+    bylen = len(by)
+    bounds = []
+    start = 0
+    while maxsplit != 0:
+        next = value.find(by, start, length)
+        if next < 0:
+            break
+        bounds.append(start)
+        bounds.append(next)
+        start = next + bylen
+        maxsplit -= 1   # NB. if it's already < 0, it stays < 0
+    bounds.append(start)
+    bounds.append(length)
+    return bounds
+
+def _splitlines_bounds(value, keepends):
+    length = len(value)
+    bounds = []
+    pos = 0
+    while pos < length:
+        sol = pos
+        while pos < length and value[pos] != '\n' and value[pos] != '\r':
+            pos += 1
+        eol = pos
+        pos += 1
+        # read CRLF as one line break
+        if pos < length and value[eol] == '\r' and value[pos] == '\n':
+            pos += 1
+        if keepends:
+            eol = min(pos, length)
+        bounds.append(sol)
+        bounds.append(eol)
+    return bounds
+
+
 def _create_list_from_bytes(value):
     # need this helper function to allow the jit to look inside and inline
     # listview_bytes
@@ -902,17 +1050,18 @@ W_BytesObject.typedef = TypeDef(
     translate = interpindirect2app(W_AbstractBytesObject.descr_translate),
     upper = interpindirect2app(W_AbstractBytesObject.descr_upper),
     zfill = interpindirect2app(W_AbstractBytesObject.descr_zfill),
-    __buffer__ = interp2app(W_BytesObject.descr_getbuffer),
+    __buffer__ = interpindirect2app(W_AbstractBytesObject.descr_getbuffer),
 
-    format = interpindirect2app(W_BytesObject.descr_format),
-    __format__ = interpindirect2app(W_BytesObject.descr__format__),
-    __mod__ = interpindirect2app(W_BytesObject.descr_mod),
-    __rmod__ = interpindirect2app(W_BytesObject.descr_rmod),
+    format = interpindirect2app(W_AbstractBytesObject.descr_format),
+    __format__ = interpindirect2app(W_AbstractBytesObject.descr__format__),
+    __mod__ = interpindirect2app(W_AbstractBytesObject.descr_mod),
+    __rmod__ = interpindirect2app(W_AbstractBytesObject.descr_rmod),
     __getnewargs__ = interpindirect2app(
         W_AbstractBytesObject.descr_getnewargs),
-    _formatter_parser = interp2app(W_BytesObject.descr_formatter_parser),
-    _formatter_field_name_split =
-        interp2app(W_BytesObject.descr_formatter_field_name_split),
+    _formatter_parser = interpindirect2app(
+        W_AbstractBytesObject.descr_formatter_parser),
+    _formatter_field_name_split = interpindirect2app(
+        W_AbstractBytesObject.descr_formatter_field_name_split),
 )
 W_BytesObject.typedef.flag_sequence_bug_compat = True
 
@@ -3,6 +3,7 @@
 from rpython.rlib import jit, rerased, objectmodel
 from rpython.rlib.debug import mark_dict_non_null
 from rpython.rlib.objectmodel import newlist_hint, r_dict, specialize
+from rpython.rlib.rfloat import isnan
 from rpython.tool.sourcetools import func_renamer, func_with_new_name
 
 from pypy.interpreter.baseobjspace import W_Root
@@ -12,7 +13,7 @@ from pypy.interpreter.gateway import (
 from pypy.interpreter.mixedmodule import MixedModule
 from pypy.interpreter.signature import Signature
 from pypy.interpreter.typedef import TypeDef
-from pypy.objspace.std.util import negate
+from pypy.objspace.std.util import negate, range_index_w
 
 
 UNROLL_CUTOFF = 5
@@ -55,7 +56,7 @@ class W_DictMultiObject(W_Root):
     @staticmethod
     def allocate_and_init_instance(space, w_type=None, module=False,
                                    instance=False, strdict=False,
-                                   kwargs=False):
+                                   kwargs=False, sharedkeys=False):
         if module:
             from pypy.objspace.std.celldict import ModuleDictStrategy
             assert w_type is None
@@ -76,6 +77,11 @@ class W_DictMultiObject(W_Root):
             assert w_type is None
             from pypy.objspace.std.kwargsdict import EmptyKwargsDictStrategy
             strategy = space.fromcache(EmptyKwargsDictStrategy)
+        elif sharedkeys:
+            assert w_type is None
+            from pypy.objspace.std.sharedkeysdict import (
+                EmptySharedKeysDictStrategy)
+            strategy = space.fromcache(EmptySharedKeysDictStrategy)
         else:
             strategy = space.fromcache(EmptyDictStrategy)
         if w_type is None:
@@ -119,6 +125,16 @@ class W_DictMultiObject(W_Root):
         if w_fill is None:
             w_fill = space.w_None
         if space.is_w(w_type, space.w_dict):
+            from pypy.objspace.std.listobject import (
+                BaseRangeListStrategy, W_ListObject)
+            if (type(w_keys) is W_ListObject and
+                    isinstance(w_keys.strategy, BaseRangeListStrategy)):
+                start, step, length = w_keys.strategy.getrange(w_keys)
+                if length > 0:
+                    strategy = space.fromcache(RangeDictStrategy)
+                    storage = strategy.get_storage_from_range(
+                        start, step, [w_fill] * length)
+                    return W_DictObject(space, strategy, storage)
             w_dict = W_DictMultiObject.allocate_and_init_instance(space,
                                                                   w_type)
 
@@ -442,6 +458,7 @@ def _add_indirections():
                     length w_keys values items \
                     iterkeys itervalues iteritems \
                     listview_bytes listview_unicode listview_int \
+                    listview_float \
                     view_as_kwargs".split()
 
     def make_method(method):
@@ -599,6 +616,9 @@ class DictStrategy(object):
     def listview_int(self, w_dict):
         return None
 
+    def listview_float(self, w_dict):
+        return None
+
     def view_as_kwargs(self, w_dict):
         return (None, None)
 
@@ -646,6 +666,9 @@ class EmptyDictStrategy(DictStrategy):
         w_type = self.space.type(w_key)
         if self.space.is_w(w_type, self.space.w_int):
             self.switch_to_int_strategy(w_dict)
+        elif (self.space.is_w(w_type, self.space.w_float) and
+              not isnan(self.space.float_w(w_key))):
+            self.switch_to_float_strategy(w_dict)
         elif w_type.compares_by_identity():
             self.switch_to_identity_strategy(w_dict)
         else:
@@ -669,6 +692,12 @@ class EmptyDictStrategy(DictStrategy):
         w_dict.set_strategy(strategy)
         w_dict.dstorage = storage
 
+    def switch_to_float_strategy(self, w_dict):
+        strategy = self.space.fromcache(FloatDictStrategy)
+        storage = strategy.get_empty_storage()
+        w_dict.set_strategy(strategy)
+        w_dict.dstorage = storage
+
     def switch_to_identity_strategy(self, w_dict):
         from pypy.objspace.std.identitydict import IdentityDictStrategy
         strategy = self.space.fromcache(IdentityDictStrategy)
@@ -1295,6 +1324,241 @@ class IntDictStrategy(AbstractTypedStrategy, DictStrategy):
 create_iterator_classes(IntDictStrategy)
 
 
+class FloatDictStrategy(AbstractTypedStrategy, DictStrategy):
+    """ Stores float keys unboxed.  NaN keys are never stored here: they
+    are only equal to themselves by identity, which cannot be preserved
+    once the key is unwrapped, so adding one switches to the object
+    strategy.  0.0 and -0.0 compare and hash equal, exactly as in the
+    object strategy, and the first key inserted is the one kept.
+    """
+    erase, unerase = rerased.new_erasing_pair("float")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def wrap(self, unwrapped):
+        return self.space.newfloat(unwrapped)
+
+    def unwrap(self, wrapped):
+        return self.space.float_w(wrapped)
+
+    def get_empty_storage(self):
+        return self.erase({})
+
+    def is_correct_type(self, w_obj):
+        space = self.space
+        return (space.is_w(space.type(w_obj), space.w_float) and
+                not isnan(space.float_w(w_obj)))
+
+    def _is_nan(self, w_obj):
+        space = self.space
+        return (space.is_w(space.type(w_obj), space.w_float) and
+                isnan(space.float_w(w_obj)))
+
+    def _never_equal_to(self, w_lookup_type):
+        space = self.space
+        # XXX there are many more types
+        return (space.is_w(w_lookup_type, space.w_NoneType) or
+                space.is_w(w_lookup_type, space.w_bytes) or
+                space.is_w(w_lookup_type, space.w_unicode)
+                )
+
+    def getitem(self, w_dict, w_key):
+        if self._is_nan(w_key):
+            return None    # no NaN is ever stored with this strategy
+        return AbstractTypedStrategy.getitem(self, w_dict, w_key)
+
+    def pop(self, w_dict, w_key, w_default):
+        if self._is_nan(w_key):
+            if w_default is not None:
+                return w_default
+            raise KeyError
+        return AbstractTypedStrategy.pop(self, w_dict, w_key, w_default)
+
+    def delitem(self, w_dict, w_key):
+        if self._is_nan(w_key):
+            raise KeyError
+        return AbstractTypedStrategy.delitem(self, w_dict, w_key)
+
+    def listview_float(self, w_dict):
+        return self.unerase(w_dict.dstorage).keys()
+
+    def wrapkey(space, key):
+        return space.newfloat(key)
+
+    def w_keys(self, w_dict):
+        return self.space.newlist_float(self.listview_float(w_dict))
+
+create_iterator_classes(FloatDictStrategy)
+
+
+class RangeDictStorage(object):
+    def __init__(self, start, step, values_w):
+        self.start = start
+        self.step = step
+        self.values_w = values_w
+
+
+class RangeKeyIterator(object):
+    def __init__(self, start, step, length):
+        self.key = start
+        self.step = step
+        self.remaining = length
+
+    def __iter__(self):
+        return self
+
+    def next(self):
+        if self.remaining <= 0:
+            raise StopIteration
+        key = self.key
+        self.key = key + self.step
+        self.remaining -= 1
+        return key
+
+
+class RangeItemsWithHash(object):
+    def __init__(self, storage):
+        self.storage = storage
+        self.i = 0
+
+    def __iter__(self):
+        return self
+
+    def next(self):
+        storage = self.storage
+        i = self.i
+        if i >= len(storage.values_w):
+            raise StopIteration
+        self.i = i + 1
+        key = storage.start + i * storage.step
+        return (key, storage.values_w[i], objectmodel.compute_hash(key))
+
+
+class RangeDictStrategy(DictStrategy):
+    """ Dicts whose keys are the ints of an arithmetic progression, in
+    order, as built by dict.fromkeys(range(n)).  Only the values are stored
+    and lookups don't need a hash table.  Storing a new value for an
+    existing key or removing the last key keeps this strategy; adding or
+    deleting any other key switches to IntDictStrategy.
+    """
+    erase, unerase = rerased.new_erasing_pair("range")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def get_storage_from_range(self, start, step, values_w):
+        return self.erase(RangeDictStorage(start, step, values_w))
+
+    def _index(self, storage, w_key):
+        return range_index_w(self.space, storage.start, storage.step,
+                             len(storage.values_w), w_key)
+
+    def length(self, w_dict):
+        return len(self.unerase(w_dict.dstorage).values_w)
+
+    def getitem(self, w_dict, w_key):
+        storage = self.unerase(w_dict.dstorage)
+        i = self._index(storage, w_key)
+        if i < 0:
+            return None
+        return storage.values_w[i]
+
+    def getitem_str(self, w_dict, key):
+        return None
+
+    def setitem(self, w_dict, w_key, w_value):
+        storage = self.unerase(w_dict.dstorage)
+        i = self._index(storage, w_key)
+        if i >= 0:
+            storage.values_w[i] = w_value
+        else:
+            self.switch_to_int_strategy(w_dict)
+            w_dict.setitem(w_key, w_value)
+
+    def setitem_str(self, w_dict, key, w_value):
+        self.switch_to_object_strategy(w_dict)
+        w_dict.setitem(self.space.newtext(key), w_value)
+
+    def setdefault(self, w_dict, w_key, w_default):
+        storage = self.unerase(w_dict.dstorage)
+        i = self._index(storage, w_key)
+        if i >= 0:
+            return storage.values_w[i]
+        self.switch_to_int_strategy(w_dict)
+        return w_dict.setdefault(w_key, w_default)
+
+    def delitem(self, w_dict, w_key):
+        storage = self.unerase(w_dict.dstorage)
+        i = self._index(storage, w_key)
+        if i < 0:
+            raise KeyError
+        if i == len(storage.values_w) - 1:
+            storage.values_w.pop()
+        else:
+            self.switch_to_int_strategy(w_dict)
+            w_dict.delitem(w_key)
+
+    def popitem(self, w_dict):
+        storage = self.unerase(w_dict.dstorage)
+        i = len(storage.values_w) - 1
+        if i < 0:
+            raise KeyError
+        w_value = storage.values_w.pop()
+        return self.space.newint(storage.start + i * storage.step), w_value
+
+    def w_keys(self, w_dict):
+        from pypy.objspace.std.listobject import make_range_list
+        storage = self.unerase(w_dict.dstorage)
+        return make_range_list(self.space, storage.start, storage.step,
+                               len(storage.values_w))
+
+    def values(self, w_dict):
+        return self.unerase(w_dict.dstorage).values_w[:]
+
+    def listview_int(self, w_dict):
+        storage = self.unerase(w_dict.dstorage)
+        return [storage.start + i * storage.step
+                for i in range(len(storage.values_w))]
+
+    def getiterkeys(self, w_dict):
+        storage = self.unerase(w_dict.dstorage)
+        return RangeKeyIterator(storage.start, storage.step,
+                                len(storage.values_w))
+
+    def getitervalues(self, w_dict):
+        return iter(self.unerase(w_dict.dstorage).values_w)
+
+    def getiteritems_with_hash(self, w_dict):
+        return RangeItemsWithHash(self.unerase(w_dict.dstorage))
+
+    def wrapkey(space, key):
+        return space.newint(key)
+
+    def switch_to_int_strategy(self, w_dict):
+        storage = self.unerase(w_dict.dstorage)
+        strategy = self.space.fromcache(IntDictStrategy)
+        new_storage = strategy.get_empty_storage()
+        d = strategy.unerase(new_storage)
+        values_w = storage.values_w
+        for i in range(len(values_w)):
+            d[storage.start + i * storage.step] = values_w[i]
+        w_dict.set_strategy(strategy)
+        w_dict.dstorage = new_storage
+
+    def switch_to_object_strategy(self, w_dict):
+        storage = self.unerase(w_dict.dstorage)
+        strategy = self.space.fromcache(ObjectDictStrategy)
+        new_storage = strategy.get_empty_storage()
+        d = strategy.unerase(new_storage)
+        values_w = storage.values_w
+        for i in range(len(values_w)):
+            w_key = self.space.newint(storage.start + i * storage.step)
+            d[w_key] = values_w[i]
+        w_dict.set_strategy(strategy)
+        w_dict.dstorage = new_storage
+
+create_iterator_classes(RangeDictStrategy)
+
+
 def update1(space, w_dict, w_data):
     if isinstance(w_data, W_DictMultiObject):    # optimization case only
         update1_dict_dict(space, w_dict, w_data)
@@ -15,6 +15,7 @@ from rpython.rlib.listsort import make_timsort_class
 from rpython.rlib.objectmodel import (
     import_from_mixin, instantiate, newlist_hint, resizelist_hint, specialize)
 from rpython.rlib import longlong2float
+from rpython.rlib.rstring import StringBuilder, startswith
 from rpython.tool.sourcetools import func_with_new_name
 
 from pypy.interpreter.baseobjspace import W_Root
@@ -25,12 +26,14 @@ from pypy.interpreter.signature import Signature
 from pypy.interpreter.typedef import TypeDef
 from pypy.interpreter.miscutils import StringSort
 from pypy.objspace.std.bytesobject import W_BytesObject
+from pypy.objspace.std.complexobject import W_ComplexObject
 from pypy.objspace.std.floatobject import W_FloatObject
 from pypy.objspace.std.intobject import W_IntObject
 from pypy.objspace.std.iterobject import (
     W_FastListIterObject, W_ReverseSeqIterObject)
 from pypy.objspace.std.sliceobject import (
     W_SliceObject, normalize_simple_slice, unwrap_start_stop)
+from pypy.objspace.std.specialisedtupleobject import Cls_ff, Cls_ii
 from pypy.objspace.std.tupleobject import W_AbstractTupleObject
 from pypy.objspace.std.unicodeobject import W_UnicodeObject
 from pypy.objspace.std.util import get_positive_index, negate
@@ -40,6 +43,14 @@ __all__ = ['W_ListObject', 'make_range_list', 'make_empty_list_with_size']
 
 UNROLL_CUTOFF = 5
 
+# str.split() results with fewer items than this are not worth a
+# BytesSliceListStrategy
+MIN_SLICE_VIEWS = 16
+
+# object lists shorter than this don't switch to DequeListStrategy on
+# pop(0) or insert(0, x): moving their items is cheap enough
+MIN_DEQUE_LENGTH = 32
+
 
 def make_range_list(space, start, step, length):
     if length <= 0:
@@ -66,6 +77,37 @@ def make_empty_list_with_size(space, hint):
     return W_ListObject.from_storage_and_strategy(space, storage, strategy)
 
 
+def specialized_sum_list(space, w_list, w_start):
+    """sum() of an exact list of floats or of complexes, without boxing
+    the intermediate results.  The start value must be an exact int, float
+    or complex; returns None if there is no fast path."""
+    if type(w_list) is not W_ListObject:
+        return None
+    if type(w_start) is W_IntObject:
+        real = float(space.int_w(w_start))
+        imag = 0.0
+    elif type(w_start) is W_FloatObject:
+        real = space.float_w(w_start)
+        imag = 0.0
+    elif type(w_start) is W_ComplexObject:
+        real = w_start.realval
+        imag = w_start.imagval
+    else:
+        return None
+    if w_list.length() == 0:
+        return w_start
+    strategy = w_list.strategy
+    if strategy is space.fromcache(ComplexListStrategy):
+        return strategy.sum(w_list, real, imag)
+    if type(w_start) is not W_ComplexObject:
+        l = w_list.getitems_float()
+        if l is not None:
+            for x in l:
+                real += x
+            return space.newfloat(real)
+    return None
+
+
 @jit.look_inside_iff(lambda space, list_w, sizehint:
         jit.loop_unrolling_heuristic(list_w, len(list_w), UNROLL_CUTOFF))
 def get_strategy_from_list_objects(space, list_w, sizehint):
@@ -113,6 +155,30 @@ def get_strategy_from_list_objects(space, list_w, sizehint):
         else:
             return space.fromcache(FloatListStrategy)
 
+    elif type(w_firstobj) is Cls_ii:
+        # check for all-(int, int)-tuples
+        for i in range(1, len(list_w)):
+            if type(list_w[i]) is not Cls_ii:
+                break
+        else:
+            return space.fromcache(IntPairListStrategy)
+
+    elif type(w_firstobj) is Cls_ff:
+        # check for all-(float, float)-tuples
+        for i in range(1, len(list_w)):
+            if type(list_w[i]) is not Cls_ff:
+                break
+        else:
+            return space.fromcache(FloatPairListStrategy)
+
+    elif type(w_firstobj) is W_ComplexObject:
+        # check for all-complexes
+        for i in range(1, len(list_w)):
+            if type(list_w[i]) is not W_ComplexObject:
+                break
+        else:
+            return space.fromcache(ComplexListStrategy)
+
     if check_int_or_float:
         for w_obj in list_w:
             if type(w_obj) is W_IntObject:
@@ -194,6 +260,17 @@ class W_ListObject(W_Root):
         storage = strategy.erase(list_b)
         return W_ListObject.from_storage_and_strategy(space, storage, strategy)
 
+    @staticmethod
+    def newlist_bytes_slices(space, value, bounds):
+        """The list of the strings value[bounds[2*i]:bounds[2*i+1]]."""
+        if len(bounds) < 2 * MIN_SLICE_VIEWS:
+            list_b = [_get_bytes_slice(value, bounds, i)
+                      for i in range(len(bounds) >> 1)]
+            return W_ListObject.newlist_bytes(space, list_b)
+        strategy = space.fromcache(BytesSliceListStrategy)
+        storage = strategy.erase((value, bounds))
+        return W_ListObject.from_storage_and_strategy(space, storage, strategy)
+
     @staticmethod
     def newlist_unicode(space, list_u):
         strategy = space.fromcache(UnicodeListStrategy)
@@ -957,6 +1034,12 @@ class EmptyListStrategy(ListStrategy):
             strategy = self.space.fromcache(UnicodeListStrategy)
         elif type(w_item) is W_FloatObject:
             strategy = self.space.fromcache(FloatListStrategy)
+        elif type(w_item) is Cls_ii:
+            strategy = self.space.fromcache(IntPairListStrategy)
+        elif type(w_item) is Cls_ff:
+            strategy = self.space.fromcache(FloatPairListStrategy)
+        elif type(w_item) is W_ComplexObject:
+            strategy = self.space.fromcache(ComplexListStrategy)
         else:
             strategy = self.space.fromcache(ObjectListStrategy)
 
@@ -1174,6 +1257,9 @@ class SimpleRangeListStrategy(BaseRangeListStrategy):
     def step(self, w_list):
         return 1
 
+    def getrange(self, w_list):
+        return 0, 1, self.unerase(w_list.lstorage)[0]
+
     def _getitem_unwrapped(self, w_list, i):
         length = self.unerase(w_list.lstorage)[0]
         if i < 0:
@@ -1252,6 +1338,9 @@ class RangeListStrategy(BaseRangeListStrategy):
     def step(self, w_list):
         return self.unerase(w_list.lstorage)[1]
 
+    def getrange(self, w_list):
+        return self.unerase(w_list.lstorage)
+
     def _getitem_unwrapped(self, w_list, i):
         v = self.unerase(w_list.lstorage)
         start = v[0]
@@ -1642,6 +1731,200 @@ class ObjectListStrategy(ListStrategy):
     # no sort() method here: W_ListObject.descr_sort() handles this
     # case explicitly
 
+    def _switch_to_deque(self, w_list):
+        # a list used as a FIFO queue: switch to the strategy that removes
+        # and inserts items at the front in amortized O(1)
+        space = self.space
+        if (not space.config.objspace.std.withliststrategies or
+                self.length(w_list) < MIN_DEQUE_LENGTH):
+            return False
+        l = self.unerase(w_list.lstorage)
+        strategy = w_list.strategy = space.fromcache(DequeListStrategy)
+        w_list.lstorage = strategy.erase(DequeStorage(l, 0))
+        return True
+
+    _base_pop = pop
+
+    def pop(self, w_list, index):
+        if index == 0 and self._switch_to_deque(w_list):
+            return w_list.pop(index)
+        return self._base_pop(w_list, index)
+
+    _base_insert = insert
+
+    def insert(self, w_list, index, w_item):
+        if index == 0 and self._switch_to_deque(w_list):
+            w_list.insert(index, w_item)
+            return
+        self._base_insert(w_list, index, w_item)
+
+
+class DequeStorage(object):
+    """The items of the list are items_w[start:]; the slots before 'start'
+    are free and contain None."""
+
+    def __init__(self, items_w, start):
+        self.items_w = items_w
+        self.start = start
+
+
+class DequeListStrategy(ListStrategy):
+    """A list of objects that also has free room at the front, used for
+    lists that see pop(0) or insert(0, x).  Both operations are amortized
+    O(1): pop(0) leaves a free slot at the front, and when insert(0, x)
+    finds no free slot, it adds room in proportion to the length of the
+    list.  Operations that are not about single items turn the list back
+    into an ObjectListStrategy list.
+    """
+
+    erase, unerase = rerased.new_erasing_pair("deque")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def switch_to_object_strategy(self, w_list):
+        storage = self.unerase(w_list.lstorage)
+        items_w = storage.items_w
+        if storage.start > 0:
+            del items_w[:storage.start]
+        strategy = w_list.strategy = self.space.fromcache(ObjectListStrategy)
+        w_list.lstorage = strategy.erase(items_w)
+
+    def _compact(self, storage):
+        # called when the list just lost its first item: drop the free
+        # slots when they are more than the items left
+        start = storage.start
+        if 2 * start > len(storage.items_w):
+            del storage.items_w[:start]
+            storage.start = 0
+
+    def init_from_list_w(self, w_list, list_w):
+        # unreachable: get_strategy_from_list_objects() never returns this
+        # strategy, lists only get it from pop(0) and insert(0, x)
+        assert False, "DequeListStrategy.init_from_list_w"
+
+    def clone(self, w_list):
+        strategy = self.space.fromcache(ObjectListStrategy)
+        storage = strategy.erase(self.getitems_copy(w_list))
+        return W_ListObject.from_storage_and_strategy(
+                self.space, storage, strategy)
+
+    def copy_into(self, w_list, w_other):
+        strategy = w_other.strategy = self.space.fromcache(ObjectListStrategy)
+        w_other.lstorage = strategy.erase(self.getitems_copy(w_list))
+
+    def _resize_hint(self, w_list, hint):
+        storage = self.unerase(w_list.lstorage)
+        resizelist_hint(storage.items_w, storage.start + hint)
+
+    def length(self, w_list):
+        storage = self.unerase(w_list.lstorage)
+        return len(storage.items_w) - storage.start
+
+    def getitem(self, w_list, index):
+        storage = self.unerase(w_list.lstorage)
+        length = len(storage.items_w) - storage.start
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError
+        return storage.items_w[storage.start + index]
+
+    def getitems_copy(self, w_list):
+        storage = self.unerase(w_list.lstorage)
+        return storage.items_w[storage.start:]
+
+    def getitems_unroll(self, w_list):
+        return self.getitems_copy(w_list)
+
+    def getitems_fixedsize(self, w_list):
+        return self.getitems_copy(w_list)
+
+    def getstorage_copy(self, w_list):
+        return self.erase(DequeStorage(self.getitems_copy(w_list), 0))
+
+    def getslice(self, w_list, start, stop, step, length):
+        storage = self.unerase(w_list.lstorage)
+        items_w = storage.items_w
+        if step == 1 and 0 <= start <= stop:
+            subitems_w = items_w[storage.start + start:storage.start + stop]
+        else:
+            start += storage.start
+            subitems_w = [None] * length
+            for i in range(length):
+                subitems_w[i] = items_w[start]
+                start += step
+        strategy = self.space.fromcache(ObjectListStrategy)
+        return W_ListObject.from_storage_and_strategy(
+                self.space, strategy.erase(subitems_w), strategy)
+
+    def append(self, w_list, w_item):
+        self.unerase(w_list.lstorage).items_w.append(w_item)
+
+    def _extend_from_list(self, w_list, w_other):
+        items_w = self.unerase(w_list.lstorage).items_w
+        items_w += w_other.getitems()
+
+    def setitem(self, w_list, index, w_item):
+        storage = self.unerase(w_list.lstorage)
+        length = len(storage.items_w) - storage.start
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError
+        storage.items_w[storage.start + index] = w_item
+
+    def insert(self, w_list, index, w_item):
+        storage = self.unerase(w_list.lstorage)
+        if index == 0:
+            if storage.start == 0:
+                # make room at the front
+                room = max(len(storage.items_w), MIN_DEQUE_LENGTH)
+                items_w = [None] * room
+                items_w += storage.items_w
+                storage.items_w = items_w
+                storage.start = room
+            storage.start -= 1
+            storage.items_w[storage.start] = w_item
+        else:
+            storage.items_w.insert(storage.start + index, w_item)
+
+    def pop_end(self, w_list):
+        storage = self.unerase(w_list.lstorage)
+        return storage.items_w.pop()
+
+    def pop(self, w_list, index):
+        storage = self.unerase(w_list.lstorage)
+        items_w = storage.items_w
+        if not 0 <= index < len(items_w) - storage.start:
+            raise IndexError
+        if index == 0:
+            w_item = items_w[storage.start]
+            items_w[storage.start] = None
+            storage.start += 1
+            self._compact(storage)
+            return w_item
+        return items_w.pop(storage.start + index)
+
+    def inplace_mul(self, w_list, times):
+        self.switch_to_object_strategy(w_list)
+        w_list.inplace_mul(times)
+
+    def deleteslice(self, w_list, start, step, slicelength):
+        self.switch_to_object_strategy(w_list)
+        w_list.deleteslice(start, step, slicelength)
+
+    def setslice(self, w_list, start, step, slicelength, sequence_w):
+        self.switch_to_object_strategy(w_list)
+        w_list.setslice(start, step, slicelength, sequence_w)
+
+    def reverse(self, w_list):
+        self.switch_to_object_strategy(w_list)
+        w_list.reverse()
+
+    def sort(self, w_list, reverse):
+        self.switch_to_object_strategy(w_list)
+        w_list.descr_sort(self.space, None, None, reverse)
+
 
 class IntegerListStrategy(ListStrategy):
     import_from_mixin(AbstractUnwrappedStrategy)
@@ -1989,6 +2272,190 @@ class BytesListStrategy(ListStrategy):
     def getitems_bytes(self, w_list):
         return self.unerase(w_list.lstorage)
 
+    _base_extend_from_list = _extend_from_list
+
+    def _extend_from_list(self, w_list, w_other):
+        if w_other.strategy is self.space.fromcache(BytesSliceListStrategy):
+            l = self.unerase(w_list.lstorage)
+            l += w_other.getitems_bytes()
+            return
+        self._base_extend_from_list(w_list, w_other)
+
+    _base_setslice = setslice
+
+    def setslice(self, w_list, start, step, slicelength, w_other):
+        if w_other.strategy is self.space.fromcache(BytesSliceListStrategy):
+            w_other = W_ListObject.newlist_bytes(self.space,
+                                                 w_other.getitems_bytes())
+        self._base_setslice(w_list, start, step, slicelength, w_other)
+
+
+def _get_bytes_slice(value, bounds, i):
+    start = bounds[2 * i]
+    stop = bounds[2 * i + 1]
+    assert 0 <= start <= stop
+    return value[start:stop]
+
+
+class BytesSliceListStrategy(ListStrategy):
+    """A list of strings that are all slices of the same parent string, as
+    returned by str.split() and str.splitlines().  The storage is a tuple
+    (parent, bounds) where 'bounds' holds the start and the stop of every
+    item next to each other.  It is never modified, so copies share it.
+    len(), find(), slicing and join() work straight from the parent.  Any
+    mutation, and reading an item, switches the list to BytesListStrategy:
+    after that the items are sliced out only once.
+    """
+
+    erase, unerase = rerased.new_erasing_pair("bytes_slices")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def switch_to_bytes_strategy(self, w_list):
+        items = self.getitems_bytes(w_list)
+        strategy = w_list.strategy = self.space.fromcache(BytesListStrategy)
+        w_list.lstorage = strategy.erase(items)
+
+    def init_from_list_w(self, w_list, list_w):
+        # unreachable: get_strategy_from_list_objects() never returns this
+        # strategy, lists only get it from str.split() and str.splitlines()
+        assert False, "BytesSliceListStrategy.init_from_list_w"
+
+    def clone(self, w_list):
+        storage = w_list.lstorage  # never modified, no need to clone
+        return W_ListObject.from_storage_and_strategy(self.space, storage,
+                                                      self)
+
+    def _resize_hint(self, w_list, hint):
+        assert hint >= 0
+
+    def copy_into(self, w_list, w_other):
+        w_other.strategy = self
+        w_other.lstorage = w_list.lstorage
+
+    def find(self, w_list, w_obj, start, stop):
+        if type(w_obj) is W_BytesObject:
+            obj = self.space.bytes_w(w_obj)
+            value, bounds = self.unerase(w_list.lstorage)
+            for i in range(start, min(stop, len(bounds) >> 1)):
+                begin = bounds[2 * i]
+                end = bounds[2 * i + 1]
+                if end - begin == len(obj) and startswith(value, obj,
+                                                          begin, end):
+                    return i
+            raise ValueError
+        return ListStrategy.find(self, w_list, w_obj, start, stop)
+
+    def length(self, w_list):
+        return len(self.unerase(w_list.lstorage)[1]) >> 1
+
+    def getitem(self, w_list, index):
+        # don't slice the same item out of the parent again on every read
+        self.switch_to_bytes_strategy(w_list)
+        return w_list.getitem(index)
+
+    def getitems_bytes(self, w_list):
+        value, bounds = self.unerase(w_list.lstorage)
+        return [_get_bytes_slice(value, bounds, i)
+                for i in range(len(bounds) >> 1)]
+
+    def getitems_copy(self, w_list):
+        space = self.space
+        value, bounds = self.unerase(w_list.lstorage)
+        return [space.newbytes(_get_bytes_slice(value, bounds, i))
+                for i in range(len(bounds) >> 1)]
+
+    @jit.unroll_safe
+    def getitems_unroll(self, w_list):
+        return self.getitems_copy(w_list)
+
+    @jit.look_inside_iff(lambda self, w_list:
+            jit.loop_unrolling_heuristic(w_list, w_list.length(),
+                                         UNROLL_CUTOFF))
+    def getitems_fixedsize(self, w_list):
+        return self.getitems_unroll(w_list)
+
+    def getstorage_copy(self, w_list):
+        return w_list.lstorage
+
+    def getslice(self, w_list, start, stop, step, length):
+        value, bounds = self.unerase(w_list.lstorage)
+        if 2 * length < len(bounds) >> 1:
+            # don't keep the whole parent alive for a small part of it
+            list_b = newlist_hint(length)
+            for i in range(length):
+                list_b.append(_get_bytes_slice(value, bounds, start))
+                start += step
+            return W_ListObject.newlist_bytes(self.space, list_b)
+        if step == 1 and 0 <= start <= stop:
+            subbounds = bounds[2 * start:2 * stop]
+        else:
+            subbounds = newlist_hint(2 * length)
+            for i in range(length):
+                subbounds.append(bounds[2 * start])
+                subbounds.append(bounds[2 * start + 1])
+                start += step
+        storage = self.erase((value, subbounds))
+        return W_ListObject.from_storage_and_strategy(self.space, storage,
+                                                      self)
+
+    def join(self, w_list, separator):
+        value, bounds = self.unerase(w_list.lstorage)
+        count = len(bounds) >> 1
+        size = len(separator) * (count - 1)
+        for i in range(count):
+            size += bounds[2 * i + 1] - bounds[2 * i]
+        sb = StringBuilder(size)
+        for i in range(count):
+            if separator and i != 0:
+                sb.append(separator)
+            sb.append_slice(value, bounds[2 * i], bounds[2 * i + 1])
+        return sb.build()
+
+    def append(self, w_list, w_item):
+        self.switch_to_bytes_strategy(w_list)
+        w_list.append(w_item)
+
+    def inplace_mul(self, w_list, times):
+        self.switch_to_bytes_strategy(w_list)
+        w_list.inplace_mul(times)
+
+    def deleteslice(self, w_list, start, step, slicelength):
+        self.switch_to_bytes_strategy(w_list)
+        w_list.deleteslice(start, step, slicelength)
+
+    def pop(self, w_list, index):
+        self.switch_to_bytes_strategy(w_list)
+        return w_list.pop(index)
+
+    def pop_end(self, w_list):
+        self.switch_to_bytes_strategy(w_list)
+        return w_list.pop_end()
+
+    def setitem(self, w_list, index, w_item):
+        self.switch_to_bytes_strategy(w_list)
+        w_list.setitem(index, w_item)
+
+    def setslice(self, w_list, start, step, slicelength, sequence_w):
+        self.switch_to_bytes_strategy(w_list)
+        w_list.setslice(start, step, slicelength, sequence_w)
+
+    def insert(self, w_list, index, w_item):
+        self.switch_to_bytes_strategy(w_list)
+        w_list.insert(index, w_item)
+
+    def extend(self, w_list, w_any):
+        self.switch_to_bytes_strategy(w_list)
+        w_list.extend(w_any)
+
+    def reverse(self, w_list):
+        self.switch_to_bytes_strategy(w_list)
+        w_list.reverse()
+
+    def sort(self, w_list, reverse):
+        self.switch_to_bytes_strategy(w_list)
+        w_list.sort(reverse)
+
 
 class UnicodeListStrategy(ListStrategy):
     import_from_mixin(AbstractUnwrappedStrategy)
@@ -2022,6 +2489,331 @@ class UnicodeListStrategy(ListStrategy):
     def getitems_unicode(self, w_list):
         return self.unerase(w_list.lstorage)
 
+
+class AbstractPairStrategy(object):
+    """Storage for lists of objects made of two unboxed values: specialised
+    2-tuples or complex numbers.  The items are kept in a flat RPython list
+    holding the two fields of every object next to each other; the objects
+    are only rebuilt when an item is read.  This is correct because such
+    objects compare by value even with 'is' (see specialisedtupleobject.py
+    and complexobject.py).
+    """
+
+    @staticmethod
+    def unerase(storage):
+        raise NotImplementedError("abstract base class")
+
+    @staticmethod
+    def erase(obj):
+        raise NotImplementedError("abstract base class")
+
+    def is_correct_type(self, w_obj):
+        return type(w_obj) is self.item_cls
+
+    def list_is_correct_type(self, w_list):
+        return w_list.strategy is self
+
+    @jit.look_inside_iff(lambda space, w_list, list_w:
+            jit.loop_unrolling_heuristic(list_w, len(list_w), UNROLL_CUTOFF))
+    def init_from_list_w(self, w_list, list_w):
+        l = newlist_hint(2 * len(list_w))
+        for w_item in list_w:
+            first, second = self.unwrap(w_item)
+            l.append(first)
+            l.append(second)
+        w_list.lstorage = self.erase(l)
+
+    def get_empty_storage(self, sizehint):
+        if sizehint == -1:
+            return self.erase([])
+        return self.erase(newlist_hint(2 * sizehint))
+
+    def clone(self, w_list):
+        l = self.unerase(w_list.lstorage)
+        storage = self.erase(l[:])
+        return W_ListObject.from_storage_and_strategy(
+                self.space, storage, self)
+
+    def _resize_hint(self, w_list, hint):
+        resizelist_hint(self.unerase(w_list.lstorage), 2 * hint)
+
+    def copy_into(self, w_list, w_other):
+        w_other.strategy = self
+        items = self.unerase(w_list.lstorage)[:]
+        w_other.lstorage = self.erase(items)
+
+    def find(self, w_list, w_obj, start, stop):
+        if self.is_correct_type(w_obj):
+            l = self.unerase(w_list.lstorage)
+            first, second = self.unwrap(w_obj)
+            for i in range(start, min(stop, len(l) >> 1)):
+                if self.pair_eq(l[2 * i], l[2 * i + 1], first, second):
+                    return i
+            raise ValueError
+        return ListStrategy.find(self, w_list, w_obj, start, stop)
+
+    def length(self, w_list):
+        return len(self.unerase(w_list.lstorage)) >> 1
+
+    def getitem(self, w_list, index):
+        l = self.unerase(w_list.lstorage)
+        length = len(l) >> 1
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError
+        return self.wrap(l[2 * index], l[2 * index + 1])
+
+    @jit.look_inside_iff(lambda self, w_list:
+            jit.loop_unrolling_heuristic(w_list, w_list.length(),
+                                         UNROLL_CUTOFF))
+    def getitems_copy(self, w_list):
+        l = self.unerase(w_list.lstorage)
+        return [self.wrap(l[2 * i], l[2 * i + 1])
+                for i in range(len(l) >> 1)]
+
+    @jit.unroll_safe
+    def getitems_unroll(self, w_list):
+        l = self.unerase(w_list.lstorage)
+        return [self.wrap(l[2 * i], l[2 * i + 1])
+                for i in range(len(l) >> 1)]
+
+    @jit.look_inside_iff(lambda self, w_list:
+            jit.loop_unrolling_heuristic(w_list, w_list.length(),
+                                         UNROLL_CUTOFF))
+    def getitems_fixedsize(self, w_list):
+        return self.getitems_unroll(w_list)
+
+    def getstorage_copy(self, w_list):
+        items = self.unerase(w_list.lstorage)[:]
+        return self.erase(items)
+
+    def getslice(self, w_list, start, stop, step, length):
+        l = self.unerase(w_list.lstorage)
+        if step == 1 and 0 <= start <= stop:
+            sublist = l[2 * start:2 * stop]
+        else:
+            sublist = newlist_hint(2 * length)
+            for i in range(length):
+                sublist.append(l[2 * start])
+                sublist.append(l[2 * start + 1])
+                start += step
+        storage = self.erase(sublist)
+        return W_ListObject.from_storage_and_strategy(
+                self.space, storage, self)
+
+    def append(self, w_list, w_item):
+        if self.is_correct_type(w_item):
+            first, second = self.unwrap(w_item)
+            l = self.unerase(w_list.lstorage)
+            l.append(first)
+            l.append(second)
+            return
+        w_list.switch_to_object_strategy()
+        w_list.append(w_item)
+
+    def insert(self, w_list, index, w_item):
+        if self.is_correct_type(w_item):
+            first, second = self.unwrap(w_item)
+            l = self.unerase(w_list.lstorage)
+            l.insert(2 * index, second)
+            l.insert(2 * index, first)
+            return
+        w_list.switch_to_object_strategy()
+        w_list.insert(index, w_item)
+
+    def _extend_from_list(self, w_list, w_other):
+        if self.list_is_correct_type(w_other):
+            l = self.unerase(w_list.lstorage)
+            l += self.unerase(w_other.lstorage)
+            return
+        elif w_other.strategy.is_empty_strategy():
+            return
+        w_other = w_other._temporarily_as_objects()
+        w_list.switch_to_object_strategy()
+        w_list.extend(w_other)
+
+    def setitem(self, w_list, index, w_item):
+        if self.is_correct_type(w_item):
+            first, second = self.unwrap(w_item)
+            l = self.unerase(w_list.lstorage)
+            length = len(l) >> 1
+            if index < 0:
+                index += length
+            if not 0 <= index < length:
+                raise IndexError
+            l[2 * index] = first
+            l[2 * index + 1] = second
+        else:
+            w_list.switch_to_object_strategy()
+            w_list.setitem(index, w_item)
+
+    def setslice(self, w_list, start, step, slicelength, w_other):
+        # rare enough for lists of records: no unboxed version
+        w_list.switch_to_object_strategy()
+        w_list.setslice(start, step, slicelength, w_other)
+
+    def deleteslice(self, w_list, start, step, slicelength):
+        if slicelength == 0:
+            return
+        if step < 0:
+            start = start + step * (slicelength - 1)
+            step = -step
+        if step == 1:
+            assert start >= 0
+            l = self.unerase(w_list.lstorage)
+            del l[2 * start:2 * (start + slicelength)]
+        else:
+            w_list.switch_to_object_strategy()
+            w_list.deleteslice(start, step, slicelength)
+
+    def pop_end(self, w_list):
+        l = self.unerase(w_list.lstorage)
+        second = l.pop()
+        first = l.pop()
+        return self.wrap(first, second)
+
+    def pop(self, w_list, index):
+        l = self.unerase(w_list.lstorage)
+        if not 0 <= index < (len(l) >> 1):
+            raise IndexError
+        w_item = self.wrap(l[2 * index], l[2 * index + 1])
+        del l[2 * index:2 * index + 2]
+        return w_item
+
+    def mul(self, w_list, times):
+        l = self.unerase(w_list.lstorage)
+        return W_ListObject.from_storage_and_strategy(
+            self.space, self.erase(l * times), self)
+
+    def inplace_mul(self, w_list, times):
+        l = self.unerase(w_list.lstorage)
+        l *= times
+
+    def reverse(self, w_list):
+        _reverse_pairs(self.unerase(w_list.lstorage))
+
+    def sort(self, w_list, reverse):
+        l = self.unerase(w_list.lstorage)
+        sorter = self.sort_cls(l)
+        # Reverse sort stability achieved by initially reversing the list,
+        # applying a stable forward sort, then reversing the final result.
+        if reverse:
+            _reverse_pairs(l)
+        sorter.sort()
+        if reverse:
+            _reverse_pairs(l)
+
+
+@specialize.argtype(0)
+def _reverse_pairs(l):
+    i = 0
+    j = (len(l) >> 1) - 1
+    while i < j:
+        first = l[2 * i]
+        second = l[2 * i + 1]
+        l[2 * i] = l[2 * j]
+        l[2 * i + 1] = l[2 * j + 1]
+        l[2 * j] = first
+        l[2 * j + 1] = second
+        i += 1
+        j -= 1
+
+
+class IntPairListStrategy(ListStrategy):
+    import_from_mixin(AbstractPairStrategy)
+
+    item_cls = Cls_ii
+
+    erase, unerase = rerased.new_erasing_pair("int_pair")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def wrap(self, first, second):
+        return Cls_ii(self.space, first, second)
+
+    def unwrap(self, w_item):
+        assert isinstance(w_item, Cls_ii)
+        return w_item.value0, w_item.value1
+
+    @staticmethod
+    def pair_eq(a0, a1, b0, b1):
+        return a0 == b0 and a1 == b1
+
+    def sort_cls(self, l):
+        return IntPairSort(l)
+
+
+class FloatPairListStrategy(ListStrategy):
+    import_from_mixin(AbstractPairStrategy)
+
+    item_cls = Cls_ff
+
+    erase, unerase = rerased.new_erasing_pair("float_pair")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def wrap(self, first, second):
+        return Cls_ff(self.space, first, second)
+
+    def unwrap(self, w_item):
+        assert isinstance(w_item, Cls_ff)
+        return w_item.value0, w_item.value1
+
+    @staticmethod
+    def item_eq(a, b):
+        # NaNs are equal here if they have the same bit pattern,
+        # like the items of tuples in general
+        return a == b or (longlong2float.float2longlong(a) ==
+                          longlong2float.float2longlong(b))
+
+    @staticmethod
+    def pair_eq(a0, a1, b0, b1):
+        return (FloatPairListStrategy.item_eq(a0, b0) and
+                FloatPairListStrategy.item_eq(a1, b1))
+
+    def sort_cls(self, l):
+        return FloatPairSort(l)
+
+
+class ComplexListStrategy(ListStrategy):
+    import_from_mixin(AbstractPairStrategy)
+
+    item_cls = W_ComplexObject
+
+    erase, unerase = rerased.new_erasing_pair("complex")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def wrap(self, real, imag):
+        return W_ComplexObject(real, imag)
+
+    def unwrap(self, w_item):
+        assert isinstance(w_item, W_ComplexObject)
+        return w_item.realval, w_item.imagval
+
+    @staticmethod
+    def pair_eq(a0, a1, b0, b1):
+        # like space.eq_w(): either equal or identical
+        if a0 == b0 and a1 == b1:
+            return True
+        return (longlong2float.float2longlong(a0) ==
+                    longlong2float.float2longlong(b0) and
+                longlong2float.float2longlong(a1) ==
+                    longlong2float.float2longlong(b1))
+
+    def sort_cls(self, l):
+        sorter = ComplexSort(l)
+        sorter.space = self.space
+        return sorter
+
+    def sum(self, w_list, real, imag):
+        l = self.unerase(w_list.lstorage)
+        for i in range(len(l) >> 1):
+            real += l[2 * i]
+            imag += l[2 * i + 1]
+        return W_ComplexObject(real, imag)
+
 # _______________________________________________________
 
 init_signature = Signature(['sequence'], None, None)
@@ -2057,6 +2849,27 @@ IntOrFloatBaseTimSort = make_timsort_class()
 UnicodeBaseTimSort = make_timsort_class()
 
 
+def _pair_getitem(l, i):
+    return (l[2 * i], l[2 * i + 1])
+
+def _pair_setitem(l, i, item):
+    l[2 * i] = item[0]
+    l[2 * i + 1] = item[1]
+
+def _pair_length(l):
+    return len(l) >> 1
+
+def _pair_getitem_slice(l, start, stop):
+    return l[2 * start:2 * stop]
+
+IntPairBaseTimSort = make_timsort_class(_pair_getitem, _pair_setitem,
+                                        _pair_length, _pair_getitem_slice)
+FloatPairBaseTimSort = make_timsort_class(_pair_getitem, _pair_setitem,
+                                          _pair_length, _pair_getitem_slice)
+ComplexBaseTimSort = make_timsort_class(_pair_getitem, _pair_setitem,
+                                        _pair_length, _pair_getitem_slice)
+
+
 class KeyContainer(W_Root):
     def __init__(self, w_key, w_item):
         self.w_key = w_key
@@ -2095,6 +2908,32 @@ class UnicodeSort(UnicodeBaseTimSort):
         return a < b
 
 
+class IntPairSort(IntPairBaseTimSort):
+    def lt(self, a, b):
+        if a[0] != b[0]:
+            return a[0] < b[0]
+        return a[1] < b[1]
+
+
+class FloatPairSort(FloatPairBaseTimSort):
+    def lt(self, a, b):
+        # like comparing tuples: the first pair of items that are
+        # neither equal nor the same NaN decides
+        if not FloatPairListStrategy.item_eq(a[0], b[0]):
+            return a[0] < b[0]
+        if not FloatPairListStrategy.item_eq(a[1], b[1]):
+            return a[1] < b[1]
+        return False
+
+
+class ComplexSort(ComplexBaseTimSort):
+    def lt(self, a, b):
+        # raises TypeError: complex numbers have no ordering
+        space = self.space
+        return space.is_true(space.lt(W_ComplexObject(a[0], a[1]),
+                                      W_ComplexObject(b[0], b[1])))
+
+
 class CustomCompareSort(SimpleSort):
     def lt(self, a, b):
         space = self.space
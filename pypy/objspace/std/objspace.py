@@ -317,10 +317,10 @@ class StdObjSpace(ObjSpace):
         return W_ListObject.newlist_float(self, list_f)
 
     def newdict(self, module=False, instance=False, kwargs=False,
-                strdict=False):
+                strdict=False, sharedkeys=False):
         return W_DictMultiObject.allocate_and_init_instance(
                 self, module=module, instance=instance,
-                strdict=strdict, kwargs=kwargs)
+                strdict=strdict, kwargs=kwargs, sharedkeys=sharedkeys)
 
     def newset(self, iterable_w=None):
         if iterable_w is None:
@@ -525,8 +525,10 @@ class StdObjSpace(ObjSpace):
     def listview_float(self, w_obj):
         if type(w_obj) is W_ListObject:
             return w_obj.getitems_float()
-        # dict and set don't have FloatStrategy, so we can just ignore them
-        # for now
+        if type(w_obj) is W_DictObject:
+            return w_obj.listview_float()
+        if type(w_obj) is W_SetObject or type(w_obj) is W_FrozensetObject:
+            return w_obj.listview_float()
         if isinstance(w_obj, W_ListObject) and self._uses_list_iter(w_obj):
             return w_obj.getitems_float()
         return None
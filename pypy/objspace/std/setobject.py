@@ -1,17 +1,24 @@
+import sys
+
 from pypy.interpreter import gateway
 from pypy.interpreter.baseobjspace import W_Root
 from pypy.interpreter.error import OperationError, oefmt
 from pypy.interpreter.signature import Signature
 from pypy.interpreter.typedef import TypeDef
 from pypy.objspace.std.bytesobject import W_BytesObject
+from pypy.objspace.std.dictmultiobject import RangeKeyIterator
+from pypy.objspace.std.floatobject import W_FloatObject
 from pypy.objspace.std.intobject import W_IntObject
+from pypy.objspace.std.listobject import BaseRangeListStrategy, W_ListObject
 from pypy.objspace.std.unicodeobject import W_UnicodeObject
-from pypy.objspace.std.util import IDTAG_SPECIAL, IDTAG_SHIFT
+from pypy.objspace.std.util import (
+    IDTAG_SPECIAL, IDTAG_SHIFT, range_index_w)
 
-from rpython.rlib.objectmodel import r_dict
+from rpython.rlib.objectmodel import newlist_hint, r_dict
 from rpython.rlib.objectmodel import iterkeys_with_hash, contains_with_hash
 from rpython.rlib.objectmodel import setitem_with_hash, delitem_with_hash
-from rpython.rlib.rarithmetic import intmask, r_uint
+from rpython.rlib.rarithmetic import LONG_BIT, intmask, r_uint
+from rpython.rlib.rfloat import isnan
 from rpython.rlib import rerased, jit
 
 
@@ -94,6 +101,10 @@ class W_BaseSetObject(W_Root):
         """ If this is an int set return its contents as a list of uwnrapped ints. Otherwise return None. """
         return self.strategy.listview_int(self)
 
+    def listview_float(self):
+        """ If this is a float set return its contents as a list of uwnrapped floats. Otherwise return None. """
+        return self.strategy.listview_float(self)
+
     def get_storage_copy(self):
         """ Returns a copy of the storage. Needed when we want to clone all elements from one set and
         put them into another. """
@@ -696,6 +707,9 @@ class SetStrategy(object):
     def listview_int(self, w_set):
         return None
 
+    def listview_float(self, w_set):
+        return None
+
     #def erase(self, storage):
     #    raise NotImplementedError
 
@@ -793,6 +807,8 @@ class EmptySetStrategy(SetStrategy):
     def add(self, w_set, w_key):
         if type(w_key) is W_IntObject:
             strategy = self.space.fromcache(IntegerSetStrategy)
+        elif type(w_key) is W_FloatObject and not isnan(w_key.floatval):
+            strategy = self.space.fromcache(FloatSetStrategy)
         elif type(w_key) is W_BytesObject:
             strategy = self.space.fromcache(BytesSetStrategy)
         elif type(w_key) is W_UnicodeObject:
@@ -1242,6 +1258,12 @@ class BytesSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
     def may_contain_equal_elements(self, strategy):
         if strategy is self.space.fromcache(IntegerSetStrategy):
             return False
+        elif strategy is self.space.fromcache(RangeSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(BitmapSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(FloatSetStrategy):
+            return False
         elif strategy is self.space.fromcache(EmptySetStrategy):
             return False
         elif strategy is self.space.fromcache(IdentitySetStrategy):
@@ -1281,6 +1303,12 @@ class UnicodeSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
     def may_contain_equal_elements(self, strategy):
         if strategy is self.space.fromcache(IntegerSetStrategy):
             return False
+        elif strategy is self.space.fromcache(RangeSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(BitmapSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(FloatSetStrategy):
+            return False
         elif strategy is self.space.fromcache(EmptySetStrategy):
             return False
         elif strategy is self.space.fromcache(IdentitySetStrategy):
@@ -1334,10 +1362,986 @@ class IntegerSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
     def wrap(self, item):
         return self.space.newint(item)
 
+    def add(self, w_set, w_key):
+        if type(w_key) is W_IntObject:
+            d = self.unerase(w_set.sstorage)
+            length = len(d)
+            d[self.space.int_w(w_key)] = None
+            if _crossed_power_of_two(length, len(d)):
+                self.maybe_switch_to_bitmap(w_set)
+        else:
+            w_set.switch_to_object_strategy(self.space)
+            w_set.add(w_key)
+
+    def maybe_switch_to_bitmap(self, w_set):
+        storage = _make_bitmap(self.space,
+                               self.unerase(w_set.sstorage).keys())
+        if storage is not None:
+            strategy = self.space.fromcache(BitmapSetStrategy)
+            w_set.strategy = strategy
+            w_set.sstorage = strategy.erase(storage)
+
+    def update(self, w_set, w_other):
+        d_set = self.unerase(w_set.sstorage)
+        length = len(d_set)
+        if self is w_other.strategy:
+            d_set.update(self.unerase(w_other.sstorage))
+        elif w_other.length() == 0:
+            return
+        else:
+            intlist = w_other.listview_int()
+            if intlist is None:
+                w_set.switch_to_object_strategy(self.space)
+                w_set.update(w_other)
+                return
+            for key in intlist:
+                d_set[key] = None
+        if _crossed_power_of_two(length, len(d_set)):
+            self.maybe_switch_to_bitmap(w_set)
+
     def iter(self, w_set):
         return IntegerIteratorImplementation(self.space, self, w_set)
 
 
+def _normalize_range(start, step, length):
+    """Return (low, high, step) describing the same set of ints as the
+    range, with a positive step, which is 1 for a single item."""
+    last = start + (length - 1) * step
+    if length == 1:
+        return start, start, 1
+    elif step > 0:
+        return start, last, step
+    else:
+        return last, start, -step
+
+def _aligned(x, y, step):
+    if x > y:
+        x, y = y, x
+    return (r_uint(y) - r_uint(x)) % r_uint(step) == 0
+
+def _range_count(low, high, step):
+    """Number of items from low to high included, or -1 if it does not fit
+    in an int."""
+    count = (r_uint(high) - r_uint(low)) // r_uint(step)
+    if count >= r_uint(sys.maxint):
+        return -1
+    return intmask(count) + 1
+
+
+class RangeSetStrategy(SetStrategy):
+    """Sets of the ints of an arithmetic progression, as built by
+    set(range(n)).  The storage is the tuple (start, step, length), with
+    length > 0, and the items are kept in the order of the range.
+    Membership, length and iteration don't need a hash table, and the
+    operations between two ranges of the same step take constant time
+    whenever their result is again a range.  Any other change switches to
+    IntegerSetStrategy."""
+
+    erase, unerase = rerased.new_erasing_pair("range")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    intersect_jmp = jit.JitDriver(greens = [], reds = 'auto',
+                                  name='set(range).intersect')
+
+    def get_storage_from_range(self, start, step, length):
+        assert length > 0
+        return self.erase((start, step, length))
+
+    def _normalized(self, w_set):
+        start, step, length = self.unerase(w_set.sstorage)
+        return _normalize_range(start, step, length)
+
+    def _index(self, w_set, w_key):
+        start, step, length = self.unerase(w_set.sstorage)
+        return range_index_w(self.space, start, step, length, w_key)
+
+    def _empty(self, w_set):
+        strategy = self.space.fromcache(EmptySetStrategy)
+        return w_set.from_storage_and_strategy(strategy.get_empty_storage(),
+                                               strategy)
+
+    def _new_range(self, w_set, low, high, step):
+        if low > high:
+            return self._empty(w_set)
+        count = _range_count(low, high, step)
+        if count < 0:
+            return None
+        storage = self.get_storage_from_range(low, step, count)
+        return w_set.from_storage_and_strategy(storage, self)
+
+    def getiterkeys(self, w_set):
+        start, step, length = self.unerase(w_set.sstorage)
+        return RangeKeyIterator(start, step, length)
+
+    def listview_int(self, w_set):
+        start, step, length = self.unerase(w_set.sstorage)
+        result = [0] * length
+        for i in range(length):
+            result[i] = start + i * step
+        return result
+
+    def switch_to_integer_strategy(self, w_set):
+        _set_ints(self.space, w_set, self.listview_int(w_set))
+
+    def _as_integer_set(self, w_set):
+        strategy = self.space.fromcache(IntegerSetStrategy)
+        storage = strategy.get_storage_from_unwrapped_list(
+            self.listview_int(w_set))
+        return w_set.from_storage_and_strategy(storage, strategy)
+
+    def _replace_by(self, w_set, w_result):
+        w_set.strategy = w_result.strategy
+        w_set.sstorage = w_result.sstorage
+
+    def may_contain_equal_elements(self, strategy):
+        if strategy is self.space.fromcache(BytesSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(UnicodeSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(EmptySetStrategy):
+            return False
+        elif strategy is self.space.fromcache(IdentitySetStrategy):
+            return False
+        return True
+
+    def length(self, w_set):
+        return self.unerase(w_set.sstorage)[2]
+
+    def clear(self, w_set):
+        w_set.switch_to_empty_strategy()
+
+    def copy_real(self, w_set):
+        # the storage is an immutable tuple
+        return w_set.from_storage_and_strategy(w_set.sstorage, self)
+
+    def get_storage_copy(self, w_set):
+        return w_set.sstorage
+
+    def getdict_w(self, w_set):
+        result = newset(self.space)
+        for key in self.listview_int(w_set):
+            result[self.space.newint(key)] = None
+        return result
+
+    def getkeys(self, w_set):
+        return [self.space.newint(key) for key in self.listview_int(w_set)]
+
+    def has_key(self, w_set, w_key):
+        return self._index(w_set, w_key) >= 0
+
+    def add(self, w_set, w_key):
+        if self._index(w_set, w_key) < 0:
+            self.switch_to_integer_strategy(w_set)
+            w_set.add(w_key)
+
+    def remove(self, w_set, w_item):
+        index = self._index(w_set, w_item)
+        if index < 0:
+            return False
+        start, step, length = self.unerase(w_set.sstorage)
+        if length == 1:
+            w_set.switch_to_empty_strategy()
+        elif index == 0:
+            w_set.sstorage = self.erase((start + step, step, length - 1))
+        elif index == length - 1:
+            w_set.sstorage = self.erase((start, step, length - 1))
+        else:
+            self.switch_to_integer_strategy(w_set)
+            w_set.remove(w_item)
+        return True
+
+    def popitem(self, w_set):
+        start, step, length = self.unerase(w_set.sstorage)
+        w_result = self.space.newint(start + (length - 1) * step)
+        if length == 1:
+            w_set.switch_to_empty_strategy()
+        else:
+            w_set.sstorage = self.erase((start, step, length - 1))
+        return w_result
+
+    def iter(self, w_set):
+        return RangeIteratorImplementation(self.space, self, w_set)
+
+    # ____________________ operations between two ranges ____________________
+    # they return None when the result is not a range
+
+    def _intersect_ranges(self, w_set, w_other):
+        low1, high1, step1 = self._normalized(w_set)
+        low2, high2, step2 = self._normalized(w_other)
+        if high1 < low2 or high2 < low1:
+            return self._empty(w_set)
+        if low1 == high1:
+            if _aligned(low1, low2, step2):
+                return self.copy_real(w_set)
+            return self._empty(w_set)
+        if low2 == high2:
+            if _aligned(low1, low2, step1):
+                return self._new_range(w_set, low2, low2, 1)
+            return self._empty(w_set)
+        if step1 != step2:
+            return None
+        if not _aligned(low1, low2, step1):
+            return self._empty(w_set)
+        return self._new_range(w_set, max(low1, low2), min(high1, high2),
+                               step1)
+
+    def _union_ranges(self, w_set, w_other):
+        low1, high1, step1 = self._normalized(w_set)
+        low2, high2, step2 = self._normalized(w_other)
+        if low1 == high1 and low2 == high2:
+            if low1 == low2:
+                return self.copy_real(w_set)
+            return None
+        if low1 == high1:
+            step = step2
+        elif low2 == high2 or step1 == step2:
+            step = step1
+        else:
+            return None
+        if not _aligned(low1, low2, step):
+            return None
+        # there must be no gap between the two ranges
+        if low2 > high1 and r_uint(low2) - r_uint(high1) > r_uint(step):
+            return None
+        if low1 > high2 and r_uint(low1) - r_uint(high2) > r_uint(step):
+            return None
+        return self._new_range(w_set, min(low1, low2), max(high1, high2),
+                               step)
+
+    def _difference_ranges(self, w_set, w_other):
+        low1, high1, step1 = self._normalized(w_set)
+        low2, high2, step2 = self._normalized(w_other)
+        if high1 < low2 or high2 < low1:
+            return self.copy_real(w_set)
+        if step1 != step2 and low2 != high2:
+            return None
+        if not _aligned(low1, low2, step1):
+            return self.copy_real(w_set)
+        # the items removed are exactly the items of w_set between low2
+        # and high2
+        if low2 <= low1 and high2 >= high1:
+            return self._empty(w_set)
+        if low2 <= low1:
+            return self._new_range(w_set, high2 + step1, high1, step1)
+        if high2 >= high1:
+            return self._new_range(w_set, low1, low2 - step1, step1)
+        return None
+
+    def _issubset_ranges(self, w_set, w_other):
+        low1, high1, step1 = self._normalized(w_set)
+        low2, high2, step2 = self._normalized(w_other)
+        if low1 < low2 or high1 > high2:
+            return False
+        if not _aligned(low1, low2, step2):
+            return False
+        return low1 == high1 or step1 % step2 == 0
+
+    # ________________________________________________________________________
+
+    def equals(self, w_set, w_other):
+        if w_set.length() != w_other.length():
+            return False
+        if w_other.strategy is self:
+            return self._issubset_ranges(w_set, w_other)
+        if not self.may_contain_equal_elements(w_other.strategy):
+            return False
+        return self._issubset_wrapped(w_set, w_other)
+
+    def _issubset_wrapped(self, w_set, w_other):
+        for key in self.listview_int(w_set):
+            if not w_other.has_key(self.space.newint(key)):
+                return False
+        return True
+
+    def issubset(self, w_set, w_other):
+        if w_other.strategy is self:
+            return self._issubset_ranges(w_set, w_other)
+        if not self.may_contain_equal_elements(w_other.strategy):
+            return False
+        if w_set.length() > w_other.length():
+            return False
+        return self._issubset_wrapped(w_set, w_other)
+
+    def _intersect_wrapped(self, w_set, w_other):
+        # called by the other strategies when w_set is the smaller set
+        result = newset(self.space)
+        for key in self.listview_int(w_set):
+            self.intersect_jmp.jit_merge_point()
+            w_key = self.space.newint(key)
+            if w_other.has_key(w_key):
+                result[w_key] = None
+        strategy = self.space.fromcache(ObjectSetStrategy)
+        return strategy.erase(result)
+
+    def _intersect_other(self, w_set, w_other):
+        strategy = self.space.fromcache(IntegerSetStrategy)
+        d = strategy.get_empty_dict()
+        start, step, length = self.unerase(w_set.sstorage)
+        if w_other.length() < length:
+            w_iterator = w_other.iter()
+            while True:
+                w_item = w_iterator.next_entry()
+                if w_item is None:
+                    break
+                index = self._index(w_set, w_item)
+                if index >= 0:
+                    d[start + index * step] = None
+        else:
+            for key in self.listview_int(w_set):
+                if w_other.has_key(self.space.newint(key)):
+                    d[key] = None
+        return w_set.from_storage_and_strategy(strategy.erase(d), strategy)
+
+    def intersect(self, w_set, w_other):
+        if w_other.strategy is self:
+            w_result = self._intersect_ranges(w_set, w_other)
+            if w_result is not None:
+                return w_result
+        elif not self.may_contain_equal_elements(w_other.strategy):
+            return self._empty(w_set)
+        return self._intersect_other(w_set, w_other)
+
+    def intersect_update(self, w_set, w_other):
+        self._replace_by(w_set, self.intersect(w_set, w_other))
+
+    def isdisjoint(self, w_set, w_other):
+        if w_other.strategy is self:
+            w_result = self._intersect_ranges(w_set, w_other)
+            if w_result is not None:
+                return w_result.length() == 0
+        elif not self.may_contain_equal_elements(w_other.strategy):
+            return True
+        return self._intersect_other(w_set, w_other).length() == 0
+
+    def difference(self, w_set, w_other):
+        if w_other.strategy is self:
+            w_result = self._difference_ranges(w_set, w_other)
+            if w_result is not None:
+                return w_result
+        elif not self.may_contain_equal_elements(w_other.strategy):
+            return self.copy_real(w_set)
+        return self._as_integer_set(w_set).difference(w_other)
+
+    def difference_update(self, w_set, w_other):
+        if w_other.strategy is self:
+            w_result = self._difference_ranges(w_set, w_other)
+            if w_result is not None:
+                self._replace_by(w_set, w_result)
+                return
+        elif not self.may_contain_equal_elements(w_other.strategy):
+            return
+        self.switch_to_integer_strategy(w_set)
+        w_set.difference_update(w_other)
+
+    def symmetric_difference(self, w_set, w_other):
+        return self._as_integer_set(w_set).symmetric_difference(w_other)
+
+    def symmetric_difference_update(self, w_set, w_other):
+        self.switch_to_integer_strategy(w_set)
+        w_set.symmetric_difference_update(w_other)
+
+    def update(self, w_set, w_other):
+        if w_other.strategy is self:
+            w_result = self._union_ranges(w_set, w_other)
+            if w_result is not None:
+                self._replace_by(w_set, w_result)
+                return
+        elif w_other.length() == 0:
+            return
+        self.switch_to_integer_strategy(w_set)
+        w_set.update(w_other)
+
+
+# IntegerSetStrategy switches to BitmapSetStrategy when the set has at least
+# BITMAP_MIN_ITEMS items and the bitmap needs at most BITMAP_DENSE_BITS bits
+# per item.  BitmapSetStrategy switches back when the set has fewer than half
+# as many items or when the bitmap needs more than BITMAP_SPARSE_BITS bits
+# per item, so that a set near the limits doesn't keep switching.
+BITMAP_MIN_ITEMS = 256
+BITMAP_DENSE_BITS = 64
+BITMAP_SPARSE_BITS = 256
+
+if LONG_BIT == 64:
+    WORD_SHIFT = 6
+else:
+    WORD_SHIFT = 5
+WORD_MASK = LONG_BIT - 1
+
+# 'nwords * LONG_BIT' can overflow for bitmaps that would cover nearly the
+# whole range of ints, so these compare numbers of words instead of bits
+def _bitmap_is_dense(count, nwords):
+    return (count >= BITMAP_MIN_ITEMS and
+            nwords <= count * BITMAP_DENSE_BITS // LONG_BIT)
+
+def _bitmap_is_sparse(count, nwords):
+    return (count < BITMAP_MIN_ITEMS // 2 or
+            nwords > count * BITMAP_SPARSE_BITS // LONG_BIT)
+
+def _popcount(x):
+    x = x - ((x >> 1) & r_uint(0x5555555555555555))
+    x = (x & r_uint(0x3333333333333333)) + ((x >> 2) &
+                                             r_uint(0x3333333333333333))
+    x = (x + (x >> 4)) & r_uint(0x0f0f0f0f0f0f0f0f)
+    return intmask((x * r_uint(0x0101010101010101)) >> (LONG_BIT - 8))
+
+def _lowest_bit(x):
+    """Index of the lowest bit set in the non-zero r_uint 'x'."""
+    n = 0
+    shift = LONG_BIT // 2
+    while shift:
+        if x & ((r_uint(1) << shift) - 1) == 0:
+            n += shift
+            x >>= shift
+        shift >>= 1
+    return n
+
+def _highest_bit(x):
+    """Index of the highest bit set in the non-zero r_uint 'x'."""
+    n = 0
+    shift = LONG_BIT // 2
+    while shift:
+        if x >> shift:
+            n += shift
+            x >>= shift
+        shift >>= 1
+    return n
+
+
+class BitmapStorage(object):
+    """The ints (base << WORD_SHIFT) + i * LONG_BIT + b for every bit b set
+    in words[i]."""
+
+    def __init__(self, base, words, count):
+        self.base = base
+        self.words = words
+        self.count = count
+
+    def copy(self):
+        return BitmapStorage(self.base, self.words[:], self.count)
+
+    def contains(self, value):
+        i = (value >> WORD_SHIFT) - self.base
+        if i < 0 or i >= len(self.words):
+            return False
+        return bool(self.words[i] & (r_uint(1) << (value & WORD_MASK)))
+
+    def clear_bit(self, value):
+        i = (value >> WORD_SHIFT) - self.base
+        self.words[i] &= ~(r_uint(1) << (value & WORD_MASK))
+        self.count -= 1
+
+    def get_value(self, i, bit):
+        return ((self.base + i) << WORD_SHIFT) + bit
+
+
+class BitmapKeyIterator(object):
+    def __init__(self, storage):
+        self.storage = storage
+        self.i = -1
+        self.word = r_uint(0)
+
+    def __iter__(self):
+        return self
+
+    def next(self):
+        words = self.storage.words
+        i = self.i
+        word = self.word
+        while not word:
+            i += 1
+            if i >= len(words):
+                self.i = i
+                raise StopIteration
+            word = words[i]
+        self.i = i
+        self.word = word & (word - 1)
+        return self.storage.get_value(i, _lowest_bit(word))
+
+
+def _make_bitmap(space, items):
+    """Return a BitmapStorage for the ints 'items' if they are dense enough,
+    or None."""
+    if len(items) < BITMAP_MIN_ITEMS:
+        return None
+    low = high = items[0]
+    for item in items:
+        if item < low:
+            low = item
+        elif item > high:
+            high = item
+    nwords = (high >> WORD_SHIFT) - (low >> WORD_SHIFT) + 1
+    # len(items) counts duplicates, the bitmap finds the real count
+    if not _bitmap_is_dense(len(items), nwords):
+        return None
+    strategy = space.fromcache(BitmapSetStrategy)
+    storage = strategy.get_storage_from_ints(items, low >> WORD_SHIFT, nwords)
+    if _bitmap_is_sparse(storage.count, nwords):
+        return None
+    return storage
+
+def _set_ints(space, w_set, items):
+    """Store the ints 'items' in 'w_set', as a bitmap if they are dense."""
+    storage = _make_bitmap(space, items)
+    if storage is not None:
+        strategy = space.fromcache(BitmapSetStrategy)
+        w_set.strategy = strategy
+        w_set.sstorage = strategy.erase(storage)
+    else:
+        strategy = space.fromcache(IntegerSetStrategy)
+        w_set.strategy = strategy
+        w_set.sstorage = strategy.get_storage_from_unwrapped_list(items)
+
+def _crossed_power_of_two(old_length, new_length):
+    # checking the density of a growing IntegerSetStrategy set costs
+    # O(n), so only do it when its length reaches a power of two
+    return (new_length >= BITMAP_MIN_ITEMS and
+            (new_length ^ old_length) > old_length)
+
+
+class BitmapSetStrategy(SetStrategy):
+    """Dense sets of ints, stored as a bitmap covering the words from the
+    smallest to the largest item: set algebra between two bitmaps works a
+    machine word at a time.  See BITMAP_MIN_ITEMS for when sets switch
+    between IntegerSetStrategy and this strategy."""
+
+    erase, unerase = rerased.new_erasing_pair("bitmap")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    intersect_jmp = jit.JitDriver(greens = [], reds = 'auto',
+                                  name='set(bitmap).intersect')
+
+    def get_storage_from_ints(self, items, base, nwords):
+        words = [r_uint(0)] * nwords
+        count = 0
+        for item in items:
+            i = (item >> WORD_SHIFT) - base
+            bit = r_uint(1) << (item & WORD_MASK)
+            if not words[i] & bit:
+                words[i] |= bit
+                count += 1
+        return BitmapStorage(base, words, count)
+
+    def _from_words(self, w_set, base, words):
+        """Build the result of an operation, trimming the words and picking
+        the strategy."""
+        start = 0
+        stop = len(words)
+        while start < stop and not words[start]:
+            start += 1
+        while stop > start and not words[stop - 1]:
+            stop -= 1
+        if start == stop:
+            strategy = self.space.fromcache(EmptySetStrategy)
+            return w_set.from_storage_and_strategy(
+                strategy.get_empty_storage(), strategy)
+        if start > 0 or stop < len(words):
+            words = words[start:stop]
+            base += start
+        count = 0
+        for word in words:
+            count += _popcount(word)
+        storage = BitmapStorage(base, words, count)
+        if _bitmap_is_sparse(count, len(words)):
+            strategy = self.space.fromcache(IntegerSetStrategy)
+            d = strategy.get_empty_dict()
+            for key in BitmapKeyIterator(storage):
+                d[key] = None
+            return w_set.from_storage_and_strategy(strategy.erase(d),
+                                                   strategy)
+        return w_set.from_storage_and_strategy(self.erase(storage), self)
+
+    def _replace_by(self, w_set, w_result):
+        w_set.strategy = w_result.strategy
+        w_set.sstorage = w_result.sstorage
+
+    def _lookup(self, storage, w_key):
+        """Return (True, the int equal to 'w_key') if it is in the set,
+        and (False, 0) otherwise."""
+        space = self.space
+        if type(w_key) is W_IntObject:
+            value = space.int_w(w_key)
+            return storage.contains(value), value
+        # an object equal to the int 'i' must have the same hash, which is
+        # 'i' itself except for hash(-1) == -2
+        h = space.hash_w(w_key)
+        if storage.contains(h) and space.eq_w(space.newint(h), w_key):
+            return True, h
+        if (h == -2 and storage.contains(-1) and
+                space.eq_w(space.newint(-1), w_key)):
+            return True, -1
+        return False, 0
+
+    def listview_int(self, w_set):
+        storage = self.unerase(w_set.sstorage)
+        result = newlist_hint(storage.count)
+        for key in BitmapKeyIterator(storage):
+            result.append(key)
+        return result
+
+    def getiterkeys(self, w_set):
+        return BitmapKeyIterator(self.unerase(w_set.sstorage))
+
+    def switch_to_integer_strategy(self, w_set):
+        strategy = self.space.fromcache(IntegerSetStrategy)
+        d = strategy.get_empty_dict()
+        for key in self.getiterkeys(w_set):
+            d[key] = None
+        w_set.strategy = strategy
+        w_set.sstorage = strategy.erase(d)
+
+    def _as_integer_set(self, w_set):
+        strategy = self.space.fromcache(IntegerSetStrategy)
+        d = strategy.get_empty_dict()
+        for key in self.getiterkeys(w_set):
+            d[key] = None
+        return w_set.from_storage_and_strategy(strategy.erase(d), strategy)
+
+    def _check_sparse(self, w_set):
+        storage = self.unerase(w_set.sstorage)
+        if _bitmap_is_sparse(storage.count, len(storage.words)):
+            self.switch_to_integer_strategy(w_set)
+
+    def may_contain_equal_elements(self, strategy):
+        if strategy is self.space.fromcache(BytesSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(UnicodeSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(EmptySetStrategy):
+            return False
+        elif strategy is self.space.fromcache(IdentitySetStrategy):
+            return False
+        return True
+
+    def length(self, w_set):
+        return self.unerase(w_set.sstorage).count
+
+    def clear(self, w_set):
+        w_set.switch_to_empty_strategy()
+
+    def copy_real(self, w_set):
+        storage = self.unerase(w_set.sstorage).copy()
+        return w_set.from_storage_and_strategy(self.erase(storage), self)
+
+    def get_storage_copy(self, w_set):
+        return self.erase(self.unerase(w_set.sstorage).copy())
+
+    def getdict_w(self, w_set):
+        result = newset(self.space)
+        for key in self.getiterkeys(w_set):
+            result[self.space.newint(key)] = None
+        return result
+
+    def getkeys(self, w_set):
+        return [self.space.newint(key) for key in self.getiterkeys(w_set)]
+
+    def has_key(self, w_set, w_key):
+        found, _ = self._lookup(self.unerase(w_set.sstorage), w_key)
+        return found
+
+    def add(self, w_set, w_key):
+        if type(w_key) is W_IntObject:
+            self._add_int(w_set, self.space.int_w(w_key))
+        elif not self.has_key(w_set, w_key):
+            w_set.switch_to_object_strategy(self.space)
+            w_set.add(w_key)
+
+    def _add_int(self, w_set, value):
+        storage = self.unerase(w_set.sstorage)
+        i = (value >> WORD_SHIFT) - storage.base
+        if i < 0 or i >= len(storage.words):
+            if not self._grow(storage, value >> WORD_SHIFT):
+                self.switch_to_integer_strategy(w_set)
+                w_set.add(self.space.newint(value))
+                return
+            i = (value >> WORD_SHIFT) - storage.base
+        bit = r_uint(1) << (value & WORD_MASK)
+        word = storage.words[i]
+        if not word & bit:
+            storage.words[i] = word | bit
+            storage.count += 1
+
+    def _grow(self, storage, wordindex):
+        """Make the bitmap cover 'wordindex', or return False if that would
+        make it sparse."""
+        nwords = len(storage.words)
+        if wordindex < storage.base:
+            missing = storage.base - wordindex
+            if _bitmap_is_sparse(storage.count + 1, nwords + missing):
+                return False
+            # leave some room in front, like lists overallocate at the end
+            extra = missing + (nwords >> 3)
+            if _bitmap_is_sparse(storage.count + 1, nwords + extra):
+                extra = missing
+            storage.words = [r_uint(0)] * extra + storage.words
+            storage.base -= extra
+        else:
+            missing = wordindex - storage.base - nwords + 1
+            if _bitmap_is_sparse(storage.count + 1, nwords + missing):
+                return False
+            storage.words.extend([r_uint(0)] * missing)
+        return True
+
+    def remove(self, w_set, w_item):
+        storage = self.unerase(w_set.sstorage)
+        found, value = self._lookup(storage, w_item)
+        if not found:
+            return False
+        storage.clear_bit(value)
+        self._check_sparse(w_set)
+        return True
+
+    def popitem(self, w_set):
+        storage = self.unerase(w_set.sstorage)
+        words = storage.words
+        # the set is never empty, see _bitmap_is_sparse()
+        while not words[-1]:
+            words.pop()
+        i = len(words) - 1
+        value = storage.get_value(i, _highest_bit(words[i]))
+        storage.clear_bit(value)
+        self._check_sparse(w_set)
+        return self.space.newint(value)
+
+    def iter(self, w_set):
+        return BitmapIteratorImplementation(self.space, self, w_set)
+
+    # __________________ operations between two bitmaps ____________________
+
+    def _union_words(self, a, b, xor):
+        base = min(a.base, b.base)
+        stop = max(a.base + len(a.words), b.base + len(b.words))
+        if _bitmap_is_sparse(a.count + b.count, stop - base):
+            return base, None
+        words = [r_uint(0)] * (stop - base)
+        offset = a.base - base
+        for i in range(len(a.words)):
+            words[offset + i] = a.words[i]
+        offset = b.base - base
+        for i in range(len(b.words)):
+            if xor:
+                words[offset + i] ^= b.words[i]
+            else:
+                words[offset + i] |= b.words[i]
+        return base, words
+
+    def _intersect_words(self, a, b):
+        base = max(a.base, b.base)
+        stop = min(a.base + len(a.words), b.base + len(b.words))
+        words = [r_uint(0)] * max(stop - base, 0)
+        for i in range(len(words)):
+            words[i] = a.words[base - a.base + i] & b.words[base - b.base + i]
+        return base, words
+
+    def _difference_words(self, a, b):
+        words = a.words[:]
+        base = max(a.base, b.base)
+        stop = min(a.base + len(a.words), b.base + len(b.words))
+        for j in range(base, stop):
+            words[j - a.base] &= ~b.words[j - b.base]
+        return a.base, words
+
+    def _issubset_bitmaps(self, a, b):
+        if a.count > b.count:
+            return False
+        for i in range(len(a.words)):
+            j = a.base + i - b.base
+            if 0 <= j < len(b.words):
+                if a.words[i] & ~b.words[j]:
+                    return False
+            elif a.words[i]:
+                return False
+        return True
+
+    def _isdisjoint_bitmaps(self, a, b):
+        base = max(a.base, b.base)
+        stop = min(a.base + len(a.words), b.base + len(b.words))
+        for j in range(base, stop):
+            if a.words[j - a.base] & b.words[j - b.base]:
+                return False
+        return True
+
+    # ______________________________________________________________________
+
+    def _ints_of_other(self, w_set, w_other):
+        """The ints of 'w_other' that are in 'w_set', iterating over the
+        smaller of the two."""
+        storage = self.unerase(w_set.sstorage)
+        result = {}
+        if w_other.length() < storage.count:
+            w_iterator = w_other.iter()
+            while True:
+                w_item = w_iterator.next_entry()
+                if w_item is None:
+                    break
+                found, value = self._lookup(storage, w_item)
+                if found:
+                    result[value] = None
+        else:
+            for key in BitmapKeyIterator(storage):
+                if w_other.has_key(self.space.newint(key)):
+                    result[key] = None
+        return result
+
+    def equals(self, w_set, w_other):
+        if w_set.length() != w_other.length():
+            return False
+        return self.issubset(w_set, w_other)
+
+    def issubset(self, w_set, w_other):
+        if w_other.strategy is self:
+            return self._issubset_bitmaps(self.unerase(w_set.sstorage),
+                                          self.unerase(w_other.sstorage))
+        if not self.may_contain_equal_elements(w_other.strategy):
+            return False
+        if w_set.length() > w_other.length():
+            return False
+        for key in self.getiterkeys(w_set):
+            if not w_other.has_key(self.space.newint(key)):
+                return False
+        return True
+
+    def isdisjoint(self, w_set, w_other):
+        if w_other.strategy is self:
+            return self._isdisjoint_bitmaps(self.unerase(w_set.sstorage),
+                                            self.unerase(w_other.sstorage))
+        if not self.may_contain_equal_elements(w_other.strategy):
+            return True
+        return len(self._ints_of_other(w_set, w_other)) == 0
+
+    def _intersect_wrapped(self, w_set, w_other):
+        # called by the other strategies when w_set is the smaller set
+        result = newset(self.space)
+        for key in self.getiterkeys(w_set):
+            self.intersect_jmp.jit_merge_point()
+            w_key = self.space.newint(key)
+            if w_other.has_key(w_key):
+                result[w_key] = None
+        strategy = self.space.fromcache(ObjectSetStrategy)
+        return strategy.erase(result)
+
+    def intersect(self, w_set, w_other):
+        if w_other.strategy is self:
+            base, words = self._intersect_words(
+                self.unerase(w_set.sstorage), self.unerase(w_other.sstorage))
+            return self._from_words(w_set, base, words)
+        strategy = self.space.fromcache(IntegerSetStrategy)
+        if not self.may_contain_equal_elements(w_other.strategy):
+            d = strategy.get_empty_dict()
+        else:
+            d = self._ints_of_other(w_set, w_other)
+        return w_set.from_storage_and_strategy(strategy.erase(d), strategy)
+
+    def intersect_update(self, w_set, w_other):
+        self._replace_by(w_set, self.intersect(w_set, w_other))
+
+    def difference(self, w_set, w_other):
+        w_result = self.copy_real(w_set)
+        self.difference_update(w_result, w_other)
+        return w_result
+
+    def difference_update(self, w_set, w_other):
+        storage = self.unerase(w_set.sstorage)
+        if w_other.strategy is self:
+            base, words = self._difference_words(
+                storage, self.unerase(w_other.sstorage))
+            self._replace_by(w_set, self._from_words(w_set, base, words))
+        elif self.may_contain_equal_elements(w_other.strategy):
+            for key in self._ints_of_other(w_set, w_other):
+                storage.clear_bit(key)
+            self._check_sparse(w_set)
+
+    def symmetric_difference(self, w_set, w_other):
+        if w_other.strategy is self:
+            base, words = self._union_words(self.unerase(w_set.sstorage),
+                                            self.unerase(w_other.sstorage),
+                                            True)
+            if words is not None:
+                return self._from_words(w_set, base, words)
+        return self._as_integer_set(w_set).symmetric_difference(w_other)
+
+    def symmetric_difference_update(self, w_set, w_other):
+        self._replace_by(w_set, self.symmetric_difference(w_set, w_other))
+
+    def update(self, w_set, w_other):
+        if w_other.strategy is self:
+            base, words = self._union_words(self.unerase(w_set.sstorage),
+                                            self.unerase(w_other.sstorage),
+                                            False)
+            if words is not None:
+                self._replace_by(w_set, self._from_words(w_set, base, words))
+                return
+        if w_other.length() == 0:
+            return
+        intlist = w_other.listview_int()
+        if intlist is None:
+            w_set.switch_to_object_strategy(self.space)
+            w_set.update(w_other)
+            return
+        for key in intlist:
+            if w_set.strategy is not self:
+                w_set.add(self.space.newint(key))
+            else:
+                self._add_int(w_set, key)
+
+
+class FloatSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
+    erase, unerase = rerased.new_erasing_pair("float")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    intersect_jmp = jit.JitDriver(greens = [], reds = 'auto',
+                                  name='set(float).intersect')
+
+    def get_empty_storage(self):
+        return self.erase({})
+
+    def get_empty_dict(self):
+        return {}
+
+    def listview_float(self, w_set):
+        return self.unerase(w_set.sstorage).keys()
+
+    def is_correct_type(self, w_key):
+        # NaNs are only equal to themselves by identity, which is lost
+        # once they are unwrapped: keep them in the object strategy
+        return type(w_key) is W_FloatObject and not isnan(w_key.floatval)
+
+    def _is_nan(self, w_key):
+        return type(w_key) is W_FloatObject and isnan(w_key.floatval)
+
+    def may_contain_equal_elements(self, strategy):
+        if strategy is self.space.fromcache(BytesSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(UnicodeSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(EmptySetStrategy):
+            return False
+        elif strategy is self.space.fromcache(IdentitySetStrategy):
+            return False
+        return True
+
+    def unwrap(self, w_item):
+        return self.space.float_w(w_item)
+
+    def wrap(self, item):
+        return self.space.newfloat(item)
+
+    def has_key(self, w_set, w_key):
+        if self._is_nan(w_key):
+            return False     # no NaN is ever stored with this strategy
+        return AbstractUnwrappedSetStrategy.has_key(self, w_set, w_key)
+
+    def remove(self, w_set, w_item):
+        if self._is_nan(w_item):
+            return False
+        return AbstractUnwrappedSetStrategy.remove(self, w_set, w_item)
+
+    def iter(self, w_set):
+        return FloatIteratorImplementation(self.space, self, w_set)
+
+
 class ObjectSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
     erase, unerase = rerased.new_erasing_pair("object")
     erase = staticmethod(erase)
@@ -1409,6 +2413,12 @@ class IdentitySetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
             return False
         if strategy is self.space.fromcache(IntegerSetStrategy):
             return False
+        if strategy is self.space.fromcache(RangeSetStrategy):
+            return False
+        if strategy is self.space.fromcache(BitmapSetStrategy):
+            return False
+        if strategy is self.space.fromcache(FloatSetStrategy):
+            return False
         if strategy is self.space.fromcache(BytesSetStrategy):
             return False
         if strategy is self.space.fromcache(UnicodeSetStrategy):
@@ -1514,6 +2524,43 @@ class IntegerIteratorImplementation(IteratorImplementation):
         else:
             return None
 
+class RangeIteratorImplementation(IteratorImplementation):
+    def __init__(self, space, strategy, w_set):
+        IteratorImplementation.__init__(self, space, strategy, w_set)
+        self.iterator = strategy.getiterkeys(w_set)
+
+    def next_entry(self):
+        # note that this 'for' loop only runs once, at most
+        for key in self.iterator:
+            return self.space.newint(key)
+        else:
+            return None
+
+class BitmapIteratorImplementation(IteratorImplementation):
+    def __init__(self, space, strategy, w_set):
+        IteratorImplementation.__init__(self, space, strategy, w_set)
+        self.iterator = strategy.getiterkeys(w_set)
+
+    def next_entry(self):
+        # note that this 'for' loop only runs once, at most
+        for key in self.iterator:
+            return self.space.newint(key)
+        else:
+            return None
+
+class FloatIteratorImplementation(IteratorImplementation):
+    def __init__(self, space, strategy, w_set):
+        IteratorImplementation.__init__(self, space, strategy, w_set)
+        d = strategy.unerase(w_set.sstorage)
+        self.iterator = d.iterkeys()
+
+    def next_entry(self):
+        # note that this 'for' loop only runs once, at most
+        for key in self.iterator:
+            return self.space.newfloat(key)
+        else:
+            return None
+
 class IdentityIteratorImplementation(IteratorImplementation):
     def __init__(self, space, strategy, w_set):
         IteratorImplementation.__init__(self, space, strategy, w_set)
@@ -1584,6 +2631,16 @@ def set_strategy_and_setdata(space, w_set, w_iterable):
         w_set.sstorage = w_iterable.get_storage_copy()
         return
 
+    if (type(w_iterable) is W_ListObject and
+            isinstance(w_iterable.strategy, BaseRangeListStrategy)):
+        start, step, length = w_iterable.strategy.getrange(w_iterable)
+        if length > 0:
+            strategy = space.fromcache(RangeSetStrategy)
+            w_set.strategy = strategy
+            w_set.sstorage = strategy.get_storage_from_range(start, step,
+                                                             length)
+            return
+
     byteslist = space.listview_bytes(w_iterable)
     if byteslist is not None:
         strategy = space.fromcache(BytesSetStrategy)
@@ -1600,11 +2657,21 @@ def set_strategy_and_setdata(space, w_set, w_iterable):
 
     intlist = space.listview_int(w_iterable)
     if intlist is not None:
-        strategy = space.fromcache(IntegerSetStrategy)
-        w_set.strategy = strategy
-        w_set.sstorage = strategy.get_storage_from_unwrapped_list(intlist)
+        _set_ints(space, w_set, intlist)
         return
 
+    floatlist = space.listview_float(w_iterable)
+    if floatlist is not None:
+        for f in floatlist:
+            if isnan(f):
+                break
+        else:
+            strategy = space.fromcache(FloatSetStrategy)
+            w_set.strategy = strategy
+            w_set.sstorage = strategy.get_storage_from_unwrapped_list(
+                floatlist)
+            return
+
     length_hint = space.length_hint(w_iterable, 0)
 
     if jit.isconstant(length_hint):
@@ -1626,6 +2693,15 @@ def _pick_correct_strategy_unroll(space, w_set, w_iterable):
         w_set.sstorage = w_set.strategy.get_storage_from_list(iterable_w)
         return
 
+    # check for floats
+    for w_item in iterable_w:
+        if type(w_item) is not W_FloatObject or isnan(w_item.floatval):
+            break
+    else:
+        w_set.strategy = space.fromcache(FloatSetStrategy)
+        w_set.sstorage = w_set.strategy.get_storage_from_list(iterable_w)
+        return
+
     # check for strings
     for w_item in iterable_w:
         if type(w_item) is not W_BytesObject:
@@ -0,0 +1,325 @@
+"""dict implementation specialized for many dicts with the same keys.
+
+Dicts built by inserting the same sequence of string keys (records decoded
+from JSON, rows, small configuration dicts...) share one immutable table of
+keys.  Every dict only stores the table and a list of values, in insertion
+order.  The tables form a tree, like the maps of mapdict.py: adding a new key
+to a dict follows (or creates) a transition to the table with one more key.
+"""
+
+from rpython.rlib import jit, rerased
+from rpython.rlib.objectmodel import import_from_mixin
+
+from pypy.objspace.std.dictmultiobject import (
+    BytesDictStrategy, DictStrategy, EmptyDictStrategy, ObjectDictStrategy,
+    UnicodeDictStrategy, _never_equal_to_string, create_iterator_classes)
+from pypy.objspace.std.kwargsdict import ZipItemsWithHash
+
+
+# a dict with more keys than this is not a record
+MAX_KEYS = 64
+# a table with more successors than this is a dispatch dict, not a record
+MAX_TRANSITIONS = 32
+# upper bound on the number of tables built per strategy.  The tables are
+# never freed: this is a deliberate bound on the memory they can leak.  Once
+# it is reached, it stays reached for the whole process, and the new dicts
+# that would need a new table use the unshared strategies instead.
+MAX_TABLES = 20000
+
+
+class AbstractKeyTable(object):
+    _immutable_fields_ = ['keys[*]', 'parent', 'index']
+
+    def __init__(self, keys, parent):
+        self.keys = keys
+        self.parent = parent
+        index = {}
+        for i in range(len(keys)):
+            index[keys[i]] = i
+        self.index = index      # never modified after this point
+        self.transitions = None
+
+    def length(self):
+        return len(self.keys)
+
+    @jit.elidable
+    def lookup(self, key):
+        return self.index.get(key, -1)
+
+    @jit.elidable
+    def get_transition(self, key, strategy):
+        """Return the table with 'key' appended, creating it if needed,
+        or None if this is not allowed by the limits above.  Once None,
+        always None for this key: the limits are never lifted."""
+        if self.transitions is None:
+            self.transitions = {}
+        else:
+            newtable = self.transitions.get(key, None)
+            if newtable is not None:
+                return newtable
+        if len(self.keys) >= MAX_KEYS:
+            return None
+        if len(self.transitions) >= MAX_TRANSITIONS:
+            return None
+        if strategy.num_tables >= MAX_TABLES:
+            return None
+        strategy.num_tables += 1
+        newtable = strategy.table_cls(self.keys + [key], self)
+        self.transitions[key] = newtable
+        return newtable
+
+
+class BytesKeyTable(object):
+    import_from_mixin(AbstractKeyTable)
+
+
+class UnicodeKeyTable(object):
+    import_from_mixin(AbstractKeyTable)
+
+
+class SharedKeysStorage(object):
+    def __init__(self, table, values_w):
+        self.table = table
+        self.values_w = values_w
+
+
+class AbstractSharedKeysDictStrategy(object):
+    def __init__(self, space):
+        self.space = space
+        self.empty_table = self.table_cls([], None)
+        self.num_tables = 0
+
+    def get_empty_storage(self):
+        return self.erase(SharedKeysStorage(self.empty_table, []))
+
+    def _never_equal_to(self, w_lookup_type):
+        return _never_equal_to_string(self.space, w_lookup_type)
+
+    def _get_table(self, storage):
+        return jit.promote(storage.table)
+
+    # ---------- reading ----------
+
+    def length(self, w_dict):
+        return len(self.unerase(w_dict.dstorage).values_w)
+
+    def getitem(self, w_dict, w_key):
+        space = self.space
+        if self.is_correct_type(w_key):
+            return self.getitem_unwrapped(w_dict, self.unwrap(w_key))
+        elif self._never_equal_to(space.type(w_key)):
+            return None
+        else:
+            self.switch_to_object_strategy(w_dict)
+            return w_dict.getitem(w_key)
+
+    def getitem_unwrapped(self, w_dict, key):
+        storage = self.unerase(w_dict.dstorage)
+        i = self._get_table(storage).lookup(key)
+        if i < 0:
+            return None
+        return storage.values_w[i]
+
+    def w_keys(self, w_dict):
+        storage = self.unerase(w_dict.dstorage)
+        return self.space.newlist([self.wrap(key)
+                                   for key in storage.table.keys])
+
+    def values(self, w_dict):
+        return self.unerase(w_dict.dstorage).values_w[:]
+
+    def items(self, w_dict):
+        space = self.space
+        storage = self.unerase(w_dict.dstorage)
+        keys = storage.table.keys
+        values_w = storage.values_w
+        return [space.newtuple([self.wrap(keys[i]), values_w[i]])
+                for i in range(len(keys))]
+
+    # ---------- writing ----------
+
+    def setitem(self, w_dict, w_key, w_value):
+        if self.is_correct_type(w_key):
+            self.setitem_unwrapped(w_dict, self.unwrap(w_key), w_value)
+        else:
+            self.switch_to_object_strategy(w_dict)
+            w_dict.setitem(w_key, w_value)
+
+    def setitem_unwrapped(self, w_dict, key, w_value):
+        storage = self.unerase(w_dict.dstorage)
+        table = self._get_table(storage)
+        i = table.lookup(key)
+        if i >= 0:
+            storage.values_w[i] = w_value
+            return
+        newtable = table.get_transition(key, self)
+        if newtable is None:
+            self.switch_to_unshared_strategy(w_dict)
+            w_dict.setitem(self.wrap(key), w_value)
+            return
+        storage.table = newtable
+        storage.values_w.append(w_value)
+
+    def setdefault(self, w_dict, w_key, w_default):
+        if self.is_correct_type(w_key):
+            key = self.unwrap(w_key)
+            w_result = self.getitem_unwrapped(w_dict, key)
+            if w_result is not None:
+                return w_result
+            self.setitem_unwrapped(w_dict, key, w_default)
+            return w_default
+        else:
+            self.switch_to_object_strategy(w_dict)
+            return w_dict.setdefault(w_key, w_default)
+
+    def delitem(self, w_dict, w_key):
+        # deleting a key other than the last one cannot be expressed with
+        # a shared table: records don't do that, so stop sharing
+        self.switch_to_unshared_strategy(w_dict)
+        w_dict.delitem(w_key)
+
+    def popitem(self, w_dict):
+        storage = self.unerase(w_dict.dstorage)
+        table = storage.table
+        if table.parent is None:
+            raise KeyError
+        key = table.keys[len(table.keys) - 1]
+        w_value = storage.values_w.pop()
+        storage.table = table.parent
+        return self.wrap(key), w_value
+
+    def clear(self, w_dict):
+        w_dict.dstorage = self.get_empty_storage()
+
+    # ---------- switching ----------
+
+    def switch_to_object_strategy(self, w_dict):
+        strategy = self.space.fromcache(ObjectDictStrategy)
+        storage = self.unerase(w_dict.dstorage)
+        keys = storage.table.keys
+        values_w = storage.values_w
+        d_new = strategy.unerase(strategy.get_empty_storage())
+        for i in range(len(keys)):
+            d_new[self.wrap(keys[i])] = values_w[i]
+        w_dict.set_strategy(strategy)
+        w_dict.dstorage = strategy.erase(d_new)
+
+    def switch_to_unshared_strategy(self, w_dict):
+        strategy = self.space.fromcache(self.unshared_strategy_cls)
+        storage = self.unerase(w_dict.dstorage)
+        keys = storage.table.keys
+        values_w = storage.values_w
+        new_storage = strategy.get_empty_storage()
+        d_new = strategy.unerase(new_storage)
+        for i in range(len(keys)):
+            d_new[keys[i]] = values_w[i]
+        w_dict.set_strategy(strategy)
+        w_dict.dstorage = new_storage
+
+    # ---------- iterator interface ----------
+
+    def getiterkeys(self, w_dict):
+        return iter(self.unerase(w_dict.dstorage).table.keys)
+
+    def getitervalues(self, w_dict):
+        return iter(self.unerase(w_dict.dstorage).values_w)
+
+    def getiteritems_with_hash(self, w_dict):
+        storage = self.unerase(w_dict.dstorage)
+        return ZipItemsWithHash(storage.table.keys, storage.values_w)
+
+
+class SharedBytesKeysDictStrategy(DictStrategy):
+    import_from_mixin(AbstractSharedKeysDictStrategy)
+
+    erase, unerase = rerased.new_erasing_pair("sharedkeys_bytes")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    table_cls = BytesKeyTable
+    unshared_strategy_cls = BytesDictStrategy
+
+    def wrap(self, key):
+        return self.space.newbytes(key)
+
+    def unwrap(self, w_key):
+        return self.space.bytes_w(w_key)
+
+    def is_correct_type(self, w_obj):
+        space = self.space
+        return space.is_w(space.type(w_obj), space.w_bytes)
+
+    def getitem_str(self, w_dict, key):
+        return self.getitem_unwrapped(w_dict, key)
+
+    def setitem_str(self, w_dict, key, w_value):
+        self.setitem_unwrapped(w_dict, key, w_value)
+
+    def listview_bytes(self, w_dict):
+        return self.unerase(w_dict.dstorage).table.keys[:]
+
+    def w_keys(self, w_dict):
+        return self.space.newlist_bytes(self.listview_bytes(w_dict))
+
+    def view_as_kwargs(self, w_dict):
+        storage = self.unerase(w_dict.dstorage)
+        # copy to make non-resizable
+        return storage.table.keys[:], storage.values_w[:]
+
+    def wrapkey(space, key):
+        return space.newbytes(key)
+
+create_iterator_classes(SharedBytesKeysDictStrategy)
+
+
+class SharedUnicodeKeysDictStrategy(DictStrategy):
+    import_from_mixin(AbstractSharedKeysDictStrategy)
+
+    erase, unerase = rerased.new_erasing_pair("sharedkeys_unicode")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    table_cls = UnicodeKeyTable
+    unshared_strategy_cls = UnicodeDictStrategy
+
+    def wrap(self, key):
+        return self.space.newunicode(key)
+
+    def unwrap(self, w_key):
+        return self.space.unicode_w(w_key)
+
+    def is_correct_type(self, w_obj):
+        space = self.space
+        return space.is_w(space.type(w_obj), space.w_unicode)
+
+    def getitem_str(self, w_dict, key):
+        return self.getitem(w_dict, self.space.newtext(key))
+
+    def setitem_str(self, w_dict, key, w_value):
+        self.switch_to_object_strategy(w_dict)
+        w_dict.setitem(self.space.newtext(key), w_value)
+
+    def listview_unicode(self, w_dict):
+        return self.unerase(w_dict.dstorage).table.keys[:]
+
+    def wrapkey(space, key):
+        return space.newunicode(key)
+
+create_iterator_classes(SharedUnicodeKeysDictStrategy)
+
+
+class EmptySharedKeysDictStrategy(EmptyDictStrategy):
+    """Empty dict that will use a shared-keys strategy if its first key
+    is a string or a unicode."""
+
+    def switch_to_bytes_strategy(self, w_dict):
+        strategy = self.space.fromcache(SharedBytesKeysDictStrategy)
+        storage = strategy.get_empty_storage()
+        w_dict.set_strategy(strategy)
+        w_dict.dstorage = storage
+
+    def switch_to_unicode_strategy(self, w_dict):
+        strategy = self.space.fromcache(SharedUnicodeKeysDictStrategy)
+        storage = strategy.get_empty_storage()
+        w_dict.set_strategy(strategy)
+        w_dict.dstorage = storage
@@ -1,8 +1,9 @@
 from pypy.interpreter.error import oefmt
 from pypy.objspace.std.tupleobject import W_AbstractTupleObject
-from pypy.objspace.std.util import negate
-from rpython.rlib.objectmodel import compute_hash, specialize
-from rpython.rlib.rarithmetic import intmask
+from pypy.objspace.std.util import negate, IDTAG_SHIFT, IDTAG_TUPLE
+from rpython.rlib.objectmodel import compute_hash, newlist_hint, specialize
+from rpython.rlib.rarithmetic import intmask, r_ulonglong
+from rpython.rlib.rbigint import rbigint
 from rpython.rlib.unroll import unrolling_iterable
 from rpython.tool.sourcetools import func_with_new_name
 from rpython.rlib.longlong2float import float2longlong
@@ -27,6 +28,7 @@ def make_specialised_class(typetuple):
 
     typelen = len(typetuple)
     iter_n = unrolling_iterable(range(typelen))
+    kind = len(_specialisations) + 1    # distinguishes the id()s of tuples
 
     class cls(W_AbstractTupleObject):
         _immutable_fields_ = ['value%s' % i for i in iter_n]
@@ -131,6 +133,35 @@ def make_specialised_class(typetuple):
                     return value
             raise oefmt(space.w_IndexError, "tuple index out of range")
 
+        if object not in typetuple:
+            # Tuples made only of ints and floats behave like values,
+            # exactly like ints and floats themselves: 'is' and id()
+            # depend only on the content.  This lets list strategies
+            # store such tuples unboxed and rebuild them on demand.
+            def is_w(self, space, w_other):
+                if type(w_other) is not cls:
+                    return self is w_other
+                for i in iter_n:
+                    myval = getattr(self, 'value%s' % i)
+                    otherval = getattr(w_other, 'value%s' % i)
+                    if typetuple[i] == float:
+                        myval = float2longlong(myval)
+                        otherval = float2longlong(otherval)
+                    if myval != otherval:
+                        return False
+                return True
+
+            def immutable_unique_id(self, space):
+                b = rbigint.fromint(kind)
+                for i in iter_n:
+                    value = getattr(self, 'value%s' % i)
+                    if typetuple[i] == float:
+                        value = float2longlong(value)
+                    b = b.lshift(64).or_(
+                        rbigint.fromrarith_int(r_ulonglong(value)))
+                b = b.lshift(IDTAG_SHIFT).int_or_(IDTAG_TUPLE)
+                return space.newlong_from_rbigint(b)
+
     cls.__name__ = ('W_SpecialisedTupleObject_' +
                     ''.join([t.__name__[0] for t in typetuple]))
     _specialisations.append(cls)
@@ -167,12 +198,21 @@ def makespecialisedtuple(space, list_w):
 # of using 'Cls_ii' or 'Cls_ff' for the elements that match.
 # This is a trade-off, but it looks like a good idea to keep
 # the list uniform for the JIT---not to mention, it is much
-# faster to move the decision out of the loop.
+# faster to move the decision out of the loop.  When both
+# lists are ints or both are floats, the result directly uses
+# the pair list strategy and no tuple is built at all.
 
 @specialize.arg(1)
-def _build_zipped_spec(space, Cls, lst1, lst2):
+def _build_zipped_pairs(space, strategy_cls, lst1, lst2):
+    from pypy.objspace.std.listobject import W_ListObject
+    strategy = space.fromcache(strategy_cls)
     length = min(len(lst1), len(lst2))
-    return [Cls(space, lst1[i], lst2[i]) for i in range(length)]
+    items = newlist_hint(2 * length)
+    for i in range(length):
+        items.append(lst1[i])
+        items.append(lst2[i])
+    return W_ListObject.from_storage_and_strategy(
+        space, strategy.erase(items), strategy)
 
 def _build_zipped_spec_oo(space, w_list1, w_list2):
     strat1 = w_list1.strategy
@@ -189,7 +229,8 @@ def _build_zipped_unspec(space, w_list1, w_list2):
                             strat2.getitem(w_list2, i)]) for i in range(length)]
 
 def specialized_zip_2_lists(space, w_list1, w_list2):
-    from pypy.objspace.std.listobject import W_ListObject
+    from pypy.objspace.std.listobject import (
+        W_ListObject, IntPairListStrategy, FloatPairListStrategy)
     if type(w_list1) is not W_ListObject or type(w_list2) is not W_ListObject:
         raise oefmt(space.w_TypeError, "expected two exact lists")
 
@@ -198,17 +239,15 @@ def specialized_zip_2_lists(space, w_list1, w_list2):
         if intlist1 is not None:
             intlist2 = w_list2.getitems_int()
             if intlist2 is not None:
-                lst_w = _build_zipped_spec(
-                        space, Cls_ii, intlist1, intlist2)
-                return space.newlist(lst_w)
+                return _build_zipped_pairs(
+                        space, IntPairListStrategy, intlist1, intlist2)
         else:
             floatlist1 = w_list1.getitems_float()
             if floatlist1 is not None:
                 floatlist2 = w_list2.getitems_float()
                 if floatlist2 is not None:
-                    lst_w = _build_zipped_spec(
-                        space, Cls_ff, floatlist1, floatlist2)
-                    return space.newlist(lst_w)
+                    return _build_zipped_pairs(
+                        space, FloatPairListStrategy, floatlist1, floatlist2)
 
         lst_w = _build_zipped_spec_oo(space, w_list1, w_list2)
         return space.newlist(lst_w)
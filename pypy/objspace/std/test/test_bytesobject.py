@@ -552,6 +552,25 @@ class AppTestBytesObject:
         raises(TypeError, b''.join, [1])
         raises(TypeError, b''.join, [[1]])
 
+    def test_split_join_many(self):
+        s = b"\n".join([b"line %d" % i for i in range(100)]) + b"\n"
+        lines = s.splitlines()
+        assert len(lines) == 100
+        assert lines[7] == b"line 7"
+        assert b"\n".join(lines) + b"\n" == s
+        assert b"".join(s.splitlines(True)) == s
+        assert b"line 42" in lines
+        assert lines.index(b"line 42") == 42
+        assert lines[::-1][0] == b"line 99"
+        assert b"|".join(lines[10:60]) == b"|".join(
+            [b"line %d" % i for i in range(10, 60)])
+        words = s.split()
+        assert words[1::2] == [b"%d" % i for i in range(100)]
+        lines.append(b"end")
+        lines.sort()
+        assert lines[-1] == b"line 99"
+        assert lines[0] == b"end"
+
     def test_unicode_join_str_arg_ascii(self):
         raises(UnicodeDecodeError, u''.join, ['\xc3\xa1'])
 
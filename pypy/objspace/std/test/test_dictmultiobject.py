@@ -1129,6 +1129,93 @@ class AppTestStrategies(object):
         assert "IntDictStrategy" in self.get_strategy(d)
         assert d[1L] == "hi"
 
+    def test_empty_to_float(self):
+        d = {}
+        d[1.5] = "hi"
+        assert "FloatDictStrategy" in self.get_strategy(d)
+        assert d[1.5] == "hi"
+        d[2.5] = "there"
+        assert d.keys() == [1.5, 2.5]
+        assert d.pop(2.5) == "there"
+        assert "FloatDictStrategy" in self.get_strategy(d)
+        assert d[1.5] == "hi"
+        assert d.get(1.5) == "hi"
+        assert d.get("x") is None
+        assert "FloatDictStrategy" in self.get_strategy(d)
+
+    def test_float_zero_signs(self):
+        import math
+        d = {}
+        d[0.0] = 1
+        d[-0.0] = 2
+        assert "FloatDictStrategy" in self.get_strategy(d)
+        assert len(d) == 1
+        assert d[0.0] == 2
+        k, = d.keys()
+        assert math.copysign(1.0, k) == 1.0
+        d = {-0.0: 1}
+        assert 0.0 in d
+        k, = d.keys()
+        assert math.copysign(1.0, k) == -1.0
+
+    def test_float_nan(self):
+        nan = float('nan')
+        d = {1.5: 1}
+        assert nan not in d
+        assert d.get(nan) is None
+        raises(KeyError, "del d[nan]")
+        assert d.pop(nan, 5) == 5
+        assert "FloatDictStrategy" in self.get_strategy(d)
+        d[nan] = 2
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+        assert d[nan] == 2
+        assert d[1.5] == 1
+        d = {}
+        d[nan] = 3
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+        assert d[nan] == 3
+
+    def test_float_int_key(self):
+        d = {1.0: "a"}
+        assert "FloatDictStrategy" in self.get_strategy(d)
+        assert d[1] == "a"
+        assert d[True] == "a"
+        d[2] = "b"
+        assert d[2.0] == "b"
+        assert sorted(d.keys()) == [1.0, 2]
+
+    def test_range_keys(self):
+        d = dict.fromkeys(range(10), "x")
+        assert "RangeDictStrategy" in self.get_strategy(d)
+        assert len(d) == 10
+        assert d[3] == d[3.0] == d[3L] == d[True] == "x"
+        assert d.get(10) is None
+        assert d.get("3") is None
+        assert d.keys() == range(10)
+        assert list(d.iteritems())[:2] == [(0, "x"), (1, "x")]
+        d[4] = "y"
+        assert d.setdefault(5, "z") == "x"
+        del d[9]
+        assert d.popitem() == (8, "x")
+        assert "RangeDictStrategy" in self.get_strategy(d)
+        assert d == {0: "x", 1: "x", 2: "x", 3: "x", 4: "y", 5: "x",
+                     6: "x", 7: "x"}
+        del d[0]
+        assert "IntDictStrategy" in self.get_strategy(d)
+        assert sorted(d) == range(1, 8)
+        #
+        d = dict.fromkeys(range(20, 0, -5))
+        assert "RangeDictStrategy" in self.get_strategy(d)
+        assert d.keys() == [20, 15, 10, 5]
+        d[0] = 1
+        assert "IntDictStrategy" in self.get_strategy(d)
+        assert d == {20: None, 15: None, 10: None, 5: None, 0: 1}
+        #
+        d = dict.fromkeys(range(3))
+        d["a"] = 1
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+        assert d == {0: None, 1: None, 2: None, "a": 1}
+
     def test_iter_dict_length_change(self):
         d = {1: 2, 3: 4, 5: 6}
         it = d.iteritems()
@@ -1643,6 +1643,54 @@ class AppTestListObject(object):
             assert L3.index(0.0, i) == i
             assert L3.index(-0.0, i) == i
 
+    def test_list_of_complexes(self):
+        N = float('nan')
+        l = [1j, complex(N, 1.0), 2+3j]
+        assert complex(N, 1.0) in l
+        assert l.index(complex(N, 1.0)) == 1
+        assert 3+2j not in l
+        assert l[::-1] == [2+3j, l[1], 1j]
+        l.append(4j)
+        l.insert(0, -1j)
+        c = l.pop(2)
+        assert c.imag == 1.0 and c.real != c.real
+        assert l == [-1j, 1j, 2+3j, 4j]
+        assert [1j] * 3 == [1j, 1j, 1j]
+        l = [2j, 1j]
+        raises(TypeError, l.sort)
+        assert l == [2j, 1j]
+        l = [1j]
+        l.sort()
+        assert l == [1j]
+        l = [2j, 1j]
+        l.sort(key=abs)
+        assert l == [1j, 2j]
+
+    def test_list_as_queue(self):
+        l = [str(i) for i in range(100)] + [None]
+        for i in range(100):
+            assert l.pop(0) == str(i)
+            l.append(i)
+        assert l == [None] + range(100)
+        for i in range(200):
+            l.insert(0, i)
+        assert len(l) == 301
+        assert l[0] == 199 and l[199] == 0 and l[200] is None
+        assert l[-1] == 99
+        assert l[:3] == [199, 198, 197]
+        l.insert(-1, 'x')
+        assert l[-2:] == ['x', 99]
+        del l[:250]
+        l.reverse()
+        assert l[:3] == [99, 'x', 98]
+        l.sort()
+        assert l[:3] == [49, 50, 51]
+        assert l[-1] == 'x'
+        while l:
+            l.pop(0)
+        l.insert(0, 1)
+        assert l == [1]
+
 
 class AppTestRangeListForcing:
     """Tests for range lists that test forcing. Regular tests should go in
@@ -1,10 +1,13 @@
 import sys
 import py
+from pypy.interpreter.error import OperationError
 from pypy.objspace.std.listobject import (
     W_ListObject, EmptyListStrategy, ObjectListStrategy, IntegerListStrategy,
     FloatListStrategy, BytesListStrategy, RangeListStrategy,
     SimpleRangeListStrategy, make_range_list, UnicodeListStrategy,
-    IntOrFloatListStrategy)
+    IntOrFloatListStrategy, IntPairListStrategy, FloatPairListStrategy,
+    ComplexListStrategy, BytesSliceListStrategy, MIN_SLICE_VIEWS,
+    DequeListStrategy, MIN_DEQUE_LENGTH)
 from pypy.objspace.std import listobject
 from pypy.objspace.std.test.test_listobject import TestW_ListObject
 
@@ -1051,6 +1054,299 @@ class TestW_ListStrategies(TestW_ListObject):
         assert isinstance(w_item, space.StringObjectCls)
 
 
+class TestW_PairListStrategies:
+    spaceconfig = {"objspace.std.withspecialisedtuple": True}
+
+    def pairs(self, values):
+        space = self.space
+        return [space.newtuple([space.wrap(a), space.wrap(b)])
+                for a, b in values]
+
+    def test_check_strategy(self):
+        space = self.space
+        l = W_ListObject(space, self.pairs([(1, 2), (3, 4)]))
+        assert isinstance(l.strategy, IntPairListStrategy)
+        assert l.strategy.unerase(l.lstorage) == [1, 2, 3, 4]
+        l = W_ListObject(space, self.pairs([(1.5, 2.5), (3.5, 4.5)]))
+        assert isinstance(l.strategy, FloatPairListStrategy)
+        l = W_ListObject(space, self.pairs([(1, 2), (3.5, 4.5)]))
+        assert isinstance(l.strategy, ObjectListStrategy)
+        l = W_ListObject(space, self.pairs([(1, 2), (3, 4.5)]))
+        assert isinstance(l.strategy, ObjectListStrategy)
+
+    def test_empty_to_pairs(self):
+        space = self.space
+        l = W_ListObject(space, [])
+        l.append(self.pairs([(1, 2)])[0])
+        assert isinstance(l.strategy, IntPairListStrategy)
+        l.append(self.pairs([(5, 6)])[0])
+        assert space.unwrap(l) == [(1, 2), (5, 6)]
+        l.append(space.wrap(7))
+        assert isinstance(l.strategy, ObjectListStrategy)
+        assert space.unwrap(l) == [(1, 2), (5, 6), 7]
+
+    def test_operations(self):
+        space = self.space
+        l = W_ListObject(space, self.pairs([(1, 2), (3, 4), (5, 6)]))
+        assert l.length() == 3
+        assert space.unwrap(l.getitem(-1)) == (5, 6)
+        l.insert(1, self.pairs([(7, 8)])[0])
+        assert space.unwrap(l) == [(1, 2), (7, 8), (3, 4), (5, 6)]
+        assert space.unwrap(l.pop(0)) == (1, 2)
+        assert space.unwrap(l.pop_end()) == (5, 6)
+        l.setitem(0, self.pairs([(9, 10)])[0])
+        assert space.unwrap(l) == [(9, 10), (3, 4)]
+        assert l.find(self.pairs([(3, 4)])[0]) == 1
+        l.reverse()
+        assert space.unwrap(l) == [(3, 4), (9, 10)]
+        l2 = l.getslice(0, 2, 1, 2)
+        assert isinstance(l2.strategy, IntPairListStrategy)
+        assert space.unwrap(l2) == [(3, 4), (9, 10)]
+        l.deleteslice(0, 1, 1)
+        assert space.unwrap(l) == [(9, 10)]
+        assert isinstance(l.strategy, IntPairListStrategy)
+
+    def test_sort(self):
+        space = self.space
+        l = W_ListObject(space, self.pairs([(3, 1), (1, 2), (3, 0), (1, 1)]))
+        l.sort(False)
+        assert isinstance(l.strategy, IntPairListStrategy)
+        assert space.unwrap(l) == [(1, 1), (1, 2), (3, 0), (3, 1)]
+        l.sort(True)
+        assert space.unwrap(l) == [(3, 1), (3, 0), (1, 2), (1, 1)]
+        l = W_ListObject(space, self.pairs([(2.5, 1.0), (0.5, 3.0)]))
+        l.sort(False)
+        assert space.unwrap(l) == [(0.5, 3.0), (2.5, 1.0)]
+
+    def test_zip(self):
+        from pypy.objspace.std.specialisedtupleobject import (
+            specialized_zip_2_lists)
+        space = self.space
+        w_l = specialized_zip_2_lists(space, space.newlist_int([1, 2, 3]),
+                                      space.newlist_int([4, 5]))
+        assert isinstance(w_l.strategy, IntPairListStrategy)
+        assert space.unwrap(w_l) == [(1, 4), (2, 5)]
+
+
+class TestW_ComplexListStrategy:
+
+    def complexes(self, values):
+        return [self.space.newcomplex(c.real, c.imag) for c in values]
+
+    def test_check_strategy(self):
+        space = self.space
+        l = W_ListObject(space, self.complexes([1+2j, 3-4j]))
+        assert isinstance(l.strategy, ComplexListStrategy)
+        assert l.strategy.unerase(l.lstorage) == [1.0, 2.0, 3.0, -4.0]
+        l = W_ListObject(space, self.complexes([1j]) + [space.wrap(1.5)])
+        assert isinstance(l.strategy, ObjectListStrategy)
+        l = W_ListObject(space, [])
+        l.append(self.complexes([1j])[0])
+        assert isinstance(l.strategy, ComplexListStrategy)
+        l.append(space.wrap(1.5))
+        assert isinstance(l.strategy, ObjectListStrategy)
+        assert space.unwrap(l) == [1j, 1.5]
+
+    def test_operations(self):
+        space = self.space
+        l = W_ListObject(space, self.complexes([1j, 2j, 3j]))
+        assert space.unwrap(l.getitem(1)) == 2j
+        l.insert(0, self.complexes([5+5j])[0])
+        l.setitem(-1, self.complexes([4j])[0])
+        assert space.unwrap(l) == [5+5j, 1j, 2j, 4j]
+        assert l.find(self.complexes([2j])[0]) == 2
+        assert space.unwrap(l.pop(1)) == 1j
+        l2 = l.getslice(0, 3, 2, 2)
+        assert isinstance(l2.strategy, ComplexListStrategy)
+        assert space.unwrap(l2) == [5+5j, 4j]
+        assert isinstance(l.strategy, ComplexListStrategy)
+
+    def test_find_nan(self):
+        space = self.space
+        nan = float("nan")
+        w_c = space.newcomplex(nan, 1.0)
+        l = W_ListObject(space, [space.newcomplex(0.0, 1.0), w_c])
+        assert l.find(w_c) == 1
+        assert l.find(space.newcomplex(-0.0, 1.0)) == 0
+        py.test.raises(ValueError, l.find, space.newcomplex(nan, -1.0))
+
+    def test_sum(self):
+        from pypy.objspace.std.listobject import specialized_sum_list
+        space = self.space
+        w_l = W_ListObject(space, self.complexes([1+2j, 3-4j]))
+        w_res = specialized_sum_list(space, w_l, space.wrap(1))
+        assert space.unwrap(w_res) == 5-2j
+        w_res = specialized_sum_list(space, w_l, space.newcomplex(0.5, 1.0))
+        assert space.unwrap(w_res) == 4.5-1j
+        w_l = W_ListObject(space, [space.wrap(1.5), space.wrap(2.0)])
+        w_res = specialized_sum_list(space, w_l, space.wrap(1))
+        assert space.unwrap(w_res) == 4.5
+        w_start = space.wrap(7)
+        w_l = W_ListObject(space, [])
+        assert specialized_sum_list(space, w_l, w_start) is w_start
+        w_l = W_ListObject(space, [space.wrap(1), space.wrap(2)])
+        assert specialized_sum_list(space, w_l, space.wrap(0)) is None
+        w_l = W_ListObject(space, [space.wrap(1.5)])
+        assert specialized_sum_list(space, w_l, space.w_None) is None
+
+
+class TestW_BytesSliceListStrategy:
+
+    def split(self, s, *args):
+        space = self.space
+        return space.call_method(space.newbytes(s), "split",
+                                 *[space.wrap(x) for x in args])
+
+    def test_split(self):
+        space = self.space
+        for s, args in [(",".join(["x%d" % i for i in range(40)]), (",",)),
+                        ("a b\tc  \n d " * 10, ()),
+                        ("a b\tc  \n d " * 10, (None, 17)),
+                        ("ab--cd--" * 20, ("--", 30)),
+                        ("--" * 20, ("--",))]:
+            w_l = self.split(s, *args)
+            assert isinstance(w_l.strategy, BytesSliceListStrategy)
+            assert space.unwrap(w_l) == s.split(*args)
+            assert w_l.getitems_bytes() == s.split(*args)
+        w_l = self.split("a,b,c", ",")
+        assert isinstance(w_l.strategy, BytesListStrategy)
+
+    def test_splitlines(self):
+        space = self.space
+        s = "a\nb\r\nc\rd\n\ne\r\r" * 5 + "last"
+        for keepends in [False, True]:
+            w_l = space.call_method(space.newbytes(s), "splitlines",
+                                    space.newbool(keepends))
+            assert isinstance(w_l.strategy, BytesSliceListStrategy)
+            assert space.unwrap(w_l) == s.splitlines(keepends)
+
+    def test_read_only(self):
+        space = self.space
+        items = ["x%d" % i for i in range(2 * MIN_SLICE_VIEWS)]
+        w_l = self.split(" ".join(items))
+        assert w_l.length() == len(items)
+        assert w_l.find(space.newbytes("x3")) == 3
+        py.test.raises(ValueError, w_l.find, space.newbytes("x"))
+        w_l2 = w_l.getslice(1, len(items), 1, len(items) - 1)
+        assert isinstance(w_l2.strategy, BytesSliceListStrategy)
+        assert space.unwrap(w_l2) == items[1:]
+        w_l2 = w_l.getslice(len(items) - 1, -1, -2, len(items) // 2)
+        assert isinstance(w_l2.strategy, BytesSliceListStrategy)
+        assert space.unwrap(w_l2) == items[::-2]
+        w_l2 = w_l.getslice(0, 2, 1, 2)
+        assert isinstance(w_l2.strategy, BytesListStrategy)
+        assert space.unwrap(w_l2) == items[:2]
+        w_s = space.call_method(space.newbytes(", "), "join", w_l)
+        assert space.bytes_w(w_s) == ", ".join(items)
+        assert isinstance(w_l.strategy, BytesSliceListStrategy)
+        # reading an item slices all of them out, once
+        assert space.bytes_w(w_l.getitem(-1)) == items[-1]
+        assert isinstance(w_l.strategy, BytesListStrategy)
+        assert space.unwrap(w_l) == items
+
+    def test_mutate(self):
+        space = self.space
+        items = ["x%d" % i for i in range(2 * MIN_SLICE_VIEWS)]
+        w_l = self.split(" ".join(items))
+        w_l2 = w_l.clone()
+        w_l.append(space.newbytes("y"))
+        assert isinstance(w_l.strategy, BytesListStrategy)
+        assert space.unwrap(w_l) == items + ["y"]
+        assert isinstance(w_l2.strategy, BytesSliceListStrategy)
+        assert space.unwrap(w_l2) == items
+        w_l2.sort(True)
+        assert space.unwrap(w_l2) == sorted(items, reverse=True)
+        w_l = self.split(" ".join(items))
+        w_l.setitem(0, space.wrap(1))
+        assert isinstance(w_l.strategy, ObjectListStrategy)
+        #
+        w_l = W_ListObject(space, [space.newbytes("a")])
+        w_l.extend(self.split(" ".join(items)))
+        assert isinstance(w_l.strategy, BytesListStrategy)
+        assert space.unwrap(w_l) == ["a"] + items
+        w_l.setslice(0, 1, 1, self.split(" ".join(items)))
+        assert isinstance(w_l.strategy, BytesListStrategy)
+        assert space.unwrap(w_l) == items + items
+        w_l = W_ListObject(space, [])
+        w_l.extend(self.split(" ".join(items)))
+        assert space.unwrap(w_l) == items
+
+
+class TestW_DequeListStrategy:
+
+    def objects(self, n):
+        space = self.space
+        return ([space.wrap(i) for i in range(n - 1)] +
+                [space.newbytes("last")])
+
+    def test_pop_front(self):
+        space = self.space
+        n = 2 * MIN_DEQUE_LENGTH
+        w_l = W_ListObject(space, self.objects(n))
+        assert isinstance(w_l.strategy, ObjectListStrategy)
+        for i in range(n - 1):
+            assert space.int_w(w_l.pop(0)) == i
+            assert isinstance(w_l.strategy, DequeListStrategy)
+            assert w_l.length() == n - 1 - i
+            assert space.bytes_w(w_l.getitem(-1)) == "last"
+            # the free slots never take more room than the items
+            storage = w_l.strategy.unerase(w_l.lstorage)
+            assert storage.start <= len(storage.items_w) - storage.start
+        assert space.unwrap(w_l) == ["last"]
+        w_l.append(space.wrap(42))
+        assert space.unwrap(w_l) == ["last", 42]
+
+    def test_insert_front(self):
+        space = self.space
+        n = MIN_DEQUE_LENGTH
+        w_l = W_ListObject(space, self.objects(n))
+        expected = space.unwrap(w_l)
+        for i in range(3 * n):
+            w_l.insert(0, space.wrap(-i))
+            expected.insert(0, -i)
+        assert isinstance(w_l.strategy, DequeListStrategy)
+        assert space.unwrap(w_l) == expected
+        w_l.insert(5, space.wrap("x"))
+        expected.insert(5, "x")
+        w_l.setitem(-1, space.wrap(7))
+        expected[-1] = 7
+        assert space.int_w(w_l.pop(3)) == expected.pop(3)
+        assert space.unwrap(w_l) == expected
+        assert space.unwrap(w_l.getslice(2, 12, 3, 4)) == expected[2:12:3]
+        assert space.unwrap(w_l.getslice(2, 5, 1, 3)) == expected[2:5]
+        assert space.unwrap(w_l.getslice(7, 7, 1, 0)) == []
+        assert space.unwrap(w_l.clone()) == expected
+        assert w_l.find(space.wrap("x")) == 4
+
+    def test_short_lists(self):
+        space = self.space
+        w_l = W_ListObject(space, self.objects(MIN_DEQUE_LENGTH - 1))
+        w_l.pop(0)
+        w_l.insert(0, space.wrap(1))
+        assert isinstance(w_l.strategy, ObjectListStrategy)
+        w_l = W_ListObject(space, [space.wrap(i) for i in range(100)])
+        w_l.pop(0)
+        assert isinstance(w_l.strategy, IntegerListStrategy)
+
+    def test_switch_back(self):
+        space = self.space
+        n = 2 * MIN_DEQUE_LENGTH
+        w_l = W_ListObject(space, self.objects(n))
+        w_l.pop(0)
+        w_l.pop(0)
+        expected = space.unwrap(w_l)
+        w_l.reverse()
+        assert isinstance(w_l.strategy, ObjectListStrategy)
+        assert space.unwrap(w_l) == expected[::-1]
+        w_l.pop(0)
+        w_l.deleteslice(0, 2, 5)
+        del expected[-1]
+        expected.reverse()
+        del expected[0:10:2]
+        assert isinstance(w_l.strategy, ObjectListStrategy)
+        assert space.unwrap(w_l) == expected
+
+
 class TestW_ListStrategiesDisabled:
     spaceconfig = {"objspace.std.withliststrategies": False}
 
@@ -80,8 +80,7 @@ class TestW_SetObject:
 
     def test_create_set_from_list(self):
         from pypy.interpreter.baseobjspace import W_Root
-        from pypy.objspace.std.setobject import BytesSetStrategy, ObjectSetStrategy, UnicodeSetStrategy
-        from pypy.objspace.std.floatobject import W_FloatObject
+        from pypy.objspace.std.setobject import BytesSetStrategy, FloatSetStrategy, ObjectSetStrategy, UnicodeSetStrategy
 
         w = self.space.wrap
         wb = self.space.newbytes
@@ -118,9 +117,15 @@ class TestW_SetObject:
         w_list = W_ListObject(self.space, [w(1.0), w(2.0), w(3.0)])
         w_set = W_SetObject(self.space)
         _initialize_set(self.space, w_set, w_list)
+        assert w_set.strategy is self.space.fromcache(FloatSetStrategy)
+        assert w_set.strategy.unerase(w_set.sstorage) == {1.0:None, 2.0:None, 3.0:None}
+
+        w_list = W_ListObject(self.space, [w(1.0), w(2), w(3.0)])
+        w_set = W_SetObject(self.space)
+        _initialize_set(self.space, w_set, w_list)
         assert w_set.strategy is self.space.fromcache(ObjectSetStrategy)
         for item in w_set.strategy.unerase(w_set.sstorage):
-            assert isinstance(item, W_FloatObject)
+            assert isinstance(item, W_Root)
 
         # changed cached object, need to change it back for other tests to pass
         intstr.get_storage_from_list = tmp_func
@@ -1037,3 +1042,85 @@ class AppTestAppSetTest:
            raise ValueError
            yield 1
         raises(ValueError, set, f())
+
+    def test_range_set(self):
+        from __pypy__ import strategy
+        s = set(range(10))
+        assert strategy(s) == "RangeSetStrategy"
+        assert strategy(frozenset(range(3, 30, 3))) == "RangeSetStrategy"
+        assert 5 in s and 5.0 in s and True in s and 5L in s
+        assert 10 not in s and 5.5 not in s and "5" not in s
+        raises(TypeError, "[] in s")
+        assert list(s) == range(10)
+        assert s == set(range(9, -1, -1)) == frozenset(range(10))
+        assert hash(frozenset(range(10))) == hash(frozenset(list(s)))
+        s.add(3)
+        s.discard(42)
+        assert strategy(s) == "RangeSetStrategy"
+        s.add(42)
+        assert strategy(s) == "IntegerSetStrategy"
+        assert s == set(range(10) + [42])
+
+    def test_range_set_algebra(self):
+        ranges = [range(0), range(1), range(10), range(3, 7), range(5, 15),
+                  range(10, 20), range(0, 20, 2), range(1, 20, 2),
+                  range(20, 0, -3), range(8, 9), range(-5, 5)]
+        for a in ranges:
+            for b in ranges:
+                ra, rb = set(a), set(b)
+                la, lb = set(list(a) + [None]), set(list(b) + [None])
+                la.remove(None)
+                lb.remove(None)
+                assert (ra & rb) == (la & lb)
+                assert (ra | rb) == (la | lb)
+                assert (ra - rb) == (la - lb)
+                assert (ra ^ rb) == (la ^ lb)
+                assert (ra <= rb) == (la <= lb)
+                assert (ra == rb) == (la == lb)
+                assert ra.isdisjoint(rb) == la.isdisjoint(lb)
+                assert ra.isdisjoint(lb) == la.isdisjoint(rb)
+                assert (ra & lb) == (la & rb) == (la & lb)
+                for op in ["__iand__", "__ior__", "__isub__", "__ixor__"]:
+                    x = set(a)
+                    getattr(x, op)(set(b))
+                    y = set(la)
+                    getattr(y, op)(lb)
+                    assert x == y
+
+    def test_bitmap_set(self):
+        from __pypy__ import strategy
+        l = [i for i in range(600) if i % 7 != 3]
+        s = set(l)
+        assert strategy(s) == "BitmapSetStrategy"
+        assert 4 in s and 4.0 in s and True in s and 4L in s
+        assert 3 not in s and 4.5 not in s and "4" not in s
+        raises(TypeError, "[] in s")
+        assert list(s) == l
+        assert hash(frozenset(s)) == hash(frozenset(l + [None]) - set([None]))
+        s.add(-1)
+        s.discard(3)
+        s.remove(4)
+        assert strategy(s) == "BitmapSetStrategy"
+        assert s == set([-1] + l) - set([4])
+        s.add("x")
+        assert strategy(s) == "ObjectSetStrategy"
+        assert len(s) == len(l) + 1
+
+    def test_bitmap_set_algebra(self):
+        from __pypy__ import strategy
+        lists = [range(300), range(200, 600), range(0, 900, 2),
+                 range(-300, 0), [5, 10 ** 9], []]
+        assert strategy(set([x for x in lists[2]])) == "BitmapSetStrategy"
+        for a in lists:
+            for b in lists:
+                ra, rb = set([x for x in a]), set([x for x in b])
+                la, lb = set(a + [None]), set(b + [None])
+                la.remove(None)
+                lb.remove(None)
+                assert (ra & rb) == (la & lb)
+                assert (ra | rb) == (la | lb)
+                assert (ra - rb) == (la - lb)
+                assert (ra ^ rb) == (la ^ lb)
+                assert (ra <= rb) == (la <= lb)
+                assert ra.isdisjoint(rb) == la.isdisjoint(lb)
+                assert (ra & lb) == (la & rb) == (la & lb)
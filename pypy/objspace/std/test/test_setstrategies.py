@@ -1,9 +1,12 @@
 from pypy.objspace.std.setobject import W_SetObject
 from pypy.objspace.std.setobject import (
+    BITMAP_MIN_ITEMS, BitmapIteratorImplementation, BitmapSetStrategy,
     BytesIteratorImplementation, BytesSetStrategy, EmptySetStrategy,
+    FloatIteratorImplementation, FloatSetStrategy,
     IntegerIteratorImplementation, IntegerSetStrategy, ObjectSetStrategy,
+    RangeIteratorImplementation, RangeSetStrategy,
     UnicodeIteratorImplementation, UnicodeSetStrategy)
-from pypy.objspace.std.listobject import W_ListObject
+from pypy.objspace.std.listobject import W_ListObject, make_range_list
 
 class TestW_SetStrategies:
 
@@ -29,6 +32,12 @@ class TestW_SetStrategies:
         s = W_SetObject(self.space, self.wrapped([u"a", u"b"]))
         assert s.strategy is self.space.fromcache(UnicodeSetStrategy)
 
+        s = W_SetObject(self.space, self.wrapped([1.5, 2.5]))
+        assert s.strategy is self.space.fromcache(FloatSetStrategy)
+
+        s = W_SetObject(self.space, self.wrapped([1.5, float('nan')]))
+        assert s.strategy is self.space.fromcache(ObjectSetStrategy)
+
     def test_switch_to_object(self):
         s = W_SetObject(self.space, self.wrapped([1,2,3,4,5]))
         s.add(self.space.wrap("six"))
@@ -44,6 +53,16 @@ class TestW_SetStrategies:
         s.add(self.space.wrap(u"six"))
         assert s.strategy is self.space.fromcache(UnicodeSetStrategy)
 
+    def test_float_nan(self):
+        space = self.space
+        s = W_SetObject(space, self.wrapped([1.5, 2.5]))
+        assert not s.has_key(space.wrap(float('nan')))
+        assert not s.remove(space.wrap(float('nan')))
+        assert s.strategy is space.fromcache(FloatSetStrategy)
+        s.add(space.wrap(float('nan')))
+        assert s.strategy is space.fromcache(ObjectSetStrategy)
+        assert s.length() == 3
+
     def test_symmetric_difference(self):
         s1 = W_SetObject(self.space, self.wrapped([1,2,3,4,5]))
         s2 = W_SetObject(self.space, self.wrapped(["six", "seven"]))
@@ -133,6 +152,12 @@ class TestW_SetStrategies:
         assert isinstance(it, UnicodeIteratorImplementation)
         assert space.unwrap(it.next()) == u"a"
         assert space.unwrap(it.next()) == u"b"
+        #
+        s = W_SetObject(space, self.wrapped([1.5, 2.5]))
+        it = s.iter()
+        assert isinstance(it, FloatIteratorImplementation)
+        assert space.unwrap(it.next()) == 1.5
+        assert space.unwrap(it.next()) == 2.5
 
     def test_listview(self):
         space = self.space
@@ -144,3 +169,243 @@ class TestW_SetStrategies:
         #
         s = W_SetObject(space, self.wrapped([u"a", u"b"]))
         assert sorted(space.listview_unicode(s)) == [u"a", u"b"]
+        #
+        s = W_SetObject(space, self.wrapped([1.5, 2.5]))
+        assert sorted(space.listview_float(s)) == [1.5, 2.5]
+
+    def range(self, start, step, length):
+        return W_SetObject(self.space,
+                           make_range_list(self.space, start, step, length))
+
+    def test_range(self):
+        space = self.space
+        s = self.range(0, 1, 10)
+        assert s.strategy is space.fromcache(RangeSetStrategy)
+        assert s.length() == 10
+        assert s.has_key(space.wrap(9))
+        assert not s.has_key(space.wrap(10))
+        assert not s.has_key(space.wrap(-1))
+        assert s.has_key(space.wrap(3.0))
+        assert s.has_key(space.w_True)
+        assert not s.has_key(space.wrap(3.5))
+        assert not s.has_key(space.wrap("3"))
+        assert s.strategy is space.fromcache(RangeSetStrategy)
+        it = s.iter()
+        assert isinstance(it, RangeIteratorImplementation)
+        assert space.unwrap(it.next()) == 0
+        assert space.unwrap(it.next()) == 1
+        assert space.listview_int(s) == range(10)
+        #
+        s = self.range(10, -3, 4)
+        assert s.strategy is space.fromcache(RangeSetStrategy)
+        assert space.listview_int(s) == [10, 7, 4, 1]
+        assert s.has_key(space.wrap(4))
+        assert not s.has_key(space.wrap(5))
+        assert not s.has_key(space.wrap(-2))
+        #
+        s = self.range(0, 1, 0)
+        assert s.strategy is space.fromcache(EmptySetStrategy)
+
+    def test_range_extreme(self):
+        import sys
+        space = self.space
+        s = self.range(-sys.maxint, 2 ** 40, 2 ** 24)
+        assert s.has_key(space.wrap(-sys.maxint + 2 ** 40 * (2 ** 24 - 1)))
+        assert not s.has_key(space.wrap(sys.maxint))
+        assert not s.has_key(space.wrap(-sys.maxint - 1))
+
+    def test_range_mutations(self):
+        space = self.space
+        s = self.range(0, 1, 10)
+        s.add(space.wrap(5))
+        assert s.strategy is space.fromcache(RangeSetStrategy)
+        assert s.remove(space.wrap(0))
+        assert s.remove(space.wrap(9))
+        assert not s.remove(space.wrap(42))
+        assert s.strategy is space.fromcache(RangeSetStrategy)
+        assert space.listview_int(s) == range(1, 9)
+        assert space.unwrap(s.popitem()) == 8
+        assert s.strategy is space.fromcache(RangeSetStrategy)
+        s.add(space.wrap(42))
+        assert s.strategy is space.fromcache(IntegerSetStrategy)
+        assert sorted(space.listview_int(s)) == range(1, 8) + [42]
+        #
+        s = self.range(0, 1, 10)
+        assert s.remove(space.wrap(5))
+        assert s.strategy is space.fromcache(IntegerSetStrategy)
+        assert s.length() == 9
+        #
+        s = self.range(0, 1, 10)
+        s.add(space.wrap("x"))
+        assert s.strategy is space.fromcache(ObjectSetStrategy)
+        assert s.length() == 11
+
+    def test_range_algebra(self):
+        space = self.space
+        strategy = space.fromcache(RangeSetStrategy)
+        a = self.range(0, 1, 10)
+        b = self.range(5, 1, 10)
+        c = self.range(1, 2, 5)
+        i = a.intersect(b)
+        assert i.strategy is strategy
+        assert space.listview_int(i) == range(5, 10)
+        assert space.listview_int(a.difference(b)) == range(5)
+        assert a.difference(b).strategy is strategy
+        assert space.listview_int(b.difference(a)) == range(10, 15)
+        assert a.difference(a).length() == 0
+        assert a.isdisjoint(self.range(10, 1, 3))
+        assert not a.isdisjoint(b)
+        assert c.issubset(a)
+        assert not a.issubset(c)
+        assert self.range(2, 2, 4).issubset(self.range(0, 1, 10))
+        assert not self.range(2, 2, 4).issubset(self.range(1, 1, 7))
+        assert a.equals(self.range(9, -1, 10))
+        assert not a.equals(b)
+        # odd numbers and even numbers
+        assert c.isdisjoint(self.range(0, 2, 5))
+        assert c.intersect(self.range(0, 2, 5)).length() == 0
+        # a hole in the middle: not a range any more
+        d = a.difference(self.range(3, 1, 2))
+        assert d.strategy is space.fromcache(IntegerSetStrategy)
+        assert sorted(space.listview_int(d)) == [0, 1, 2, 5, 6, 7, 8, 9]
+        #
+        u = self.range(0, 1, 10)
+        u.update(b)
+        assert u.strategy is strategy
+        assert space.listview_int(u) == range(15)
+        u.update(self.range(20, 1, 2))
+        assert u.strategy is space.fromcache(IntegerSetStrategy)
+        assert sorted(space.listview_int(u)) == range(15) + [20, 21]
+        #
+        s = self.range(0, 1, 10)
+        s.intersect_update(W_SetObject(space, self.wrapped([3, 4, 42])))
+        assert s.strategy is space.fromcache(IntegerSetStrategy)
+        assert sorted(space.listview_int(s)) == [3, 4]
+        #
+        s = W_SetObject(space, self.wrapped([1, 2]))
+        s.update(self.range(5, 1, 2))
+        assert s.strategy is space.fromcache(IntegerSetStrategy)
+        assert sorted(space.listview_int(s)) == [1, 2, 5, 6]
+
+    def ints(self, l):
+        return W_SetObject(self.space, self.space.newlist_int(l))
+
+    def test_bitmap(self):
+        space = self.space
+        n = BITMAP_MIN_ITEMS
+        s = self.ints(range(-100, 3 * n, 2))
+        assert s.strategy is space.fromcache(BitmapSetStrategy)
+        assert s.length() == len(range(-100, 3 * n, 2))
+        assert s.has_key(space.wrap(-100))
+        assert s.has_key(space.wrap(4.0))
+        assert s.has_key(space.w_False)
+        assert not s.has_key(space.wrap(3))
+        assert not s.has_key(space.wrap(-102))
+        assert not s.has_key(space.wrap("x"))
+        assert isinstance(s.iter(), BitmapIteratorImplementation)
+        assert space.listview_int(s) == range(-100, 3 * n, 2)
+        #
+        s = self.ints(range(0, 1000 * n, 1000))
+        assert s.strategy is space.fromcache(IntegerSetStrategy)
+        s = self.ints(range(n - 1))
+        assert s.strategy is space.fromcache(IntegerSetStrategy)
+
+    def test_bitmap_extreme(self):
+        import sys
+        space = self.space
+        n = BITMAP_MIN_ITEMS
+        s = self.ints(range(n) + [-sys.maxint - 1, sys.maxint])
+        assert s.strategy is space.fromcache(IntegerSetStrategy)
+        assert s.length() == n + 2
+        assert s.has_key(space.wrap(-sys.maxint - 1))
+        assert s.has_key(space.wrap(sys.maxint))
+        #
+        s = self.ints(range(n))
+        assert s.strategy is space.fromcache(BitmapSetStrategy)
+        s.add(space.wrap(sys.maxint))
+        s.add(space.wrap(-sys.maxint - 1))
+        assert s.strategy is space.fromcache(IntegerSetStrategy)
+        assert sorted(space.listview_int(s)) == (
+            [-sys.maxint - 1] + range(n) + [sys.maxint])
+
+    def test_bitmap_from_adds(self):
+        space = self.space
+        n = BITMAP_MIN_ITEMS
+        s = self.ints([])
+        for i in range(2 * n, 0, -1):
+            s.add(space.wrap(i))
+        assert s.strategy is space.fromcache(BitmapSetStrategy)
+        for i in range(2 * n, 4 * n):
+            s.add(space.wrap(i))
+        s.add(space.wrap(-5))
+        assert s.strategy is space.fromcache(BitmapSetStrategy)
+        assert space.listview_int(s) == [-5] + range(1, 4 * n)
+        # far away: the bitmap would become sparse
+        s.add(space.wrap(10 ** 9))
+        assert s.strategy is space.fromcache(IntegerSetStrategy)
+        assert s.length() == 4 * n + 1
+        #
+        s = self.ints(range(2 * n))
+        s.add(space.wrap("x"))
+        assert s.strategy is space.fromcache(ObjectSetStrategy)
+        assert s.length() == 2 * n + 1
+
+    def test_bitmap_remove(self):
+        space = self.space
+        n = BITMAP_MIN_ITEMS
+        s = self.ints(range(n))
+        assert s.strategy is space.fromcache(BitmapSetStrategy)
+        assert not s.remove(space.wrap(n))
+        assert s.remove(space.wrap(0))
+        assert space.unwrap(s.popitem()) == n - 1
+        assert s.strategy is space.fromcache(BitmapSetStrategy)
+        for i in range(1, n // 2 + 10):
+            s.remove(space.wrap(i))
+        assert s.strategy is space.fromcache(IntegerSetStrategy)
+        assert sorted(space.listview_int(s)) == range(n // 2 + 10, n - 1)
+
+    def test_bitmap_algebra(self):
+        space = self.space
+        bitmap = space.fromcache(BitmapSetStrategy)
+        n = BITMAP_MIN_ITEMS
+        a = self.ints(range(4 * n))
+        b = self.ints(range(2 * n, 6 * n))
+        assert a.strategy is b.strategy is bitmap
+        c = a.intersect(b)
+        assert c.strategy is bitmap
+        assert space.listview_int(c) == range(2 * n, 4 * n)
+        c = a.difference(b)
+        assert c.strategy is bitmap
+        assert space.listview_int(c) == range(2 * n)
+        c = a.symmetric_difference(b)
+        assert c.strategy is bitmap
+        assert space.listview_int(c) == range(2 * n) + range(4 * n, 6 * n)
+        c = a.copy_real()
+        c.update(b)
+        assert c.strategy is bitmap
+        assert space.listview_int(c) == range(6 * n)
+        assert not a.isdisjoint(b)
+        assert a.isdisjoint(self.ints(range(4 * n, 8 * n)))
+        assert c.issubset(self.ints(range(-1, 6 * n)))
+        assert not c.issubset(a)
+        assert a.equals(self.ints(range(4 * n - 1, -1, -1)))
+        # a small intersection is not dense
+        c = a.intersect(self.ints(range(4 * n - 3, 6 * n)))
+        assert c.strategy is space.fromcache(IntegerSetStrategy)
+        assert sorted(space.listview_int(c)) == range(4 * n - 3, 4 * n)
+        # with other strategies
+        c = a.intersect(self.ints([5, 10 ** 9]))
+        assert space.listview_int(c) == [5]
+        c = self.ints([5, 10 ** 9]).intersect(a)
+        assert c.length() == 1 and c.has_key(space.wrap(5))
+        c = a.copy_real()
+        c.update(self.ints([4 * n, 4 * n + 1]))
+        assert c.strategy is bitmap
+        assert c.length() == 4 * n + 2
+        c.difference_update(self.ints([0, 1, 10 ** 9]))
+        assert c.strategy is bitmap
+        assert c.length() == 4 * n
+        c = self.ints([10 ** 9])
+        c.update(a)
+        assert c.strategy is space.fromcache(IntegerSetStrategy)
+        assert c.length() == 4 * n + 1
@@ -0,0 +1,159 @@
+import py
+from pypy.objspace.std.sharedkeysdict import (
+    SharedBytesKeysDictStrategy, SharedUnicodeKeysDictStrategy,
+    EmptySharedKeysDictStrategy, MAX_KEYS, MAX_TRANSITIONS)
+from pypy.objspace.std.dictmultiobject import (
+    BytesDictStrategy, UnicodeDictStrategy, ObjectDictStrategy)
+
+
+def make_record(space, keys, values):
+    w_d = space.newdict(sharedkeys=True)
+    for i in range(len(keys)):
+        space.setitem(w_d, space.newbytes(keys[i]), space.newint(values[i]))
+    return w_d
+
+def test_from_empty(space):
+    w_d = space.newdict(sharedkeys=True)
+    assert isinstance(w_d.get_strategy(), EmptySharedKeysDictStrategy)
+    space.setitem(w_d, space.newbytes("a"), space.newint(1))
+    assert isinstance(w_d.get_strategy(), SharedBytesKeysDictStrategy)
+    w_d = space.newdict(sharedkeys=True)
+    space.setitem(w_d, space.newunicode(u"a"), space.newint(1))
+    assert isinstance(w_d.get_strategy(), SharedUnicodeKeysDictStrategy)
+
+def test_tables_are_shared(space):
+    w_d1 = make_record(space, ["x", "y", "z"], [1, 2, 3])
+    w_d2 = make_record(space, ["x", "y", "z"], [4, 5, 6])
+    w_d3 = make_record(space, ["x", "z"], [7, 8])
+    strategy = w_d1.get_strategy()
+    assert w_d2.get_strategy() is strategy
+    t1 = strategy.unerase(w_d1.dstorage).table
+    t2 = strategy.unerase(w_d2.dstorage).table
+    t3 = strategy.unerase(w_d3.dstorage).table
+    assert t1 is t2
+    assert t1.keys == ["x", "y", "z"]
+    assert t3.keys == ["x", "z"]
+    assert t3.parent is t1.parent.parent
+    assert space.int_w(space.getitem(w_d2, space.newbytes("y"))) == 5
+    assert w_d1.getitem_str("z") is not None
+    assert w_d3.getitem_str("y") is None
+
+def test_overwrite_keeps_table(space):
+    w_d = make_record(space, ["a", "b"], [1, 2])
+    strategy = w_d.get_strategy()
+    table = strategy.unerase(w_d.dstorage).table
+    space.setitem(w_d, space.newbytes("a"), space.newint(42))
+    assert strategy.unerase(w_d.dstorage).table is table
+    assert space.int_w(space.getitem(w_d, space.newbytes("a"))) == 42
+
+def test_popitem(space):
+    w_d = make_record(space, ["a", "b"], [1, 2])
+    strategy = w_d.get_strategy()
+    w_key, w_value = w_d.popitem()
+    assert space.bytes_w(w_key) == "b"
+    assert space.int_w(w_value) == 2
+    assert strategy.unerase(w_d.dstorage).table.keys == ["a"]
+    w_d.popitem()
+    py.test.raises(KeyError, w_d.popitem)
+
+def test_delitem_unshares(space):
+    w_d = make_record(space, ["a", "b", "c"], [1, 2, 3])
+    space.delitem(w_d, space.newbytes("b"))
+    assert isinstance(w_d.get_strategy(), BytesDictStrategy)
+    assert space.int_w(space.len(w_d)) == 2
+    assert w_d.getitem_str("c") is not None
+
+def test_other_key_type(space):
+    w_d = make_record(space, ["a", "b"], [1, 2])
+    space.setitem(w_d, space.newint(1), space.newint(3))
+    assert isinstance(w_d.get_strategy(), ObjectDictStrategy)
+    assert space.int_w(space.len(w_d)) == 3
+
+def test_lookup_other_key_type(space):
+    w_d = make_record(space, ["a", "b"], [1, 2])
+    assert w_d.getitem(space.newint(1)) is None
+    assert not space.is_true(space.contains(w_d, space.newint(1)))
+    assert isinstance(w_d.get_strategy(), SharedBytesKeysDictStrategy)
+
+def test_unicode_setitem_str(space):
+    w_d = space.newdict(sharedkeys=True)
+    space.setitem(w_d, space.newunicode(u"a"), space.newint(1))
+    w_d.setitem_str("b", space.newint(2))
+    assert isinstance(w_d.get_strategy(), ObjectDictStrategy)
+    assert space.int_w(space.len(w_d)) == 2
+
+def test_limit_keys(space):
+    keys = ["k%d" % i for i in range(MAX_KEYS + 1)]
+    w_d = make_record(space, keys, range(MAX_KEYS + 1))
+    assert isinstance(w_d.get_strategy(), BytesDictStrategy)
+    assert space.int_w(space.len(w_d)) == MAX_KEYS + 1
+
+def test_limit_transitions(space):
+    for i in range(MAX_TRANSITIONS):
+        w_d = make_record(space, ["root", "t%d" % i], [1, 2])
+        assert isinstance(w_d.get_strategy(), SharedBytesKeysDictStrategy)
+    w_d = make_record(space, ["root", "other"], [1, 2])
+    assert isinstance(w_d.get_strategy(), BytesDictStrategy)
+    # existing transitions are still followed
+    w_d = make_record(space, ["root", "t0"], [1, 2])
+    assert isinstance(w_d.get_strategy(), SharedBytesKeysDictStrategy)
+
+def test_unicode_unshared(space):
+    w_d = space.newdict(sharedkeys=True)
+    space.setitem(w_d, space.newunicode(u"a"), space.newint(1))
+    space.setitem(w_d, space.newunicode(u"b"), space.newint(2))
+    space.delitem(w_d, space.newunicode(u"a"))
+    assert isinstance(w_d.get_strategy(), UnicodeDictStrategy)
+    assert w_d.listview_unicode() == [u"b"]
+
+
+class AppTestSharedKeysDictStrategy(object):
+    spaceconfig = {"usemodules": ["_pypyjson"]}
+
+    def setup_class(cls):
+        if cls.runappdirect:
+            py.test.skip("__repr__ doesn't work on appdirect")
+
+    def w_get_strategy(self, obj):
+        import __pypy__
+        r = __pypy__.internal_repr(obj)
+        return r[r.find("(") + 1: r.find(")")]
+
+    def test_newdict(self):
+        import __pypy__
+        d = __pypy__.newdict("sharedkeys")
+        assert "EmptySharedKeysDictStrategy" in self.get_strategy(d)
+        d["a"] = 1
+        d["b"] = 2
+        assert "SharedBytesKeysDictStrategy" in self.get_strategy(d)
+        assert d == {"a": 1, "b": 2}
+        assert d.keys() == ["a", "b"]
+        assert d.values() == [1, 2]
+        assert d.items() == [("a", 1), ("b", 2)]
+        assert list(d.iteritems()) == [("a", 1), ("b", 2)]
+        assert dict.fromkeys(d) == {"a": None, "b": None}
+        assert d.setdefault("a", 5) == 1
+        assert d.setdefault("c", 5) == 5
+        assert d.pop("c") == 5
+        assert "SharedBytesKeysDictStrategy" not in self.get_strategy(d)
+        assert d == {"a": 1, "b": 2}
+
+    def test_copy_and_clear(self):
+        import __pypy__
+        d = __pypy__.newdict("sharedkeys")
+        d["a"] = 1
+        d2 = d.copy()
+        assert d2 == {"a": 1}
+        d.clear()
+        assert d == {}
+        assert d2 == {"a": 1}
+        d["b"] = 3
+        assert d == {"b": 3}
+
+    def test_json_records(self):
+        import _pypyjson
+        l = _pypyjson.loads('[{"a": 1, "b": 2}, {"a": 3, "b": 4}]')
+        assert l == [{u"a": 1, u"b": 2}, {u"a": 3, u"b": 4}]
+        for d in l:
+            assert "SharedUnicodeKeysDictStrategy" in self.get_strategy(d)
+            assert d.keys() == [u"a", u"b"]
@@ -236,5 +236,68 @@ class AppTestW_SpecialisedTupleObject:
         assert (0.0, 0.0) == (-0.0, -0.0)
 
 
+    def test_identity_by_value(self):
+        a = 5
+        t1 = (a, 6)
+        t2 = (a, 6)
+        assert t1 is t2
+        assert id(t1) == id(t2)
+        assert (1.5, 2.5) is (1.5, 2.5)
+        assert (1, 2) is not (1.0, 2.0)
+        assert id((1, 2)) != id((1.0, 2.0))
+        assert id((1, 2)) != id((2, 1))
+        l = [t1]
+        assert l[0] is t1
+
+    def test_identity_vs_id_pairs(self):
+        import sys
+        class I(int): pass
+        nan = float('nan')
+        l = []
+        for i in [0, 1, 3]:
+            l.append((i, 2))
+            l.append((2, i))
+            l.append((i, -sys.maxint - 1))
+            l.append((float(i), 2.0))
+            l.append((i + 0.1, -0.0))
+            l.append((i, 2.0))
+            l.append((long(i), 2L))
+            l.append((I(i), 2))
+        l.append((0.0, 0.0))
+        l.append((-0.0, 0.0))
+        l.append((nan, nan))
+        l.append((True, False))
+        for i, a in enumerate(l):
+            for b in l[i:]:
+                assert (a is b) == (id(a) == id(b))
+                if a is b:
+                    assert a == b
+        # rebuilt tuples of two ints or two floats are identical ...
+        assert tuple([3, 2]) is (3, 2)
+        assert (nan, nan) is (nan, nan)
+        assert id((3, 2)) > sys.maxint
+        # ... but not other tuples
+        assert (-0.0, 0.0) is not (0.0, 0.0)
+        assert tuple([3, 2.0]) is not (3, 2.0)
+        assert tuple([3L, 2L]) is not (3L, 2L)
+        assert (I(3), 2) is not (I(3), 2)
+        class T(tuple): pass
+        assert T((3, 2)) is not T((3, 2))
+
+    def test_list_of_pairs(self):
+        l = [(i, i * 2) for i in range(5)]
+        assert self.isspecialised(l[3], '_ii')
+        l.sort(reverse=True)
+        assert l == [(4, 8), (3, 6), (2, 4), (1, 2), (0, 0)]
+        assert (2, 4) in l
+        assert l.index((1, 2)) == 3
+        l.append((1, 2.5))
+        assert l[-1] == (1, 2.5)
+        l = zip([1.5, 2.5], [3.5, 4.5])
+        assert l == [(1.5, 3.5), (2.5, 4.5)]
+        l.sort(reverse=True)
+        assert l == [(2.5, 4.5), (1.5, 3.5)]
+
+
 class AppTestAll(test_tupleobject.AppTestW_TupleObject):
     spaceconfig = {"objspace.std.withspecialisedtuple": True}
@@ -0,0 +1,96 @@
+from pypy.objspace.std.test import test_bytesobject
+
+
+class TestW_StringBufferObject:
+    spaceconfig = {"objspace.std.withstrbuf": True}
+
+    def test_shared_builder(self):
+        from pypy.objspace.std.strbufobject import W_StringBufferObject
+        space = self.space
+        w_a = space.add(space.newbytes("ab"), space.newbytes("cd"))
+        assert isinstance(w_a, W_StringBufferObject)
+        w_b = space.add(w_a, space.newbytes("ef"))
+        assert isinstance(w_b, W_StringBufferObject)
+        assert w_b.builder is w_a.builder
+        # w_a can no longer extend the builder in place
+        w_c = space.add(w_a, space.newbytes("gh"))
+        assert w_c.builder is not w_a.builder
+        assert space.bytes_w(w_a) == "abcd"
+        assert space.bytes_w(w_b) == "abcdef"
+        assert space.bytes_w(w_c) == "abcdgh"
+        assert space.int_w(space.len(w_b)) == 6
+
+
+class AppTestStringObject(test_bytesobject.AppTestBytesObject):
+    spaceconfig = {"objspace.std.withstrbuf": True}
+
+    def test_basic(self):
+        import __pypy__
+        # cannot do "Hello, " + "World!" because cpy2.5 optimises this
+        # away on AST level
+        s = "Hello, ".__add__("World!")
+        assert type(s) is str
+        assert 'W_StringBufferObject' in __pypy__.internal_repr(s)
+
+    def test_add_twice(self):
+        x = "a".__add__("b")
+        y = x + "c"
+        c = x + "d"
+        assert y == "abc"
+        assert c == "abd"
+
+    def test_add(self):
+        import __pypy__
+        all = ""
+        for i in range(20):
+            all += str(i)
+        assert 'W_StringBufferObject' in __pypy__.internal_repr(all)
+        assert all == "012345678910111213141516171819"
+
+    def test_hash(self):
+        import __pypy__
+        def join(s): return s[:len(s) // 2] + s[len(s) // 2:]
+        t = 'a' * 101
+        s = join(t)
+        assert 'W_StringBufferObject' in __pypy__.internal_repr(s)
+        assert hash(s) == hash(t)
+
+    def test_len(self):
+        s = "a".__add__("b")
+        r = "c".__add__("d")
+        t = s + r
+        assert len(s) == 2
+        assert len(r) == 2
+        assert len(t) == 4
+
+    def test_compare(self):
+        s = "a".__add__("b")
+        assert s == "ab"
+        assert "ab" == s
+        assert s != "abc"
+        assert "abc" != s
+        assert s < "ac" and "ac" > s
+        assert s <= "ab" and "ab" >= s
+        assert s == "a".__add__("b")
+
+    def test_mixed(self):
+        s = "a".__add__("b")
+        assert s + u"c" == u"abc"
+        assert type(s + u"c") is unicode
+        assert s + bytearray("c") == bytearray("abc")
+        raises(TypeError, "s + 42")
+        raises(TypeError, "'a' + buffer('b')")
+        raises(TypeError, "s + buffer('b')")
+        assert "x".__add__(s) == "xab"
+        assert "%s-%s" % ("x", s) == "x-ab"
+        assert s.__add__("%s") % "c" == "abc"
+        assert "{0}".__add__("{1}").format(s, 1) == "ab1"
+        assert s.upper() == "AB"
+        assert {s: 1}["ab"] == 1
+        assert s in set(["ab"])
+        assert buffer(s)[:] == "ab"
+
+    def test_marshal(self):
+        import marshal
+        s = "a".__add__("b")
+        assert marshal.loads(marshal.dumps(s)) == "ab"
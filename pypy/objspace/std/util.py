@@ -1,3 +1,4 @@
+from rpython.rlib.rarithmetic import r_uint
 from rpython.rlib.rstring import InvalidBaseError
 
 from pypy.interpreter.error import OperationError, oefmt
@@ -15,6 +16,7 @@ IDTAG_SPECIAL = 11    # -1 - (-maxunicode-1): unichar
                       # 257: empty unicode
                       # 258: empty tuple
                       # 259: empty frozenset
+IDTAG_TUPLE   = 13    # non-empty specialised tuples of ints and floats
 
 CMP_OPS = dict(lt='<', le='<=', eq='==', ne='!=', gt='>', ge='>=')
 BINARY_BITWISE_OPS = {'and': '&', 'lshift': '<<', 'or': '|', 'rshift': '>>',
@@ -49,6 +51,45 @@ def get_positive_index(where, length):
     assert where >= 0
     return where
 
+def range_index(start, step, length, value):
+    """Return the index of 'value' in the arithmetic progression of
+    'length' items start, start + step, ..., or -1 if it is not in it."""
+    # unsigned arithmetic: the distance between two machine ints does not
+    # always fit in a signed machine int
+    if step > 0:
+        if value < start:
+            return -1
+        distance = r_uint(value) - r_uint(start)
+        ustep = r_uint(step)
+    else:
+        if value > start:
+            return -1
+        distance = r_uint(start) - r_uint(value)
+        ustep = r_uint(0) - r_uint(step)
+    if distance % ustep != 0:
+        return -1
+    index = distance // ustep
+    if index >= r_uint(length):
+        return -1
+    return int(index)
+
+def range_index_w(space, start, step, length, w_value):
+    """Like range_index() for any wrapped object, which may be equal to an
+    int without being one (True, 2.0, 2L...)."""
+    if space.is_w(space.type(w_value), space.w_int):
+        return range_index(start, step, length, space.int_w(w_value))
+    # an object equal to the int 'i' must have the same hash, which is 'i'
+    # itself except for hash(-1) == -2
+    h = space.hash_w(w_value)
+    index = range_index(start, step, length, h)
+    if index >= 0 and space.eq_w(space.newint(h), w_value):
+        return index
+    if h == -2:
+        index = range_index(start, step, length, -1)
+        if index >= 0 and space.eq_w(space.newint(-1), w_value):
+            return index
+    return -1
+
 
 def wrap_parsestringerror(space, e, w_source):
     if isinstance(e, InvalidBaseError):
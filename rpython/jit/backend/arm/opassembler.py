@@ -246,6 +246,12 @@ class ResOpAssembler(BaseAssembler):
     emit_op_guard_no_overflow = emit_op_guard_true
     emit_op_guard_overflow    = emit_op_guard_false
 
+    def emit_op_guard_always_fails(self, op, arglocs, regalloc, fcond):
+        # a register is always equal to itself
+        self.mc.CMP_rr(r.ip.value, r.ip.value)
+        self.guard_success_cc = c.NE
+        return self._emit_guard(op, arglocs)
+
     def emit_op_guard_class(self, op, arglocs, regalloc, fcond):
         self._cmp_guard_class(op, arglocs, regalloc, fcond)
         self.guard_success_cc = c.EQ
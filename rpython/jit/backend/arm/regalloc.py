@@ -685,6 +685,7 @@ class Regalloc(BaseRegalloc):
     prepare_op_guard_overflow = prepare_op_guard_no_overflow
     prepare_op_guard_not_invalidated = prepare_op_guard_no_overflow
     prepare_op_guard_not_forced = prepare_op_guard_no_overflow
+    prepare_op_guard_always_fails = prepare_op_guard_no_overflow
 
     def prepare_op_guard_exception(self, op, fcond):
         boxes = op.getarglist()
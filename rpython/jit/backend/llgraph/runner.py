@@ -25,6 +25,7 @@ from rpython.rlib.objectmodel import Symbolic, compute_hash
 class LLAsmInfo(object):
     def __init__(self, lltrace):
         self.ops_offset = None
+        self.asmlen = 0
         self.lltrace = lltrace
 
 class LLTrace(object):
@@ -334,6 +335,7 @@ class LLGraphCPU(model.AbstractCPU):
     vector_ext.setup_once = lambda asm: asm
     load_supported_factors = (1,2,4,8)
     assembler = None
+    guard_switch_dispatches = 0     # for tests
 
     def __init__(self, rtyper, stats=None, *ignored_args, **kwds):
         model.AbstractCPU.__init__(self)
@@ -367,6 +369,17 @@ class LLGraphCPU(model.AbstractCPU):
         self._record_labels(lltrace)
         return LLAsmInfo(lltrace)
 
+    def update_guard_switch(self, faildescr, opnum, index, values, descrs,
+                            inputargs, original_loop_token):
+        cases = []
+        for i in range(len(values)):
+            key = values[i]
+            if opnum == rop.GUARD_CLASS:
+                key = llmemory.cast_adr_to_ptr(llmemory.cast_int_to_adr(key),
+                                               rclass.CLASSTYPE)
+            cases.append((key, descrs[i]))
+        faildescr._llgraph_switch = (opnum, index, cases)
+
     def _record_labels(self, lltrace):
         for i, op in enumerate(lltrace.operations):
             if op.getopnum() == rop.LABEL:
@@ -1187,14 +1200,27 @@ class LLFrame(object):
                 assert (descr._llgraph_bridge.operations[0].opnum in
                         (rop.SAVE_EXC_CLASS, rop.GUARD_EXCEPTION,
                          rop.GUARD_NO_EXCEPTION))
-            target = (descr._llgraph_bridge, -1)
             values = [value for value in values if value is not None]
+            if hasattr(descr, '_llgraph_switch'):
+                descr = self._dispatch_guard_switch(descr, values)
+            target = (descr._llgraph_bridge, -1)
             raise Jump(target, values)
         else:
             raise ExecutionFinished(LLDeadFrame(descr, values,
                                                 self.last_exception,
                                                 saved_data, extra_value))
 
+    def _dispatch_guard_switch(self, descr, values):
+        opnum, index, cases = descr._llgraph_switch
+        key = values[index]
+        if opnum == rop.GUARD_CLASS:
+            key = lltype.cast_opaque_ptr(rclass.OBJECTPTR, key).typeptr
+        for value, target_descr in cases:
+            if value == key:
+                self.cpu.guard_switch_dispatches += 1
+                return target_descr
+        return descr
+
     def execute_force_spill(self, _, arg):
         pass
 
@@ -1345,6 +1371,9 @@ class LLFrame(object):
         self.overflow_flag = ovf
         return z
 
+    def execute_guard_always_fails(self, descr):
+        self.fail_guard(descr)
+
     def execute_guard_no_overflow(self, descr):
         if self.overflow_flag:
             self.fail_guard(descr)
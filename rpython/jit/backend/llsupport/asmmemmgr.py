@@ -66,6 +66,25 @@ class AsmMemoryManager(object):
         else:
             return False    # too small to record
 
+    def seal(self, page_size=rmmap.PAGESIZE):
+        """Stop using the free parts of the pages that already contain
+        some code or data, so that nothing is written to these pages any
+        more (apart from patching the code already there).  Called before
+        fork() to keep these pages shared with the child processes.  Only
+        the whole pages contained in the free blocks remain free.
+        """
+        for start, stop in self.free_blocks.items():
+            self._del_free_block(start, stop)
+            new_start = (start + page_size - 1) & ~(page_size - 1)
+            new_stop = stop & ~(page_size - 1)
+            kept = new_stop - new_start
+            if kept >= self.min_fragment:
+                self._add_free_block(new_start, new_stop)
+            else:
+                kept = 0
+            # the rest is lost, count it as used
+            self.total_mallocs += r_uint(stop - start - kept)
+
     def _allocate_large_block(self, minsize):
         # Compute 'size' from 'minsize': it must be rounded up to
         # 'large_alloc_size'.  Additionally, we use the following line
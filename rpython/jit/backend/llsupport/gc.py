@@ -74,6 +74,8 @@ class GcLLDescription(GcCache):
         pass
     def can_use_nursery_malloc(self, size):
         return False
+    def should_pretenure(self, sizedescr):
+        return False
     def has_write_barrier_class(self):
         return None
     def get_nursery_free_addr(self):
@@ -492,6 +494,19 @@ class GcLLDescr_framework(GcLLDescription):
         self.generate_function('malloc_big_fixedsize', malloc_big_fixedsize,
                                [lltype.Signed] * 2)
 
+        # allocate a fixed-size object directly in the old generation,
+        # for the types for which should_pretenure() returns True.
+        # The GC fields are not cleared.
+        def malloc_fixedsize_old(size, tid):
+            if self.DEBUG:
+                self._random_usage_of_xmm_registers()
+            type_id = llop.extract_ushort(llgroup.HALFWORD, tid)
+            check_typeid(type_id)
+            return llop1.do_malloc_fixedsize_old(llmemory.GCREF,
+                                                 type_id, size)
+        self.generate_function('malloc_fixedsize_old', malloc_fixedsize_old,
+                               [lltype.Signed] * 2)
+
     def _bh_malloc(self, sizedescr):
         from rpython.memory.gctypelayout import check_typeid
         llop1 = self.llop1
@@ -554,6 +569,15 @@ class GcLLDescr_framework(GcLLDescription):
     def can_use_nursery_malloc(self, size):
         return size < self.max_size_of_young_obj
 
+    def should_pretenure(self, sizedescr):
+        """Ask the GC if the objects of this type usually survive their
+        first minor collection.  If so, NEW and NEW_WITH_VTABLE allocate
+        them directly in the old generation."""
+        if self.layoutbuilder is None:
+            return False
+        type_id = llop.extract_ushort(llgroup.HALFWORD, sizedescr.tid)
+        return self.llop1.gc_should_pretenure(lltype.Bool, type_id)
+
     def has_write_barrier_class(self):
         return WriteBarrierDescr
 
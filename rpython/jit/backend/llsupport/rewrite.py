@@ -478,7 +478,9 @@ class GcRewriterAssembler(object):
     def handle_new_fixedsize(self, descr, op):
         assert isinstance(descr, SizeDescr)
         size = descr.size
-        if self.gen_malloc_nursery(size, op):
+        if self.gc_ll_descr.should_pretenure(descr):
+            self.gen_malloc_fixedsize_old(size, descr.tid, op)
+        elif self.gen_malloc_nursery(size, op):
             self.gen_initialize_tid(op, descr.tid)
         else:
             self.gen_malloc_fixedsize(size, descr.tid, op)
@@ -736,6 +738,19 @@ class GcRewriterAssembler(object):
         # (this is always true because it's a fixed-size object)
         self.remember_write_barrier(v_result)
 
+    def gen_malloc_fixedsize_old(self, size, typeid, v_result):
+        """Generate a CALL_R(malloc_fixedsize_old_fn, ...), for the types
+        that the GC asks to allocate directly in the old generation.
+        """
+        assert (size & (WORD-1)) == 0, "size not aligned?"
+        addr = self.gc_ll_descr.get_malloc_fn_addr('malloc_fixedsize_old')
+        args = [ConstInt(addr), ConstInt(size), ConstInt(typeid)]
+        descr = self.gc_ll_descr.malloc_fixedsize_old_descr
+        self._gen_call_malloc_gc(args, v_result, descr)
+        # don't call remember_write_barrier(): 'v_result' is an old object,
+        # so the following setfields of GC pointers still need a write
+        # barrier
+
     def gen_boehm_malloc_array(self, arraydescr, v_num_elem, v_result):
         """Generate a CALL_R(malloc_array_fn, ...) for Boehm."""
         addr = self.gc_ll_descr.get_malloc_fn_addr('malloc_array')
@@ -92,6 +92,18 @@ def test_malloc_with_fragment():
             assert memmgr.free_blocks_end == {}
             assert memmgr.blocks_by_size == [[], [], [], [], []]
 
+def test_seal():
+    memmgr = AsmMemoryManager(min_fragment=8,
+                              num_indices=5)
+    memmgr._add_free_block(10, 40)
+    memmgr._add_free_block(48, 60)
+    memmgr._add_free_block(70, 75)
+    memmgr.seal(page_size=16)
+    assert memmgr.free_blocks == {16: 32}
+    assert memmgr.free_blocks_end == {32: 16}
+    assert memmgr.blocks_by_size == [[], [], [], [16], []]
+    assert memmgr.total_mallocs == 14 + 12 + 5
+
 
 class TestAsmMemoryManager:
 
@@ -72,6 +72,17 @@ class FakeLLOp(object):
 
     do_malloc_fixedsize_clear = do_malloc_fixedsize
 
+    def do_malloc_fixedsize_old(self, RESTYPE, type_id, size):
+        p, tid = self._malloc(type_id, size)
+        p = llmemory.cast_adr_to_ptr(p, RESTYPE)
+        self.record.append(("fixedsize_old", repr(size), tid, p))
+        return p
+
+    pretenured = ()
+
+    def gc_should_pretenure(self, RESTYPE, type_id):
+        return llop.combine_ushort(lltype.Signed, type_id, 0) in self.pretenured
+
     def do_malloc_varsize(self, RESTYPE, type_id, length, size,
                                 itemsize, offset_to_length):
         p, tid = self._malloc(type_id, size + itemsize * length)
@@ -149,6 +160,17 @@ class TestFramework(object):
         assert self.llop1.record == [("fixedsize", repr(sizedescr.size),
                                       sizedescr.tid, p)]
 
+    def test_malloc_fixedsize_old(self):
+        S = lltype.GcStruct('S', ('x', lltype.Signed))
+        sizedescr = descr.get_size_descr(self.gc_ll_descr, S)
+        assert not self.gc_ll_descr.should_pretenure(sizedescr)
+        self.llop1.pretenured = (sizedescr.tid,)
+        assert self.gc_ll_descr.should_pretenure(sizedescr)
+        p = self.gc_ll_descr.malloc_fixedsize_old(sizedescr.size,
+                                                  sizedescr.tid)
+        assert self.llop1.record == [("fixedsize_old", repr(sizedescr.size),
+                                      sizedescr.tid, p)]
+
     def test_gc_malloc_array(self):
         A = lltype.GcArray(lltype.Signed)
         arraydescr = descr.get_array_descr(self.gc_ll_descr, A)
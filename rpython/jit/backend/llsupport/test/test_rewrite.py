@@ -646,6 +646,42 @@ class TestFramework(RewriteTests):
             jump()
         """)
 
+    def test_new_pretenured(self):
+        self.gc_ll_descr.should_pretenure = lambda descr: descr.tid == 5678
+        self.check_rewrite("""
+            [p1]
+            p0 = new(descr=tdescr)
+            p2 = new(descr=sdescr)
+            setfield_gc(p0, p1, descr=tzdescr)
+            jump()
+        """, """
+            [p1]
+            p0 = call_r(ConstClass(malloc_fixedsize_old), %(tdescr.size)d, \
+                                5678, descr=malloc_fixedsize_old_descr)
+            check_memory_error(p0)
+            gc_store(p0, %(tzdescr.offset)s, 0, %(tzdescr.field_size)s)
+            p2 = call_malloc_nursery(%(sdescr.size)d)
+            gc_store(p2, 0,  1234, %(tiddescr.field_size)s)
+            cond_call_gc_wb(p0, descr=wbdescr)
+            gc_store(p0, %(tzdescr.offset)s, p1, %(tzdescr.field_size)s)
+            jump()
+        """)
+
+    def test_new_with_vtable_pretenured(self):
+        self.gc_ll_descr.should_pretenure = lambda descr: True
+        self.check_rewrite("""
+            []
+            p0 = new_with_vtable(descr=o_descr)
+            jump()
+        """, """
+            [p1]
+            p0 = call_r(ConstClass(malloc_fixedsize_old), 104, 9315, \
+                                descr=malloc_fixedsize_old_descr)
+            check_memory_error(p0)
+            gc_store(p0, 0,  0, %(vtable_descr.field_size)s)
+            jump()
+        """)
+
     def test_rewrite_assembler_newstr_newunicode(self):
         # note: strdescr.basesize already contains the extra final character,
         # so that's why newstr(14) is rounded up to 'basesize+15' and not
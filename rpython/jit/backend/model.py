@@ -148,6 +148,23 @@ class AbstractCPU(object):
         old one that already has a bridge attached to it."""
         raise NotImplementedError
 
+    def update_guard_switch(self, faildescr, opnum, index, values, descrs,
+                            inputargs, original_loop_token):
+        """Optional.  The bridge attached to 'faildescr' and the bridges
+        attached to descrs[1:] form a chain: each of them starts with a
+        GUARD_CLASS or GUARD_VALUE ('opnum') on the input argument number
+        'index', whose failure enters the next bridge with the same
+        input arguments.  From now on, when 'faildescr' fails and this
+        argument has the class or integer value values[i], the backend may
+        jump directly to the bridge attached to descrs[i].  Called again
+        with more values when the chain has grown."""
+        pass
+
+    def seal_machine_code(self):
+        """Optional.  Don't write new machine code or data into the pages
+        that already contain some; see gc.freeze() in PyPy."""
+        pass
+
     def free_loop_and_bridges(self, compiled_loop_token):
         """This method is called to free resources (machine code,
         references to resume guards, etc.) allocated by the compilation
@@ -284,12 +301,14 @@ class AbstractCPU(object):
 class CompiledLoopToken(object):
     asmmemmgr_blocks = None
     asmmemmgr_gcreftracers = None
+    bridge_jumps = None     # x86: {faildescr: (adr_jump_offset, bridge addr)}
 
     def __init__(self, cpu, number):
         cpu.tracker.total_compiled_loops += 1
         self.cpu = cpu
         self.number = number
         self.bridges_count = 0
+        self.guard_failures = 0     # see AbstractResumeGuardDescr.handle_fail
         self.invalidate_positions = []
         # a list of weakrefs to looptokens that has been redirected to
         # this one
@@ -653,6 +653,7 @@ class Regalloc(BaseRegalloc, VectorRegalloc):
     prepare_guard_no_overflow = prepare_guard_no_exception
     prepare_guard_overflow = prepare_guard_no_exception
     prepare_guard_not_forced = prepare_guard_no_exception
+    prepare_guard_always_fails = prepare_guard_no_exception
 
     def prepare_guard_value(self, op):
         l0 = self.ensure_reg(op.getarg(0))
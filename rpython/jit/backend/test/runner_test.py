@@ -278,6 +278,36 @@ class BaseBackendTest(Runner):
         assert self.cpu.tracker.total_compiled_bridges == 1
         return looptoken
 
+    def test_guard_always_fails(self):
+        faildescr1 = BasicFailDescr(1)
+        faildescr2 = BasicFinalDescr(2)
+        faildescr3 = BasicFinalDescr(3)
+        loop = parse("""
+        [i0]
+        i1 = int_add(i0, 1)
+        guard_always_fails(descr=faildescr1) [i1]
+        finish(i1, descr=faildescr2)
+        """, namespace={'faildescr1': faildescr1,
+                        'faildescr2': faildescr2})
+        looptoken = JitCellToken()
+        self.cpu.compile_loop(loop.inputargs, loop.operations, looptoken)
+        deadframe = self.cpu.execute_token(looptoken, 2)
+        fail = self.cpu.get_latest_descr(deadframe)
+        assert fail.identifier == 1
+        assert self.cpu.get_int_value(deadframe, 0) == 3
+        # the guard can get a bridge like any other guard
+        bridge = parse("""
+        [i1]
+        i2 = int_add(i1, 10)
+        finish(i2, descr=faildescr3)
+        """, namespace={'faildescr3': faildescr3})
+        self.cpu.compile_bridge(faildescr1, bridge.inputargs,
+                                bridge.operations, looptoken)
+        deadframe = self.cpu.execute_token(looptoken, 2)
+        fail = self.cpu.get_latest_descr(deadframe)
+        assert fail.identifier == 3
+        assert self.cpu.get_int_value(deadframe, 0) == 13
+
     def test_compile_bridge_with_holes(self):
         faildescr1 = BasicFailDescr(1)
         faildescr2 = BasicFailDescr(2)
@@ -4709,6 +4739,81 @@ class LLtypeBackendTest(BaseBackendTest):
         fail = self.cpu.get_latest_descr(deadframe)
         assert fail.identifier == 99
 
+    def test_guard_switch(self):
+        # a chain of bridges, each starting with a guard_value on i0 that
+        # fails into the next bridge, see compile.record_guard_switch()
+        keys = [7, -3, 42, 5, 1000, 2]
+        root = BasicFailDescr(100)
+        loop = parse("""
+        [i0, i1]
+        i2 = int_add(i1, 1)
+        guard_value(i0, 0, descr=root) [i0, i2]
+        finish(i2, descr=fin)
+        """, namespace={'root': root, 'fin': BasicFinalDescr(0)})
+        looptoken = JitCellToken()
+        self.cpu.compile_loop(loop.inputargs, loop.operations, looptoken)
+        descrs = [root]
+        for k in range(1, len(keys) + 1):
+            bridge = parse("""
+            [i0, i1]
+            guard_value(i0, %d, descr=faildescr) [i0, i1]
+            i2 = int_add(i1, %d)
+            finish(i2, descr=fin)
+            """ % (keys[k - 1], 100 * k),
+                namespace={'faildescr': BasicFailDescr(k),
+                           'fin': BasicFinalDescr(k)})
+            self.cpu.compile_bridge(descrs[-1], bridge.inputargs,
+                                    bridge.operations, looptoken)
+            descrs.append(bridge.operations[0].getdescr())
+        self.cpu.update_guard_switch(root, rop.GUARD_VALUE, 0, keys,
+                                     descrs[:-1], bridge.inputargs,
+                                     looptoken)
+        dispatches = getattr(self.cpu, 'guard_switch_dispatches', 0)
+        for k in range(1, len(keys) + 1):
+            deadframe = self.cpu.execute_token(looptoken, keys[k - 1], 10)
+            fail = self.cpu.get_latest_descr(deadframe)
+            assert fail.identifier == k
+            assert self.cpu.get_int_value(deadframe, 0) == 11 + 100 * k
+        if hasattr(self.cpu, 'guard_switch_dispatches'):
+            assert (self.cpu.guard_switch_dispatches ==
+                    dispatches + len(keys))
+        deadframe = self.cpu.execute_token(looptoken, 0, 10)
+        fail = self.cpu.get_latest_descr(deadframe)
+        assert fail.identifier == 0
+        assert self.cpu.get_int_value(deadframe, 0) == 11
+        # not in the switch: through the whole chain of guards
+        deadframe = self.cpu.execute_token(looptoken, 6, 10)
+        fail = self.cpu.get_latest_descr(deadframe)
+        assert fail.identifier == len(keys)
+        assert self.cpu.get_int_value(deadframe, 0) == 6
+        assert self.cpu.get_int_value(deadframe, 1) == 11
+
+    def test_guard_switch_class(self):
+        t_box, T_box, _ = self.alloc_instance(self.T)
+        u_box, U_box, _ = self.alloc_instance(self.U)
+        root = BasicFailDescr(100)
+        p0 = InputArgRef()
+        operations = [
+            ResOperation(rop.GUARD_CLASS, [p0, T_box], descr=root),
+            ResOperation(rop.FINISH, [], descr=BasicFinalDescr(0))]
+        operations[0].setfailargs([p0])
+        looptoken = JitCellToken()
+        self.cpu.compile_loop([p0], operations, looptoken)
+        p1 = InputArgRef()
+        faildescr = BasicFailDescr(1)
+        operations = [
+            ResOperation(rop.GUARD_CLASS, [p1, U_box], descr=faildescr),
+            ResOperation(rop.FINISH, [], descr=BasicFinalDescr(1))]
+        operations[0].setfailargs([p1])
+        self.cpu.compile_bridge(root, [p1], operations, looptoken)
+        self.cpu.update_guard_switch(root, rop.GUARD_CLASS, 0,
+                                     [U_box.getint()], [root], [p1],
+                                     looptoken)
+        deadframe = self.cpu.execute_token(looptoken, u_box.getref_base())
+        assert self.cpu.get_latest_descr(deadframe).identifier == 1
+        deadframe = self.cpu.execute_token(looptoken, t_box.getref_base())
+        assert self.cpu.get_latest_descr(deadframe).identifier == 0
+
     def test_raw_load_int(self):
         from rpython.rlib import rawstorage
         for T in [rffi.UCHAR, rffi.SIGNEDCHAR,
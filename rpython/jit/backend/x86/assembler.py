@@ -625,7 +625,13 @@ class Assembler386(BaseAssembler, VectorAssemblerMixin):
         debug_print("            end: 0x%x" % r_uint(rawstart + fullsize))
         debug_stop("jit-backend-addr")
         self.patch_pending_failure_recoveries(rawstart)
-        # patch the jump from original guard
+        # patch the jump from original guard, remembering where it is in
+        # case update_guard_switch() needs to redirect it again
+        clt = self.current_clt
+        if clt.bridge_jumps is None:
+            clt.bridge_jumps = {}
+        clt.bridge_jumps[faildescr] = (faildescr.adr_jump_offset,
+                                       rawstart + startpos)
         self.patch_jump_for_descr(faildescr, rawstart + startpos)
         ops_offset = self.mc.ops_offset
         frame_depth = max(self.current_clt.frame_info.jfi_frame_depth,
@@ -902,6 +908,10 @@ class Assembler386(BaseAssembler, VectorAssemblerMixin):
     def patch_jump_for_descr(self, faildescr, adr_new_target):
         adr_jump_offset = faildescr.adr_jump_offset
         assert adr_jump_offset != 0
+        self._patch_guard_jump(adr_jump_offset, adr_new_target)
+        faildescr.adr_jump_offset = 0    # means "patched"
+
+    def _patch_guard_jump(self, adr_jump_offset, adr_new_target):
         offset = adr_new_target - (adr_jump_offset + 4)
         # If the new target fits within a rel32 of the jump, just patch
         # that. Otherwise, leave the original rel32 to the recovery stub in
@@ -922,7 +932,126 @@ class Assembler386(BaseAssembler, VectorAssemblerMixin):
             p = rffi.cast(rffi.INTP, adr_jump_offset)
             adr_target = adr_jump_offset + 4 + rffi.cast(lltype.Signed, p[0])
             mc.copy_to_raw_memory(adr_target)
-        faildescr.adr_jump_offset = 0    # means "patched"
+
+    def update_guard_switch(self, faildescr, opnum, index, values, descrs,
+                            inputargs, looptoken):
+        """Write a piece of code that loads the class or the value checked
+        at the start of the bridges of 'descrs', finds it with a binary
+        search, and jumps to the right bridge after moving the values from
+        the locations of 'faildescr' to those of the guard of the bridge.
+        Then redirect the jump of 'faildescr' to this code.  The code
+        written by a previous call is not freed before the loop, as another
+        thread may still be running it; compile.py limits the number of
+        calls."""
+        if IS_X86_32:
+            return      # no scratch register to hold the key
+        clt = looptoken.compiled_loop_token
+        if clt is None or clt.bridge_jumps is None:
+            return
+        if faildescr not in clt.bridge_jumps:
+            return
+        adr_jump_offset, adr_default = clt.bridge_jumps[faildescr]
+        keys = []
+        cases = []
+        for i in range(len(values)):
+            key = values[i]
+            if opnum == rop.GUARD_CLASS and self.cpu.vtable_offset is None:
+                key = (self.cpu.gc_ll_descr
+                        .get_typeid_from_classptr_if_gcremovetypeptr(key))
+            descr = descrs[i]
+            if (not rx86.fits_in_32bits(key) or
+                    descr not in clt.bridge_jumps or
+                    descr.rd_vector_info is not None):
+                return
+            # keep 'keys' sorted, for the binary search
+            j = len(keys)
+            keys.append(key)
+            cases.append(descr)
+            while j > 0 and keys[j - 1] > key:
+                keys[j] = keys[j - 1]
+                cases[j] = cases[j - 1]
+                j -= 1
+            keys[j] = key
+            cases[j] = descr
+        #
+        self.mc = codebuf.MachineCodeBlockWrapper()
+        self.mc.force_frame_size(DEFAULT_FRAME_BYTES)
+        src_locs = self.rebuild_faillocs_from_descr(faildescr, inputargs)
+        self.mc.MOV(X86_64_SCRATCH_REG, src_locs[index])
+        if opnum == rop.GUARD_CLASS:
+            offset = self.cpu.vtable_offset
+            if offset is not None:
+                self.mc.MOV_rm(X86_64_SCRATCH_REG.value,
+                               (X86_64_SCRATCH_REG.value, offset))
+            else:
+                # the typeid is in the low half of the GC header; see
+                # _cmp_guard_gc_type()
+                self.mc.MOV32_rm(X86_64_SCRATCH_REG.value,
+                                 (X86_64_SCRATCH_REG.value, 0))
+        jumps_to_case = [0] * len(keys)   # position of the Jcc to patch
+        self._emit_switch_search(keys, 0, len(keys), jumps_to_case,
+                                 adr_default)
+        for i in range(len(keys)):
+            descr = cases[i]
+            case_pos = self.mc.get_relative_pos()
+            jcc_pos = jumps_to_case[i]
+            self.mc.overwrite32(jcc_pos - 4, case_pos - jcc_pos)
+            adr_bridge = clt.bridge_jumps[descr][1]
+            if descr is not faildescr:
+                dst_locs = self.rebuild_faillocs_from_descr(descr, inputargs)
+                self._remap_switch_case(src_locs, dst_locs)
+            self.mc.JMP(imm(adr_bridge))
+        rawstart = self.mc.materialize(self.cpu,
+                                       self.get_asmmemmgr_blocks(looptoken),
+                                       self.cpu.gc_ll_descr.gcrootmap)
+        self.mc = None
+        debug_start("jit-backend-addr")
+        debug_print("guard switch of %d cases for Guard 0x%x at 0x%x" %
+                    (len(keys), r_uint(compute_unique_id(faildescr)),
+                     r_uint(rawstart)))
+        debug_stop("jit-backend-addr")
+        self._patch_guard_jump(adr_jump_offset, rawstart)
+
+    def _emit_switch_search(self, keys, start, stop, jumps_to_case,
+                            adr_default):
+        # the key is in the scratch register
+        mc = self.mc
+        if stop - start <= 3:
+            for i in range(start, stop):
+                mc.CMP_ri(X86_64_SCRATCH_REG.value, keys[i])
+                mc.J_il(rx86.Conditions['E'], 0xfffff)    # patched later
+                jumps_to_case[i] = mc.get_relative_pos(break_basic_block=False)
+            mc.JMP(imm(adr_default))
+        else:
+            middle = (start + stop) >> 1
+            mc.CMP_ri(X86_64_SCRATCH_REG.value, keys[middle])
+            mc.J_il(rx86.Conditions['L'], 0xfffff)        # patched below
+            jl_location = mc.get_relative_pos(break_basic_block=False)
+            self._emit_switch_search(keys, middle, stop, jumps_to_case,
+                                     adr_default)
+            offset = mc.get_relative_pos() - jl_location
+            mc.overwrite32(jl_location - 4, offset)
+            self._emit_switch_search(keys, start, middle, jumps_to_case,
+                                     adr_default)
+
+    def _remap_switch_case(self, src_locs, dst_locs):
+        src_locations1 = []
+        dst_locations1 = []
+        src_locations2 = []
+        dst_locations2 = []
+        assert len(src_locs) == len(dst_locs)
+        for i in range(len(src_locs)):
+            src_loc = src_locs[i]
+            if not src_loc.is_float():
+                src_locations1.append(src_loc)
+                dst_locations1.append(dst_locs[i])
+            else:
+                src_locations2.append(src_loc)
+                dst_locations2.append(dst_locs[i])
+        remap_frame_layout_mixed(self, src_locations1, dst_locations1,
+                                 X86_64_SCRATCH_REG,
+                                 src_locations2, dst_locations2,
+                                 X86_64_XMM_SCRATCH_REG)
 
     def fixup_target_tokens(self, rawstart):
         for targettoken in self.target_tokens_currently_compiling:
@@ -1726,6 +1855,16 @@ class Assembler386(BaseAssembler, VectorAssemblerMixin):
         self.guard_success_cc = rx86.Conditions['Z']
         self.implement_guard(guard_token)
 
+    def genop_guard_guard_always_fails(self, guard_op, guard_token,
+                                       locs, ign):
+        # an unconditional jump, patched later like the conditional ones
+        self.mc.JMP_l(0)
+        pos = self.mc.get_relative_pos(break_basic_block=False)
+        guard_token.pos_jump_offset = pos - 4
+        saved = self.mc.get_scratch_register_known_value()
+        guard_token.known_scratch_value = saved
+        self.pending_guard_tokens.append(guard_token)
+
     def genop_guard_guard_not_invalidated(self, guard_op, guard_token,
                                           locs, ign):
         pos = self.mc.get_relative_pos(break_basic_block=False)
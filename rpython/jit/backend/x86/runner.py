@@ -107,6 +107,12 @@ class AbstractX86CPU(AbstractLLCPU):
     def redirect_call_assembler(self, oldlooptoken, newlooptoken):
         self.assembler.redirect_call_assembler(oldlooptoken, newlooptoken)
 
+    def update_guard_switch(self, faildescr, opnum, index, values, descrs,
+                            inputargs, original_loop_token):
+        self.assembler.update_guard_switch(faildescr, opnum, index, values,
+                                           descrs, inputargs,
+                                           original_loop_token)
+
     def invalidate_loop(self, looptoken):
         from rpython.jit.backend.x86 import codebuf
 
@@ -671,6 +671,12 @@ class GuardOpAssembler(object):
         self.guard_success_cc = c.NO
         self._emit_guard(op, arglocs)
 
+    def emit_guard_always_fails(self, op, arglocs, regalloc):
+        # a register is always equal to itself
+        self.mc.cmp_op(r.SCRATCH, r.SCRATCH)
+        self.guard_success_cc = c.NE
+        self._emit_guard(op, arglocs)
+
     def emit_guard_value(self, op, arglocs, regalloc):
         l0 = arglocs[0]
         l1 = arglocs[1]
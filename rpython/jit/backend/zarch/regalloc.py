@@ -1227,6 +1227,7 @@ class Regalloc(BaseRegalloc, vector_ext.VectorRegalloc):
     prepare_guard_no_overflow = prepare_guard_no_exception
     prepare_guard_overflow = prepare_guard_no_exception
     prepare_guard_not_forced = prepare_guard_no_exception
+    prepare_guard_always_fails = prepare_guard_no_exception
 
     def prepare_guard_not_forced_2(self, op):
         self.rm.before_call(op.getfailargs(), save_all_regs=True)
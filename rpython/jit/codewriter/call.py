@@ -7,7 +7,7 @@ from rpython.jit.codewriter import support
 from rpython.jit.codewriter.jitcode import JitCode
 from rpython.jit.codewriter.effectinfo import (VirtualizableAnalyzer,
     QuasiImmutAnalyzer, RandomEffectsAnalyzer, effectinfo_from_writeanalyze,
-    EffectInfo, CallInfoCollection)
+    EffectInfo, CallInfoCollection, MAX_NONESCAPING_ARGS)
 from rpython.rtyper.lltypesystem import lltype, llmemory
 from rpython.rtyper.lltypesystem.lltype import getfunctionptr
 from rpython.rlib import rposix
@@ -15,6 +15,8 @@ from rpython.translator.backendopt.canraise import RaiseAnalyzer
 from rpython.translator.backendopt.writeanalyze import ReadWriteAnalyzer
 from rpython.translator.backendopt.graphanalyze import DependencyTracker
 from rpython.translator.backendopt.collectanalyze import CollectAnalyzer
+from rpython.translator.backendopt.escape import AbstractDataFlowInterpreter
+from rpython.translator.simplify import get_graph
 
 
 class CallControl(object):
@@ -39,6 +41,7 @@ class CallControl(object):
             self.quasiimmut_analyzer = QuasiImmutAnalyzer(translator)
             self.randomeffects_analyzer = RandomEffectsAnalyzer(translator)
             self.collect_analyzer = CollectAnalyzer(translator)
+            self.escape_analyzer = AbstractDataFlowInterpreter(translator)
             self.seen_rw = DependencyTracker(self.readwrite_analyzer)
             self.seen_gc = DependencyTracker(self.collect_analyzer)
         #
@@ -311,10 +314,15 @@ class CallControl(object):
                     "operation %r in %s: this calls an elidable function "
                     "but the function has no result" % (op, calling_graph))
         #
+        nonescaping_args = 0
+        if (extraeffect == EffectInfo.EF_CANNOT_RAISE or
+                extraeffect == EffectInfo.EF_CAN_RAISE):
+            nonescaping_args = self._get_nonescaping_args(op)
         effectinfo = effectinfo_from_writeanalyze(
             self.readwrite_analyzer.analyze(op, self.seen_rw), self.cpu,
             extraeffect, oopspecindex, can_invalidate, call_release_gil_target,
             extradescr, self.collect_analyzer.analyze(op, self.seen_gc),
+            nonescaping_args,
         )
         #
         assert effectinfo is not None
@@ -328,6 +336,48 @@ class CallControl(object):
         return self.cpu.calldescrof(FUNC, tuple(NON_VOID_ARGS), RESULT,
                                     effectinfo)
 
+    def _get_nonescaping_args(self, op):
+        """Returns a bitmask of the non-void GC arguments of 'op' that the
+        called function(s) neither store anywhere, nor return, nor raise.
+        The optimizer can pass a temporary copy of a virtual there and
+        keep the virtual afterwards.
+        """
+        if op.opname == 'direct_call':
+            graph = get_graph(op.args[0], self.rtyper.annotator.translator)
+            if graph is None:
+                return 0
+            graphs = [graph]
+            args = op.args[1:]
+        elif op.opname == 'indirect_call':
+            graphs = op.args[-1].value
+            if not graphs:
+                return 0
+            args = op.args[1:-1]
+        else:
+            return 0
+        adi = self.escape_analyzer
+        for graph in graphs:
+            adi.schedule_function(graph)
+        adi.complete()
+        result = 0
+        i = 0
+        for argnum, v in enumerate(args):
+            if v.concretetype is lltype.Void:
+                continue
+            if i >= MAX_NONESCAPING_ARGS:
+                break
+            if (isinstance(v.concretetype, lltype.Ptr) and
+                    v.concretetype.TO._gckind == 'gc'):
+                for graph in graphs:
+                    state = adi.functionargs[graph][argnum]
+                    if (state is None or state.does_escape() or
+                            state.does_return()):
+                        break
+                else:
+                    result |= 1 << i
+            i += 1
+        return result
+
     def _canraise(self, op):
         """Returns True, False, or "mem" to mean 'only MemoryError'."""
         if op.opname == 'pseudo_call_cannot_raise':
@@ -117,7 +117,8 @@ class EffectInfo(object):
                 can_invalidate=False,
                 call_release_gil_target=_NO_CALL_RELEASE_GIL_TARGET,
                 extradescrs=None,
-                can_collect=True):
+                can_collect=True,
+                nonescaping_args=0):
         readonly_descrs_fields = frozenset_or_none(readonly_descrs_fields)
         readonly_descrs_arrays = frozenset_or_none(readonly_descrs_arrays)
         readonly_descrs_interiorfields = frozenset_or_none(
@@ -135,7 +136,8 @@ class EffectInfo(object):
                extraeffect,
                oopspecindex,
                can_invalidate,
-               can_collect)
+               can_collect,
+               nonescaping_args)
         tgt_func, tgt_saveerr = call_release_gil_target
         if tgt_func:
             key += (object(),)    # don't care about caching in this case
@@ -187,6 +189,9 @@ class EffectInfo(object):
         result.extraeffect = extraeffect
         result.can_invalidate = can_invalidate
         result.can_collect = can_collect
+        # bit 'n' is set if the function neither stores nor returns its
+        # argument number 'n' (not counting the function itself)
+        result.nonescaping_args = nonescaping_args
         result.oopspecindex = oopspecindex
         result.extradescrs = extradescrs
         result.call_release_gil_target = call_release_gil_target
@@ -236,6 +241,16 @@ class EffectInfo(object):
     def check_can_collect(self):
         return self.can_collect
 
+    def check_arg_does_not_escape(self, argindex):
+        # 'argindex' is the index of the argument in the call operation,
+        # where argument 0 is the function
+        if (self.extraeffect != self.EF_CANNOT_RAISE and
+                self.extraeffect != self.EF_CAN_RAISE):
+            return False
+        if not 1 <= argindex <= MAX_NONESCAPING_ARGS:
+            return False
+        return bool(self.nonescaping_args & (1 << (argindex - 1)))
+
     def check_is_elidable(self):
         return (self.extraeffect == self.EF_ELIDABLE_CAN_RAISE or
                 self.extraeffect == self.EF_ELIDABLE_OR_MEMORYERROR or
@@ -258,6 +273,9 @@ class EffectInfo(object):
         return '<EffectInfo 0x%x: EF=%r%s>' % (id(self), self.extraeffect, more)
 
 
+# only the first arguments of a call are considered by the escape analysis
+MAX_NONESCAPING_ARGS = 30
+
 def frozenset_or_none(x):
     if x is None:
         return None
@@ -275,7 +293,8 @@ def effectinfo_from_writeanalyze(effects, cpu,
                                  call_release_gil_target=
                                      EffectInfo._NO_CALL_RELEASE_GIL_TARGET,
                                  extradescr=None,
-                                 can_collect=True):
+                                 can_collect=True,
+                                 nonescaping_args=0):
     from rpython.translator.backendopt.writeanalyze import top_set
     if effects is top_set or extraeffect == EffectInfo.EF_RANDOM_EFFECTS:
         readonly_descrs_fields = None
@@ -364,7 +383,8 @@ def effectinfo_from_writeanalyze(effects, cpu,
                       can_invalidate,
                       call_release_gil_target,
                       extradescr,
-                      can_collect)
+                      can_collect,
+                      nonescaping_args)
 
 def consider_struct(TYPE, fieldname):
     if fieldType(TYPE, fieldname) is lltype.Void:
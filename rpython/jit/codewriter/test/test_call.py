@@ -396,3 +396,45 @@ def test_can_or_cannot_collect():
         assert call_op.opname == 'direct_call'
         call_descr = cc.getcalldescr(call_op)
         assert call_descr.extrainfo.check_can_collect() == expected
+
+def test_nonescaping_args():
+    from rpython.jit.backend.llgraph.runner import LLGraphCPU
+    class A(object):
+        pass
+    keep = A()
+    def f1(a, b, n):
+        return a.x + b.x + n    # reads only
+    f1._dont_inline_ = True
+
+    def f2(a, b):
+        keep.a = b              # stores its second argument
+        return a.x
+    f2._dont_inline_ = True
+
+    def f3(a):
+        a.x += 1
+        return a                # returns its argument
+    f3._dont_inline_ = True
+
+    def f(n):
+        a = A()
+        a.x = n
+        b = A()
+        b.x = n + 1
+        return f1(a, b, n) + f2(a, b) + f3(a).x
+
+    rtyper = support.annotate(f, [1])
+    jitdriver_sd = FakeJitDriverSD(rtyper.annotator.translator.graphs[0])
+    cc = CallControl(LLGraphCPU(rtyper), jitdrivers_sd=[jitdriver_sd])
+    res = cc.find_all_graphs(FakePolicy())
+    [f_graph] = [x for x in res if x.func is f]
+    calls = [op for block, op in f_graph.iterblockops()
+                if op.opname == 'direct_call']
+    expected = {f1: 0b011, f2: 0b001, f3: 0b000}
+    for call_op in calls:
+        func = call_op.args[0].value._obj._callable
+        if func in expected:
+            effectinfo = cc.getcalldescr(call_op).extrainfo
+            assert effectinfo.nonescaping_args == expected[func]
+            del expected[func]
+    assert not expected
@@ -580,7 +580,10 @@ def send_loop_to_backend(greenkey, jitdriver_sd, metainterp_sd, loop, type,
                                       name=loopname)
     #
     if metainterp_sd.warmrunnerdesc is not None:    # for tests
-        metainterp_sd.warmrunnerdesc.memory_manager.keep_loop_alive(original_jitcell_token)
+        memmgr = metainterp_sd.warmrunnerdesc.memory_manager
+        memmgr.record_compiled(original_jitcell_token, operations,
+                               get_asmlen(asminfo))
+        memmgr.keep_loop_alive(original_jitcell_token)
 
 def send_bridge_to_backend(jitdriver_sd, metainterp_sd, faildescr, inputargs,
                            operations, original_loop_token, memo):
@@ -625,11 +628,100 @@ def send_bridge_to_backend(jitdriver_sd, metainterp_sd, faildescr, inputargs,
     metainterp_sd.logger_ops.log_bridge(inputargs, operations, None, faildescr,
                                         ops_offset, memo=memo)
     #
+    if metainterp_sd.warmrunnerdesc is not None:    # for tests
+        metainterp_sd.warmrunnerdesc.memory_manager.record_compiled(
+            original_loop_token, operations, get_asmlen(asminfo))
     #if metainterp_sd.warmrunnerdesc is not None:    # for tests
     #    metainterp_sd.warmrunnerdesc.memory_manager.keep_loop_alive(
     #        original_loop_token)
+    if isinstance(faildescr, AbstractResumeGuardDescr):
+        record_guard_switch(metainterp_sd, faildescr, inputargs, operations,
+                            original_loop_token)
     return asminfo
 
+# ____________________________________________________________
+#
+# A call site that sees many classes (or a promoted integer that takes many
+# values) produces a chain of bridges: the bridge attached to a guard starts
+# with a GUARD_CLASS or GUARD_VALUE on one of its input arguments, the
+# bridge attached to that guard starts with the same check for another
+# class, and so on.  Reaching the n-th bridge means failing n guards in a
+# row.  Once a chain is GUARD_SWITCH_THRESHOLD bridges long, we ask the
+# backend to dispatch directly from the first guard of the chain to the
+# right bridge, with cpu.update_guard_switch().  The backend writes a new
+# dispatcher every time, and the old ones can only be freed with the loop
+# because another thread may still be running them.  So we only ask again
+# when the number of cases has doubled, and not beyond
+# GUARD_SWITCH_MAX_CASES: the values after that go through the chain.
+
+GUARD_SWITCH_THRESHOLD = 4
+GUARD_SWITCH_MAX_CASES = 64
+
+class GuardSwitch(object):
+    def __init__(self, root, opnum, index):
+        self.root = root       # the guard whose failure starts the chain
+        self.opnum = opnum     # GUARD_CLASS or GUARD_VALUE
+        self.index = index     # which input argument is checked
+        self.values = []       # the classes or values checked so far...
+        self.descrs = []       # ...and the guard to whose bridge they lead
+        self.next_update = GUARD_SWITCH_THRESHOLD
+
+def record_guard_switch(metainterp_sd, faildescr, inputargs, operations,
+                        jitcell_token):
+    if not operations:
+        return
+    op = operations[0]
+    opnum = op.getopnum()
+    if opnum == rop.GUARD_VALUE:
+        if op.getarg(0).type != history.INT:
+            return    # GC pointers may move
+    elif opnum != rop.GUARD_CLASS:
+        return
+    const = op.getarg(1)
+    if not isinstance(const, ConstInt):
+        return
+    # the guard must get the input arguments of the bridge unchanged, so
+    # that the bridge attached to it can be entered with the same values
+    failargs = op.getfailargs()
+    if len(failargs) != len(inputargs):
+        return
+    index = -1
+    for i in range(len(inputargs)):
+        if failargs[i] is not inputargs[i]:
+            return
+        if inputargs[i] is op.getarg(0):
+            index = i
+    if index < 0:
+        return
+    guard_descr = op.getdescr()
+    assert isinstance(guard_descr, AbstractResumeGuardDescr)
+    #
+    switches = jitcell_token.guard_switches
+    if switches is None:
+        switches = jitcell_token.guard_switches = {}
+    switch = switches.get(faildescr, None)
+    if switch is not None:
+        del switches[faildescr]
+        if switch.opnum != opnum or switch.index != index:
+            switch = None
+    if switch is None:
+        switch = GuardSwitch(faildescr, opnum, index)
+    switch.values.append(const.getint())
+    switch.descrs.append(faildescr)
+    switches[guard_descr] = switch     # the chain may continue from there
+    if (len(switch.values) >= switch.next_update and
+            len(switch.values) <= GUARD_SWITCH_MAX_CASES):
+        switch.next_update = len(switch.values) * 2
+        metainterp_sd.cpu.update_guard_switch(switch.root, switch.opnum,
+                                              switch.index, switch.values,
+                                              switch.descrs, inputargs,
+                                              jitcell_token)
+
+def get_asmlen(asminfo):
+    if asminfo is None:     # some tests
+        return 0
+    return asminfo.asmlen
+
 # ____________________________________________________________
 
 class _DoneWithThisFrameDescr(AbstractFailDescr):
@@ -727,21 +819,35 @@ class AbstractResumeGuardDescr(ResumeDescr):
     TY_FLOAT        = 0x06
 
     def handle_fail(self, deadframe, metainterp_sd, jitdriver_sd):
-        if (self.must_compile(deadframe, metainterp_sd, jitdriver_sd)
-                and not rstack.stack_almost_full()):
-            self.start_compiling()
-            try:
-                self._trace_and_compile_from_bridge(deadframe, metainterp_sd,
-                                                    jitdriver_sd)
-            finally:
-                self.done_compiling()
+        clt = self.rd_loop_token
+        if clt is not None:
+            clt.guard_failures += 1
+        budget = metainterp_sd.warmrunnerdesc.compile_budget
+        if budget.is_pending(self) and not self.status & self.ST_BUSY_FLAG:
+            must_compile = True     # deferred earlier, no need to warm up
         else:
-            from rpython.jit.metainterp.blackhole import resume_in_blackhole
-            if isinstance(self, ResumeGuardCopiedDescr):
-                resume_in_blackhole(metainterp_sd, jitdriver_sd, self.prev, deadframe)    
+            must_compile = self.must_compile(deadframe, metainterp_sd,
+                                             jitdriver_sd)
+        if must_compile and not rstack.stack_almost_full():
+            if not budget.may_compile():
+                # over the compile budget: compile it after the refill
+                budget.defer(self)
             else:
-                assert isinstance(self, ResumeGuardDescr)
-                resume_in_blackhole(metainterp_sd, jitdriver_sd, self, deadframe)
+                self.start_compiling()
+                starttime = budget.start_compiling()
+                try:
+                    self._trace_and_compile_from_bridge(deadframe,
+                                                        metainterp_sd,
+                                                        jitdriver_sd)
+                finally:
+                    budget.done_compiling(self, starttime)
+                    self.done_compiling()
+        from rpython.jit.metainterp.blackhole import resume_in_blackhole
+        if isinstance(self, ResumeGuardCopiedDescr):
+            resume_in_blackhole(metainterp_sd, jitdriver_sd, self.prev, deadframe)    
+        else:
+            assert isinstance(self, ResumeGuardDescr)
+            resume_in_blackhole(metainterp_sd, jitdriver_sd, self, deadframe)
         assert 0, "unreachable"
 
     def _trace_and_compile_from_bridge(self, deadframe, metainterp_sd,
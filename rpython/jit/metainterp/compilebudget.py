@@ -0,0 +1,124 @@
+import time
+from rpython.rlib.debug import debug_start, debug_print, debug_stop
+
+#
+# Logic to bound the time spent tracing and compiling bridges.
+#
+# Tracing and compiling a bridge happens on the thread whose guard failed,
+# in the middle of whatever it was doing.  With a 'compile_budget' (in
+# milliseconds per 'compile_budget_window'), once the bridges compiled in
+# the current window took longer than the budget, the guards whose
+# counter reaches the threshold are not compiled but put in 'pending',
+# and keep running in the blackhole interpreter.  When the window is over
+# the budget is refilled, and the next failure of a pending guard compiles
+# its bridge at once, without having to warm up its counter again.
+#
+# The duration of every bridge compilation is also recorded in a small
+# histogram, whether or not a budget is set.
+#
+
+MAX_PENDING = 1000
+
+# upper bounds, in milliseconds, of the buckets of the stall histogram;
+# the last bucket is for everything longer
+STALL_BUCKETS = [1, 5, 10, 50]
+
+# indices for get_stat()
+STAT_COMPILE_BUDGET = 0
+STAT_COMPILE_WINDOW = 1
+STAT_SPENT = 2
+STAT_PENDING = 3
+STAT_DEFERRED = 4
+STAT_COMPILED = 5
+STAT_STALLS = 6        # followed by one entry per bucket
+stat_names = ['compile_budget', 'compile_budget_window', 'spent',
+              'pending', 'deferred', 'compiled'] + [
+              'stalls_under_%dms' % _limit for _limit in STALL_BUCKETS] + [
+              'stalls_over_%dms' % STALL_BUCKETS[-1]]
+
+
+class CompileBudget(object):
+    timer = staticmethod(time.time)
+
+    def __init__(self):
+        self.budget = 0.0          # in seconds, 0.0 means unlimited
+        self.window = 1.0          # in seconds
+        self.window_start = 0.0
+        self.spent = 0.0           # in the current window, in seconds
+        self.pending = {}          # guard descrs whose bridge is deferred
+        self.deferred = 0
+        self.compiled = 0
+        self.stalls = [0] * (len(STALL_BUCKETS) + 1)
+
+    def set_budget(self, milliseconds):
+        self.budget = milliseconds / 1000.0
+        if self.budget <= 0.0:
+            self.budget = 0.0
+            self.pending.clear()
+
+    def set_window(self, milliseconds):
+        if milliseconds > 0:
+            self.window = milliseconds / 1000.0
+
+    def may_compile(self):
+        if self.budget == 0.0:
+            return True
+        now = self.timer()
+        if now - self.window_start >= self.window:
+            self.window_start = now
+            self.spent = 0.0
+        return self.spent < self.budget
+
+    def is_pending(self, descr):
+        return len(self.pending) > 0 and descr in self.pending
+
+    def defer(self, descr):
+        if descr in self.pending:
+            return
+        if len(self.pending) >= MAX_PENDING:
+            # forget them all; their counters will warm up again
+            self.pending.clear()
+        self.pending[descr] = None
+        self.deferred += 1
+        debug_start("jit-compile-budget")
+        debug_print("deferred bridge, pending:", len(self.pending))
+        debug_stop("jit-compile-budget")
+
+    def start_compiling(self):
+        return self.timer()
+
+    def done_compiling(self, descr, starttime):
+        duration = self.timer() - starttime
+        if duration < 0.0:
+            duration = 0.0
+        self.spent += duration
+        self.compiled += 1
+        if len(self.pending) > 0:
+            try:
+                del self.pending[descr]
+            except KeyError:
+                pass
+        milliseconds = duration * 1000.0
+        i = 0
+        while i < len(STALL_BUCKETS):
+            if milliseconds < STALL_BUCKETS[i]:
+                break
+            i += 1
+        self.stalls[i] += 1
+
+    def get_stat(self, no):
+        if no == STAT_COMPILE_BUDGET:
+            return int(self.budget * 1000.0)
+        elif no == STAT_COMPILE_WINDOW:
+            return int(self.window * 1000.0)
+        elif no == STAT_SPENT:
+            return int(self.spent * 1000.0)
+        elif no == STAT_PENDING:
+            return len(self.pending)
+        elif no == STAT_DEFERRED:
+            return self.deferred
+        elif no == STAT_COMPILED:
+            return self.compiled
+        elif STAT_STALLS <= no < STAT_STALLS + len(self.stalls):
+            return self.stalls[no - STAT_STALLS]
+        return -1
@@ -117,6 +117,7 @@ class AbstractFailDescr(AbstractDescr):
 
     _attrs_ = ('adr_jump_offset', 'rd_locs', 'rd_loop_token', 'rd_vector_info')
 
+    rd_loop_token = None
     rd_vector_info = None
 
     def handle_fail(self, deadframe, metainterp_sd, jitdriver_sd):
@@ -410,6 +411,13 @@ class JitCellToken(AbstractDescr):
     # and more data specified by the backend when the loop is compiled
     number = -1
     generation = r_int64(0)
+    # estimates used by the memory manager when it has a memory budget
+    code_size = 0           # bytes of machine code and resume data
+    asm_size = 0            # bytes of machine code only
+    recompile_cost = 0      # operations compiled for the loop and bridges
+    entry_count = 0         # entries from the interpreter, decayed
+    # chains of bridges that check the same argument, see compile.py
+    guard_switches = None
     # one purpose of LoopToken is to keep alive the CompiledLoopToken
     # returned by the backend.  When the LoopToken goes away, the
     # CompiledLoopToken has its __del__ called, which frees the assembler
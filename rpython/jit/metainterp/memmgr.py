@@ -2,6 +2,9 @@ import math
 from rpython.rlib.rarithmetic import r_int64
 from rpython.rlib.debug import debug_start, debug_print, debug_stop
 from rpython.rlib.objectmodel import we_are_translated
+from rpython.rlib.listsort import make_timsort_class
+from rpython.rlib.jit_hooks import LOOP_STATS_CONTAINER
+from rpython.rtyper.lltypesystem import lltype
 
 #
 # Logic to decide which loops are old and not used any more.
@@ -19,6 +22,43 @@ from rpython.rlib.objectmodel import we_are_translated
 # 'generation' field is much smaller than the current generation, and
 # removed from the set.
 #
+# Independently of the age, a 'memory_budget' in bytes can be given.
+# Every loop token records an estimate of the memory it uses: the size
+# of the machine code of the loop and of its bridges, plus GUARD_OVERHEAD
+# bytes per guard for the fail descr and the resume data.  When the total
+# for the alive loops goes above the budget, the loops that are the
+# cheapest to lose are freed first: the score of a loop is the number of
+# times it was entered, times the number of operations we would have to
+# trace and compile again, divided by its size.
+#
+
+GUARD_OVERHEAD = 160     # bytes per guard, an estimate
+
+# indices for get_stat()
+STAT_TOTAL_SIZE = 0
+STAT_MEMORY_BUDGET = 1
+STAT_ALIVE_LOOPS = 2
+STAT_HITS = 3
+STAT_MISSES = 4
+STAT_EVICTED_LOOPS = 5
+STAT_EVICTED_SIZE = 6
+stat_names = ['total_size', 'memory_budget', 'alive_loops', 'hits',
+              'misses', 'evicted_loops', 'evicted_size']
+
+def eviction_score(looptoken):
+    size = looptoken.code_size
+    if size <= 0:
+        size = 1
+    return (float(looptoken.entry_count + 1) * looptoken.recompile_cost /
+            size)
+
+def _eviction_lt(a, b):
+    if a.invalidated != b.invalidated:
+        return a.invalidated
+    return eviction_score(a) < eviction_score(b)
+
+EvictionSort = make_timsort_class(lt=_eviction_lt)
+
 
 class MemoryManager(object):
 
@@ -38,6 +78,12 @@ class MemoryManager(object):
         self.current_generation = r_int64(1)
         self.next_check = r_int64(-1)
         self.alive_loops = {}
+        self.memory_budget = 0
+        self.total_size = 0        # of the loops in 'alive_loops'
+        self.hits = 0
+        self.misses = 0
+        self.evicted_loops = 0
+        self.evicted_size = 0
 
     def set_max_age(self, max_age, check_frequency=0):
         if max_age <= 0:
@@ -49,16 +95,82 @@ class MemoryManager(object):
             self.check_frequency = check_frequency
             self.next_check = self.current_generation + 1
 
+    def set_memory_budget(self, budget):
+        if budget < 0:
+            budget = 0
+        self.memory_budget = budget
+
     def next_generation(self):
         self.current_generation += 1
         if self.current_generation == self.next_check:
             self._kill_old_loops_now()
             self.next_check = self.current_generation + self.check_frequency
+        if 0 < self.memory_budget < self.total_size:
+            self._evict_to_budget()
 
     def keep_loop_alive(self, looptoken):
         if looptoken.generation != self.current_generation:
             looptoken.generation = self.current_generation
-            self.alive_loops[looptoken] = None
+            if looptoken not in self.alive_loops:
+                self.alive_loops[looptoken] = None
+                self.total_size += looptoken.code_size
+
+    def enter_loop(self, looptoken):
+        # called every time the interpreter jumps to the machine code
+        self.hits += 1
+        looptoken.entry_count += 1
+        self.keep_loop_alive(looptoken)
+
+    def record_compiled(self, looptoken, operations, asmlen):
+        # called after a loop or a bridge of 'looptoken' was compiled
+        num_guards = 0
+        for op in operations:
+            if op.is_guard():
+                num_guards += 1
+        size = asmlen + num_guards * GUARD_OVERHEAD
+        looptoken.code_size += size
+        looptoken.asm_size += asmlen
+        looptoken.recompile_cost += len(operations)
+        if looptoken in self.alive_loops:
+            self.total_size += size
+        self.misses += 1
+
+    def get_stat(self, no):
+        if no == STAT_TOTAL_SIZE:
+            return self.total_size
+        elif no == STAT_MEMORY_BUDGET:
+            return self.memory_budget
+        elif no == STAT_ALIVE_LOOPS:
+            return len(self.alive_loops)
+        elif no == STAT_HITS:
+            return self.hits
+        elif no == STAT_MISSES:
+            return self.misses
+        elif no == STAT_EVICTED_LOOPS:
+            return self.evicted_loops
+        elif no == STAT_EVICTED_SIZE:
+            return self.evicted_size
+        return -1
+
+    def get_loop_stats(self):
+        # one entry per alive loop, see jit_hooks.stats_get_loop_stats()
+        tokens = []
+        for looptoken in self.alive_loops:
+            if looptoken.compiled_loop_token is not None:
+                tokens.append(looptoken)
+        result = lltype.malloc(LOOP_STATS_CONTAINER, len(tokens))
+        for i in range(len(tokens)):
+            looptoken = tokens[i]
+            clt = looptoken.compiled_loop_token
+            result[i].number = looptoken.number
+            result[i].guard_failures = clt.guard_failures
+            result[i].bridges = clt.bridges_count
+            result[i].asm_size = looptoken.asm_size
+        return result
+
+    def _forget_loop(self, looptoken):
+        del self.alive_loops[looptoken]
+        self.total_size -= looptoken.code_size
 
     def _kill_old_loops_now(self):
         debug_start("jit-mem-collect")
@@ -70,7 +182,7 @@ class MemoryManager(object):
         for looptoken in self.alive_loops.keys():
             if (0 <= looptoken.generation < max_generation or
                 looptoken.invalidated):
-                del self.alive_loops[looptoken]
+                self._forget_loop(looptoken)
         newtotal = len(self.alive_loops)
         debug_print("Loop tokens freed: ", oldtotal - newtotal)
         debug_print("Loop tokens left:  ", newtotal)
@@ -81,3 +193,39 @@ class MemoryManager(object):
             # a single one is not enough for all tests :-(
             rgc.collect(); rgc.collect(); rgc.collect()
         debug_stop("jit-mem-collect")
+
+    def _evict_to_budget(self):
+        debug_start("jit-mem-budget")
+        debug_print("Current generation:", self.current_generation)
+        debug_print("Memory before:     ", self.total_size)
+        # free a bit more than strictly needed, to avoid doing this again
+        # after every single compilation
+        target = self.memory_budget - (self.memory_budget >> 3)
+        tokens = self.alive_loops.keys()
+        EvictionSort(tokens).sort()
+        # keep the loops of the previous generation: we are called when
+        # we start tracing, and one of them is the loop that we are
+        # about to attach a bridge to
+        min_generation = self.current_generation - 1
+        freed = 0
+        for looptoken in tokens:
+            if self.total_size <= target:
+                break
+            if looptoken.generation >= min_generation:
+                continue
+            self.evicted_size += looptoken.code_size
+            self._forget_loop(looptoken)
+            freed += 1
+        self.evicted_loops += freed
+        # decay the entry counts, so that loops that were hot a long time
+        # ago do not stay forever
+        for looptoken in self.alive_loops:
+            looptoken.entry_count >>= 1
+        debug_print("Loop tokens freed: ", freed)
+        debug_print("Memory after:      ", self.total_size)
+        debug_stop("jit-mem-budget")
+        if not we_are_translated() and freed > 0:
+            looptoken = None
+            tokens = None
+            from rpython.rlib import rgc
+            rgc.collect(); rgc.collect(); rgc.collect()
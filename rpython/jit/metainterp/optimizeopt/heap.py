@@ -348,6 +348,7 @@ class OptHeap(Optimization):
             opnum == rop.JIT_DEBUG or            # no effect whatsoever
             opnum == rop.ENTER_PORTAL_FRAME or   # no effect whatsoever
             opnum == rop.LEAVE_PORTAL_FRAME or   # no effect whatsoever
+            opnum == rop.KEEPALIVE or            # no effect whatsoever
             opnum == rop.COPYSTRCONTENT or       # no effect on GC struct/array
             opnum == rop.COPYUNICODECONTENT or   # no effect on GC struct/array
             opnum == rop.CHECK_MEMORY_ERROR):    # may only abort the whole loop
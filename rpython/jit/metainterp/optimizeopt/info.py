@@ -121,11 +121,14 @@ class NonNullPtrInfo(PtrInfo):
         short.append(op)
 
 class AbstractVirtualPtrInfo(NonNullPtrInfo):
-    _attrs_ = ('_cached_vinfo', 'descr', '_is_virtual')
+    _attrs_ = ('_cached_vinfo', 'descr', '_is_virtual', '_copy',
+               '_copy_items')
     # XXX merge _cached_vinfo with descr
 
     _cached_vinfo = None
     descr = None
+    _copy = None          # a real object, see get_copy()
+    _copy_items = None    # the items written into '_copy' so far
 
     def get_descr(self):
         return self.descr
@@ -136,6 +139,17 @@ class AbstractVirtualPtrInfo(NonNullPtrInfo):
     def force_box(self, op, optforce):
         if self.is_virtual():
             #
+            if self._copy is not None:
+                # no-one kept a reference to the copy passed to residual
+                # calls: bring it up-to-date and use it as the real object
+                self._update_copy(optforce)
+                copy = self._copy
+                self._copy = None
+                self._copy_items = None
+                self._is_virtual = False
+                op.set_forwarded(copy)
+                return copy
+            #
             if self._is_immutable_and_filled_with_constants(optforce.optimizer):
                 constptr = optforce.optimizer.constant_fold(op)
                 op.set_forwarded(constptr)
@@ -161,6 +175,50 @@ class AbstractVirtualPtrInfo(NonNullPtrInfo):
     def is_virtual(self):
         return self._is_virtual
 
+    def get_copy(self, optforce):
+        """Return a real object with the same content as this virtual,
+        without forcing the virtual.  The caller must guarantee that no
+        reference to the object is kept and that it is not modified.
+        The object is allocated the first time and updated the next
+        times; if the virtual is forced later, it becomes this object.
+        """
+        assert self.is_virtual()
+        if self._copy is None:
+            copyop = self._new_copy()
+            assert copyop is not None
+            self._copy = optforce.force_box(copyop, optforce)
+        else:
+            self._update_copy(optforce)
+        self._copy_items = self.all_items()[:]
+        return self._copy
+
+    def _new_copy(self):
+        # return a new allocation operation, attached to a virtual with the
+        # same content as this one, or None if not supported
+        return None
+
+    def _update_copy(self, optforce):
+        # write into the copy the items that changed since the last time
+        items = self.all_items()
+        old_items = self._copy_items
+        for i in range(len(items)):
+            item = items[i]
+            if item is None:
+                continue
+            item = optforce.get_box_replacement(item)
+            if i < len(old_items) and old_items[i] is not None:
+                old_item = optforce.get_box_replacement(old_items[i])
+                if old_item is item:
+                    continue
+                if (old_item.is_constant() and item.is_constant() and
+                        old_item.same_constant(item)):
+                    continue
+            itembox = optforce.force_box(item)
+            optforce.emit_extra(self._copy_write_item(i, itembox))
+
+    def _copy_write_item(self, index, itembox):
+        raise NotImplementedError("abstract")
+
     def _visitor_walk_recursive(self, op, visitor, optimizer):
         raise NotImplementedError("abstract")
 
@@ -212,6 +270,11 @@ class AbstractStructPtrInfo(AbstractVirtualPtrInfo):
         self.init_fields(fielddescr.get_parent_descr(), fielddescr.get_index())
         return self._fields[fielddescr.get_index()]
 
+    def _copy_write_item(self, index, itembox):
+        fielddescr = self.descr.get_all_fielddescrs()[index]
+        return ResOperation(rop.SETFIELD_GC, [self._copy, itembox],
+                            descr=fielddescr)
+
     def _force_elements(self, op, optforce, descr):
         if self._fields is None:
             return
@@ -225,6 +288,8 @@ class AbstractStructPtrInfo(AbstractVirtualPtrInfo):
                 optforce.emit_extra(setfieldop)
 
     def _force_at_the_end_of_preamble(self, op, optforce, rec):
+        if self._copy is not None:
+            return self.force_box(op, optforce)
         if self._fields is None:
             return optforce.get_box_replacement(op)
         if self in rec:
@@ -321,6 +386,14 @@ class InstancePtrInfo(AbstractStructPtrInfo):
     def is_about_object(self):
         return True
 
+    def _new_copy(self):
+        op = ResOperation(rop.NEW_WITH_VTABLE, [], descr=self.descr)
+        opinfo = InstancePtrInfo(self.descr, self._known_class,
+                                 is_virtual=True)
+        opinfo._fields = self._fields[:]
+        op.set_forwarded(opinfo)
+        return op
+
     @specialize.argtype(1)
     def visitor_dispatch_virtual_type(self, visitor):
         fielddescrs = self.descr.get_all_fielddescrs()
@@ -351,6 +424,13 @@ class StructPtrInfo(AbstractStructPtrInfo):
         self.descr = descr
         self._is_virtual = is_virtual
 
+    def _new_copy(self):
+        op = ResOperation(rop.NEW, [], descr=self.descr)
+        opinfo = StructPtrInfo(self.descr, is_virtual=True)
+        opinfo._fields = self._fields[:]
+        op.set_forwarded(opinfo)
+        return op
+
     def make_guards(self, op, short, optimizer):
         if self.descr is not None:
             c_typeid = ConstInt(self.descr.get_type_id())
@@ -515,9 +595,26 @@ class ArrayPtrInfo(AbstractVirtualPtrInfo):
         else:
             self._items = [None] * size
 
+    def _new_copy(self):
+        if self._clear:
+            opnum = rop.NEW_ARRAY_CLEAR
+        else:
+            opnum = rop.NEW_ARRAY
+        op = ResOperation(opnum, [ConstInt(self.length)], descr=self.descr)
+        opinfo = ArrayPtrInfo(self.descr, None, self.length, self._clear,
+                              is_virtual=True)
+        opinfo._items = self._items[:]
+        op.set_forwarded(opinfo)
+        return op
+
     def all_items(self):
         return self._items
 
+    def _copy_write_item(self, index, itembox):
+        return ResOperation(rop.SETARRAYITEM_GC,
+                            [self._copy, ConstInt(index), itembox],
+                            descr=self.descr)
+
     def copy_fields_to_const(self, constinfo, optheap):
         descr = self.descr
         if self._items is not None:
@@ -596,6 +693,8 @@ class ArrayPtrInfo(AbstractVirtualPtrInfo):
             shortboxes.add_heap_op(op, getarrayitem_op)
 
     def _force_at_the_end_of_preamble(self, op, optforce, rec):
+        if self._copy is not None:
+            return self.force_box(op, optforce)
         if self._items is None:
             return optforce.get_box_replacement(op)
         if self in rec:
@@ -630,6 +729,9 @@ class ArrayStructInfo(ArrayPtrInfo):
         self._items = [None] * (size * lgt)
         self._is_virtual = is_virtual
 
+    def _new_copy(self):
+        return None
+
     def _compute_index(self, index, fielddescr):
         all_fdescrs = fielddescr.get_arraydescr().get_all_fielddescrs()
         if all_fdescrs is None:
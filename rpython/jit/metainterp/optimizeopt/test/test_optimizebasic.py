@@ -859,6 +859,135 @@ class BaseTestOptimizeBasic(BaseTestBasic):
         """
         self.optimize_loop(ops, expected)
 
+    def test_nonvirtual_call_does_not_escape(self):
+        ops = """
+        [i]
+        p1 = new_with_vtable(descr=nodesize)
+        setfield_gc(p1, i, descr=valuedescr)
+        call_n(123, p1, descr=noescapedescr)
+        i1 = getfield_gc_i(p1, descr=valuedescr)
+        i2 = int_add(i1, 1)
+        call_n(123, p1, descr=noescapedescr)
+        jump(i2)
+        """
+        expected = """
+        [i]
+        p2 = new_with_vtable(descr=nodesize)
+        setfield_gc(p2, i, descr=valuedescr)
+        call_n(123, p2, descr=noescapedescr)
+        i2 = int_add(i, 1)
+        call_n(123, p2, descr=noescapedescr)
+        jump(i2)
+        """
+        self.optimize_loop(ops, expected)
+
+    def test_nonvirtual_call_does_not_escape_then_forced(self):
+        ops = """
+        [i]
+        p1 = new_with_vtable(descr=nodesize)
+        setfield_gc(p1, i, descr=valuedescr)
+        call_n(123, p1, descr=noescapedescr)
+        escape_n(p1)
+        jump(i)
+        """
+        expected = """
+        [i]
+        p2 = new_with_vtable(descr=nodesize)
+        setfield_gc(p2, i, descr=valuedescr)
+        call_n(123, p2, descr=noescapedescr)
+        escape_n(p2)
+        jump(i)
+        """
+        self.optimize_loop(ops, expected)
+
+    def test_nonvirtual_call_does_not_escape_then_modified(self):
+        ops = """
+        [i]
+        p1 = new_with_vtable(descr=nodesize)
+        setfield_gc(p1, i, descr=valuedescr)
+        call_n(123, p1, descr=noescapedescr)
+        i1 = int_add(i, 1)
+        setfield_gc(p1, i1, descr=valuedescr)
+        call_n(123, p1, descr=noescapedescr)
+        escape_n(p1)
+        jump(i1)
+        """
+        expected = """
+        [i]
+        p2 = new_with_vtable(descr=nodesize)
+        setfield_gc(p2, i, descr=valuedescr)
+        call_n(123, p2, descr=noescapedescr)
+        i1 = int_add(i, 1)
+        setfield_gc(p2, i1, descr=valuedescr)
+        call_n(123, p2, descr=noescapedescr)
+        escape_n(p2)
+        jump(i1)
+        """
+        self.optimize_loop(ops, expected)
+
+    def test_nonvirtual_call_does_not_escape_forces_fields(self):
+        ops = """
+        [i]
+        p1 = new_with_vtable(descr=nodesize)
+        p2 = new_with_vtable(descr=nodesize)
+        setfield_gc(p2, i, descr=valuedescr)
+        setfield_gc(p1, p2, descr=nextdescr)
+        call_n(123, p1, descr=noescapedescr)
+        p3 = getfield_gc_r(p1, descr=nextdescr)
+        escape_n(p3)
+        jump(i)
+        """
+        # the call does not read 'nextdescr', so the heap optimization
+        # delays writing it into the copy
+        expected = """
+        [i]
+        p2 = new_with_vtable(descr=nodesize)
+        p4 = new_with_vtable(descr=nodesize)
+        setfield_gc(p2, i, descr=valuedescr)
+        call_n(123, p4, descr=noescapedescr)
+        setfield_gc(p4, p2, descr=nextdescr)
+        escape_n(p2)
+        jump(i)
+        """
+        self.optimize_loop(ops, expected)
+
+    def test_nonvirtual_call_writes_argument(self):
+        ops = """
+        [i]
+        p1 = new_with_vtable(descr=nodesize)
+        setfield_gc(p1, i, descr=valuedescr)
+        call_n(123, p1, descr=noescapewritedescr)
+        i1 = getfield_gc_i(p1, descr=valuedescr)
+        jump(i1)
+        """
+        expected = """
+        [i]
+        p1 = new_with_vtable(descr=nodesize)
+        setfield_gc(p1, i, descr=valuedescr)
+        call_n(123, p1, descr=noescapewritedescr)
+        i1 = getfield_gc_i(p1, descr=valuedescr)
+        jump(i1)
+        """
+        self.optimize_loop(ops, expected)
+
+    def test_nonvirtual_call_escapes_through_other_argument(self):
+        ops = """
+        [i]
+        p1 = new_with_vtable(descr=nodesize)
+        setfield_gc(p1, i, descr=valuedescr)
+        call_n(123, p1, p1, descr=noescapedescr)
+        i1 = getfield_gc_i(p1, descr=valuedescr)
+        jump(i1)
+        """
+        expected = """
+        [i]
+        p1 = new_with_vtable(descr=nodesize)
+        setfield_gc(p1, i, descr=valuedescr)
+        call_n(123, p1, p1, descr=noescapedescr)
+        jump(i)
+        """
+        self.optimize_loop(ops, expected)
+
     def test_nonvirtual_2(self):
         ops = """
         [i, p0]
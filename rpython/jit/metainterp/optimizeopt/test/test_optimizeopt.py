@@ -3725,6 +3725,34 @@ class OptimizeOptTest(BaseTestWithUnroll):
         """
         self.optimize_loop(ops, ops)
 
+    def test_residual_call_keepalive_does_not_invalidate_caches(self):
+        # the tracer puts a keepalive of the virtualizable after every
+        # call_may_force; it must not undo what the effectinfo of the
+        # call proved, so that 'p1.a' stays loop-invariant
+        ops = """
+        [p0, p1]
+        i1 = getfield_gc_i(p1, descr=adescr)
+        call_may_force_n(i1, descr=mayforcevirtdescr)
+        guard_not_forced() []
+        keepalive(p0)
+        i2 = getfield_gc_i(p1, descr=adescr)
+        call_may_force_n(i2, descr=mayforcevirtdescr)
+        guard_not_forced() []
+        keepalive(p0)
+        jump(p0, p1)
+        """
+        expected = """
+        [p0, p1, i1]
+        call_may_force_n(i1, descr=mayforcevirtdescr)
+        guard_not_forced() []
+        keepalive(p0)
+        call_may_force_n(i1, descr=mayforcevirtdescr)
+        guard_not_forced() []
+        keepalive(p0)
+        jump(p0, p1, i1)
+        """
+        self.optimize_loop(ops, expected)
+
     def test_call_assembler_invalidates_caches(self):
         ops = '''
         [p1, i1, i4]
@@ -234,9 +234,69 @@ class OptVirtualize(optimizer.Optimization):
             if info and info.is_virtual():
                 return
         else:
+            self._copy_nonescaping_virtuals(op)
             return self.emit(op)
     optimize_CALL_R = optimize_CALL_N
     optimize_CALL_I = optimize_CALL_N
+    optimize_CALL_F = optimize_CALL_N
+
+    def _copy_nonescaping_virtuals(self, op):
+        # A virtual passed to a residual call that neither stores nor
+        # returns it (see CallControl._get_nonescaping_args()) is not
+        # forced: the call gets a real copy, and the virtual stays virtual
+        # afterwards.  This is only valid if the call cannot write into the
+        # copy either.  The same copy is updated and passed to the following
+        # calls, and becomes the real object if the virtual is forced later.
+        effectinfo = op.getdescr().get_extra_info()
+        if not effectinfo.nonescaping_args:
+            return
+        candidates = []
+        escaping = []
+        for i in range(1, op.numargs()):
+            arg = self.get_box_replacement(op.getarg(i))
+            if arg.type != 'r':
+                continue
+            opinfo = self.getptrinfo(arg)
+            if opinfo is None or not opinfo.is_virtual():
+                continue
+            if (effectinfo.check_arg_does_not_escape(i) and
+                    self._can_pass_copy(opinfo, effectinfo)):
+                candidates.append(i)
+            else:
+                escaping.append(arg)
+        if not candidates:
+            return
+        # force through the following optimizations, like OptEarlyForce
+        # would do, so that OptHeap sees the fields written
+        optforce = self.optimizer.optearlyforce
+        if optforce is None:
+            optforce = self.optimizer
+        # force the escaping virtuals first: if one of them references a
+        # candidate, the candidate must be forced too
+        for arg in escaping:
+            self.optimizer.force_box(arg, optforce)
+        # the objects referenced by a copy escape for good
+        for i in candidates:
+            opinfo = self.getptrinfo(op.getarg(i))
+            if opinfo is not None and opinfo.is_virtual():
+                for item in opinfo.all_items():
+                    if item is not None:
+                        self.optimizer.force_box(item, optforce)
+        for i in candidates:
+            opinfo = self.getptrinfo(op.getarg(i))
+            if opinfo is not None and opinfo.is_virtual():
+                op.setarg(i, opinfo.get_copy(optforce))
+
+    def _can_pass_copy(self, opinfo, effectinfo):
+        if isinstance(opinfo, info.AbstractStructPtrInfo):
+            for fielddescr in opinfo.descr.get_all_fielddescrs():
+                if effectinfo.check_write_descr_field(fielddescr):
+                    return False
+            return True
+        if (isinstance(opinfo, info.ArrayPtrInfo) and
+                not isinstance(opinfo, info.ArrayStructInfo)):
+            return not effectinfo.check_write_descr_array(opinfo.descr)
+        return False
 
     def do_RAW_MALLOC_VARSIZE_CHAR(self, op):
         sizebox = self.get_constant_box(op.getarg(1))
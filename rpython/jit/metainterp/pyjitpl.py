@@ -1272,6 +1272,7 @@ class MIFrame(object):
                 return
             if self.metainterp.portal_call_depth or not self.metainterp.get_procedure_token(greenboxes, True):
                 if not jitdriver_sd.no_loop_header:
+                    self.truncate_trace_if_needed(orgpc)
                     return
             # automatically add a loop_header if there is none
             self.metainterp.seen_loop_header_for_jdindex = jdindex
@@ -1296,6 +1297,7 @@ class MIFrame(object):
             # close the loop.  We have to put the possibly-modified list
             # 'redboxes' back into the registers where it comes from.
             put_back_list_of_boxes3(self, jcposition, redboxes)
+            self.truncate_trace_if_needed(orgpc)
         else:
             if jitdriver_sd.warmstate.should_unroll_one_iteration(greenboxes):
                 if self.unroll_iterations > 0:
@@ -1321,6 +1323,15 @@ class MIFrame(object):
             self.metainterp.leave_portal_frame(jd_no)
             raise ChangeFrame
 
+    def truncate_trace_if_needed(self, orgpc):
+        # the jit_merge_point of the outermost function is a safe place
+        # to stop a trace that became too long: we resume there in the
+        # interpreter, like after a GUARD_FUTURE_CONDITION
+        metainterp = self.metainterp
+        if metainterp.truncating_trace and not metainterp.portal_call_depth:
+            self.pc = orgpc
+            metainterp.compile_truncated_trace()
+
     def debug_merge_point(self, jitdriver_sd, jd_index, portal_call_depth, current_call_id, greenkey):
         # debugging: produce a DEBUG_MERGE_POINT operation
         if have_debug_prints():
@@ -2037,6 +2048,7 @@ class MetaInterp(object):
 
         self.aborted_tracing_jitdriver = None
         self.aborted_tracing_greenkey = None
+        self.truncating_trace = False
 
     def retrace_needed(self, trace, exported_state):
         self.partial_trace = trace
@@ -2389,8 +2401,25 @@ class MetaInterp(object):
 
     def blackhole_if_trace_too_long(self):
         warmrunnerstate = self.jitdriver_sd.warmstate
-        if self.history.length() > warmrunnerstate.trace_limit:
-            jd_sd, greenkey_of_huge_function = self.find_biggest_function()
+        trace_limit = warmrunnerstate.trace_limit
+        if self.history.length() > trace_limit:
+            if self.truncating_trace:
+                # give the outermost function some time to reach its
+                # next jit_merge_point
+                if self.history.length() <= trace_limit + (trace_limit >> 2):
+                    return
+                self.truncating_trace = False
+                jd_sd, greenkey_of_huge_function = None, None
+            else:
+                jd_sd, greenkey_of_huge_function = self.find_biggest_function()
+                if (greenkey_of_huge_function is None and
+                        self.can_truncate_trace()):
+                    # no inlined function to blame: the outermost function
+                    # is simply huge.  Instead of aborting, and aborting
+                    # again every time we try, compile the part traced so
+                    # far at its next jit_merge_point.
+                    self.truncating_trace = True
+                    return
             self.history.trace.done()
             self.staticdata.stats.record_aborted(greenkey_of_huge_function)
             self.portal_trace_positions = None
@@ -2405,6 +2434,33 @@ class MetaInterp(object):
                     warmrunnerstate.JitCell.trace_next_iteration(greenkey)
             raise SwitchToBlackhole(Counters.ABORT_TOO_LONG)
 
+    def can_truncate_trace(self):
+        return (self.partial_trace is None and
+                self.staticdata.warmrunnerdesc is not None)
+
+    def compile_truncated_trace(self):
+        # Called at a jit_merge_point of the outermost function, after the
+        # trace became longer than 'trace_limit'.  We end the trace with a
+        # guard that always fails and compile it as a bridge or an entry
+        # bridge.  Running it goes back to the interpreter at the current
+        # jit_merge_point; once the guard failed often enough, the rest of
+        # the function is traced as a bridge, which may be truncated in
+        # the same way.
+        self.truncating_trace = False
+        debug_print('~~~ trace too long, compiling the first part')
+        self.generate_guard(rop.GUARD_ALWAYS_FAILS)
+        # the backends want traces to end with a FINISH or a JUMP
+        token = self.staticdata.loop_tokens_exit_frame_with_exception_ref[0]
+        self.history.record(rop.FINISH, [history.CONST_NULL], None,
+                            descr=token.finishdescr)
+        self.history.trace.done()
+        self.portal_trace_positions = None
+        target_token = compile.compile_trace(self, self.resumekey, [])
+        if target_token is None:
+            raise SwitchToBlackhole(Counters.ABORT_TOO_LONG)
+        # the interpreter continues from the jit_merge_point
+        raise SwitchToBlackhole(Counters.TRUNCATED_TRACES)
+
     def _interpret(self):
         # Execute the frames forward until we raise a DoneWithThisFrame,
         # a ExitFrameWithException, or a ContinueRunningNormally exception.
@@ -2501,7 +2557,11 @@ class MetaInterp(object):
         # a stack of blackhole interpreters filled with the same values, and
         # run it.
         from rpython.jit.metainterp.blackhole import convert_and_run_from_pyjitpl
-        self.aborted_tracing(stb.reason)
+        if stb.reason == Counters.TRUNCATED_TRACES:
+            # not an abort: the first part of the trace was compiled
+            self.staticdata.profiler.count(stb.reason)
+        else:
+            self.aborted_tracing(stb.reason)
         convert_and_run_from_pyjitpl(self, stb.raising_exception)
         assert False    # ^^^ must raise
 
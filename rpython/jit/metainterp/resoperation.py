@@ -947,6 +947,7 @@ _oplist = [
     'GUARD_NOT_INVALIDATED/0d/n',
     'GUARD_FUTURE_CONDITION/0d/n',
     # is removable, may be patched by an optimization
+    'GUARD_ALWAYS_FAILS/0d/n',    # ends a trace cut short by trace_limit
     '_GUARD_LAST', # ----- end of guard operations -----
 
     '_NOSIDEEFFECT_FIRST', # ----- start of no_side_effect operations -----
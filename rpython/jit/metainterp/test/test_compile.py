@@ -170,3 +170,29 @@ def test_compile_tmp_callback():
         assert lltype.cast_opaque_ptr(lltype.Ptr(EXC), e.value) == llexc
     else:
         assert 0, "should have raised"
+
+def test_record_guard_switch():
+    from rpython.jit.metainterp.history import JitCellToken
+    class FakeSwitchCPU(object):
+        def __init__(self):
+            self.updates = []
+        def update_guard_switch(self, faildescr, opnum, index, values,
+                                descrs, inputargs, looptoken):
+            assert faildescr is descrs[0]
+            self.updates.append(len(values))
+    class FakeMetaInterpSD:
+        cpu = FakeSwitchCPU()
+    token = JitCellToken()
+    faildescr = compile.ResumeGuardDescr()
+    for i in range(100):
+        guard_descr = compile.ResumeGuardDescr()
+        bridge = parse("""
+        [i0, i1]
+        guard_value(i1, %d, descr=guard_descr) [i0, i1]
+        jump(i0, i1)
+        """ % i, namespace={'guard_descr': guard_descr})
+        compile.record_guard_switch(FakeMetaInterpSD, faildescr,
+                                    bridge.inputargs, bridge.operations,
+                                    token)
+        faildescr = guard_descr
+    assert FakeMetaInterpSD.cpu.updates == [4, 8, 16, 32, 64]
@@ -0,0 +1,92 @@
+from rpython.jit.metainterp.compilebudget import (CompileBudget,
+    MAX_PENDING, STAT_SPENT, STAT_PENDING, STAT_DEFERRED, STAT_COMPILED,
+    STAT_STALLS, stat_names)
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeDescr(object):
+    pass
+
+
+def make_budget(budget_ms, window_ms=1000):
+    budget = CompileBudget()
+    budget.timer = FakeClock()
+    budget.set_budget(budget_ms)
+    budget.set_window(window_ms)
+    return budget
+
+def compile_for(budget, descr, seconds):
+    starttime = budget.start_compiling()
+    budget.timer.now += seconds
+    budget.done_compiling(descr, starttime)
+
+
+def test_unlimited():
+    budget = make_budget(0)
+    for i in range(5):
+        assert budget.may_compile()
+        compile_for(budget, FakeDescr(), 0.5)
+    assert budget.get_stat(STAT_COMPILED) == 5
+    assert budget.get_stat(STAT_DEFERRED) == 0
+
+def test_defer_when_exhausted():
+    budget = make_budget(10)
+    d1, d2 = FakeDescr(), FakeDescr()
+    assert budget.may_compile()
+    compile_for(budget, d1, 0.004)
+    assert budget.may_compile()
+    compile_for(budget, d1, 0.007)
+    assert budget.get_stat(STAT_SPENT) == 11
+    assert not budget.may_compile()
+    assert not budget.is_pending(d2)
+    budget.defer(d2)
+    budget.defer(d2)
+    assert budget.is_pending(d2)
+    assert budget.get_stat(STAT_PENDING) == 1
+    assert budget.get_stat(STAT_DEFERRED) == 1
+    # still in the same window
+    budget.timer.now += 0.5
+    assert not budget.may_compile()
+    # refilled
+    budget.timer.now += 0.6
+    assert budget.may_compile()
+    assert budget.get_stat(STAT_SPENT) == 0
+    compile_for(budget, d2, 0.001)
+    assert not budget.is_pending(d2)
+    assert budget.get_stat(STAT_PENDING) == 0
+
+def test_pending_is_bounded():
+    budget = make_budget(1)
+    compile_for(budget, FakeDescr(), 1.0)
+    for i in range(MAX_PENDING):
+        budget.defer(FakeDescr())
+    assert budget.get_stat(STAT_PENDING) == MAX_PENDING
+    budget.defer(FakeDescr())
+    assert budget.get_stat(STAT_PENDING) == 1
+    assert budget.get_stat(STAT_DEFERRED) == MAX_PENDING + 1
+
+def test_disabling_drops_pending():
+    budget = make_budget(1)
+    budget.defer(FakeDescr())
+    budget.set_budget(0)
+    assert budget.get_stat(STAT_PENDING) == 0
+    assert budget.may_compile()
+
+def test_stall_histogram():
+    budget = make_budget(0)
+    for seconds in [0.0001, 0.0004, 0.002, 0.007, 0.02, 0.3]:
+        compile_for(budget, FakeDescr(), seconds)
+    stalls = [budget.get_stat(STAT_STALLS + i)
+              for i in range(len(stat_names) - STAT_STALLS)]
+    assert stalls == [2, 1, 1, 1, 1]
+    assert stat_names[STAT_STALLS:] == [
+        'stalls_under_1ms', 'stalls_under_5ms', 'stalls_under_10ms',
+        'stalls_under_50ms', 'stalls_over_50ms']
+    assert budget.get_stat(len(stat_names)) == -1
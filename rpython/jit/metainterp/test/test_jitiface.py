@@ -144,6 +144,91 @@ class JitHookInterfaceTests(object):
 
         self.meta_interp(main, [], ProfilerClass=Profiler)
 
+    def test_get_stats_memmgr(self):
+        from rpython.jit.metainterp import memmgr
+        driver = JitDriver(greens = [], reds = ['i', 's'])
+
+        def loop(i):
+            s = 0
+            while i > 0:
+                driver.jit_merge_point(i=i, s=s)
+                if i % 2:
+                    s += 1
+                i -= 1
+                s+= 2
+            return s
+
+        def main():
+            loop(30)
+            loop(30)
+            # the loop and its bridges
+            assert jit_hooks.stats_memmgr_get_value(None,
+                                                    memmgr.STAT_MISSES) >= 2
+            assert jit_hooks.stats_memmgr_get_value(None,
+                                                    memmgr.STAT_HITS) >= 2
+            assert jit_hooks.stats_memmgr_get_value(None,
+                                              memmgr.STAT_TOTAL_SIZE) > 0
+            assert jit_hooks.stats_memmgr_get_value(None,
+                                              memmgr.STAT_EVICTED_LOOPS) == 0
+
+        self.meta_interp(main, [])
+
+    def test_compile_budget(self):
+        from rpython.jit.metainterp import compilebudget
+        from rpython.rlib.jit import set_param
+        driver = JitDriver(greens = [], reds = ['i', 's'])
+
+        def loop(i):
+            s = 0
+            while i > 0:
+                driver.jit_merge_point(i=i, s=s)
+                if i % 2:
+                    s += 1
+                if i % 3:
+                    s += 2
+                if i % 5:
+                    s += 3
+                i -= 1
+            return s
+
+        def main():
+            set_param(driver, 'compile_budget_window', 1000000)
+            loop(100)
+            # the first bridge uses up the budget; the others are deferred
+            def get(no):
+                return jit_hooks.stats_compile_budget_get_value(None, no)
+            assert get(compilebudget.STAT_COMPILED) == 1
+            assert get(compilebudget.STAT_DEFERRED) >= 1
+            assert get(compilebudget.STAT_PENDING) == get(
+                compilebudget.STAT_DEFERRED)
+            assert get(compilebudget.STAT_SPENT) >= 1
+
+        self.meta_interp(main, [], compile_budget=1)
+
+    def test_get_loop_stats(self):
+        driver = JitDriver(greens = [], reds = ['i', 's'])
+
+        def loop(i):
+            s = 0
+            while i > 0:
+                driver.jit_merge_point(i=i, s=s)
+                if i % 2:
+                    s += 1
+                i -= 1
+                s += 2
+            return s
+
+        def main():
+            loop(30)
+            stats = jit_hooks.stats_get_loop_stats(None)
+            assert len(stats) == 1
+            assert stats[0].number >= 0
+            assert stats[0].bridges == 1
+            # the guard failed until its bridge was compiled
+            assert stats[0].guard_failures >= 1
+
+        self.meta_interp(main, [])
+
     def test_get_stats_empty(self):
         driver = JitDriver(greens = [], reds = ['i'])
         def loop(i):
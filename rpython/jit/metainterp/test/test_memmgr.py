@@ -21,6 +21,23 @@ from rpython.rlib import rgc
 class FakeLoopToken:
     generation = 0
     invalidated = False
+    code_size = 0
+    asm_size = 0
+    recompile_cost = 0
+    entry_count = 0
+
+def sized_token(code_size, recompile_cost, entry_count=0):
+    token = FakeLoopToken()
+    token.code_size = code_size
+    token.recompile_cost = recompile_cost
+    token.entry_count = entry_count
+    return token
+
+class FakeOp:
+    def __init__(self, is_guard):
+        self._is_guard = is_guard
+    def is_guard(self):
+        return self._is_guard
 
 
 class _TestMemoryManager:
@@ -79,6 +96,96 @@ class _TestMemoryManager:
                 assert tokens[i] in memmgr.alive_loops
 
 
+    def test_record_compiled(self):
+        from rpython.jit.metainterp.memmgr import GUARD_OVERHEAD
+        memmgr = MemoryManager()
+        token = FakeLoopToken()
+        ops = [FakeOp(False), FakeOp(True), FakeOp(True)]
+        memmgr.record_compiled(token, ops, 100)
+        assert token.code_size == 100 + 2 * GUARD_OVERHEAD
+        assert token.recompile_cost == 3
+        assert memmgr.total_size == 0      # not alive yet
+        memmgr.keep_loop_alive(token)
+        assert memmgr.total_size == token.code_size
+        memmgr.record_compiled(token, [FakeOp(False)], 50)   # a bridge
+        assert memmgr.total_size == 150 + 2 * GUARD_OVERHEAD
+        assert token.recompile_cost == 4
+        assert memmgr.misses == 2
+        memmgr.enter_loop(token)
+        memmgr.enter_loop(token)
+        assert memmgr.hits == 2
+        assert token.entry_count == 2
+
+    def test_budget_disabled(self):
+        memmgr = MemoryManager()
+        tokens = [sized_token(1000, 10) for i in range(10)]
+        for token in tokens:
+            memmgr.keep_loop_alive(token)
+            memmgr.next_generation()
+        assert memmgr.total_size == 10000
+        assert memmgr.alive_loops == dict.fromkeys(tokens)
+
+    def test_budget_evicts_cheapest(self):
+        memmgr = MemoryManager()
+        memmgr.set_memory_budget(3500)
+        hot = sized_token(1000, 10, entry_count=100)
+        big = sized_token(2000, 10, entry_count=5)
+        costly = sized_token(1000, 500, entry_count=5)
+        cheap = sized_token(1000, 10, entry_count=5)
+        for token in [hot, big, costly, cheap]:
+            memmgr.keep_loop_alive(token)
+            memmgr.next_generation()
+            memmgr.next_generation()
+        # 'big' is the least useful per byte, and freeing it is enough
+        # to go below the budget
+        assert big not in memmgr.alive_loops
+        assert hot in memmgr.alive_loops
+        assert costly in memmgr.alive_loops
+        assert cheap in memmgr.alive_loops
+        assert memmgr.total_size == 3000
+        assert memmgr.evicted_loops == 1
+        assert memmgr.evicted_size == 2000
+        # entry counts are halved after each eviction
+        assert hot.entry_count == 50
+
+    def test_budget_keeps_recent_loops(self):
+        memmgr = MemoryManager()
+        memmgr.set_memory_budget(1500)
+        old = sized_token(1000, 1000, entry_count=1000)
+        memmgr.keep_loop_alive(old)
+        memmgr.next_generation()
+        memmgr.next_generation()
+        new = sized_token(1000, 1)
+        memmgr.keep_loop_alive(new)
+        memmgr.next_generation()
+        # 'new' has a worse score, but it was compiled just now
+        assert memmgr.alive_loops == {new: None}
+        assert memmgr.total_size == 1000
+
+    def test_budget_invalidated_first(self):
+        memmgr = MemoryManager()
+        memmgr.set_memory_budget(2500)
+        tokens = [sized_token(1000, 10) for i in range(3)]
+        tokens[1].entry_count = 1000
+        tokens[1].invalidated = True
+        for token in tokens:
+            memmgr.keep_loop_alive(token)
+        memmgr.next_generation()
+        memmgr.next_generation()
+        assert tokens[1] not in memmgr.alive_loops
+        assert memmgr.total_size == 2000
+
+    def test_stats(self):
+        from rpython.jit.metainterp import memmgr as memmgr_mod
+        memmgr = MemoryManager()
+        memmgr.set_memory_budget(12345)
+        memmgr.keep_loop_alive(sized_token(100, 1))
+        assert memmgr.get_stat(memmgr_mod.STAT_TOTAL_SIZE) == 100
+        assert memmgr.get_stat(memmgr_mod.STAT_MEMORY_BUDGET) == 12345
+        assert memmgr.get_stat(memmgr_mod.STAT_ALIVE_LOOPS) == 1
+        assert len(memmgr_mod.stat_names) == 7
+
+
 class _TestIntegration(LLJitMixin):
     # See comments in TestMemoryManager.  To get temporarily the normal
     # behavior just rename this class to TestIntegration.
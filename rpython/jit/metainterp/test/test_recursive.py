@@ -396,6 +396,39 @@ class RecursiveTests:
         res = self.meta_interp(loop, [100], trace_limit=TRACE_LIMIT)
         assert res == 80
 
+    def test_trace_limit_compiles_prefix(self):
+        # a single huge function: there is no inlined function to blame
+        # when the trace is too long, so it is compiled in several parts
+        # that end in a GUARD_ALWAYS_FAILS, each one continued by a bridge
+        myjitdriver = JitDriver(greens=['pc'], reds=['n', 'total'])
+        def step(total, pc, n):
+            return total + pc * n
+        def interp(n):
+            pc = 0
+            total = 0
+            while True:
+                myjitdriver.jit_merge_point(pc=pc, n=n, total=total)
+                if pc == 0:
+                    if n <= 0:
+                        break
+                    n -= 1
+                else:
+                    total = step(total, pc, n)
+                pc += 1
+                if pc == 100:
+                    pc = 0
+                    myjitdriver.can_enter_jit(pc=pc, n=n, total=total)
+            return total
+        TRACE_LIMIT = 60
+        res = self.meta_interp(interp, [50], trace_limit=TRACE_LIMIT)
+        assert res == interp(50)
+        self.check_aborted_count(0)
+        self.check_max_trace_length(TRACE_LIMIT)
+        loops = get_stats().get_all_loops()
+        assert loops[0].operations[-2].getopname() == 'guard_always_fails'
+        # about one part per TRACE_LIMIT operations
+        assert get_stats().compiled_count > 5
+
     def test_max_failure_args(self):
         FAILARGS_LIMIT = 10
         jitdriver = JitDriver(greens = [], reds = ['i', 'n', 'o'])
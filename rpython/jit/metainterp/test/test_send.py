@@ -484,6 +484,65 @@ class SendTests(object):
         assert res == f(55)
         self.check_jitcell_token_count(1)
 
+    def _check_guard_switch(self, min_cases):
+        from rpython.jit.metainterp.warmspot import get_stats
+        from rpython.jit.metainterp import pyjitpl
+        longest = 0
+        for token in get_stats().get_all_jitcell_tokens():
+            if token.guard_switches is not None:
+                for switch in token.guard_switches.values():
+                    longest = max(longest, len(switch.values))
+        assert longest >= min_cases
+        cpu = pyjitpl._warmrunnerdesc.metainterp_sd.cpu
+        if hasattr(cpu, 'guard_switch_dispatches'):
+            assert cpu.guard_switch_dispatches > 0
+
+    def test_megamorphic_send(self):
+        class Base:
+            def f(self):
+                return 1
+        class A(Base):
+            def f(self):
+                return 2
+        class B(Base):
+            def f(self):
+                return 3
+        class C(Base):
+            def f(self):
+                return 4
+        class D(Base):
+            def f(self):
+                return 5
+        class E(Base):
+            def f(self):
+                return 6
+        myjitdriver = JitDriver(greens = [], reds = ['i', 's', 'n', 'lst'])
+        def f(n):
+            lst = [Base(), A(), B(), C(), D(), E()]
+            i = s = 0
+            while i < n:
+                myjitdriver.jit_merge_point(i=i, s=s, n=n, lst=lst)
+                s = (s * 3 + lst[i % 6].f()) & 0xffff
+                i += 1
+            return s
+        res = self.meta_interp(f, [400])
+        assert res == f(400)
+        self._check_guard_switch(5)
+
+    def test_megamorphic_promote(self):
+        myjitdriver = JitDriver(greens = [], reds = ['i', 's', 'n'])
+        def f(n):
+            i = s = 0
+            while i < n:
+                myjitdriver.jit_merge_point(i=i, s=s, n=n)
+                x = promote(i % 7)
+                s += x * x
+                i += 1
+            return s
+        res = self.meta_interp(f, [500])
+        assert res == f(500)
+        self._check_guard_switch(5)
+
     def test_bug1(self):
         myjitdriver = JitDriver(greens = [], reds = ['n', 'node'])
         class Base:
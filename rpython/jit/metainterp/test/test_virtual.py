@@ -1312,6 +1312,35 @@ class VirtualMiscTests:
         self.check_trace_count(1)
         self.check_resops(setarrayitem_raw=2, getarrayitem_raw_i=4)
 
+    def test_virtual_passed_to_nonescaping_call(self):
+        mydriver = JitDriver(greens=[], reds=['n', 'total'])
+        class Node(object):
+            def __init__(self, value):
+                self.value = value
+        glob = Node(0)
+        @dont_look_inside
+        def peek(node):
+            return node.value & 1
+        @dont_look_inside
+        def bump(node):
+            node.value += 1
+        def f(n):
+            total = 0
+            while n > 0:
+                mydriver.can_enter_jit(n=n, total=total)
+                mydriver.jit_merge_point(n=n, total=total)
+                node = Node(n)
+                total += peek(node)
+                bump(glob)
+                total += node.value
+                n -= 1
+            return total
+        assert f(10) == self.meta_interp(f, [10])
+        self.check_trace_count(1)
+        # 'node' is still virtual after the call to peek(), which gets
+        # a real copy; so bump() does not invalidate what we know about it
+        self.check_resops(new_with_vtable=2, getfield_gc_i=0)
+
 # ____________________________________________________________
 # Run 1: all the tests instantiate a real RPython class
 
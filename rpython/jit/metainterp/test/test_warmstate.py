@@ -111,6 +111,7 @@ def test_make_jitdriver_callbacks_1():
     class FakeWarmRunnerDesc:
         cpu = None
         memory_manager = None
+        compile_budget = None
         rtyper = None
         jitcounter = DeterministicJitCounter()
     class FakeJitDriverSD:
@@ -143,6 +144,7 @@ def test_make_jitdriver_callbacks_3():
         rtyper = None
         cpu = None
         memory_manager = None
+        compile_budget = None
         jitcounter = DeterministicJitCounter()
     class FakeJitDriverSD:
         jitdriver = None
@@ -170,6 +172,7 @@ def test_make_jitdriver_callbacks_4():
         rtyper = None
         cpu = None
         memory_manager = None
+        compile_budget = None
         jitcounter = DeterministicJitCounter()
     class FakeJitDriverSD:
         jitdriver = None
@@ -197,6 +200,7 @@ def test_make_jitdriver_callbacks_5():
         rtyper = None
         cpu = None
         memory_manager = None
+        compile_budget = None
         jitcounter = DeterministicJitCounter()
     class FakeJitDriverSD:
         jitdriver = None
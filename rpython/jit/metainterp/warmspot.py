@@ -19,6 +19,7 @@ from rpython.translator.backendopt import removenoops
 from rpython.translator.unsimplify import call_final_function
 
 from rpython.jit.metainterp import history, pyjitpl, gc, memmgr, jitexc
+from rpython.jit.metainterp import compilebudget
 from rpython.jit.metainterp.pyjitpl import MetaInterpStaticData
 from rpython.jit.metainterp.jitprof import Profiler, EmptyProfiler
 from rpython.jit.metainterp.jitdriver import JitDriverStaticData
@@ -88,7 +89,8 @@ def ll_meta_interp(function, args, backendopt=False,
 
 def jittify_and_run(interp, graph, args, repeat=1, graph_and_interp_only=False,
                     backendopt=False, trace_limit=sys.maxint, inline=False,
-                    loop_longevity=0, retrace_limit=5, function_threshold=4,
+                    loop_longevity=0, memory_budget=0, compile_budget=0,
+                    retrace_limit=5, function_threshold=4,
                     disable_unrolling=sys.maxint,
                     enable_opts=ALL_OPTS_NAMES, max_retrace_guards=15,
                     max_unroll_recursion=7, vec=0, vec_all=0, vec_cost=0,
@@ -111,6 +113,8 @@ def jittify_and_run(interp, graph, args, repeat=1, graph_and_interp_only=False,
         jd.warmstate.set_param_trace_limit(trace_limit)
         jd.warmstate.set_param_inlining(inline)
         jd.warmstate.set_param_loop_longevity(loop_longevity)
+        jd.warmstate.set_param_memory_budget(memory_budget)
+        jd.warmstate.set_param_compile_budget(compile_budget)
         jd.warmstate.set_param_retrace_limit(retrace_limit)
         jd.warmstate.set_param_max_retrace_guards(max_retrace_guards)
         jd.warmstate.set_param_enable_opts(enable_opts)
@@ -228,6 +232,7 @@ class WarmRunnerDesc(object):
         pyjitpl._warmrunnerdesc = self   # this is a global for debugging only!
         self.set_translator(translator)
         self.memory_manager = memmgr.MemoryManager()
+        self.compile_budget = compilebudget.CompileBudget()
         self.build_cpu(CPUClass, **kwds)
         self.inline_inlineable_portals()
         self.find_portals()
@@ -289,6 +289,24 @@ class WarmEnterState(object):
             self.warmrunnerdesc.memory_manager is not None):   # all for tests
             self.warmrunnerdesc.memory_manager.set_max_age(value)
 
+    def set_param_memory_budget(self, value):
+        # note: it's a global parameter, not a per-jitdriver one
+        if (self.warmrunnerdesc is not None and
+            self.warmrunnerdesc.memory_manager is not None):   # all for tests
+            self.warmrunnerdesc.memory_manager.set_memory_budget(value)
+
+    def set_param_compile_budget(self, value):
+        # note: it's a global parameter, not a per-jitdriver one
+        if (self.warmrunnerdesc is not None and
+            self.warmrunnerdesc.compile_budget is not None):   # all for tests
+            self.warmrunnerdesc.compile_budget.set_budget(value)
+
+    def set_param_compile_budget_window(self, value):
+        # note: it's a global parameter, not a per-jitdriver one
+        if (self.warmrunnerdesc is not None and
+            self.warmrunnerdesc.compile_budget is not None):   # all for tests
+            self.warmrunnerdesc.compile_budget.set_window(value)
+
     def set_param_retrace_limit(self, value):
         if self.warmrunnerdesc:
             if self.warmrunnerdesc.memory_manager:
@@ -389,7 +407,7 @@ class WarmEnterState(object):
             #
             # Record in the memmgr that we just ran this loop,
             # so that it will keep it alive for a longer time
-            warmrunnerdesc.memory_manager.keep_loop_alive(loop_token)
+            warmrunnerdesc.memory_manager.enter_loop(loop_token)
             #
             # Handle the failure
             fail_descr = cpu.get_latest_descr(deadframe)
@@ -59,6 +59,7 @@ abort: compiling:       11
 abort: vable escape:    12
 abort: bad loop:        135
 abort: force quasi-immut: 3
+truncated traces:       2
 nvirtuals:              13
 nvholes:                14
 nvreused:               15
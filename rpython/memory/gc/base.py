@@ -200,6 +200,25 @@ class GCBase(object):
     def set_max_heap_size(self, size):
         raise NotImplementedError
 
+    def freeze(self):
+        """Do a full collection and make the surviving objects immortal.
+        Returns the number of objects frozen so far; GCs that don't
+        support it just collect and return 0."""
+        self.collect()
+        return 0
+
+    def collect_step(self, budget):
+        """Do a step of an incremental major collection.  Returns True
+        if it finished a major collection; GCs that are not incremental
+        just do a full collection and return True."""
+        self.collect()
+        return True
+
+    def get_stats(self, stat_no):
+        """Return one of the rgc.STAT_xxx counters, or -1 if this GC
+        doesn't provide it."""
+        return -1
+
     def trace(self, obj, callback, arg):
         """Enumerate the locations inside the given obj that can contain
         GC pointers.  For each such location, callback(pointer, arg) is
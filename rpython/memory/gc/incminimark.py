@@ -52,6 +52,28 @@ Environment variables can be used to fine-tune the following parameters:
                          in time.  Defaults to a conservative value depending
                          on nursery size and maximum object size inside the
                          nursery.  Useful for debugging by setting it to 0.
+
+ PYPY_GC_MARK_PREFETCH   The number of objects waiting, with their header
+                         prefetched, before being marked.  Defaults to 0
+                         (no prefetching).  Values like 8 or 16 reduce the
+                         time spent waiting for cache misses in the marking
+                         steps of large heaps.
+
+ PYPY_GC_MAX_PAUSE       Target duration of the GC pauses, in milliseconds.
+                         Defaults to 0 (no target).  If set, the size of
+                         the marking steps is adapted to the measured speed
+                         of the previous ones instead of being given by
+                         PYPY_GC_INCREMENT_STEP, and the nursery is made
+                         smaller (or bigger again, up to PYPY_GC_NURSERY)
+                         depending on how long the minor collections take.
+
+ PYPY_GC_PRETENURE       Survival rate, in percent, above which the objects
+                         of a type are allocated directly in the old
+                         generation by the JIT.  Defaults to 0 (off).  The
+                         survival rate of each type is measured on samples
+                         of the nursery allocations.  Values like 70 avoid
+                         copying out of the nursery most of the objects
+                         built e.g. when filling a big cache.
 """
 # XXX Should find a way to bound the major collection threshold by the
 # XXX total addressable size.  Maybe by keeping some minimarkpage arenas
@@ -62,7 +84,9 @@ Environment variables can be used to fine-tune the following parameters:
 # XXX old_objects_pointing_to_young (IRC 2014-10-22, fijal and gregor_w)
 import sys
 import os
+import time
 from rpython.rtyper.lltypesystem import lltype, llmemory, llarena, llgroup
+from rpython.rtyper.lltypesystem import rffi
 from rpython.rtyper.lltypesystem.lloperation import llop
 from rpython.rtyper.lltypesystem.llmemory import raw_malloc_usage
 from rpython.memory.gc.base import GCBase, MovingGCBase
@@ -72,6 +96,8 @@ from rpython.rlib.rarithmetic import ovfcheck, LONG_BIT, intmask, r_uint
 from rpython.rlib.rarithmetic import LONG_BIT_SHIFT
 from rpython.rlib.debug import ll_assert, debug_print, debug_start, debug_stop
 from rpython.rlib.objectmodel import specialize
+from rpython.rlib.unroll import unrolling_iterable
+from rpython.rlib import rgc
 from rpython.memory.gc.minimarkpage import out_of_memory
 
 #
@@ -182,6 +208,25 @@ STATE_FINALIZING = 3
 
 GC_STATES = ['SCANNING', 'MARKING', 'SWEEPING', 'FINALIZING']
 
+# upper bound for PYPY_GC_MARK_PREFETCH
+MAX_MARK_PREFETCH = 256
+
+# with PYPY_GC_MAX_PAUSE, bounds of the adapted marking step, in bytes
+MIN_INCREMENT_STEP = 64 * 1024
+MAX_INCREMENT_STEP = sys.maxint // 4
+
+# with PYPY_GC_PRETENURE: number of nursery allocations sampled per
+# nursery size of allocated memory; size of the table of survival rates,
+# which must be a power of two; number of samples of a type between two
+# decisions about pretenuring it
+PRETENURE_SAMPLES_PER_NURSERY = 64
+PRETENURE_TABLE_SIZE = 512
+PRETENURE_MIN_SAMPLES = 32
+
+# the pause histograms of get_stats(), see rgc.PAUSE_BUCKETS
+NUM_PAUSE_BUCKETS = len(rgc.PAUSE_BUCKETS) + 1
+unroll_pause_buckets = unrolling_iterable(rgc.PAUSE_BUCKETS)
+
 
 FORWARDSTUB = lltype.GcStruct('forwarding_stub',
                               ('forw', llmemory.Address))
@@ -292,11 +337,31 @@ class IncrementalMiniMarkGC(MovingGCBase):
         self.major_collection_threshold = major_collection_threshold
         self.growth_rate_max = growth_rate_max
         self.num_major_collects = 0
+        self.num_frozen_objects = 0
+        self.freezing = False
         self.min_heap_size = 0.0
         self.max_heap_size = 0.0
         self.max_heap_size_already_raised = False
         self.max_delta = float(r_uint(-1))
         self.max_number_of_pinned_objects = 0      # computed later
+        self.max_pinned_from_env = False
+        self.mark_prefetch = 0
+        self.max_pause = 0.0        # in seconds, 0.0 means no target
+        self.nursery_size_min = 0   # bounds when adapting the nursery size
+        self.nursery_size_max = 0
+        self.pretenure_threshold = 0    # in percent, 0 means off
+        #
+        # statistics returned by get_stats()
+        self.num_minor_collects = 0
+        self.minor_collect_time = 0.0       # in seconds
+        self.num_major_steps = 0
+        self.major_step_time = 0.0          # in seconds
+        self.bytes_promoted = r_uint(0)
+        self.last_minor_pause = 0.0         # in seconds
+        self.pause_histograms = lltype.malloc(rffi.CArray(lltype.Signed),
+                                              2 * NUM_PAUSE_BUCKETS,
+                                              flavor='raw', zero=True,
+                                              immortal=True)
         #
         self.card_page_indices = card_page_indices
         if self.card_page_indices > 0:
@@ -406,6 +471,26 @@ class IncrementalMiniMarkGC(MovingGCBase):
         # objects. The addresses are used to set the next 'nursery_top'.
         self.nursery_barriers = self.AddressDeque()
         #
+        # With 'pretenure_threshold', 'nursery_top' is regularly lowered
+        # to make collect_and_reserve() sample an allocation; the real
+        # value is then saved in 'pretenure_real_top'.  The sampled
+        # objects are recorded in 'pretenure_samples' until the next minor
+        # collection checks if they survived.  The survival rates are
+        # counted in a small table indexed by the member index of the
+        # type: 'pretenure_keys' stores the member index plus one,
+        # 'pretenure_decided' is non-zero for the types to pretenure.
+        self.pretenure_real_top = llmemory.NULL
+        self.pretenure_samples = self.AddressStack()
+        self.pretenure_keys = self._new_pretenure_table()
+        self.pretenure_seen = self._new_pretenure_table()
+        self.pretenure_survived = self._new_pretenure_table()
+        self.pretenure_decided = self._new_pretenure_table()
+        #
+        # The objects popped from 'objects_to_trace' but not visited yet,
+        # when 'mark_prefetch' is set.  Always empty outside
+        # visit_all_objects_step().
+        self.prefetched_objects = self.AddressDeque()
+        #
         # Counter tracking how many pinned objects currently reside inside
         # the nursery.
         self.pinned_objects_in_nursery = 0
@@ -489,11 +574,30 @@ class IncrementalMiniMarkGC(MovingGCBase):
                 self.gc_nursery_debug = True
             else:
                 self.gc_nursery_debug = False
+            #
+            mark_prefetch = env.read_uint_from_env('PYPY_GC_MARK_PREFETCH')
+            if mark_prefetch > 0:
+                self.mark_prefetch = intmask(min(mark_prefetch,
+                                                 r_uint(MAX_MARK_PREFETCH)))
+            #
+            max_pause = env.read_float_from_env('PYPY_GC_MAX_PAUSE')
+            if max_pause > 0.0:
+                self.max_pause = max_pause / 1000.0
+            #
+            pretenure = env.read_uint_from_env('PYPY_GC_PRETENURE')
+            if pretenure > 0:
+                self.pretenure_threshold = intmask(min(pretenure, r_uint(100)))
             self._minor_collection()    # to empty the nursery
             llarena.arena_free(self.nursery)
             self.nursery_size = newsize
             self.allocate_nursery()
         #
+        # with 'max_pause', the nursery can shrink down to 1/16th of its
+        # initial size, and grow back up to it
+        self.nursery_size_max = self.nursery_size
+        self.nursery_size_min = max(2 * (self.nonlarge_max + 1),
+                                    (self.nursery_size // 16) & ~(WORD-1))
+        #
         env_max_number_of_pinned_objects = os.environ.get('PYPY_GC_MAX_PINNED')
         if env_max_number_of_pinned_objects:
             try:
@@ -503,10 +607,16 @@ class IncrementalMiniMarkGC(MovingGCBase):
             #
             if env_max_number_of_pinned_objects >= 0: # 0 allows to disable pinning completely
                 self.max_number_of_pinned_objects = env_max_number_of_pinned_objects
+                self.max_pinned_from_env = True
         else:
-            # Estimate this number conservatively
-            bigobj = self.nonlarge_max + 1
-            self.max_number_of_pinned_objects = self.nursery_size / (bigobj * 2)
+            self._set_max_number_of_pinned_objects()
+
+    def _set_max_number_of_pinned_objects(self):
+        # Estimate this number conservatively.  Called again when
+        # _adapt_nursery_size() changes the size of the nursery, unless
+        # PYPY_GC_MAX_PINNED was given.
+        bigobj = self.nonlarge_max + 1
+        self.max_number_of_pinned_objects = self.nursery_size / (bigobj * 2)
 
     def _nursery_memory_size(self):
         extra = self.nonlarge_max + 1
@@ -751,6 +861,79 @@ class IncrementalMiniMarkGC(MovingGCBase):
             self.minor_and_major_collection()
         self.rrc_invoke_callback()
 
+    def collect_step(self, budget):
+        """Do a minor collection, then one step of the incremental major
+        collection, starting a new one if none is in progress.  If
+        'budget' > 0, the step marks about 'budget' bytes of objects, or
+        sweeps about as many bytes, instead of the usual amounts; the
+        parts that are not incremental, like the end of the marking
+        phase and FINALIZING, are still done in full.  Meant to be called
+        when the program is idle.  Returns True if this step finished a
+        major collection.
+        """
+        num_major_collects = self.num_major_collects
+        self._minor_collection()
+        self.major_collection_step(budget=budget)
+        if self.gc_state == STATE_FINALIZING:
+            # this state is not incremental anyway
+            self.major_collection_step()
+        self.rrc_invoke_callback()
+        return self.num_major_collects != num_major_collects
+
+    def freeze(self):
+        """Do a full major collection, then freeze all the objects that
+        survive.  They get GCFLAG_NO_HEAP_PTRS like prebuilt objects, so
+        that the marking phase ignores them, and they are removed from
+        the lists walked by the sweeping phase.  This means that the
+        following collections don't write to them at all, which keeps
+        their pages shared between processes forked afterwards.  Like
+        for prebuilt objects, writing a pointer into a frozen object
+        makes the write barrier add it to 'prebuilt_root_objects'.
+        Frozen objects are never freed: their destructors and finalizers
+        are forgotten.
+        """
+        # First, finish the current major gc, if there is one in progress.
+        self.gc_step_until(STATE_SCANNING)
+        if self.pinned_objects_in_nursery > 0:
+            # an old object might point to a pinned object, which would
+            # not be visited any more once it leaves the nursery; give up
+            self.minor_and_major_collection()
+            return self.num_frozen_objects
+        #
+        # Then do a complete collection again, whose sweeping phase
+        # freezes the surviving objects.
+        debug_start("gc-freeze")
+        self.gc_step_until(STATE_SWEEPING)
+        self.freezing = True
+        try:
+            self.gc_step_until(STATE_FINALIZING)
+        finally:
+            self.freezing = False
+        self.ac.freeze_pages()
+        #
+        self.old_objects_with_destructors.delete()
+        self.old_objects_with_destructors = self.AddressStack()
+        self.old_objects_with_finalizers.delete()
+        self.old_objects_with_finalizers = self.AddressDeque()
+        # the weakrefs are frozen too, and so are the objects they point to
+        self.old_objects_with_weakrefs.delete()
+        self.old_objects_with_weakrefs = self.AddressStack()
+        debug_print("frozen objects:", self.num_frozen_objects)
+        debug_stop("gc-freeze")
+        self.gc_step_until(STATE_SCANNING)
+        return self.num_frozen_objects
+
+    def _freeze_object(self, obj):
+        hdr = self.header(obj)
+        if (hdr.tid & GCFLAG_HAS_CARDS or
+                hdr.tid & GCFLAG_TRACK_YOUNG_PTRS == 0):
+            # the write barrier would not remove GCFLAG_NO_HEAP_PTRS
+            # from this object: keep it alive as a root instead
+            self.prebuilt_root_objects.append(obj)
+        else:
+            hdr.tid |= GCFLAG_NO_HEAP_PTRS
+        self.num_frozen_objects += 1
+
 
     def minor_collection_with_major_progress(self, extrasize=0):
         """Do a minor collection.  Then, if there is already a major GC
@@ -758,6 +941,8 @@ class IncrementalMiniMarkGC(MovingGCBase):
         no major GC but the threshold is reached, start a major GC.
         """
         self._minor_collection()
+        if self.max_pause > 0.0:
+            self._adapt_nursery_size(self.last_minor_pause)
 
         # If the gc_state is STATE_SCANNING, we're not in the middle
         # of an incremental major collection.  In that case, wait
@@ -797,6 +982,16 @@ class IncrementalMiniMarkGC(MovingGCBase):
         major collection, and finally reserve totalsize bytes.
         """
 
+        if self.pretenure_real_top:
+            # We only reached the limit set by _pretenure_arm_sample().
+            # Record the object as a sample if it fits below the real top.
+            self._pretenure_disarm_sample()
+            if self.nursery_free <= self.nursery_top:
+                result = self.nursery_free - totalsize
+                self.pretenure_samples.append(result)
+                self._pretenure_arm_sample()
+                return result
+        #
         minor_collection_count = 0
         while True:
             self.nursery_free = llmemory.NULL      # debug: don't use me
@@ -873,6 +1068,8 @@ class IncrementalMiniMarkGC(MovingGCBase):
             if self.nursery_top - self.nursery_free > self.debug_tiny_nursery:
                 self.nursery_free = self.nursery_top - self.debug_tiny_nursery
         #
+        if self.pretenure_threshold > 0:
+            self._pretenure_arm_sample()
         return result
     collect_and_reserve._dont_inline_ = True
 
@@ -1031,6 +1228,7 @@ class IncrementalMiniMarkGC(MovingGCBase):
         if self.next_major_collection_threshold < 0:
             # cannot trigger a full collection now, but we can ensure
             # that one will occur very soon
+            self._pretenure_disarm_sample()
             self.nursery_free = self.nursery_top
 
     def can_optimize_clean_setarrayitems(self):
@@ -1620,10 +1818,12 @@ class IncrementalMiniMarkGC(MovingGCBase):
         that remain alive and move them out."""
         #
         debug_start("gc-minor")
+        start = self.timer()
         #
         # All nursery barriers are invalid from this point on.  They
         # are evaluated anew as part of the minor collection.
         self.nursery_barriers.delete()
+        self._pretenure_disarm_sample()
         #
         # Keeps track of surviving pinned objects. See also '_trace_drag_out()'
         # where this stack is filled.  Pinning an object only prevents it from
@@ -1720,6 +1920,10 @@ class IncrementalMiniMarkGC(MovingGCBase):
         if self.young_objects_with_destructors.non_empty():
             self.deal_with_young_objects_with_destructors()
         #
+        # Check which of the sampled allocations survived.
+        if self.pretenure_samples.non_empty():
+            self._pretenure_record_samples()
+        #
         # Clear this mapping.  Without pinned objects we just clear the dict
         # as all objects in the nursery are dragged out of the nursery and, if
         # needed, into their shadow.  However, if we have pinned objects we have
@@ -1805,6 +2009,7 @@ class IncrementalMiniMarkGC(MovingGCBase):
         # Accounting: 'nursery_surviving_size' is the size of objects
         # from the nursery that we just moved out.
         self.size_objects_made_old += r_uint(self.nursery_surviving_size)
+        self.bytes_promoted += r_uint(self.nursery_surviving_size)
         #
         debug_print("minor collect, total memory used:",
                     self.get_total_memory_used())
@@ -1815,6 +2020,10 @@ class IncrementalMiniMarkGC(MovingGCBase):
         #
         self.root_walker.finished_minor_collection()
         #
+        duration = self._count_pause(start, 0)
+        self.num_minor_collects += 1
+        self.minor_collect_time += duration
+        self.last_minor_pause = duration
         debug_stop("gc-minor")
 
     def _reset_flag_old_objects_pointing_to_pinned(self, obj, ignore):
@@ -2214,10 +2423,12 @@ class IncrementalMiniMarkGC(MovingGCBase):
             n -= 1
 
     # Note - minor collections seem fast enough so that one
-    # is done before every major collection step
-    def major_collection_step(self, reserving_size=0):
+    # is done before every major collection step.  If 'budget' > 0, it
+    # replaces the usual amount of marking or sweeping work, in bytes.
+    def major_collection_step(self, reserving_size=0, budget=0):
         debug_start("gc-collect-step")
         debug_print("starting gc state: ", GC_STATES[self.gc_state])
+        start = self.timer()
         # Debugging checks
         if self.pinned_objects_in_nursery == 0:
             ll_assert(self.nursery_free == self.nursery,
@@ -2282,7 +2493,17 @@ class IncrementalMiniMarkGC(MovingGCBase):
             if estimate_from_nursery > estimate:
                 estimate = estimate_from_nursery
             estimate = intmask(estimate)
-            remaining = self.visit_all_objects_step(estimate)
+            if budget > 0:
+                estimate = budget
+            if self.max_pause > 0.0 and budget == 0:
+                # a step with an explicit budget says nothing about the
+                # step size that fits in 'max_pause'
+                start = self.timer()
+                remaining = self.visit_all_objects_step(estimate)
+                self._adapt_increment_step(estimate - remaining,
+                                           self.timer() - start)
+            else:
+                remaining = self.visit_all_objects_step(estimate)
             #
             if remaining >= estimate // 2:
                 if self.more_objects_to_trace.non_empty():
@@ -2290,11 +2511,15 @@ class IncrementalMiniMarkGC(MovingGCBase):
                     # there are more objects added during the marking steps
                     # of this major collection.  Visit them all now.
                     # The idea is to ensure termination at the cost of some
-                    # incrementality, in theory.
+                    # incrementality, in theory.  With a budget, only visit
+                    # what is left of it, and the next steps do the rest.
                     swap = self.objects_to_trace
                     self.objects_to_trace = self.more_objects_to_trace
                     self.more_objects_to_trace = swap
-                    self.visit_all_objects()
+                    if budget > 0:
+                        self.visit_all_objects_step(remaining)
+                    else:
+                        self.visit_all_objects()
 
             # XXX A simplifying assumption that should be checked,
             # finalizers/weak references are rare and short which means that
@@ -2365,6 +2590,8 @@ class IncrementalMiniMarkGC(MovingGCBase):
                 # a total object size of at least '3 * nursery_size' bytes
                 # is processed.
                 limit = 3 * self.nursery_size // self.small_request_threshold
+                if budget > 0:
+                    limit = budget // self.small_request_threshold + 1
                 self.free_unvisited_rawmalloc_objects_step(limit)
                 done = False    # the 2nd half below must still be done
             else:
@@ -2373,6 +2600,8 @@ class IncrementalMiniMarkGC(MovingGCBase):
                 # GCFLAG_VISITED on the others.  Visit at most '3 *
                 # nursery_size' bytes.
                 limit = 3 * self.nursery_size // self.ac.page_size
+                if budget > 0:
+                    limit = budget // self.ac.page_size + 1
                 done = self.ac.mass_free_incremental(self._free_if_unvisited,
                                                      limit)
             # XXX tweak the limits above
@@ -2431,9 +2660,202 @@ class IncrementalMiniMarkGC(MovingGCBase):
         else:
             ll_assert(False, "bogus gc_state")
 
+        self.num_major_steps += 1
+        self.major_step_time += self._count_pause(start, NUM_PAUSE_BUCKETS)
         debug_print("stopping, now in gc state: ", GC_STATES[self.gc_state])
         debug_stop("gc-collect-step")
 
+    # ----------
+    # PYPY_GC_MAX_PAUSE support
+
+    timer = staticmethod(time.time)
+
+    def _adapt_increment_step(self, marked, elapsed):
+        # Called after a marking step that visited 'marked' bytes in
+        # 'elapsed' seconds.  Aim for the next step to take 'max_pause'
+        # seconds at the same speed, but only move half-way there, to
+        # smooth out the variations from one step to the next.  Note
+        # that the steps are still at least twice the size of what
+        # survived the last minor collection, which ensures progress.
+        if marked <= 0:
+            return
+        if elapsed <= 0.0:      # too fast to be measured
+            target = float(self.gc_increment_step) * 2.0
+        else:
+            target = float(marked) * (self.max_pause / elapsed)
+        step = (float(self.gc_increment_step) + target) * 0.5
+        if step < MIN_INCREMENT_STEP:
+            step = MIN_INCREMENT_STEP
+        elif step > MAX_INCREMENT_STEP:
+            step = MAX_INCREMENT_STEP
+        self.gc_increment_step = r_uint(int(step))
+
+    def _adapt_nursery_size(self, elapsed):
+        # Called after a minor collection that took 'elapsed' seconds.
+        # If it took more than half the target pause, halve the nursery;
+        # if it took less than 1/8th of it, double the nursery.  This is
+        # only possible when the nursery is empty.
+        if (self.pinned_objects_in_nursery > 0 or
+                self.debug_rotating_nurseries or
+                self.debug_tiny_nursery >= 0):
+            return
+        newsize = self.nursery_size
+        if elapsed > self.max_pause * 0.5:
+            newsize = (newsize // 2) & ~(WORD-1)
+            if newsize < self.nursery_size_min:
+                return
+        elif elapsed < self.max_pause * 0.125:
+            newsize = newsize * 2
+            if newsize > self.nursery_size_max:
+                newsize = self.nursery_size_max
+            if newsize <= self.nursery_size:
+                return
+        else:
+            return
+        debug_start("gc-set-nursery-size")
+        debug_print("minor collection took", elapsed * 1000.0, "ms,",
+                    "changing nursery size to", newsize)
+        llarena.arena_free(self.nursery)
+        self.nursery_size = newsize
+        self.nursery = self._alloc_nursery()
+        self.nursery_free = self.nursery
+        self.nursery_top = self.nursery + self.nursery_size
+        if not self.max_pinned_from_env:
+            # the pinned objects must leave room for the other objects
+            self._set_max_number_of_pinned_objects()
+        debug_stop("gc-set-nursery-size")
+
+    # ----------
+    # PYPY_GC_PRETENURE support
+
+    def _new_pretenure_table(self):
+        return lltype.malloc(rffi.CArray(lltype.Signed), PRETENURE_TABLE_SIZE,
+                             flavor='raw', zero=True, immortal=True)
+
+    def _pretenure_arm_sample(self):
+        # Lower 'nursery_top' so that collect_and_reserve() is called
+        # again, and samples an allocation, after a fraction of the
+        # nursery has been allocated.  The JIT reads 'nursery_top' too,
+        # so this also samples the allocations done by the machine code.
+        interval = self.nursery_size // PRETENURE_SAMPLES_PER_NURSERY
+        sample_top = self.nursery_free + interval
+        if sample_top < self.nursery_top:
+            self.pretenure_real_top = self.nursery_top
+            self.nursery_top = sample_top
+
+    def _pretenure_disarm_sample(self):
+        if self.pretenure_real_top:
+            self.nursery_top = self.pretenure_real_top
+            self.pretenure_real_top = llmemory.NULL
+
+    def _pretenure_record_samples(self):
+        # Called during a minor collection, after all surviving objects
+        # have been moved out of the nursery, but before the nursery is
+        # cleared.  The samples are the addresses (including the header)
+        # of objects allocated in the nursery since the previous minor
+        # collection.
+        size_gc_header = self.gcheaderbuilder.size_gc_header
+        while self.pretenure_samples.non_empty():
+            obj = self.pretenure_samples.pop() + size_gc_header
+            survived = self.is_forwarded(obj)
+            typeid = self.get_possibly_forwarded_type_id(obj)
+            if self.combine(typeid, 0):   # typeid 0: not initialized yet
+                self._pretenure_record(self.get_member_index(typeid),
+                                       survived)
+
+    def _pretenure_record(self, member_index, survived):
+        i = member_index & (PRETENURE_TABLE_SIZE - 1)
+        if self.pretenure_keys[i] != member_index + 1:
+            if self.pretenure_decided[i]:
+                return     # keep the other type, already pretenured
+            self.pretenure_keys[i] = member_index + 1
+            self.pretenure_seen[i] = 0
+            self.pretenure_survived[i] = 0
+        seen = self.pretenure_seen[i] + 1
+        alive = self.pretenure_survived[i]
+        if survived:
+            alive += 1
+        if seen >= PRETENURE_MIN_SAMPLES:
+            # decide again from the samples taken since the last decision
+            decided = alive * 100 >= seen * self.pretenure_threshold
+            self.pretenure_decided[i] = int(decided)
+            seen = 0
+            alive = 0
+        self.pretenure_seen[i] = seen
+        self.pretenure_survived[i] = alive
+
+    def should_pretenure(self, typeid):
+        """Return True if most of the sampled objects of type 'typeid'
+        survived their first minor collection.  The JIT then allocates
+        the fixed-size objects of this type with malloc_fixedsize_old()."""
+        if self.pretenure_threshold <= 0:
+            return False
+        member_index = self.get_member_index(typeid)
+        i = member_index & (PRETENURE_TABLE_SIZE - 1)
+        return (self.pretenure_keys[i] == member_index + 1 and
+                self.pretenure_decided[i] != 0)
+
+    def malloc_fixedsize_old(self, typeid):
+        """Allocate a fixed-size object directly in the old generation.
+        It is not zero-filled, and has GCFLAG_TRACK_YOUNG_PTRS, so the
+        writes into it need the write barrier."""
+        obj = self.external_malloc(typeid, 0, alloc_young=False)
+        if self.gc_state == STATE_MARKING:
+            # like an object that just survived a minor collection: it
+            # is not visited yet, so it must be traced before the end
+            # of the marking
+            self.more_objects_to_trace.append(obj)
+        return llmemory.cast_adr_to_ptr(obj, llmemory.GCREF)
+
+    # ----------
+    # Statistics
+
+    def _count_pause(self, start, histogram):
+        # Count a pause that started at 'start' in one of the two pause
+        # histograms, and return its duration in seconds.
+        duration = self.timer() - start
+        if duration < 0.0:
+            duration = 0.0
+        milliseconds = duration * 1000.0
+        i = histogram
+        for limit in unroll_pause_buckets:
+            if milliseconds >= limit:
+                i += 1
+        self.pause_histograms[i] += 1
+        return duration
+
+    def get_stats(self, stat_no):
+        if stat_no == rgc.STAT_MINOR_COLLECTIONS:
+            return self.num_minor_collects
+        elif stat_no == rgc.STAT_MINOR_TIME:
+            return int(self.minor_collect_time * 1000000.0)
+        elif stat_no == rgc.STAT_MAJOR_STEPS:
+            return self.num_major_steps
+        elif stat_no == rgc.STAT_MAJOR_STEP_TIME:
+            return int(self.major_step_time * 1000000.0)
+        elif stat_no == rgc.STAT_MAJOR_COLLECTIONS:
+            return self.num_major_collects
+        elif stat_no == rgc.STAT_BYTES_PROMOTED:
+            return intmask(self.bytes_promoted)
+        elif stat_no == rgc.STAT_TOTAL_MEMORY:
+            return intmask(self.get_total_memory_used())
+        elif stat_no == rgc.STAT_ARENA_MEMORY:
+            return intmask(self.ac.total_arena_memory)
+        elif stat_no == rgc.STAT_ARENA_MEMORY_USED:
+            return intmask(self.ac.total_memory_used)
+        elif stat_no == rgc.STAT_RAWMALLOC_MEMORY:
+            return intmask(self.rawmalloced_total_size)
+        elif stat_no == rgc.STAT_PINNED_OBJECTS:
+            return self.pinned_objects_in_nursery
+        elif (rgc.STAT_MINOR_PAUSES <= stat_no <
+                  rgc.STAT_MINOR_PAUSES + NUM_PAUSE_BUCKETS):
+            return self.pause_histograms[stat_no - rgc.STAT_MINOR_PAUSES]
+        elif (rgc.STAT_MAJOR_STEP_PAUSES <= stat_no <
+                  rgc.STAT_MAJOR_STEP_PAUSES + NUM_PAUSE_BUCKETS):
+            return self.pause_histograms[NUM_PAUSE_BUCKETS + stat_no -
+                                         rgc.STAT_MAJOR_STEP_PAUSES]
+        return -1
+
     def _sweep_old_objects_pointing_to_pinned(self, obj, new_list):
         if self.header(obj).tid & GCFLAG_VISITED:
             new_list.append(obj)
@@ -2443,6 +2865,8 @@ class IncrementalMiniMarkGC(MovingGCBase):
         obj = hdr + size_gc_header
         if self.header(obj).tid & GCFLAG_VISITED:
             self.header(obj).tid &= ~GCFLAG_VISITED
+            if self.freezing:
+                self._freeze_object(obj)
             return False     # survives
         return True      # dies
 
@@ -2452,7 +2876,10 @@ class IncrementalMiniMarkGC(MovingGCBase):
     def free_rawmalloced_object_if_unvisited(self, obj, check_flag):
         if self.header(obj).tid & check_flag:
             self.header(obj).tid &= ~check_flag   # survives
-            self.old_rawmalloced_objects.append(obj)
+            if self.freezing:
+                self._freeze_object(obj)     # and is not swept any more
+            else:
+                self.old_rawmalloced_objects.append(obj)
         else:
             size_gc_header = self.gcheaderbuilder.size_gc_header
             totalsize = size_gc_header + self.get_size(obj)
@@ -2556,6 +2983,8 @@ class IncrementalMiniMarkGC(MovingGCBase):
     TEST_VISIT_SINGLE_STEP = False    # for tests
 
     def visit_all_objects_step(self, size_to_track):
+        if self.mark_prefetch > 0:
+            return self._visit_all_objects_step_prefetching(size_to_track)
         # Objects can be added to pending by visit
         pending = self.objects_to_trace
         while pending.non_empty():
@@ -2565,6 +2994,34 @@ class IncrementalMiniMarkGC(MovingGCBase):
                 return 0
         return size_to_track
 
+    def _visit_all_objects_step_prefetching(self, size_to_track):
+        # Same as visit_all_objects_step(), but the objects popped from
+        # 'objects_to_trace' first wait in the FIFO 'prefetched_objects',
+        # up to 'mark_prefetch' of them.  We prefetch their header when
+        # they enter the FIFO; by the time visit() reads it, the cache
+        # miss has hopefully been served while we visited the others.
+        # The order in which objects are visited doesn't matter.
+        pending = self.objects_to_trace
+        prefetched = self.prefetched_objects
+        size_gc_header = self.gcheaderbuilder.size_gc_header
+        in_flight = 0
+        while True:
+            while in_flight < self.mark_prefetch and pending.non_empty():
+                obj = pending.pop()
+                llop.raw_prefetch(lltype.Void, obj - size_gc_header)
+                prefetched.append(obj)
+                in_flight += 1
+            if in_flight == 0:
+                return size_to_track
+            obj = prefetched.popleft()
+            in_flight -= 1
+            size_to_track -= self.visit(obj)
+            if size_to_track < 0 or self.TEST_VISIT_SINGLE_STEP:
+                # put back the objects still in flight
+                while prefetched.non_empty():
+                    pending.append(prefetched.popleft())
+                return 0
+
     def visit(self, obj):
         #
         # 'obj' is a live object.  Check GCFLAG_VISITED to know if we
@@ -2786,6 +3243,8 @@ class IncrementalMiniMarkGC(MovingGCBase):
 
     def _finalization_state(self, obj):
         tid = self.header(obj).tid
+        if tid & GCFLAG_NO_HEAP_PTRS:
+            return 3     # prebuilt or frozen object, immortal
         if tid & GCFLAG_VISITED:
             if tid & GCFLAG_FINALIZATION_ORDERING:
                 return 2
@@ -137,9 +137,18 @@ class ArenaCollection(object):
         # part of current_arena might still contain uninitialized pages
         self.num_uninitialized_pages = 0
         #
+        # the size class being walked by mass_free_incremental(), or -1
+        self.size_class_with_old_pages = -1
+        #
         # the total memory used, counting every block in use, without
         # the additional bookkeeping stuff.
         self.total_memory_used = r_uint(0)
+        #
+        # the part of it that is in pages forgotten by freeze_pages()
+        self.total_memory_frozen = r_uint(0)
+        #
+        # the memory taken by all the arenas currently allocated
+        self.total_arena_memory = r_uint(0)
 
 
     def _new_page_ptr_list(self, length):
@@ -296,6 +305,7 @@ class ArenaCollection(object):
         if not arena_base:
             out_of_memory("out of memory: couldn't allocate the next arena")
         arena_end = arena_base + self.arena_size
+        self.total_arena_memory += r_uint(self.arena_size)
         #
         # 'firstpage' points to the first unused page
         firstpage = start_of_page(arena_base + self.page_size - 1,
@@ -319,7 +329,7 @@ class ArenaCollection(object):
         """Prepare calls to mass_free_incremental(): moves the chained lists
         into 'self.old_xxx'.
         """
-        self.total_memory_used = r_uint(0)
+        self.total_memory_used = self.total_memory_frozen
         #
         size_class = self.small_request_threshold >> WORD_POWER_2
         self.size_class_with_old_pages = size_class
@@ -374,6 +384,22 @@ class ArenaCollection(object):
         ll_assert(res, "non-incremental mass_free_in_pages() returned False")
 
 
+    def freeze_pages(self):
+        """Forget all the pages that contain objects.  These objects must
+        be immortal from now on: mass_free() will not walk these pages
+        any more, and no more objects are allocated in them, so that they
+        are left untouched.  The free blocks they still contain are lost.
+        """
+        ll_assert(self.size_class_with_old_pages < 0,
+                  "freeze_pages() called during mass_free_incremental()")
+        size_class = self.small_request_threshold >> WORD_POWER_2
+        while size_class >= 1:
+            self.page_for_size[size_class]      = PAGE_NULL
+            self.full_page_for_size[size_class] = PAGE_NULL
+            size_class -= 1
+        self.total_memory_frozen = self.total_memory_used
+
+
     def _rehash_arenas_lists(self):
         #
         # Rehash arenas into the correct arenas_lists[i].  If
@@ -398,6 +424,7 @@ class ArenaCollection(object):
                     llarena.arena_reset(arena.base, self.arena_size, 4)
                     llarena.arena_free(arena.base)
                     lltype.free(arena, flavor='raw', track_allocation=False)
+                    self.total_arena_memory -= r_uint(self.arena_size)
                     #
                 else:
                     # Insert 'arena' in the correct arenas_lists[n]
@@ -20,6 +20,11 @@ class SimpleArenaCollection(object):
         self.small_request_threshold = small_request_threshold
         self.all_objects = []
         self.total_memory_used = 0
+        self.total_memory_frozen = 0
+
+    @property
+    def total_arena_memory(self):
+        return self.total_memory_used    # every object is its own "arena"
 
     def malloc(self, size):
         nsize = raw_malloc_usage(size)
@@ -36,7 +41,7 @@ class SimpleArenaCollection(object):
     def mass_free_prepare(self):
         self.old_all_objects = self.all_objects
         self.all_objects = []
-        self.total_memory_used = 0
+        self.total_memory_used = self.total_memory_frozen
 
     def mass_free_incremental(self, ok_to_free_func, max_pages):
         old = self.old_all_objects
@@ -56,3 +61,7 @@ class SimpleArenaCollection(object):
         self.mass_free_prepare()
         res = self.mass_free_incremental(ok_to_free_func, sys.maxint)
         assert res
+
+    def freeze_pages(self):
+        self.all_objects = []
+        self.total_memory_frozen = self.total_memory_used
@@ -673,6 +673,285 @@ class TestIncrementalMiniMarkGCSimple(TestMiniMarkGCSimple):
 
 class TestIncrementalMiniMarkGCFull(DirectGCTest):
     from rpython.memory.gc.incminimark import IncrementalMiniMarkGC as GCClass
+
+    def test_freeze(self):
+        p = self.malloc(S)
+        p.x = 5
+        p.next = self.malloc(S)
+        p.next.x = 6
+        self.stackroots.append(p)
+        assert self.gc.freeze() == 2
+        p = self.stackroots.pop()
+        hdr = self.gc.header(llmemory.cast_ptr_to_adr(p))
+        assert hdr.tid & incminimark.GCFLAG_NO_HEAP_PTRS
+        # frozen objects survive without roots, and are not marked
+        self.gc.collect()
+        assert p.x == 5
+        assert p.next.x == 6
+        assert hdr.tid & incminimark.GCFLAG_VISITED == 0
+        # the pages of frozen objects are not swept any more
+        assert self.gc.ac.total_memory_frozen > 0
+        assert self.gc.ac.total_memory_used == self.gc.ac.total_memory_frozen
+        q = self.malloc(S)
+        self.stackroots.append(q)
+        self.gc.collect()
+        q = self.stackroots.pop()
+        # writing a pointer into a frozen object makes it a root
+        self.write(p, 'prev', q)
+        q.x = 7
+        assert hdr.tid & incminimark.GCFLAG_NO_HEAP_PTRS == 0
+        self.gc.collect()
+        assert p.prev.x == 7
+        assert p.next.x == 6
+        assert hdr.tid & incminimark.GCFLAG_VISITED == 0
+        self.gc.debug_check_consistency()
+
+    def test_mark_prefetch(self):
+        self.gc.mark_prefetch = 4
+        for j in range(3):
+            p = self.malloc(S)
+            p.x = j * 100
+            self.stackroots.append(p)
+            for i in range(1, 20):
+                q = self.malloc(S)
+                q.x = j * 100 + i
+                self.write(q, 'next', self.stackroots[-1])
+                self.stackroots[-1] = q
+        self.gc.debug_gc_step_until(incminimark.STATE_MARKING)
+        # tiny steps: the objects still in flight go back to
+        # 'objects_to_trace' every time
+        while self.gc.objects_to_trace.non_empty():
+            self.gc.visit_all_objects_step(1)
+            assert not self.gc.prefetched_objects.non_empty()
+        self.gc.debug_gc_step_until(incminimark.STATE_SCANNING)
+        self.gc.collect()
+        for j in range(3):
+            p = self.stackroots[j]
+            for i in range(19, -1, -1):
+                assert p.x == j * 100 + i
+                p = p.next
+            assert not p
+        self.gc.debug_check_consistency()
+
+    def test_max_pause_increment_step(self):
+        self.gc.max_pause = 0.001
+        self.gc.gc_increment_step = 1000000
+        # marking 1MB took 10ms: the target is 100KB, go half-way there
+        self.gc._adapt_increment_step(1000000, 0.010)
+        assert self.gc.gc_increment_step == 550000
+        # a step too fast to be measured: the target is twice the size
+        self.gc._adapt_increment_step(1000, 0.0)
+        assert self.gc.gc_increment_step == 825000
+        for i in range(50):
+            self.gc._adapt_increment_step(1000, 1.0)
+        assert self.gc.gc_increment_step == incminimark.MIN_INCREMENT_STEP
+
+    def test_max_pause_nursery_size(self):
+        class FakeTimer(object):
+            now = 0.0
+            delta = 0.0
+            def __call__(self):
+                self.now += self.delta
+                return self.now
+        timer = FakeTimer()
+        self.gc.timer = timer
+        self.gc.max_pause = 0.001
+        size = self.gc.nursery_size
+        p = self.malloc(S)
+        p.x = 42
+        self.stackroots.append(p)
+        # the minor collections are too slow: halve the nursery, but
+        # not below 'nursery_size_min'
+        timer.delta = 0.01
+        self.gc.minor_collection_with_major_progress()
+        assert self.gc.nursery_size == size // 2
+        self.gc.minor_collection_with_major_progress()
+        assert self.gc.nursery_size == self.gc.nursery_size_min
+        q = self.malloc(S)
+        q.x = 43
+        self.write(self.stackroots[0], 'next', q)
+        # they are fast again: grow the nursery back
+        timer.delta = 0.00001
+        self.gc.minor_collection_with_major_progress()
+        assert self.gc.nursery_size == size
+        self.gc.minor_collection_with_major_progress()
+        assert self.gc.nursery_size == size
+        assert self.stackroots[0].x == 42
+        assert self.stackroots[0].next.x == 43
+        self.gc.debug_check_consistency()
+
+    def test_max_pause_nursery_size_pinning(self):
+        class FakeTimer(object):
+            now = 0.0
+            def __call__(self):
+                self.now += 0.01
+                return self.now
+        self.gc.timer = FakeTimer()
+        self.gc.max_pause = 0.001
+        while self.gc.nursery_size > self.gc.nursery_size_min:
+            self.gc.minor_collection_with_major_progress()
+        # the pinned objects still leave room for the others in the
+        # smaller nursery
+        INTS = lltype.GcArray(lltype.Signed)
+        n = (self.gc.nonlarge_max + 1) // WORD - 3
+        for i in range(10):
+            p = self.malloc(INTS, n)
+            self.stackroots.append(p)
+            if not self.gc.pin(llmemory.cast_ptr_to_adr(p)):
+                break
+        assert 0 < self.gc.pinned_objects_in_nursery < 10
+        for i in range(10):
+            self.malloc(INTS, n)
+        for p in self.stackroots:
+            adr = llmemory.cast_ptr_to_adr(p)
+            if self.gc._is_pinned(adr):
+                self.gc.unpin(adr)
+        self.gc.collect()
+        self.gc.debug_check_consistency()
+
+    def test_collect_step(self):
+        for i in range(100):
+            p = self.malloc(S)
+            p.x = i
+            if i > 0:
+                self.write(p, 'next', self.stackroots[-1])
+                self.stackroots.pop()
+            self.stackroots.append(p)
+        self.gc.collect()      # make everything old
+        # with a small budget, a major collection takes several steps
+        steps = 1
+        while not self.gc.collect_step(4 * WORD):
+            assert self.gc.gc_state != incminimark.STATE_FINALIZING
+            steps += 1
+        assert steps > 4
+        assert self.gc.gc_state == incminimark.STATE_SCANNING
+        # with a large budget, it is only a few steps
+        steps = 1
+        while not self.gc.collect_step(10**9):
+            steps += 1
+        assert steps <= 3
+        p = self.stackroots[0]
+        for i in range(99, -1, -1):
+            assert p.x == i
+            p = p.next
+        self.gc.debug_check_consistency()
+
+    def test_collect_step_budget(self):
+        for i in range(100):
+            p = self.malloc(S)
+            p.x = i
+            if i > 0:
+                self.write(p, 'next', self.stackroots[-1])
+                self.stackroots.pop()
+            self.stackroots.append(p)
+        self.gc.collect()      # make everything old
+        self.gc.max_pause = 0.001
+        self.gc.gc_increment_step = 12345
+        self.gc.collect_step(4 * WORD)
+        assert self.gc.gc_state == incminimark.STATE_MARKING
+        # pretend that the root was added during the marking steps: a
+        # step with a budget doesn't visit all these objects at once
+        gc = self.gc
+        gc.objects_to_trace, gc.more_objects_to_trace = (
+            gc.more_objects_to_trace, gc.objects_to_trace)
+        assert not gc.objects_to_trace.non_empty()
+        gc.collect_step(4 * WORD)
+        assert gc.gc_state == incminimark.STATE_MARKING
+        steps = 2
+        while not gc.collect_step(4 * WORD):
+            steps += 1
+        assert steps > 4
+        # steps with a budget don't tune the usual step size
+        assert gc.gc_increment_step == 12345
+        p = self.stackroots[0]
+        for i in range(99, -1, -1):
+            assert p.x == i
+            p = p.next
+        gc.debug_check_consistency()
+
+    def test_get_stats(self):
+        from rpython.rlib import rgc
+        class FakeTimer(object):
+            now = 0.0
+            def __call__(self):
+                self.now += 0.002
+                return self.now
+        self.gc.timer = FakeTimer()
+        p = self.malloc(S)
+        p.x = 42
+        self.stackroots.append(p)
+        self.gc.minor_collection_with_major_progress()
+        assert self.gc.get_stats(rgc.STAT_MINOR_COLLECTIONS) == 1
+        assert self.gc.get_stats(rgc.STAT_MINOR_TIME) == 2000
+        assert self.gc.get_stats(rgc.STAT_BYTES_PROMOTED) > 0
+        # each pause took 2ms, so they are all in the 'under_5ms' bucket
+        assert self.gc.get_stats(rgc.STAT_MINOR_PAUSES + 0) == 0
+        assert self.gc.get_stats(rgc.STAT_MINOR_PAUSES + 1) == 1
+        #
+        self.gc.collect()
+        assert self.gc.get_stats(rgc.STAT_MAJOR_COLLECTIONS) == 1
+        steps = self.gc.get_stats(rgc.STAT_MAJOR_STEPS)
+        assert steps > 0
+        assert self.gc.get_stats(rgc.STAT_MAJOR_STEP_TIME) == steps * 2000
+        assert self.gc.get_stats(rgc.STAT_MAJOR_STEP_PAUSES + 1) == steps
+        assert (self.gc.get_stats(rgc.STAT_TOTAL_MEMORY) ==
+                self.gc.get_stats(rgc.STAT_ARENA_MEMORY_USED) +
+                self.gc.get_stats(rgc.STAT_RAWMALLOC_MEMORY))
+        assert (self.gc.get_stats(rgc.STAT_ARENA_MEMORY) >=
+                self.gc.get_stats(rgc.STAT_ARENA_MEMORY_USED))
+        assert self.gc.get_stats(rgc.STAT_PINNED_OBJECTS) == 0
+        assert self.gc.get_stats(-1) == -1
+        assert self.stackroots[0].x == 42
+
+    def test_pretenure(self):
+        self.gc.pretenure_threshold = 50
+        # the S objects all survive, the VARNODE objects all die
+        for i in range(200):
+            p = self.malloc(S)
+            p.x = i
+            if i > 0:
+                self.write(p, 'next', self.stackroots.pop())
+            self.stackroots.append(p)
+            self.malloc(VARNODE)
+        self.gc.minor_collection_with_major_progress()
+        assert self.gc.should_pretenure(self.get_type_id(S))
+        assert not self.gc.should_pretenure(self.get_type_id(VARNODE))
+        p = self.stackroots[0]
+        for i in range(199, -1, -1):
+            assert p.x == i
+            p = p.next
+        self.gc.pretenure_threshold = 0
+        assert not self.gc.should_pretenure(self.get_type_id(S))
+
+    def malloc_old(self, TYPE):
+        p = self.gc.malloc_fixedsize_old(self.get_type_id(TYPE))
+        p = lltype.cast_opaque_ptr(lltype.Ptr(TYPE), p)
+        zero_gc_pointers_inside(p, TYPE)
+        assert not self.gc.is_in_nursery(llmemory.cast_ptr_to_adr(p))
+        return p
+
+    def test_malloc_fixedsize_old(self):
+        p = self.malloc_old(S)
+        p.x = 42
+        self.stackroots.append(p)
+        # the write barrier is needed for young objects stored into 'p'
+        q = self.malloc(S)
+        q.x = 43
+        self.write(p, 'next', q)
+        self.gc.minor_collection_with_major_progress()
+        assert self.stackroots[0].next.x == 43
+        # objects allocated old during the marking are kept alive even if
+        # they are only referenced from the stack
+        self.gc.debug_gc_step_until(incminimark.STATE_MARKING)
+        p = self.malloc_old(S)
+        p.x = 44
+        self.stackroots.append(p)
+        self.gc.collect()
+        assert self.stackroots[0].x == 42
+        assert self.stackroots[0].next.x == 43
+        assert self.stackroots[1].x == 44
+        self.gc.debug_check_consistency()
+
     def test_malloc_fixedsize_no_cleanup(self):
         p = self.malloc(S)
         import pytest
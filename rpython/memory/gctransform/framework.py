@@ -308,6 +308,14 @@ class BaseFrameworkGCTransformer(GCTransformer):
 
         self.collect_ptr = getfn(GCClass.collect.im_func,
             [s_gc, annmodel.SomeInteger()], annmodel.s_None)
+        self.freeze_ptr = getfn(GCClass.freeze.im_func,
+                                [s_gc], annmodel.SomeInteger())
+        self.collect_step_ptr = getfn(GCClass.collect_step.im_func,
+                                      [s_gc, annmodel.SomeInteger()],
+                                      annmodel.SomeBool())
+        self.get_stats_ptr = getfn(GCClass.get_stats.im_func,
+                                   [s_gc, annmodel.SomeInteger()],
+                                   annmodel.SomeInteger())
         self.can_move_ptr = getfn(GCClass.can_move.im_func,
                                   [s_gc, SomeAddress()],
                                   annmodel.SomeBool())
@@ -559,6 +567,14 @@ class BaseFrameworkGCTransformer(GCTransformer):
                                               [s_gc, SomeAddress()],
                                               SomeAddress())
 
+        if hasattr(GCClass, 'should_pretenure'):
+            self.should_pretenure_ptr = getfn(GCClass.should_pretenure,
+                                              [s_gc, s_typeid16],
+                                              annmodel.SomeBool())
+            self.malloc_fixedsize_old_ptr = getfn(
+                GCClass.malloc_fixedsize_old,
+                [s_gc, s_typeid16], s_gcref)
+
 
     def create_custom_trace_funcs(self, gc, rtyper):
         custom_trace_funcs = tuple(rtyper.custom_trace_funcs)
@@ -843,6 +859,24 @@ class BaseFrameworkGCTransformer(GCTransformer):
                   resultvar=op.result)
         self.pop_roots(hop, livevars)
 
+    def gct_gc_freeze(self, hop):
+        livevars = self.push_roots(hop)
+        hop.genop("direct_call", [self.freeze_ptr, self.c_const_gc],
+                  resultvar=hop.spaceop.result)
+        self.pop_roots(hop, livevars)
+
+    def gct_gc_collect_step(self, hop):
+        livevars = self.push_roots(hop)
+        hop.genop("direct_call", [self.collect_step_ptr, self.c_const_gc,
+                                  hop.spaceop.args[0]],
+                  resultvar=hop.spaceop.result)
+        self.pop_roots(hop, livevars)
+
+    def gct_gc_get_stats(self, hop):
+        hop.genop("direct_call", [self.get_stats_ptr, self.c_const_gc,
+                                  hop.spaceop.args[0]],
+                  resultvar=hop.spaceop.result)
+
     def gct_gc_can_move(self, hop):
         op = hop.spaceop
         v_addr = hop.genop('cast_ptr_to_adr',
@@ -975,6 +1009,35 @@ class BaseFrameworkGCTransformer(GCTransformer):
             self.emit_raw_memclear(hop.llops, v_clear_size, None,
                                    c_after_header, v_a)
 
+    def gct_do_malloc_fixedsize_old(self, hop):
+        # used by the JIT (see rpython.jit.backend.llsupport.gc)
+        op = hop.spaceop
+        [v_typeid, v_size] = op.args
+        livevars = self.push_roots(hop)
+        if hasattr(self, 'malloc_fixedsize_old_ptr'):
+            hop.genop("direct_call",
+                      [self.malloc_fixedsize_old_ptr, self.c_const_gc,
+                       v_typeid],
+                      resultvar=op.result)
+        else:
+            # never called with GCs that don't support pretenuring
+            c_false = rmodel.inputconst(lltype.Bool, False)
+            hop.genop("direct_call",
+                      [self.malloc_fixedsize_ptr, self.c_const_gc,
+                       v_typeid, v_size, c_false, c_false, c_false],
+                      resultvar=op.result)
+        self.pop_roots(hop, livevars)
+
+    def gct_gc_should_pretenure(self, hop):
+        # used by the JIT (see rpython.jit.backend.llsupport.gc)
+        if not hasattr(self, 'should_pretenure_ptr'):
+            c_false = rmodel.inputconst(lltype.Bool, False)
+            hop.genop("same_as", [c_false], resultvar=hop.spaceop.result)
+            return
+        hop.genop("direct_call", [self.should_pretenure_ptr, self.c_const_gc,
+                                  hop.spaceop.args[0]],
+                  resultvar=hop.spaceop.result)
+
     def gct_do_malloc_varsize(self, hop):
         # used by the JIT (see rpython.jit.backend.llsupport.gc)
         op = hop.spaceop
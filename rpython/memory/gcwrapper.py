@@ -135,6 +135,15 @@ class GCManagedHeap(object):
     def collect(self, *gen):
         self.gc.collect(*gen)
 
+    def freeze(self):
+        return self.gc.freeze()
+
+    def collect_step(self, budget):
+        return self.gc.collect_step(budget)
+
+    def get_stats(self, stat_no):
+        return self.gc.get_stats(stat_no)
+
     def can_move(self, addr):
         return self.gc.can_move(addr)
 
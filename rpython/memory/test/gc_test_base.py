@@ -797,6 +797,52 @@ class GCTest(object):
         res = self.interpret(f, [20])  # for GenerationGC, enough for a minor collection
         assert res == True
 
+    def test_freeze(self):
+        import weakref
+        class A:
+            pass
+        def f(x):
+            a = A()
+            a.x = x
+            a.next = None
+            b = A()
+            b.x = x + 1
+            b.next = None
+            a.next = b
+            ref = weakref.ref(b)
+            rgc.freeze()
+            c = A()
+            c.x = x + 2
+            c.next = None
+            b.next = c
+            llop.gc__collect(lltype.Void)
+            llop.gc__collect(lltype.Void)
+            return a.next.x + ref().next.x * 10
+        res = self.interpret(f, [5])
+        assert res == 76
+
+    def test_collect_step(self):
+        class A:
+            pass
+        def f(x):
+            a = None
+            for i in range(x):
+                b = A()
+                b.x = i
+                b.next = a
+                a = b
+            steps = 1
+            while not rgc.collect_step(64):
+                steps += 1
+            total = 0
+            while a is not None:
+                total += a.x
+                a = a.next
+            return total * 1000 + steps
+        res = self.interpret(f, [20])
+        assert res // 1000 == 190
+        assert res % 1000 >= 1
+
     def test_many_weakrefs(self):
         # test for the case where allocating the weakref itself triggers
         # a collection
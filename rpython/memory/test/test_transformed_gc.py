@@ -1438,6 +1438,83 @@ class TestIncrementalMiniMarkGC(TestMiniMarkGC):
         res = run([])
         assert res
 
+    def define_get_stats(cls):
+        class A:
+            pass
+        def f():
+            a = None
+            for i in range(100):
+                b = A()
+                b.next = a
+                a = b
+            llop.gc__collect(lltype.Void)
+            assert rgc.get_stats(rgc.STAT_MINOR_COLLECTIONS) > 0
+            assert rgc.get_stats(rgc.STAT_BYTES_PROMOTED) > 0
+            assert rgc.get_stats(rgc.STAT_MAJOR_STEPS) > 0
+            assert (rgc.get_stats(rgc.STAT_TOTAL_MEMORY) >=
+                    rgc.get_stats(rgc.STAT_ARENA_MEMORY_USED))
+            return rgc.get_stats(rgc.STAT_MAJOR_COLLECTIONS)
+        return f
+
+    def test_get_stats(self):
+        run = self.runner("get_stats")
+        res = run([])
+        assert res >= 1
+
+    def define_collect_step(cls):
+        class A:
+            pass
+        def f():
+            a = None
+            for i in range(100):
+                b = A()
+                b.x = i
+                b.next = a
+                a = b
+            steps = 1
+            while not rgc.collect_step(100):
+                steps += 1
+            total = 0
+            while a is not None:
+                total += a.x
+                a = a.next
+            assert total == 4950
+            return steps
+        return f
+
+    def test_collect_step(self):
+        run = self.runner("collect_step")
+        res = run([])
+        assert res > 1
+
+class TestIncrementalMiniMarkGCFreeze(GCTest):
+    # freeze() leaves the objects of the previous tests in pages that the
+    # GC forgets about, and the runner reuses the same GC for all the tests
+    # of a class; so this test gets a GC of its own
+    gcname = "incminimark"
+    gcpolicy = TestIncrementalMiniMarkGC.gcpolicy
+
+    def define_freeze(cls):
+        class A:
+            pass
+        def func():
+            a = A()
+            a.x = 42
+            a.next = None
+            rgc.freeze()
+            b = A()
+            b.x = 43
+            b.next = None
+            a.next = b
+            llop.gc__collect(lltype.Void)
+            return a.x * 100 + a.next.x
+        return func
+
+    def test_freeze(self):
+        run = self.runner("freeze")
+        res = run([])
+        assert res == 4243
+
 # ________________________________________________________________
 # tagged pointers
 
@@ -549,6 +549,9 @@ PARAMETER_DOCS = {
     'trace_limit': 'number of recorded operations before we abort tracing with ABORT_TOO_LONG',
     'inlining': 'inline python functions or not (1/0)',
     'loop_longevity': 'a parameter controlling how long loops will be kept before being freed, an estimate',
+    'memory_budget': 'estimated number of bytes of machine code and resume data above which the least useful loops are freed (0=unlimited)',
+    'compile_budget': 'milliseconds that may be spent tracing and compiling bridges per compile_budget_window; further bridges are deferred to the next window (0=unlimited)',
+    'compile_budget_window': 'length in milliseconds of the time window of compile_budget',
     'retrace_limit': 'how many times we can try retracing before giving up',
     'max_retrace_guards': 'number of extra guards a retrace can cause',
     'max_unroll_loops': 'number of extra unrollings a loop can cause',
@@ -570,6 +573,9 @@ PARAMETERS = {'threshold': 1039, # just above 1024, prime
               'trace_limit': 6000,
               'inlining': 1,
               'loop_longevity': 1000,
+              'memory_budget': 0,
+              'compile_budget': 0,
+              'compile_budget_window': 1000,
               'retrace_limit': 0,
               'max_retrace_guards': 15,
               'max_unroll_loops': 0,
@@ -1313,6 +1319,7 @@ class Counters(object):
     ABORT_BAD_LOOP
     ABORT_ESCAPE
     ABORT_FORCE_QUASIIMMUT
+    TRUNCATED_TRACES
     NVIRTUALS
     NVHOLES
     NVREUSED
@@ -129,6 +129,16 @@ LOOP_RUN_CONTAINER = lltype.GcArray(lltype.Struct('elem',
 def stats_get_loop_run_times(warmrunnerdesc):
     return warmrunnerdesc.metainterp_sd.cpu.get_all_loop_runs()
 
+LOOP_STATS_CONTAINER = lltype.GcArray(lltype.Struct('elem',
+                                        ('number', lltype.Signed),
+                                        ('guard_failures', lltype.Signed),
+                                        ('bridges', lltype.Signed),
+                                        ('asm_size', lltype.Signed)))
+
+@register_helper(lltype.Ptr(LOOP_STATS_CONTAINER))
+def stats_get_loop_stats(warmrunnerdesc):
+    return warmrunnerdesc.memory_manager.get_loop_stats()
+
 @register_helper(annmodel.SomeInteger(unsigned=True))
 def stats_asmmemmgr_allocated(warmrunnerdesc):
     return warmrunnerdesc.metainterp_sd.cpu.asmmemmgr.get_stats()[0]
@@ -137,6 +147,18 @@ def stats_asmmemmgr_allocated(warmrunnerdesc):
 def stats_asmmemmgr_used(warmrunnerdesc):
     return warmrunnerdesc.metainterp_sd.cpu.asmmemmgr.get_stats()[1]
 
+@register_helper(annmodel.SomeInteger())
+def stats_memmgr_get_value(warmrunnerdesc, no):
+    return warmrunnerdesc.memory_manager.get_stat(no)
+
+@register_helper(annmodel.SomeInteger())
+def stats_compile_budget_get_value(warmrunnerdesc, no):
+    return warmrunnerdesc.compile_budget.get_stat(no)
+
+@register_helper(annmodel.s_None)
+def seal_machine_code(warmrunnerdesc):
+    warmrunnerdesc.metainterp_sd.cpu.seal_machine_code()
+
 # ---------------------- jitcell interface ----------------------
 
 def _new_hook(name, resulttype):
@@ -19,6 +19,65 @@ def set_max_heap_size(nbytes):
     """
     pass
 
+def freeze():
+    """Do a full collection, then make all the objects that survive it
+    immortal.  With the incminimark GC, the following collections don't
+    write to the memory holding these objects any more, as long as the
+    program doesn't write to them either; this is meant to be called in
+    a pre-forking server before the worker processes are forked, so that
+    they keep sharing these pages.  Returns the total number of objects
+    frozen so far, or 0 if the GC doesn't support it.
+    """
+    collect()
+    return 0
+
+def collect_step(budget=0):
+    """Do a minor collection and a step of the incremental major
+    collection, starting one if needed.  If 'budget' > 0, the step does
+    about 'budget' bytes of marking or sweeping work instead of the usual
+    amount.  Returns True if a major collection has just finished.  With
+    GCs that are not incremental, this does a full collection.
+    """
+    collect()
+    return True
+
+# indices for get_stats()
+STAT_MINOR_COLLECTIONS = 0
+STAT_MINOR_TIME = 1             # in microseconds
+STAT_MAJOR_STEPS = 2
+STAT_MAJOR_STEP_TIME = 3        # in microseconds
+STAT_MAJOR_COLLECTIONS = 4
+STAT_BYTES_PROMOTED = 5
+STAT_TOTAL_MEMORY = 6
+STAT_ARENA_MEMORY = 7
+STAT_ARENA_MEMORY_USED = 8
+STAT_RAWMALLOC_MEMORY = 9
+STAT_PINNED_OBJECTS = 10
+STAT_MINOR_PAUSES = 11          # followed by one entry per bucket
+STAT_MAJOR_STEP_PAUSES = 16     # followed by one entry per bucket
+
+# upper bounds, in milliseconds, of the buckets of the pause histograms;
+# the last bucket is for everything longer
+PAUSE_BUCKETS = [1, 5, 10, 50]
+pause_bucket_names = ['under_%dms' % _limit for _limit in PAUSE_BUCKETS] + [
+                      'over_%dms' % PAUSE_BUCKETS[-1]]
+stat_names = ['minor_collections', 'minor_collection_time', 'major_steps',
+              'major_step_time', 'major_collections', 'bytes_promoted',
+              'total_memory', 'arena_memory', 'arena_memory_used',
+              'rawmalloc_memory', 'pinned_objects'] + [
+              'minor_pauses_' + _name for _name in pause_bucket_names] + [
+              'major_step_pauses_' + _name for _name in pause_bucket_names]
+assert stat_names.index('minor_pauses_under_1ms') == STAT_MINOR_PAUSES
+assert stat_names.index('major_step_pauses_under_1ms') == STAT_MAJOR_STEP_PAUSES
+
+def get_stats(stat_no):
+    """Return one of the STAT_xxx counters of the GC, or -1 if the GC
+    doesn't provide it.  The counters are cumulative since the start of
+    the process, apart from the memory sizes and the number of pinned
+    objects, which are the current values.
+    """
+    return -1
+
 # for test purposes we allow objects to be pinned and use
 # the following list to keep track of the pinned objects
 _pinned_objects = []
@@ -137,6 +196,45 @@ class SetMaxHeapSizeEntry(ExtRegistryEntry):
         return hop.genop('gc_set_max_heap_size', [v_nbytes],
                          resulttype=lltype.Void)
 
+class FreezeEntry(ExtRegistryEntry):
+    _about_ = freeze
+
+    def compute_result_annotation(self):
+        from rpython.annotator import model as annmodel
+        return annmodel.SomeInteger()
+
+    def specialize_call(self, hop):
+        hop.exception_cannot_occur()
+        return hop.genop('gc_freeze', [], resulttype=hop.r_result)
+
+class CollectStepEntry(ExtRegistryEntry):
+    _about_ = collect_step
+
+    def compute_result_annotation(self, s_budget=None):
+        from rpython.annotator import model as annmodel
+        return annmodel.SomeBool()
+
+    def specialize_call(self, hop):
+        if len(hop.args_s) == 1:
+            [v_budget] = hop.inputargs(lltype.Signed)
+        else:
+            v_budget = hop.inputconst(lltype.Signed, 0)
+        hop.exception_cannot_occur()
+        return hop.genop('gc_collect_step', [v_budget],
+                         resulttype=hop.r_result)
+
+class GetStatsEntry(ExtRegistryEntry):
+    _about_ = get_stats
+
+    def compute_result_annotation(self, s_stat_no):
+        from rpython.annotator import model as annmodel
+        return annmodel.SomeInteger()
+
+    def specialize_call(self, hop):
+        [v_stat_no] = hop.inputargs(lltype.Signed)
+        hop.exception_cannot_occur()
+        return hop.genop('gc_get_stats', [v_stat_no], resulttype=hop.r_result)
+
 def can_move(p):
     """Check if the GC object 'p' is at an address that can move.
     Must not be called with None.  With non-moving GCs, it is always False.
@@ -816,6 +816,15 @@ class LLFrame(object):
     def op_gc__collect(self, *gen):
         self.heap.collect(*gen)
 
+    def op_gc_freeze(self):
+        return self.heap.freeze()
+
+    def op_gc_collect_step(self, budget):
+        return self.heap.collect_step(budget)
+
+    def op_gc_get_stats(self, stat_no):
+        return self.heap.get_stats(stat_no)
+
     def op_gc_heap_stats(self):
         raise NotImplementedError
 
@@ -976,11 +985,16 @@ class LLFrame(object):
         raise NotImplementedError("do_malloc_fixedsize")
     def op_do_malloc_fixedsize_clear(self):
         raise NotImplementedError("do_malloc_fixedsize_clear")
+    def op_do_malloc_fixedsize_old(self):
+        raise NotImplementedError("do_malloc_fixedsize_old")
     def op_do_malloc_varsize(self):
         raise NotImplementedError("do_malloc_varsize")
     def op_do_malloc_varsize_clear(self):
         raise NotImplementedError("do_malloc_varsize_clear")
 
+    def op_gc_should_pretenure(self):
+        raise NotImplementedError("gc_should_pretenure")
+
     def op_get_write_barrier_failing_case(self):
         raise NotImplementedError("get_write_barrier_failing_case")
 
@@ -393,6 +393,7 @@ LL_OPERATIONS = {
     'raw_memset':           LLOp(),
     'raw_memcopy':          LLOp(),
     'raw_memmove':          LLOp(),
+    'raw_prefetch':         LLOp(canrun=True),
     'raw_load':             LLOp(sideeffects=False, canrun=True),
     'raw_store':            LLOp(canrun=True),
     'bare_raw_store':       LLOp(),
@@ -439,16 +440,21 @@ LL_OPERATIONS = {
     'get_exc_value_addr':   LLOp(),
     'do_malloc_fixedsize':LLOp(canmallocgc=True),
     'do_malloc_fixedsize_clear': LLOp(canmallocgc=True),
+    'do_malloc_fixedsize_old': LLOp(canmallocgc=True),
     'do_malloc_varsize':  LLOp(canmallocgc=True),
     'do_malloc_varsize_clear':  LLOp(canmallocgc=True),
     'get_write_barrier_failing_case': LLOp(sideeffects=False),
     'get_write_barrier_from_array_failing_case': LLOp(sideeffects=False),
     'gc_get_type_info_group': LLOp(sideeffects=False),
+    'gc_should_pretenure': LLOp(sideeffects=False),
     'll_read_timestamp': LLOp(canrun=True),
 
     # __________ GC operations __________
 
     'gc__collect':          LLOp(canmallocgc=True),
+    'gc_freeze':            LLOp(canmallocgc=True),
+    'gc_collect_step':      LLOp(canmallocgc=True),
+    'gc_get_stats':         LLOp(),
     'gc_free':              LLOp(),
     'gc_fetch_exception':   LLOp(),
     'gc_restore_exception': LLOp(),
@@ -710,6 +710,10 @@ def op_raw_store(p, ofs, newvalue):
     p = rffi.cast(rffi.CArrayPtr(TVAL), p + ofs)
     p[0] = newvalue
 
+def op_raw_prefetch(addr):
+    assert lltype.typeOf(addr) == llmemory.Address
+    # only a hint, nothing to do here
+
 def op_raw_load(TVAL, p, ofs):
     from rpython.rtyper.lltypesystem import rffi
     p = rffi.cast(llmemory.Address, p)
@@ -52,6 +52,17 @@ class BasicGcPolicy(object):
     def OP_GC_SET_MAX_HEAP_SIZE(self, funcgen, op):
         return ''
 
+    def OP_GC_FREEZE(self, funcgen, op):
+        return '%s = 0;' % funcgen.expr(op.result)
+
+    def OP_GC_COLLECT_STEP(self, funcgen, op):
+        # not incremental: do a full collection, which finishes at once
+        return '%s %s = 1;' % (self.OP_GC__COLLECT(funcgen, op),
+                               funcgen.expr(op.result))
+
+    def OP_GC_GET_STATS(self, funcgen, op):
+        return '%s = -1;' % funcgen.expr(op.result)
+
     def OP_GC_THREAD_PREPARE(self, funcgen, op):
         return ''
 
@@ -254,6 +265,13 @@ class BoehmGcPolicy(BasicGcPolicy):
         nbytes = funcgen.expr(op.args[0])
         return 'GC_set_max_heap_size(%s);' % (nbytes,)
 
+    def OP_GC_FREEZE(self, funcgen, op):
+        return 'GC_gcollect(); %s = 0;' % funcgen.expr(op.result)
+
+    def OP_GC_COLLECT_STEP(self, funcgen, op):
+        # GC_collect_a_little() returns 0 when there is nothing left to do
+        return '%s = !GC_collect_a_little();' % funcgen.expr(op.result)
+
     def GC_KEEPALIVE(self, funcgen, v):
         return 'pypy_asm_keepalive(%s);' % funcgen.expr(v)
 
@@ -32,6 +32,13 @@
 #define OP_RAW_MEMCOPY(x,y,size,r) memcpy(y,x,size);
 #define OP_RAW_MEMMOVE(x,y,size,r) memmove(y,x,size);
 
+/* only a hint: start loading into the cache the line at 'p', for writing */
+#ifdef __GNUC__
+#  define OP_RAW_PREFETCH(p, r)  __builtin_prefetch((void*)(p), 1)
+#else
+#  define OP_RAW_PREFETCH(p, r)  /* nothing */
+#endif
+
 /************************************************************/
 
 #define OP_FREE(p)	OP_RAW_FREE(p, do_not_use)
@@ -146,6 +146,21 @@ def test_raw_memmove():
     res = fc()
     assert res
 
+def test_raw_prefetch():
+    from rpython.rtyper.lltypesystem import lltype
+    from rpython.rtyper.lltypesystem.lloperation import llop
+    def f():
+        addr = raw_malloc(100)
+        addr.signed[0] = 12
+        llop.raw_prefetch(lltype.Void, addr)
+        llop.raw_prefetch(lltype.Void, addr + 50)
+        result = addr.signed[0]
+        raw_free(addr)
+        return result
+    fc = compile(f, [])
+    res = fc()
+    assert res == 12
+
 def test_pointer_comparison():
     def f():
         result = 0
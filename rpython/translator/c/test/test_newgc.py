@@ -1776,6 +1776,36 @@ class TestIncrementalMiniMarkGC(TestMiniMarkGC):
         res = self.run("ignore_finalizer")
         assert res == 1    # translated: x1 is removed from the list
 
+    def define_collect_step(cls):
+        class A:
+            pass
+        def f():
+            a = None
+            for i in range(1000):
+                b = A()
+                b.x = i
+                b.next = a
+                a = b
+            rgc.collect()
+            majors = rgc.get_stats(rgc.STAT_MAJOR_COLLECTIONS)
+            steps = 1
+            while not rgc.collect_step(1000):
+                steps += 1
+            if rgc.get_stats(rgc.STAT_MAJOR_COLLECTIONS) != majors + 1:
+                return -1
+            total = 0
+            while a is not None:
+                total += a.x
+                a = a.next
+            if total != 499500:
+                return -2
+            return steps
+        return f
+
+    def test_collect_step(self):
+        res = self.run("collect_step")
+        assert res > 1
+
 
 # ____________________________________________________________________
 
@@ -156,3 +156,10 @@ class TestRefcount(object):
         fn = self.compile_func(f, [int])
         res = fn(1)
         assert res == 1
+
+    def test_collect_step(self):
+        from rpython.rlib import rgc
+        def f():
+            return rgc.collect_step(1000)
+        fn = self.compile_func(f, [])
+        assert fn() == 1